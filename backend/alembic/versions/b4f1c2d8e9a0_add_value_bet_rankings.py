@@ -0,0 +1,64 @@
+"""Add value bet scan snapshot tables
+
+Revision ID: b4f1c2d8e9a0
+Revises: 9739fb5c6a1f
+Create Date: 2026-10-16 10:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f1c2d8e9a0'
+down_revision = '9739fb5c6a1f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('value_bet_scans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('matches_analyzed', sa.Integer(), nullable=True),
+    sa.Column('matches_with_odds', sa.Integer(), nullable=True),
+    sa.Column('value_bets_found', sa.Integer(), nullable=True),
+    sa.Column('strength_source', sa.String(), nullable=True),
+    sa.Column('elapsed_seconds', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_value_bet_scans_id'), 'value_bet_scans', ['id'], unique=False)
+    op.create_table('value_bet_rankings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('scan_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('match_rank', sa.Integer(), nullable=False),
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('match_name', sa.String(), nullable=False),
+    sa.Column('market_type', sa.String(), nullable=False),
+    sa.Column('market_name', sa.String(), nullable=True),
+    sa.Column('selection', sa.String(), nullable=False),
+    sa.Column('market_odds', sa.Float(), nullable=False),
+    sa.Column('fair_odds', sa.Float(), nullable=True),
+    sa.Column('our_probability', sa.Float(), nullable=True),
+    sa.Column('implied_probability', sa.Float(), nullable=True),
+    sa.Column('edge', sa.Float(), nullable=False),
+    sa.Column('kelly_stake', sa.Float(), nullable=True),
+    sa.Column('value_rating', sa.String(), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('bookmaker', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+    sa.ForeignKeyConstraint(['scan_id'], ['value_bet_scans.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_value_bet_rankings_id'), 'value_bet_rankings', ['id'], unique=False)
+    op.create_index('ix_value_bet_rankings_scan_rank', 'value_bet_rankings', ['scan_id', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_value_bet_rankings_scan_rank', table_name='value_bet_rankings')
+    op.drop_index(op.f('ix_value_bet_rankings_id'), table_name='value_bet_rankings')
+    op.drop_table('value_bet_rankings')
+    op.drop_index(op.f('ix_value_bet_scans_id'), table_name='value_bet_scans')
+    op.drop_table('value_bet_scans')
@@ -0,0 +1,74 @@
+"""Add daily performance rollups
+
+Revision ID: c7d2e4a1f3b5
+Revises: b4f1c2d8e9a0
+Create Date: 2026-10-16 14:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e4a1f3b5'
+down_revision = 'b4f1c2d8e9a0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('performance_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('bucket_date', sa.Date(), nullable=False),
+    sa.Column('model_name', sa.String(), nullable=False),
+    sa.Column('model_version', sa.String(), nullable=False),
+    sa.Column('market_type', sa.String(), nullable=False),
+    sa.Column('league', sa.String(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('greens', sa.Integer(), nullable=False),
+    sa.Column('reds', sa.Integer(), nullable=False),
+    sa.Column('profit_loss', sa.Float(), nullable=False),
+    sa.Column('confidence_sum', sa.Float(), nullable=False),
+    sa.Column('feedback_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'bucket_date', 'model_name', 'model_version', 'market_type', 'league', name='uq_performance_rollups_bucket')
+    )
+    op.create_index(op.f('ix_performance_rollups_id'), 'performance_rollups', ['id'], unique=False)
+
+    # Backfill a partir das predições já liquidadas
+    op.execute("""
+        INSERT INTO performance_rollups (source, bucket_date, model_name, model_version, market_type, league,
+                                         total, greens, reds, profit_loss, confidence_sum, feedback_sum)
+        SELECT 'predictions', COALESCE(date(p.predicted_at), CURRENT_DATE), '', COALESCE(p.model_version, ''),
+               COALESCE(p.market_type, ''), COALESCE(m.league, ''), COUNT(*),
+               SUM(CASE WHEN p.is_winner THEN 1 ELSE 0 END),
+               SUM(CASE WHEN NOT p.is_winner THEN 1 ELSE 0 END),
+               SUM(COALESCE(p.profit_loss, 0)), SUM(COALESCE(p.confidence_score, 0)), 0
+        FROM predictions p JOIN matches m ON m.id = p.match_id
+        WHERE p.actual_outcome IS NOT NULL
+        GROUP BY COALESCE(date(p.predicted_at), CURRENT_DATE), COALESCE(p.model_version, ''),
+                 COALESCE(p.market_type, ''), COALESCE(m.league, '')
+    """)
+    # prediction_logs é criada por create_ml_tables.py (fora do Alembic)
+    if 'prediction_logs' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.execute("""
+        INSERT INTO performance_rollups (source, bucket_date, model_name, model_version, market_type, league,
+                                         total, greens, reds, profit_loss, confidence_sum, feedback_sum)
+        SELECT 'prediction_logs', COALESCE(date(l.created_at), CURRENT_DATE), COALESCE(l.model_name, ''),
+               COALESCE(l.model_version, ''), '1X2', COALESCE(l.league, ''), COUNT(*),
+               SUM(CASE WHEN l.was_correct THEN 1 ELSE 0 END),
+               SUM(CASE WHEN l.was_correct THEN 0 ELSE 1 END),
+               0, SUM(COALESCE(l.confidence_score, 0)), SUM(COALESCE(l.feedback_score, 0))
+        FROM prediction_logs l
+        WHERE l.analyzed_at IS NOT NULL
+        GROUP BY COALESCE(date(l.created_at), CURRENT_DATE), COALESCE(l.model_name, ''),
+                 COALESCE(l.model_version, ''), COALESCE(l.league, '')
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_performance_rollups_id'), table_name='performance_rollups')
+    op.drop_table('performance_rollups')
@@ -0,0 +1,81 @@
+"""Add composite and partial indexes for hot filters
+
+Revision ID: d3a9f6b2c8e1
+Revises: c7d2e4a1f3b5
+Create Date: 2026-10-16 16:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9f6b2c8e1'
+down_revision = 'c7d2e4a1f3b5'
+branch_labels = None
+depends_on = None
+
+
+# (nome, tabela, colunas, WHERE do índice parcial)
+INDEXES = [
+    ('ix_matches_status_match_date', 'matches', ['status', 'match_date'], None),
+    ('ix_matches_home_team_date', 'matches', ['home_team_id', 'match_date'], None),
+    ('ix_matches_away_team_date', 'matches', ['away_team_id', 'match_date'], None),
+    ('ix_predictions_match_market_type', 'predictions', ['match_id', 'market_type', 'prediction_type'], None),
+    ('ix_predictions_market_confidence', 'predictions', ['market_type', 'confidence_score'], None),
+    ('ix_predictions_model_version', 'predictions', ['model_version'], None),
+    ('ix_predictions_predicted_at', 'predictions', ['predicted_at'], None),
+    ('ix_predictions_pending', 'predictions', ['match_id'], 'actual_outcome IS NULL'),
+    ('ix_odds_match_market_timestamp', 'odds', ['match_id', 'market', 'odds_timestamp'], None),
+    ('ix_odds_active_match', 'odds', ['match_id'], 'is_active = {true}'),
+    ('ix_team_statistics_team_season', 'team_statistics', ['team_id', 'season'], None),
+    ('ix_ticket_selections_match_id', 'ticket_selections', ['match_id'], None),
+    ('ix_prediction_logs_match_id', 'prediction_logs', ['match_id'], None),
+]
+
+
+def _existing(bind):
+    """Tabelas existentes -> nomes de índices (algumas tabelas são criadas fora do Alembic)"""
+    inspector = sa.inspect(bind)
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def _create_indexes(existing, true):
+    for name, table, columns, where in INDEXES:
+        if table not in existing or name in existing[table]:
+            continue
+        partial = sa.text(where.format(true=true)) if where else None
+        op.create_index(
+            name, table, columns, unique=False,
+            sqlite_where=partial, postgresql_where=partial, postgresql_concurrently=True
+        )
+
+
+def _analyze(existing):
+    """Estatísticas novas para o planner considerar os índices recém-criados"""
+    for table in sorted({table for _, table, _, _ in INDEXES if table in existing}):
+        op.execute(f"ANALYZE {table}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = _existing(bind)
+
+    if bind.dialect.name == 'postgresql':
+        # CONCURRENTLY: não bloqueia escrita em tabelas grandes (fora de transação)
+        with op.get_context().autocommit_block():
+            _create_indexes(existing, 'true')
+            _analyze(existing)
+    else:
+        _create_indexes(existing, '1')
+        _analyze(existing)
+
+
+def downgrade() -> None:
+    existing = _existing(op.get_bind())
+    for name, table, _, _ in reversed(INDEXES):
+        if name in existing.get(table, ()):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,43 @@
+"""Add job_runs history for the job runner
+
+Revision ID: e5b8c1d4a7f2
+Revises: d3a9f6b2c8e1
+Create Date: 2026-10-16 21:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c1d4a7f2'
+down_revision = 'd3a9f6b2c8e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('job_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.String(), nullable=False),
+    sa.Column('runner', sa.String(), nullable=False),
+    sa.Column('worker', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_seconds', sa.Float(), nullable=False),
+    sa.Column('items_processed', sa.Integer(), nullable=False),
+    sa.Column('api_calls', sa.Integer(), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_runs_id'), 'job_runs', ['id'], unique=False)
+    op.create_index('ix_job_runs_job_started', 'job_runs', ['job_id', 'started_at'], unique=False)
+    op.create_index('ix_job_runs_started_at', 'job_runs', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_runs_started_at', table_name='job_runs')
+    op.drop_index('ix_job_runs_job_started', table_name='job_runs')
+    op.drop_index(op.f('ix_job_runs_id'), table_name='job_runs')
+    op.drop_table('job_runs')
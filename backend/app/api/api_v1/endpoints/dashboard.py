@@ -4,18 +4,20 @@
 Endpoints específicos para o Dashboard e Sidebar
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.response_cache import cached_response, NS_DASHBOARD
 from app.models.match import Match
 from app.models.prediction import Prediction
 
 router = APIRouter()
 
 @router.get("/overview")
-async def get_dashboard_overview(db: Session = Depends(get_db)):
+@cached_response(NS_DASHBOARD, ttl=60)
+async def get_dashboard_overview(db: AsyncSession = Depends(get_async_db)):
     """
     Overview do dashboard para sidebar - Today's Overview
     Retorna estatísticas do dia atual
@@ -25,15 +27,17 @@ async def get_dashboard_overview(db: Session = Depends(get_db)):
     today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
 
     # Jogos de hoje
-    today_matches = db.query(func.count(Match.id)).filter(
-        and_(
-            Match.match_date >= today_start,
-            Match.match_date <= today_end
+    today_matches = (await db.execute(
+        select(func.count(Match.id)).where(
+            and_(
+                Match.match_date >= today_start,
+                Match.match_date <= today_end
+            )
         )
-    ).scalar() or 0
+    )).scalar() or 0
 
     # Predições feitas (total)
-    predictions_made = db.query(func.count(Prediction.id)).scalar() or 0
+    predictions_made = (await db.execute(select(func.count(Prediction.id)))).scalar() or 0
 
     # Taxa de acurácia do modelo
     accuracy_rate = 59.0  # Baseado no modelo Random Forest Enhanced
@@ -42,21 +46,23 @@ async def get_dashboard_overview(db: Session = Depends(get_db)):
     future_24h = now + timedelta(hours=24)
 
     # Buscar jogos nas próximas 24h
-    upcoming_matches = db.query(Match.id).filter(
-        and_(
-            Match.match_date >= now,
-            Match.match_date <= future_24h,
-            Match.status.in_(['NS', 'TBD', 'SCHEDULED'])
+    upcoming_matches = (await db.execute(
+        select(Match.id).where(
+            and_(
+                Match.match_date >= now,
+                Match.match_date <= future_24h,
+                Match.status.in_(['NS', 'TBD', 'SCHEDULED'])
+            )
         )
-    ).all()
+    )).all()
 
     # Extrair IDs dos jogos
     upcoming_match_ids = [m.id for m in upcoming_matches]
 
     # Buscar predições para esses jogos
-    predictions_for_upcoming = db.query(Prediction.match_id).filter(
-        Prediction.match_id.in_(upcoming_match_ids)
-    ).all() if upcoming_match_ids else []
+    predictions_for_upcoming = (await db.execute(
+        select(Prediction.match_id).where(Prediction.match_id.in_(upcoming_match_ids))
+    )).all() if upcoming_match_ids else []
 
     # Contar jogos sem predições
     pred_match_ids = {p.match_id for p in predictions_for_upcoming}
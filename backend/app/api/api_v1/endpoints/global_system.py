@@ -3,15 +3,15 @@
 Endpoints para gerenciar o sistema escalável de análise mundial
 """
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from typing import Dict, List, Optional
 from datetime import datetime, date, timedelta
-from app.services.global_match_system import global_match_system, run_daily_analysis, start_global_monitoring
+from app.api.deps import get_global_match_system
 
 router = APIRouter()
 
 @router.get("/status")
-async def get_system_status():
+async def get_system_status(global_match_system=Depends(get_global_match_system)):
     """
     📊 Status do Sistema Global
 
@@ -34,7 +34,8 @@ async def get_system_status():
 @router.post("/discover-matches")
 async def discover_matches_globally(
     days_ahead: int = Query(7, ge=1, le=30, description="Dias à frente para descobrir jogos"),
-    background_tasks: BackgroundTasks = None
+    background_tasks: BackgroundTasks = None,
+    global_match_system=Depends(get_global_match_system)
 ):
     """
     🔍 Descoberta Global de Jogos
@@ -77,7 +78,8 @@ async def discover_matches_globally(
 @router.post("/generate-predictions")
 async def generate_predictions_for_date(
     target_date: Optional[date] = Query(None, description="Data para gerar previsões (padrão: hoje)"),
-    background_tasks: BackgroundTasks = None
+    background_tasks: BackgroundTasks = None,
+    global_match_system=Depends(get_global_match_system)
 ):
     """
     🧠 Geração de Previsões em Massa
@@ -165,7 +167,7 @@ async def generate_predictions_for_date(
         raise HTTPException(status_code=500, detail=f"Erro ao gerar previsões: {str(e)}")
 
 @router.get("/live-monitoring")
-async def get_live_monitoring_status():
+async def get_live_monitoring_status(global_match_system=Depends(get_global_match_system)):
     """
     🔴 Status do Monitoramento Ao Vivo
 
@@ -219,6 +221,8 @@ async def start_global_monitoring_endpoint(background_tasks: BackgroundTasks):
     - Preparação de dados para retreino
     """
     try:
+        from app.services.global_match_system import start_global_monitoring
+
         # Iniciar monitoramento em background
         background_tasks.add_task(start_global_monitoring)
 
@@ -250,6 +254,8 @@ async def run_daily_analysis_endpoint(background_tasks: BackgroundTasks):
     4. Preparação para monitoramento
     """
     try:
+        from app.services.global_match_system import run_daily_analysis
+
         # Executar análise em background
         background_tasks.add_task(run_daily_analysis)
 
@@ -271,7 +277,7 @@ async def run_daily_analysis_endpoint(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Erro na análise diária: {str(e)}")
 
 @router.get("/leagues")
-async def get_supported_leagues():
+async def get_supported_leagues(global_match_system=Depends(get_global_match_system)):
     """
     🏆 Ligas Suportadas
 
@@ -299,7 +305,7 @@ async def get_supported_leagues():
     }
 
 @router.get("/predictions/{match_id}")
-async def get_match_prediction_by_id(match_id: str):
+async def get_match_prediction_by_id(match_id: str, global_match_system=Depends(get_global_match_system)):
     """
     🎯 Previsão de Jogo Específico
 
@@ -338,7 +344,7 @@ async def get_match_prediction_by_id(match_id: str):
         raise HTTPException(status_code=500, detail=f"Erro ao buscar previsão: {str(e)}")
 
 @router.get("/today")
-async def get_today_analysis():
+async def get_today_analysis(global_match_system=Depends(get_global_match_system)):
     """
     📅 Análise de Hoje
 
@@ -2,25 +2,49 @@
 🔴 LIVE MATCHES - Endpoint para monitoramento de jogos ao vivo
 """
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, select
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db, run_sync_db
 from app.core.rate_limiter import limiter
 from app.models import Match, Odds, Prediction
+from app.services.match_page_loader import load_1x2_predictions_async, load_latest_1x2_odds_async
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+
+async def _load_matches(db: AsyncSession, *criteria, order_by, limit: Optional[int] = None) -> List[Match]:
+    """Jogos com os times já carregados (AsyncSession não permite lazy load)"""
+    stmt = select(Match).options(
+        selectinload(Match.home_team), selectinload(Match.away_team)
+    ).where(*criteria).order_by(order_by)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list((await db.execute(stmt)).scalars())
+
+
+async def _load_odds_and_predictions(
+    db: AsyncSession,
+    match_ids: List[int]
+) -> Tuple[Dict[int, Odds], Dict[int, Prediction]]:
+    """Odds 1X2 mais recentes e prediction 1X2 de todos os jogos (2 queries)"""
+    return (
+        await load_latest_1x2_odds_async(db, match_ids),
+        await load_1x2_predictions_async(db, match_ids)
+    )
+
+
 @router.get("/live")
 @limiter.limit("60/minute")
 async def get_live_matches(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 100
 ):
     """
@@ -38,24 +62,19 @@ async def get_live_matches(
     # Buscar jogos AO VIVO
     live_statuses = ['LIVE', '1H', '2H', 'HT', 'BT', 'ET', 'P', 'SUSP', 'INT']
 
-    live_matches = db.query(Match).filter(
-        Match.status.in_(live_statuses)
-    ).order_by(Match.match_date.desc()).limit(limit).all()
+    live_matches = await _load_matches(
+        db, Match.status.in_(live_statuses),
+        order_by=Match.match_date.desc(), limit=limit
+    )
+
+    # Odds mais recentes e predictions (se existirem) de todos os jogos
+    odds_by_match, predictions_by_match = await _load_odds_and_predictions(db, [m.id for m in live_matches])
 
     results = []
 
     for match in live_matches:
-        # Buscar odds mais recentes
-        latest_odds = db.query(Odds).filter(
-            Odds.match_id == match.id,
-            Odds.market == '1X2'
-        ).order_by(Odds.odds_timestamp.desc()).first()
-
-        # Buscar prediction (se existir)
-        prediction = db.query(Prediction).filter(
-            Prediction.match_id == match.id,
-            Prediction.market_type == '1X2'
-        ).first()
+        latest_odds = odds_by_match.get(match.id)
+        prediction = predictions_by_match.get(match.id)
 
         match_data = {
             'id': match.id,
@@ -105,7 +124,7 @@ async def get_live_matches(
 @limiter.limit("60/minute")
 async def get_today_matches(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     include_finished: bool = False
 ):
     """
@@ -121,32 +140,24 @@ async def get_today_matches(
     today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     today_end = today_start + timedelta(days=1)
 
-    query = db.query(Match).filter(
-        and_(
-            Match.match_date >= today_start,
-            Match.match_date < today_end
-        )
-    )
+    criteria = [
+        Match.match_date >= today_start,
+        Match.match_date < today_end
+    ]
 
     if not include_finished:
-        query = query.filter(Match.status != 'FT')
+        criteria.append(Match.status != 'FT')
+
+    matches = await _load_matches(db, *criteria, order_by=Match.match_date)
 
-    matches = query.order_by(Match.match_date).all()
+    # Odds e predictions de todos os jogos de uma vez
+    odds_by_match, predictions_by_match = await _load_odds_and_predictions(db, [m.id for m in matches])
 
     results = []
 
     for match in matches:
-        # Buscar odds
-        latest_odds = db.query(Odds).filter(
-            Odds.match_id == match.id,
-            Odds.market == '1X2'
-        ).order_by(Odds.odds_timestamp.desc()).first()
-
-        # Buscar prediction
-        prediction = db.query(Prediction).filter(
-            Prediction.match_id == match.id,
-            Prediction.market_type == '1X2'
-        ).first()
+        latest_odds = odds_by_match.get(match.id)
+        prediction = predictions_by_match.get(match.id)
 
         match_data = {
             'id': match.id,
@@ -202,7 +213,7 @@ async def get_today_matches(
 @limiter.limit("60/minute")
 async def get_upcoming_matches(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     hours_ahead: int = 24,
     limit: int = 50
 ):
@@ -216,26 +227,21 @@ async def get_upcoming_matches(
     now = datetime.now()
     future_time = now + timedelta(hours=hours_ahead)
 
-    upcoming = db.query(Match).filter(
-        and_(
-            Match.match_date > now,
-            Match.match_date <= future_time,
-            Match.status.in_(['NS', 'TBD', 'SCHEDULED'])
-        )
-    ).order_by(Match.match_date).limit(limit).all()
+    upcoming = await _load_matches(
+        db,
+        Match.match_date > now,
+        Match.match_date <= future_time,
+        Match.status.in_(['NS', 'TBD', 'SCHEDULED']),
+        order_by=Match.match_date, limit=limit
+    )
+
+    odds_by_match, predictions_by_match = await _load_odds_and_predictions(db, [m.id for m in upcoming])
 
     results = []
 
     for match in upcoming:
-        latest_odds = db.query(Odds).filter(
-            Odds.match_id == match.id,
-            Odds.market == '1X2'
-        ).order_by(Odds.odds_timestamp.desc()).first()
-
-        prediction = db.query(Prediction).filter(
-            Prediction.match_id == match.id,
-            Prediction.market_type == '1X2'
-        ).first()
+        latest_odds = odds_by_match.get(match.id)
+        prediction = predictions_by_match.get(match.id)
 
         # Calculate time until match starts
         time_until = match.match_date - now
@@ -279,10 +285,7 @@ async def get_upcoming_matches(
 
 @router.get("/stats")
 @limiter.limit("100/minute")
-async def get_live_stats(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+async def get_live_stats(request: Request):
     """
     📊 ESTATÍSTICAS AO VIVO
 
@@ -299,8 +302,8 @@ async def get_live_stats(
     from app.services.live_stats_service import LiveStatsService
 
     try:
-        service = LiveStatsService(db)
-        live_matches = service.get_live_matches()
+        # Serviço síncrono: roda no threadpool limitado, fora do event loop
+        live_matches = await run_sync_db(lambda db: LiveStatsService(db).get_live_matches())
 
         return {
             'success': True,
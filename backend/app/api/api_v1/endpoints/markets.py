@@ -4,15 +4,19 @@ Endpoints para mercados de apostas, análise Poisson e value bets
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 
-from app.core.database import get_db
-from app.models import Match, Team, Odds
-from app.services.poisson_service import poisson_service
+from app.core.database import get_db, get_async_db, run_sync_db
+from app.core.response_cache import cached_response, NS_VALUE_BETS
+from app.models import Match, Team, Odds, TeamStatistics
+from app.services.poisson_service import poisson_service, PoissonPrediction, DEFAULT_LEAGUE_AVG_GOALS
 from app.services.value_bet_detector import value_bet_detector, ValueBet
+from app.services.value_bet_scanner import value_bet_scanner, SNAPSHOT_MIN_EDGE
 from app.core.markets_config import (
     MARKET_NAMES,
     MARKET_CATEGORIES,
@@ -24,6 +28,40 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _analyze_match_poisson(
+    db: Session,
+    match: Match,
+    league_avg_goals: Optional[float] = None
+) -> Tuple[PoissonPrediction, str]:
+    """
+    Poisson do jogo: forças Dixon-Coles ajustadas (ataque/defesa por time,
+    fator casa por liga) e, sem modelo ajustado, médias de TeamStatistics
+
+    Returns:
+        (predição, modelo usado: 'dixon_coles' ou 'team_statistics')
+    """
+    from app.services.team_strength_service import team_strength_service
+
+    prediction = team_strength_service.analyze_match(match)
+    if prediction is not None:
+        return prediction, 'dixon_coles'
+
+    home_stats, away_stats = (
+        db.query(TeamStatistics).filter(
+            TeamStatistics.team_id == team_id
+        ).order_by(TeamStatistics.created_at.desc()).first()
+        for team_id in (match.home_team_id, match.away_team_id)
+    )
+    prediction = poisson_service.analyze_match(
+        home_goals_avg=home_stats.goals_scored_avg if home_stats else 1.5,
+        away_goals_avg=away_stats.goals_scored_avg if away_stats else 1.3,
+        home_conceded_avg=home_stats.goals_conceded_avg if home_stats else 1.2,
+        away_conceded_avg=away_stats.goals_conceded_avg if away_stats else 1.1,
+        league_avg=league_avg_goals or DEFAULT_LEAGUE_AVG_GOALS
+    )
+    return prediction, 'team_statistics'
+
+
 @router.get("/markets")
 async def get_all_available_markets():
     """
@@ -42,7 +80,7 @@ async def get_all_available_markets():
 @router.get("/markets/{match_id}")
 async def get_match_markets(
     match_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retorna todos os mercados e odds disponíveis para uma partida
@@ -54,12 +92,16 @@ async def get_match_markets(
         - Odds organizadas por mercado
     """
     # Buscar partida
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = (await db.execute(
+        select(Match).options(
+            selectinload(Match.home_team), selectinload(Match.away_team)
+        ).where(Match.id == match_id)
+    )).scalars().first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
     # Buscar todas as odds
-    odds_list = db.query(Odds).filter(Odds.match_id == match_id).all()
+    odds_list = (await db.execute(select(Odds).where(Odds.match_id == match_id))).scalars().all()
 
     # Organizar por mercado
     markets_data = {}
@@ -87,7 +129,9 @@ async def get_match_markets(
 @router.post("/analysis/poisson/{match_id}")
 async def analyze_match_poisson(
     match_id: int,
-    league_avg_goals: float = Query(2.7, description="Média de gols da liga"),
+    league_avg_goals: Optional[float] = Query(
+        None, description="Média de gols da liga (só usada sem modelo Dixon-Coles ajustado)"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -95,10 +139,11 @@ async def analyze_match_poisson(
 
     Args:
         match_id: ID da partida
-        league_avg_goals: Média de gols da liga (default: 2.7)
+        league_avg_goals: Média de gols da liga no fallback por TeamStatistics
+            (default: DEFAULT_LEAGUE_AVG_GOALS)
 
     Returns:
-        - Lambdas calculados
+        - Lambdas calculados (forças Dixon-Coles ajustadas quando disponíveis)
         - Probabilidades de todos os resultados
         - Odds justas (fair odds)
     """
@@ -107,27 +152,14 @@ async def analyze_match_poisson(
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
-    # Calcular médias de gols (simplificado - em produção usar histórico real)
-    # Aqui vamos usar dados mockados, mas você deve implementar cálculo real
-    home_goals_avg = 1.5  # TODO: Calcular do histórico
-    away_goals_avg = 1.2
-    home_conceded_avg = 1.0
-    away_conceded_avg = 1.3
-
-    # Análise Poisson
-    prediction = poisson_service.analyze_match(
-        home_goals_avg=home_goals_avg,
-        away_goals_avg=away_goals_avg,
-        home_conceded_avg=home_conceded_avg,
-        away_conceded_avg=away_conceded_avg,
-        league_avg=league_avg_goals
-    )
+    prediction, model = _analyze_match_poisson(db, match, league_avg_goals)
 
     return {
         "match_id": match_id,
         "match_name": f"{match.home_team.name} vs {match.away_team.name}",
         "lambda_home": round(prediction.home_lambda, 3),
         "lambda_away": round(prediction.away_lambda, 3),
+        "model": model,
         "probabilities": {
             k: round(v * 100, 2) for k, v in prediction.probabilities.items()
         },
@@ -163,17 +195,7 @@ async def detect_match_value_bets(
         raise HTTPException(status_code=404, detail="Match not found")
 
     # Análise Poisson
-    home_goals_avg = 1.5  # TODO: Calcular real
-    away_goals_avg = 1.2
-    home_conceded_avg = 1.0
-    away_conceded_avg = 1.3
-
-    poisson_prediction = poisson_service.analyze_match(
-        home_goals_avg=home_goals_avg,
-        away_goals_avg=away_goals_avg,
-        home_conceded_avg=home_conceded_avg,
-        away_conceded_avg=away_conceded_avg
-    )
+    poisson_prediction, _ = _analyze_match_poisson(db, match)
 
     # Buscar odds de mercado
     odds_list = db.query(Odds).filter(Odds.match_id == match_id).all()
@@ -214,103 +236,39 @@ async def detect_match_value_bets(
 
 
 @router.get("/value-bets/scan")
+@cached_response(NS_VALUE_BETS, ttl=300)
 async def scan_all_value_bets(
-    min_edge: float = Query(10.0, description="Edge mínimo (%)"),
-    limit: int = Query(20, description="Máximo de value bets a retornar"),
-    db: Session = Depends(get_db)
+    min_edge: float = Query(10.0, ge=SNAPSHOT_MIN_EDGE, description=f"Edge mínimo (%), a partir de {SNAPSHOT_MIN_EDGE}"),
+    limit: int = Query(20, ge=1, le=200, description="Máximo de value bets a retornar"),
+    offset: int = Query(0, ge=0, description="Paginação: quantos value bets pular"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Escaneia TODAS as partidas disponíveis procurando value bets
+    Value bets de TODAS as partidas ativas, ranqueados por rating + edge
+
+    O scan é pré-calculado pelo scheduler (value_bet_scanner.run_scan) a partir
+    das forças reais dos times e das odds de todas as partidas; aqui apenas
+    paginamos o snapshot (máximo 2 value bets por jogo).
 
     Args:
-        min_edge: Edge mínimo
+        min_edge: Edge mínimo (>= SNAPSHOT_MIN_EDGE: o snapshot não guarda edges menores)
         limit: Máximo de resultados
+        offset: Início da página
 
     Returns:
         - Top value bets de todas as partidas
     """
-    # Buscar apenas partidas ATIVAS (não finalizadas, não canceladas, não adiadas)
-    # Status permitidos: NS (não iniciado), 1H (1º tempo), 2H (2º tempo), HT (intervalo), LIVE
-    # Também filtrar por data (apenas jogos de hoje e futuros)
-    from datetime import datetime, timedelta
-    today = datetime.now().date()
-    yesterday = today - timedelta(days=1)
-
-    matches = db.query(Match).filter(
-        Match.status.in_(['NS', '1H', '2H', 'HT', 'LIVE']),  # Apenas jogos ativos
-        Match.match_date >= yesterday  # Apenas jogos recentes/futuros
-    ).limit(50).all()
-
-    all_value_bets = []
-
-    for match in matches:
-        try:
-            # Análise simplificada (em produção, fazer cálculos reais)
-            poisson_prediction = poisson_service.analyze_match(
-                home_goals_avg=1.5,
-                away_goals_avg=1.2,
-                home_conceded_avg=1.0,
-                away_conceded_avg=1.3
-            )
-
-            # Buscar odds
-            odds_list = db.query(Odds).filter(Odds.match_id == match.id).all()
-
-            if not odds_list:
-                continue
-
-            market_odds = {}
-            for odd in odds_list:
-                if odd.market_type not in market_odds:
-                    market_odds[odd.market_type] = {}
-
-                for selection, odds_value in odd.odds_data.items():
-                    market_odds[odd.market_type][selection] = {
-                        'odds': float(odds_value),
-                        'bookmaker': odd.bookmaker
-                    }
-
-            # Detectar value bets
-            value_bets = value_bet_detector.detect_value_bets(
-                match_id=match.id,
-                match_name=f"{match.home_team.name} vs {match.away_team.name}",
-                poisson_prediction=poisson_prediction,
-                market_odds=market_odds,
-                confidence=0.7
-            )
-
-            # Adicionar apenas os com edge >= min_edge
-            all_value_bets.extend([vb for vb in value_bets if vb.edge >= min_edge])
-
-        except Exception as e:
-            logger.error(f"Erro ao analisar match {match.id}: {e}")
-            continue
-
-    # 🔧 MELHORADO: Ordenação inteligente por rating + edge
-    rating_priority = {'PREMIUM': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
-    all_value_bets.sort(
-        key=lambda x: (rating_priority.get(x.value_rating, 0), x.edge),
-        reverse=True
-    )
-
-    # 🔧 MELHORADO: Diversificação - pegar no máximo 2 value bets por jogo
-    diversified_vbs = []
-    match_count = {}
+    page = await value_bet_scanner.get_page_async(db, min_edge=min_edge, offset=offset, limit=limit)
 
-    for vb in all_value_bets:
-        if match_count.get(vb.match_id, 0) < 2:
-            diversified_vbs.append(vb)
-            match_count[vb.match_id] = match_count.get(vb.match_id, 0) + 1
+    if page is None:
+        # Primeiro acesso antes do job: calcular o snapshot agora (fora do event loop)
+        await run_sync_db(value_bet_scanner.run_scan)
+        page = await value_bet_scanner.get_page_async(db, min_edge=min_edge, offset=offset, limit=limit)
 
-        if len(diversified_vbs) >= limit:
-            break
+    if page is None:
+        raise HTTPException(status_code=503, detail="Scan de value bets indisponível")
 
-    return {
-        "total_matches_analyzed": len(matches),
-        "total_value_bets_found": len(all_value_bets),
-        "value_bets": [vb.to_dict() for vb in diversified_vbs],
-        "generated_at": datetime.now().isoformat()
-    }
+    return page
 
 
 @router.post("/calculator/kelly")
@@ -1,16 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime, date
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models import Match, Team
 from app.services.football_data_service import FootballDataService
 
 router = APIRouter()
 
+# Times carregados junto com o jogo (AsyncSession não faz lazy load)
+WITH_TEAMS = (selectinload(Match.home_team), selectinload(Match.away_team))
+
+
 @router.get("/today")
-async def get_today_matches(db: Session = Depends(get_db)):
+async def get_today_matches(db: AsyncSession = Depends(get_async_db)):
     """Get today's matches from database (synchronized from external APIs)"""
     try:
         from datetime import date, timedelta
@@ -25,9 +31,11 @@ async def get_today_matches(db: Session = Depends(get_db)):
 
         try:
             logger.info(f"🔍 Searching for matches on {today}")
-            db_matches = db.query(Match).filter(
-                func.date(Match.match_date) == today
-            ).all()
+            db_matches = (await db.execute(
+                select(Match).options(*WITH_TEAMS).where(
+                    func.date(Match.match_date) == today
+                )
+            )).scalars().all()
             logger.info(f"📊 Found {len(db_matches)} matches in database")
         except Exception as e:
             logger.error(f"❌ Database query failed: {e}")
@@ -64,7 +72,7 @@ async def get_today_matches(db: Session = Depends(get_db)):
 
 @router.get("/")
 async def get_matches(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     date_from: Optional[date] = None,
@@ -73,18 +81,18 @@ async def get_matches(
     status: Optional[str] = None
 ):
     """Get matches from database with filters"""
-    query = db.query(Match)
+    query = select(Match).options(*WITH_TEAMS)
 
     if date_from:
-        query = query.filter(Match.match_date >= date_from)
+        query = query.where(Match.match_date >= date_from)
     if date_to:
-        query = query.filter(Match.match_date <= date_to)
+        query = query.where(Match.match_date <= date_to)
     if league:
-        query = query.filter(Match.league == league)
+        query = query.where(Match.league == league)
     if status:
-        query = query.filter(Match.status == status)
+        query = query.where(Match.status == status)
 
-    matches = query.offset(skip).limit(limit).all()
+    matches = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
 
     return {
         "matches": [
@@ -106,9 +114,11 @@ async def get_matches(
     }
 
 @router.get("/{match_id}")
-async def get_match_details(match_id: int, db: Session = Depends(get_db)):
+async def get_match_details(match_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get detailed information about a specific match"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = (await db.execute(
+        select(Match).options(*WITH_TEAMS, selectinload(Match.statistics)).where(Match.id == match_id)
+    )).scalars().first()
 
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
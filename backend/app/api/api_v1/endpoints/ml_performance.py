@@ -13,6 +13,7 @@ import logging
 from app.core.database import get_db
 from app.models import PredictionLog, ModelPerformance, Match
 from app.services.prediction_logger import PredictionLogger
+from app.services.performance_rollup_service import PerformanceRollupService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -28,16 +29,11 @@ async def get_ml_performance_overview(
     Retorna métricas gerais de performance dos modelos ML
     """
     try:
-        logger_service = PredictionLogger(db)
+        # Agregados diários (performance_rollups) do período
+        cutoff_date = (datetime.now() - timedelta(days=days_back)).date()
+        overview = PerformanceRollupService(db).model_overview(cutoff_date)
         
-        # Buscar logs analisados do período
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        analyzed_logs = db.query(PredictionLog).filter(
-            PredictionLog.analyzed_at.isnot(None),
-            PredictionLog.created_at >= cutoff_date
-        ).all()
-        
-        if not analyzed_logs:
+        if not overview["total"]:
             return {
                 "message": "Nenhuma predição analisada no período",
                 "period_days": days_back,
@@ -45,46 +41,23 @@ async def get_ml_performance_overview(
             }
         
         # Calcular métricas gerais
-        total_predictions = len(analyzed_logs)
-        correct_predictions = len([log for log in analyzed_logs if log.was_correct])
-        accuracy = correct_predictions / total_predictions if total_predictions > 0 else 0
-        
-        avg_confidence = sum(log.confidence_score for log in analyzed_logs) / total_predictions
-        avg_feedback_score = sum(log.feedback_score for log in analyzed_logs) / total_predictions
+        total_predictions = overview["total"]
+        accuracy = overview["correct"] / total_predictions
+        avg_confidence = overview["confidence_sum"] / total_predictions
+        avg_feedback_score = overview["feedback_sum"] / total_predictions
         
         # Performance por modelo
-        models = {}
-        for log in analyzed_logs:
-            model_key = f"{log.model_name}_{log.model_version}"
-            if model_key not in models:
-                models[model_key] = {"total": 0, "correct": 0, "confidence_sum": 0}
-            
-            models[model_key]["total"] += 1
-            if log.was_correct:
-                models[model_key]["correct"] += 1
-            models[model_key]["confidence_sum"] += log.confidence_score
-        
-        # Calcular acurácia por modelo
         model_performance = {}
-        for model_key, stats in models.items():
+        for model_key, stats in overview["models"].items():
             model_performance[model_key] = {
                 "accuracy": stats["correct"] / stats["total"] if stats["total"] > 0 else 0,
-                "avg_confidence": stats["confidence_sum"] / stats["total"],
+                "avg_confidence": stats["confidence_sum"] / stats["total"] if stats["total"] > 0 else 0,
                 "total_predictions": stats["total"]
             }
         
         # Performance por liga
-        leagues = {}
-        for log in analyzed_logs:
-            league = log.league
-            if league not in leagues:
-                leagues[league] = {"total": 0, "correct": 0}
-            leagues[league]["total"] += 1
-            if log.was_correct:
-                leagues[league]["correct"] += 1
-        
         league_performance = {}
-        for league, stats in leagues.items():
+        for league, stats in overview["leagues"].items():
             league_performance[league] = {
                 "accuracy": stats["correct"] / stats["total"] if stats["total"] > 0 else 0,
                 "total_predictions": stats["total"]
@@ -395,6 +368,7 @@ async def analyze_green_red(
         reds = 0
         total_analyzed = 0
         updated_predictions = []
+        rollup = PerformanceRollupService(db)
 
         for match in finished_matches:
             # Buscar prediction
@@ -416,6 +390,7 @@ async def analyze_green_red(
 
             # Comparar com prediction
             is_correct = (prediction.predicted_outcome == actual_outcome)
+            before = rollup.prediction_contribution(prediction, match.league)
 
             # Atualizar prediction
             prediction.actual_outcome = actual_outcome
@@ -430,6 +405,8 @@ async def analyze_green_red(
                     # RED: perdeu stake
                     prediction.profit_loss = -100
 
+            rollup.track(before, rollup.prediction_contribution(prediction, match.league))
+
             total_analyzed += 1
             if is_correct:
                 greens += 1
@@ -448,6 +425,7 @@ async def analyze_green_red(
                 "confidence": float(prediction.confidence_score) if prediction.confidence_score else None
             })
 
+        rollup.flush()
         db.commit()
 
         # Calcular estatísticas
@@ -490,34 +468,21 @@ async def get_green_red_stats(
     try:
         from app.models import Prediction
 
-        # Total de predictions com resultado
-        total = db.query(Prediction).filter(
-            Prediction.actual_outcome.isnot(None)
-        ).count()
-
-        # Greens (acertos)
-        greens = db.query(Prediction).filter(
-            Prediction.is_winner == True
-        ).count()
-
-        # Reds (erros)
-        reds = db.query(Prediction).filter(
-            Prediction.is_winner == False
-        ).count()
+        # Totais liquidados vêm dos agregados diários (performance_rollups)
+        totals = PerformanceRollupService(db).green_red_totals()
+        total = totals['total']
+        greens = totals['greens']
+        reds = totals['reds']
+        total_profit = totals['profit_loss']
 
         # Predictions pendentes (sem resultado ainda)
-        pending = db.query(Prediction).filter(
+        pending = db.query(func.count(Prediction.id)).filter(
             Prediction.actual_outcome.is_(None)
-        ).count()
+        ).scalar()
 
         # Accuracy
         accuracy = (greens / total * 100) if total > 0 else 0
 
-        # Lucro/prejuízo total
-        total_profit = db.query(func.sum(Prediction.profit_loss)).filter(
-            Prediction.profit_loss.isnot(None)
-        ).scalar() or 0
-
         return {
             "total_analyzed": total,
             "greens": greens,
@@ -8,9 +8,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.services.ml_manager import ml_manager
-from app.services.ml_training_service import MLTrainingService
-from app.services.ml_trainer_real_data import universal_ml_trainer
+from app.api.deps import get_ml_manager, get_ml_training_service, get_universal_ml_trainer
 from app.core.config import settings
 
 router = APIRouter()
@@ -29,7 +27,8 @@ class TrainingRequest(BaseModel):
 async def get_enhanced_prediction(
     home_team_id: str,
     away_team_id: str,
-    match_date: Optional[str] = None
+    match_date: Optional[str] = None,
+    ml_manager=Depends(get_ml_manager)
 ) -> Dict:
     """
     🔮 Predição avançada combinando ML + Análise Matemática
@@ -67,7 +66,7 @@ async def get_enhanced_prediction(
         )
 
 @router.get("/system/status")
-async def get_ml_system_status() -> Dict:
+async def get_ml_system_status(ml_manager=Depends(get_ml_manager)) -> Dict:
     """
     📊 Status do sistema de Machine Learning
 
@@ -90,7 +89,10 @@ async def get_ml_system_status() -> Dict:
         )
 
 @router.post("/system/initialize")
-async def initialize_ml_system(background_tasks: BackgroundTasks) -> Dict:
+async def initialize_ml_system(
+    background_tasks: BackgroundTasks,
+    ml_manager=Depends(get_ml_manager)
+) -> Dict:
     """
     🚀 Inicializar sistema de Machine Learning
 
@@ -114,7 +116,8 @@ async def initialize_ml_system(background_tasks: BackgroundTasks) -> Dict:
 @router.post("/training/start")
 async def start_training(
     training_request: TrainingRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    training_service=Depends(get_ml_training_service)
 ) -> Dict:
     """
     🎓 Iniciar treinamento de modelos ML
@@ -123,8 +126,6 @@ async def start_training(
     - **leagues**: Lista de ligas específicas (opcional)
     """
     try:
-        training_service = MLTrainingService()
-
         if training_request.training_type == "full":
             # Treinamento completo em background
             background_tasks.add_task(training_service.run_full_training_pipeline)
@@ -148,7 +149,10 @@ async def start_training(
         )
 
 @router.post("/training/auto-retrain")
-async def auto_retrain(background_tasks: BackgroundTasks) -> Dict:
+async def auto_retrain(
+    background_tasks: BackgroundTasks,
+    ml_manager=Depends(get_ml_manager)
+) -> Dict:
     """
     🔄 Retreinamento automático baseado em configurações
 
@@ -169,13 +173,15 @@ async def auto_retrain(background_tasks: BackgroundTasks) -> Dict:
         )
 
 @router.get("/models/info")
-async def get_models_info() -> Dict:
+async def get_models_info(ml_manager=Depends(get_ml_manager)) -> Dict:
     """
     📋 Informações detalhadas sobre modelos treinados
 
     Retorna metadados, performance e estatísticas dos modelos
     """
     try:
+        from app.services.ml_prediction_engine import REGISTRY_NAME as ML_ENGINE_REGISTRY_NAME
+
         models_data = await ml_manager.ml_engine._load_models()
 
         if not models_data:
@@ -190,6 +196,7 @@ async def get_models_info() -> Dict:
         # Extrair informações dos modelos
         model_info = {
             "models_available": True,
+            "model_version": ml_manager.ml_engine.registry.current_version(ML_ENGINE_REGISTRY_NAME),
             "training_date": models_data.get('training_date'),
             "training_samples": models_data.get('training_samples'),
             "feature_count": len(models_data.get('feature_columns', [])),
@@ -228,7 +235,8 @@ async def get_models_info() -> Dict:
 async def compare_prediction_methods(
     home_team_id: str,
     away_team_id: str,
-    match_date: Optional[str] = None
+    match_date: Optional[str] = None,
+    ml_manager=Depends(get_ml_manager)
 ) -> Dict:
     """
     ⚖️ Comparar métodos de predição (ML vs Matemático)
@@ -340,7 +348,8 @@ async def get_training_reports() -> Dict:
 @router.post("/test/ml-engine/{home_team_id}/{away_team_id}")
 async def test_ml_engine(
     home_team_id: str,
-    away_team_id: str
+    away_team_id: str,
+    ml_manager=Depends(get_ml_manager)
 ) -> Dict:
     """
     🧪 Testar motor de ML com times específicos
@@ -390,7 +399,10 @@ async def test_ml_engine(
         )
 
 @router.post("/training/universal")
-async def train_universal_model(background_tasks: BackgroundTasks) -> Dict:
+async def train_universal_model(
+    background_tasks: BackgroundTasks,
+    universal_ml_trainer=Depends(get_universal_ml_trainer)
+) -> Dict:
     """
     🌍 Treinar modelo universal com TODAS as ligas
 
@@ -437,6 +449,7 @@ async def train_universal_model(background_tasks: BackgroundTasks) -> Dict:
         # Iniciar treinamento em background
         background_tasks.add_task(
             _train_universal_background,
+            universal_ml_trainer,
             training_info
         )
 
@@ -452,7 +465,7 @@ async def train_universal_model(background_tasks: BackgroundTasks) -> Dict:
             detail=f"Erro ao iniciar treinamento universal: {str(e)}"
         )
 
-async def _train_universal_background(training_info: Dict):
+async def _train_universal_background(universal_ml_trainer, training_info: Dict):
     """Função background para treinar modelo universal"""
     try:
         print("🌍 INICIANDO TREINAMENTO UNIVERSAL ML")
@@ -477,42 +490,29 @@ async def _train_universal_background(training_info: Dict):
         return {"success": False, "error": str(e)}
 
 @router.get("/universal/status")
-async def get_universal_model_status() -> Dict:
+async def get_universal_model_status(universal_ml_trainer=Depends(get_universal_ml_trainer)) -> Dict:
     """
     🌍 Status do modelo universal ML
 
     Retorna informações sobre modelos universais treinados
     """
     try:
-        import os
-        from pathlib import Path
-
-        models_dir = Path(universal_ml_trainer.models_dir)
+        loaded = universal_ml_trainer._current()
 
         status = {
-            "models_dir": str(models_dir),
-            "models_exist": models_dir.exists(),
-            "trained_models": [],
-            "metadata_available": False,
+            "models_dir": str(universal_ml_trainer.registry.root / universal_ml_trainer.registry_name),
+            "models_exist": loaded is not None,
+            "model_version": loaded.version if loaded else None,
+            "trained_models": sorted(loaded.model['models']) if loaded else [],
+            "metadata_available": loaded is not None,
             "supported_leagues": [],
             "total_teams": 0
         }
 
-        if models_dir.exists():
-            # Verificar modelos treinados
-            model_files = [f for f in os.listdir(models_dir) if f.endswith('_real_data.joblib')]
-            status["trained_models"] = [f.replace('_real_data.joblib', '') for f in model_files]
-
-            # Verificar metadata
-            metadata_file = models_dir / "training_metadata.joblib"
-            status["metadata_available"] = metadata_file.exists()
-
-            if metadata_file.exists():
-                import joblib
-                metadata = joblib.load(metadata_file)
-                status["training_date"] = metadata.get('training_date', 'Unknown')
-                status["total_samples"] = metadata.get('total_samples', 0)
-                status["feature_names"] = metadata.get('feature_names', [])
+        if loaded is not None:
+            status["training_date"] = loaded.model.get('training_date', 'Unknown')
+            status["total_samples"] = loaded.model.get('total_samples', 0)
+            status["feature_names"] = loaded.model.get('feature_names', [])
 
         # Verificar dados disponíveis por liga
         from app.core.database import get_db_session
@@ -547,7 +547,8 @@ async def get_universal_model_status() -> Dict:
 async def predict_universal_match(
     home_team: str,
     away_team: str,
-    league: Optional[str] = None
+    league: Optional[str] = None,
+    universal_ml_trainer=Depends(get_universal_ml_trainer)
 ) -> Dict:
     """
     🌍 Predição universal para qualquer liga
@@ -3,15 +3,16 @@
 Endpoints para gerenciar o sistema de retreino automático dos modelos
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from typing import Dict, List, Optional
 from datetime import datetime
-from app.services.automated_ml_retraining import automated_ml_retraining
+from app.api.deps import get_automated_ml_retraining
+from app.core.model_registry import model_registry
 
 router = APIRouter()
 
 @router.get("/status")
-async def get_retraining_status():
+async def get_retraining_status(automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     📊 Status do Sistema de Retreino Automático
 
@@ -33,7 +34,7 @@ async def get_retraining_status():
         raise HTTPException(status_code=500, detail=f"Erro ao obter status: {str(e)}")
 
 @router.get("/triggers")
-async def evaluate_retraining_triggers():
+async def evaluate_retraining_triggers(automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     🔍 Avaliar Triggers de Retreino
 
@@ -70,7 +71,7 @@ async def evaluate_retraining_triggers():
         raise HTTPException(status_code=500, detail=f"Erro ao avaliar triggers: {str(e)}")
 
 @router.post("/retrain/{model_name}")
-async def retrain_specific_model(model_name: str, background_tasks: BackgroundTasks):
+async def retrain_specific_model(model_name: str, background_tasks: BackgroundTasks, automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     🔄 Retreinar Modelo Específico
 
@@ -98,6 +99,7 @@ async def retrain_specific_model(model_name: str, background_tasks: BackgroundTa
         # Executar retreino em background
         background_tasks.add_task(
             _execute_model_retraining,
+            automated_ml_retraining,
             model_name,
             manual_trigger
         )
@@ -115,7 +117,7 @@ async def retrain_specific_model(model_name: str, background_tasks: BackgroundTa
         raise HTTPException(status_code=500, detail=f"Erro ao iniciar retreino: {str(e)}")
 
 @router.post("/retrain-all")
-async def retrain_all_models(background_tasks: BackgroundTasks):
+async def retrain_all_models(background_tasks: BackgroundTasks, automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     🚀 Retreino em Massa
 
@@ -134,7 +136,7 @@ async def retrain_all_models(background_tasks: BackgroundTasks):
             }
 
         # Executar retreino em massa em background
-        background_tasks.add_task(_execute_bulk_retraining)
+        background_tasks.add_task(_execute_bulk_retraining, automated_ml_retraining)
 
         return {
             "success": True,
@@ -149,7 +151,7 @@ async def retrain_all_models(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Erro ao iniciar retreino em massa: {str(e)}")
 
 @router.get("/performance-history/{model_name}")
-async def get_model_performance_history(model_name: str, days: int = 30):
+async def get_model_performance_history(model_name: str, days: int = 30, automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     📈 Histórico de Performance
 
@@ -222,7 +224,7 @@ async def get_model_performance_history(model_name: str, days: int = 30):
         raise HTTPException(status_code=500, detail=f"Erro ao obter histórico: {str(e)}")
 
 @router.put("/config", response_model=None)
-async def update_retraining_config(config: dict):
+async def update_retraining_config(config: dict, automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     ⚙️ Atualizar Configurações
 
@@ -266,7 +268,7 @@ async def update_retraining_config(config: dict):
         raise HTTPException(status_code=500, detail=f"Erro ao atualizar configurações: {str(e)}")
 
 @router.get("/models")
-async def get_supported_models():
+async def get_supported_models(automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     📋 Modelos Suportados
 
@@ -289,7 +291,8 @@ async def get_supported_models():
                     "last_evaluation": performance.last_evaluation.isoformat() if performance else None,
                     "trend": performance.trend if performance else "unknown"
                 },
-                "model_file_exists": (automated_ml_retraining.models_dir / f"{model_name}.joblib").exists()
+                "model_file_exists": automated_ml_retraining.registry.current_version(model_name) is not None,
+                "current_version": automated_ml_retraining.registry.current_version(model_name)
             }
 
         return {
@@ -303,8 +306,42 @@ async def get_supported_models():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao listar modelos: {str(e)}")
 
+@router.get("/registry")
+async def get_model_registry():
+    """
+    🗃️ Registro de Modelos
+
+    Versões registradas de cada modelo, a versão promovida e a carregada neste worker.
+    """
+    return {"success": True, **model_registry.get_status()}
+
+@router.post("/registry/{model_name}/promote/{version}")
+async def promote_model_version(model_name: str, version: str):
+    """
+    ⬆️ Promover Versão
+
+    Passa a servir `version` em todos os workers (troca na próxima predição).
+    """
+    try:
+        entry = model_registry.promote(model_name, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"success": True, "model_name": model_name, "current_version": entry["version"]}
+
+@router.post("/registry/{model_name}/rollback")
+async def rollback_model_version(model_name: str):
+    """
+    ↩️ Rollback
+
+    Volta a servir a versão registrada antes da atual.
+    """
+    entry = model_registry.rollback(model_name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Sem versão anterior para o modelo '{model_name}'")
+    return {"success": True, "model_name": model_name, "current_version": entry["version"]}
+
 @router.delete("/model/{model_name}")
-async def delete_model(model_name: str):
+async def delete_model(model_name: str, automated_ml_retraining=Depends(get_automated_ml_retraining)):
     """
     🗑️ Remover Modelo
 
@@ -322,6 +359,10 @@ async def delete_model(model_name: str):
             model_file.unlink()
             removed_files.append(str(model_file))
 
+        # Remover versões do registry
+        if automated_ml_retraining.registry.remove(model_name):
+            removed_files.append(str(automated_ml_retraining.registry.root / model_name))
+
         # Remover histórico de performance
         history_file = automated_ml_retraining.performance_log_dir / f"{model_name}_performance_history.json"
         if history_file.exists():
@@ -345,7 +386,7 @@ async def delete_model(model_name: str):
         raise HTTPException(status_code=500, detail=f"Erro ao remover modelo: {str(e)}")
 
 # Funções auxiliares para background tasks
-async def _execute_model_retraining(model_name: str, trigger):
+async def _execute_model_retraining(automated_ml_retraining, model_name: str, trigger):
     """Executa retreino de um modelo específico em background"""
     try:
         result = await automated_ml_retraining.retrain_model(model_name, trigger)
@@ -353,7 +394,7 @@ async def _execute_model_retraining(model_name: str, trigger):
     except Exception as e:
         print(f"Erro no retreino do modelo {model_name}: {str(e)}")
 
-async def _execute_bulk_retraining():
+async def _execute_bulk_retraining(automated_ml_retraining):
     """Executa retreino em massa em background"""
     try:
         results = await automated_ml_retraining.run_bulk_retraining()
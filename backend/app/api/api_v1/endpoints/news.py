@@ -11,13 +11,12 @@ from datetime import datetime, timedelta
 import feedparser
 from pydantic import BaseModel
 
+from app.api.deps import get_api_football_service
 from app.core.database import get_db
 from app.models.match import Match
 from app.models.team import Team
-from app.services.api_football_service import APIFootballService
 
 router = APIRouter()
-api_football = APIFootballService()
 
 # Pydantic models
 class NewsSource(BaseModel):
@@ -225,7 +224,8 @@ async def get_injuries(
     team_id: Optional[int] = Query(None, description="Filtrar por time (API-Sports team ID)"),
     status: Optional[str] = Query(None, description="Status: injured, recovering, fit"),
     season: int = Query(2025, description="Temporada (ano)"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    api_football=Depends(get_api_football_service)
 ):
     """
     📋 Retorna lesões de jogadores via API-Sports
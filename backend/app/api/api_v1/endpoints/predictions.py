@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 from typing import List, Optional, Dict
 from datetime import datetime, date, timezone, timedelta
 import logging
@@ -7,13 +9,15 @@ import logging
 # Timezone de Brasília (BRT = UTC-3)
 BRT = timezone(timedelta(hours=-3))
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.rate_limiter import limiter
+from app.core.response_cache import cached_response, NS_PREDICTIONS
 from app.models import Match, Prediction, Team, Odds
 from app.services.prediction_service import PredictionService
 from app.services.combination_service import CombinationService
 from app.services.api_football_service import APIFootballService
 from app.services.poisson_service import poisson_service
+from app.services.match_page_loader import load_match_page_context_async
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -124,7 +128,12 @@ def normalize_league_name(league: str) -> str:
 # 🔧 HELPER FUNCTION - GET ODDS
 # ========================================
 
-async def get_odds_for_match(db: Session, match: Match, probabilities: Dict[str, float]) -> Dict[str, float]:
+async def get_odds_for_match(
+    db: Session,
+    match: Match,
+    probabilities: Dict[str, float],
+    preloaded_odds: Optional[Dict[int, Odds]] = None
+) -> Dict[str, float]:
     """
     Busca odds reais para uma partida com fallback em 3 níveis:
     1. Banco de dados (odds reais Bet365)
@@ -135,16 +144,21 @@ async def get_odds_for_match(db: Session, match: Match, probabilities: Dict[str,
         db: Database session
         match: Objeto Match
         probabilities: Dict com 'home', 'draw', 'away' probabilities
+        preloaded_odds: Odds 1X2 mais recentes já carregadas em lote
+            (match_id -> Odds). Quando informado, não consulta o banco.
 
     Returns:
         Dict com odds {'home': float, 'draw': float, 'away': float}
     """
 
     # 1️⃣ TENTAR BANCO DE DADOS PRIMEIRO (qualquer bookmaker)
-    real_odds = db.query(Odds).filter(
-        Odds.match_id == match.id,
-        Odds.market == '1X2'
-    ).order_by(Odds.odds_timestamp.desc()).first()  # Pegar a mais recente
+    if preloaded_odds is not None:
+        real_odds = preloaded_odds.get(match.id)
+    else:
+        real_odds = db.query(Odds).filter(
+            Odds.match_id == match.id,
+            Odds.market == '1X2'
+        ).order_by(Odds.odds_timestamp.desc()).first()  # Pegar a mais recente
 
     if real_odds and real_odds.home_win and real_odds.draw and real_odds.away_win:
         logger.info(f"✅ Odds reais encontradas no DB para match {match.id} - Bookmaker: {real_odds.bookmaker}")
@@ -214,9 +228,10 @@ async def get_odds_for_match(db: Session, match: Match, probabilities: Dict[str,
 
 @router.get("/featured")
 @limiter.limit("30/minute")
+@cached_response(NS_PREDICTIONS, ttl=120)
 async def get_featured_predictions(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = Query(10, ge=1, le=50)
 ):
     """
@@ -233,29 +248,36 @@ async def get_featured_predictions(
 
     # Buscar predições com alta confiança
     # ✅ FILTRAR APENAS JOGOS VÁLIDOS (upcoming + live) - EXCLUIR FINALIZADOS
-    predictions_query = db.query(Prediction).join(
-        Match, Match.id == Prediction.match_id
-    ).filter(
-        Match.status.in_(['NS', 'TBD', 'SCHEDULED', 'LIVE', 'HT', '1H', '2H']),
-        Match.match_date >= today_start,
-        Match.match_date <= future_date,
-        Prediction.market_type == '1X2',
-        Prediction.confidence_score >= 0.35  # Apenas predições com boa confiança
-    ).order_by(
-        Prediction.confidence_score.desc()
-    ).limit(limit).all()
+    predictions_query = (await db.execute(
+        select(Prediction).join(
+            Match, Match.id == Prediction.match_id
+        ).options(
+            contains_eager(Prediction.match)
+        ).where(
+            Match.status.in_(['NS', 'TBD', 'SCHEDULED', 'LIVE', 'HT', '1H', '2H']),
+            Match.match_date >= today_start,
+            Match.match_date <= future_date,
+            Prediction.market_type == '1X2',
+            Prediction.confidence_score >= 0.35  # Apenas predições com boa confiança
+        ).order_by(
+            Prediction.confidence_score.desc()
+        ).limit(limit)
+    )).scalars().all()
+
+    # 📦 Times e odds de todas as partidas da página em lote
+    page = await load_match_page_context_async(
+        db,
+        [prediction.match for prediction in predictions_query],
+        include_latest_1x2_odds=True
+    )
 
     results = []
 
     for prediction in predictions_query:
-        match = db.query(Match).filter(Match.id == prediction.match_id).first()
+        match = prediction.match
         if not match:
             continue
 
-        # Buscar times
-        home_team = db.query(Team).filter(Team.id == match.home_team_id).first()
-        away_team = db.query(Team).filter(Team.id == match.away_team_id).first()
-
         # Extrair probabilidades do key_factors
         key_factors = prediction.key_factors or {}
 
@@ -272,12 +294,12 @@ async def get_featured_predictions(
             'draw': key_factors.get('confidence_draw', 0.33),
             'away': key_factors.get('confidence_away', 0.33)
         }
-        odds_data = await get_odds_for_match(db, match, probabilities)
+        odds_data = await get_odds_for_match(db, match, probabilities, page.latest_1x2_odds)
 
         game_card = {
             "id": match.id,
-            "home_team": {"name": home_team.name if home_team else "Unknown"},
-            "away_team": {"name": away_team.name if away_team else "Unknown"},
+            "home_team": {"name": page.team_name(match.home_team_id)},
+            "away_team": {"name": page.team_name(match.away_team_id)},
             "status": status,
             "time": to_brasilia_time(match.match_date),
             "league": normalize_league_name(match.league) if match.league else "Outras Ligas",
@@ -295,7 +317,7 @@ async def get_featured_predictions(
 
 @router.get("/live")
 async def get_live_matches(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = Query(50, ge=1, le=100)
 ):
     """
@@ -311,22 +333,25 @@ async def get_live_matches(
     """
 
     # Buscar jogos AO VIVO
-    live_matches = db.query(Match).filter(
-        Match.status.in_(['LIVE', 'HT', '1H', '2H'])
-    ).order_by(Match.match_date.desc()).limit(limit).all()
+    live_matches = (await db.execute(
+        select(Match).where(
+            Match.status.in_(['LIVE', 'HT', '1H', '2H'])
+        ).order_by(Match.match_date.desc()).limit(limit)
+    )).scalars().all()
+
+    # 📦 Times, odds ativas e predições de todos os jogos em lote
+    page = await load_match_page_context_async(
+        db,
+        live_matches,
+        include_active_odds=True,
+        include_predictions=True
+    )
 
     results = []
 
     for match in live_matches:
-        # Buscar times
-        home_team = db.query(Team).filter(Team.id == match.home_team_id).first()
-        away_team = db.query(Team).filter(Team.id == match.away_team_id).first()
-
-        # Buscar TODAS as odds disponíveis para este jogo
-        all_odds = db.query(Odds).filter(
-            Odds.match_id == match.id,
-            Odds.is_active == True
-        ).all()
+        # TODAS as odds disponíveis para este jogo
+        all_odds = page.active_odds.get(match.id, [])
 
         # Organizar odds por mercado
         markets = {}
@@ -376,11 +401,8 @@ async def get_live_matches(
                     'timestamp': odds.odds_timestamp.isoformat() if odds.odds_timestamp else None
                 }
 
-        # Buscar predição ML para este jogo
-        prediction = db.query(Prediction).filter(
-            Prediction.match_id == match.id,
-            Prediction.market_type == '1X2'
-        ).first()
+        # Predição ML para este jogo
+        prediction = page.predictions.get(match.id)
 
         match_data = {
             'match_id': match.id,
@@ -388,11 +410,11 @@ async def get_live_matches(
             'minute': match.minute,
             'home_team': {
                 'id': match.home_team_id,
-                'name': home_team.name if home_team else 'Unknown'
+                'name': page.team_name(match.home_team_id)
             },
             'away_team': {
                 'id': match.away_team_id,
-                'name': away_team.name if away_team else 'Unknown'
+                'name': page.team_name(match.away_team_id)
             },
             'score': {
                 'home': match.home_score,
@@ -430,8 +452,9 @@ async def get_live_matches(
 
 
 @router.get("/upcoming")
+@cached_response(NS_PREDICTIONS, ttl=120)
 async def get_upcoming_predictions(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     days_ahead: int = Query(7, ge=1, le=30, description="Número de dias à frente"),
     limit: int = Query(50, ge=1, le=100)
 ):
@@ -449,25 +472,27 @@ async def get_upcoming_predictions(
 
     # Buscar matches futuros e ao vivo (EXCLUIR FINALIZADOS)
     # ✅ APENAS: NS, TBD, SCHEDULED, LIVE, HT, 1H, 2H
-    upcoming_matches = db.query(Match).filter(
-        Match.status.in_(['NS', 'TBD', 'SCHEDULED', 'LIVE', 'HT', '1H', '2H']),
-        Match.match_date >= today_start,
-        Match.match_date <= future_date
-    ).order_by(Match.match_date).limit(limit).all()
+    upcoming_matches = (await db.execute(
+        select(Match).where(
+            Match.status.in_(['NS', 'TBD', 'SCHEDULED', 'LIVE', 'HT', '1H', '2H']),
+            Match.match_date >= today_start,
+            Match.match_date <= future_date
+        ).order_by(Match.match_date).limit(limit)
+    )).scalars().all()
+
+    # 📦 Times, odds 1X2 e predições SINGLE de todos os jogos em lote
+    page = await load_match_page_context_async(
+        db,
+        upcoming_matches,
+        include_latest_1x2_odds=True,
+        include_predictions=True,
+        prediction_type='SINGLE'
+    )
 
     results = []
 
     for match in upcoming_matches:
-        # Buscar times
-        home_team = db.query(Team).filter(Team.id == match.home_team_id).first()
-        away_team = db.query(Team).filter(Team.id == match.away_team_id).first()
-
-        # Buscar predição
-        prediction = db.query(Prediction).filter(
-            Prediction.match_id == match.id,
-            Prediction.market_type == '1X2',
-            Prediction.prediction_type == 'SINGLE'
-        ).first()
+        prediction = page.predictions.get(match.id)
 
         match_data = {
             "match_id": match.id,
@@ -475,11 +500,11 @@ async def get_upcoming_predictions(
             "status": match.status,
             "home_team": {
                 "id": match.home_team_id,
-                "name": home_team.name if home_team else "Unknown"
+                "name": page.team_name(match.home_team_id)
             },
             "away_team": {
                 "id": match.away_team_id,
-                "name": away_team.name if away_team else "Unknown"
+                "name": page.team_name(match.away_team_id)
             },
             "league": {
                 "name": normalize_league_name(match.league) if match.league else "Outras Ligas"
@@ -497,7 +522,7 @@ async def get_upcoming_predictions(
                 'draw': key_factors.get('confidence_draw', 0.33),
                 'away': key_factors.get('confidence_away', 0.33)
             }
-            odds_data = await get_odds_for_match(db, match, probabilities)
+            odds_data = await get_odds_for_match(db, match, probabilities, page.latest_1x2_odds)
 
             match_data["prediction"] = {
                 "predicted_outcome": prediction.predicted_outcome,  # '1', 'X', '2'
@@ -1188,12 +1213,14 @@ async def get_date_combinations(
         raise HTTPException(status_code=500, detail=f"Failed to generate combinations: {str(e)}")
 
 @router.get("/{match_id}")
-async def get_match_prediction(match_id: int, db: Session = Depends(get_db)):
+async def get_match_prediction(match_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get existing prediction for a match"""
 
-    prediction = db.query(Prediction).filter(
-        Prediction.match_id == match_id
-    ).order_by(Prediction.predicted_at.desc()).first()
+    prediction = (await db.execute(
+        select(Prediction).where(
+            Prediction.match_id == match_id
+        ).order_by(Prediction.predicted_at.desc()).limit(1)
+    )).scalars().first()
 
     if not prediction:
         raise HTTPException(status_code=404, detail="No prediction found for this match")
@@ -1221,7 +1248,7 @@ async def get_match_prediction(match_id: int, db: Session = Depends(get_db)):
 
 @router.get("/")
 async def get_predictions(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     prediction_type: Optional[str] = None,
@@ -1232,20 +1259,22 @@ async def get_predictions(
 ):
     """Get predictions with filters"""
 
-    query = db.query(Prediction)
+    query = select(Prediction)
 
     if prediction_type:
-        query = query.filter(Prediction.prediction_type == prediction_type)
+        query = query.where(Prediction.prediction_type == prediction_type)
     if market_type:
-        query = query.filter(Prediction.market_type == market_type)
+        query = query.where(Prediction.market_type == market_type)
     if final_recommendation:
-        query = query.filter(Prediction.final_recommendation == final_recommendation)
+        query = query.where(Prediction.final_recommendation == final_recommendation)
     if date_from:
-        query = query.filter(Prediction.predicted_at >= date_from)
+        query = query.where(Prediction.predicted_at >= date_from)
     if date_to:
-        query = query.filter(Prediction.predicted_at <= date_to)
+        query = query.where(Prediction.predicted_at <= date_to)
 
-    predictions = query.order_by(Prediction.predicted_at.desc()).offset(skip).limit(limit).all()
+    predictions = (await db.execute(
+        query.order_by(Prediction.predicted_at.desc()).offset(skip).limit(limit)
+    )).scalars().all()
 
     return {
         "predictions": [
@@ -1513,7 +1542,7 @@ async def get_all_markets_for_match(
     - `probabilities`: Probabilidade de cada mercado (0-1)
     - `fair_odds`: Odd justa calculada (1 / probabilidade)
     - `value_bets`: Apostas com valor (se odds de mercado disponíveis)
-    - `lambda_home/away`: Gols esperados (Poisson)
+    - `lambda_home/away`: Gols esperados (Dixon-Coles ajustado; sem modelo, médias recentes)
     - `team_stats`: Estatísticas usadas no cálculo
 
     **Exemplo de uso:**
@@ -1612,14 +1641,20 @@ async def get_all_markets_for_match(
         # 5. Calcular todos os mercados usando Poisson
         logger.info(f"Calculating all markets for match {match_id}: {home_team.name} vs {away_team.name}")
 
-        poisson_result = poisson_service.analyze_match(
-            home_goals_avg=home_goals_avg,
-            away_goals_avg=away_goals_avg,
-            home_conceded_avg=home_conceded_avg,
-            away_conceded_avg=away_conceded_avg,
-            market_odds=market_odds,
-            league_avg=2.7  # Média de gols por jogo (pode ser ajustado por liga)
-        )
+        # Forças Dixon-Coles ajustadas (fator casa por liga); sem modelo, médias recentes
+        from app.services.team_strength_service import team_strength_service
+
+        poisson_model = 'dixon_coles'
+        poisson_result = team_strength_service.analyze_match(match, market_odds=market_odds)
+        if poisson_result is None:
+            poisson_model = 'recent_averages'
+            poisson_result = poisson_service.analyze_match(
+                home_goals_avg=home_goals_avg,
+                away_goals_avg=away_goals_avg,
+                home_conceded_avg=home_conceded_avg,
+                away_conceded_avg=away_conceded_avg,
+                market_odds=market_odds
+            )
 
         # 6. Formatar resposta
         return {
@@ -1645,7 +1680,8 @@ async def get_all_markets_for_match(
             },
             "poisson_params": {
                 "lambda_home": round(poisson_result.home_lambda, 3),
-                "lambda_away": round(poisson_result.away_lambda, 3)
+                "lambda_away": round(poisson_result.away_lambda, 3),
+                "model": poisson_model
             },
             "probabilities": {
                 market: round(prob, 4)
@@ -310,8 +310,7 @@ async def analyze_assisted_prediction(
                 away_goals_avg=away_stats.goals_scored_avg if away_stats else 1.3,
                 home_conceded_avg=home_stats.goals_conceded_avg if home_stats else 1.2,
                 away_conceded_avg=away_stats.goals_conceded_avg if away_stats else 1.1,
-                market_odds=market_odds_dict,
-                league_avg=2.7
+                market_odds=market_odds_dict
             )
 
             # 🔥 DETERMINAR CATEGORIAS A PROCESSAR
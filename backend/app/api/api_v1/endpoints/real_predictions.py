@@ -11,8 +11,13 @@ import numpy as np
 import os
 from pydantic import BaseModel
 
+from app.core.model_registry import model_registry
+
 router = APIRouter()
 
+# Bundle {'models', 'encoders', ...} gravado por train_ml_with_csv.py
+REGISTRY_NAME = "brasileirao_real"
+
 class PredictionResponse(BaseModel):
     home_team: str
     away_team: str
@@ -27,36 +32,51 @@ class BrasileiraoPredictionEngine:
     """
 
     def __init__(self):
+        self.registry = model_registry
         self.models = {}
         self.encoders = {}
         self.models_loaded = False
-        self.models_dir = "models/brasileirao_real"
+        self.model_version = None
+        self.models_dir = "models/brasileirao_real"  # arquivos antigos, adotados pelo registry
+
+    def _load_legacy_bundle(self) -> Optional[Dict]:
+        """Montar o bundle a partir dos arquivos gravados antes do registry"""
+        if not os.path.exists(self.models_dir):
+            raise Exception(f"Diretório de modelos não encontrado: {self.models_dir}")
+
+        encoders = {}
+        metadata_path = os.path.join(self.models_dir, "metadata.joblib")
+        if os.path.exists(metadata_path):
+            encoders = joblib.load(metadata_path).get('encoders', {})
+
+        model_files = {
+            'random_forest': 'random_forest_brasileirao.joblib',
+            'gradient_boosting': 'gradient_boosting_brasileirao.joblib',
+            'logistic_regression': 'logistic_regression_brasileirao.joblib'
+        }
+        models = {}
+        for model_name, filename in model_files.items():
+            model_path = os.path.join(self.models_dir, filename)
+            if os.path.exists(model_path):
+                models[model_name] = joblib.load(model_path)
+
+        return {'models': models, 'encoders': encoders} if models else None
+
+    def _current(self):
+        """Versão atual do bundle (cache do registry; troca após novo treino)"""
+        loaded = self.registry.get(REGISTRY_NAME, fallback=self._load_legacy_bundle)
+        if loaded is not None:
+            self.models = loaded.model['models']
+            self.encoders = loaded.model.get('encoders', {})
+            self.model_version = loaded.version
+            self.models_loaded = len(self.models) > 0
+        return loaded
 
     def load_models(self):
         """Carregar modelos treinados"""
         try:
-            if not os.path.exists(self.models_dir):
-                raise Exception(f"Diretório de modelos não encontrado: {self.models_dir}")
-
-            # Carregar metadados
-            metadata_path = os.path.join(self.models_dir, "metadata.joblib")
-            if os.path.exists(metadata_path):
-                metadata = joblib.load(metadata_path)
-                self.encoders = metadata.get('encoders', {})
-
-            # Carregar modelos
-            model_files = {
-                'random_forest': 'random_forest_brasileirao.joblib',
-                'gradient_boosting': 'gradient_boosting_brasileirao.joblib',
-                'logistic_regression': 'logistic_regression_brasileirao.joblib'
-            }
-
-            for model_name, filename in model_files.items():
-                model_path = os.path.join(self.models_dir, filename)
-                if os.path.exists(model_path):
-                    self.models[model_name] = joblib.load(model_path)
-
-            self.models_loaded = len(self.models) > 0
+            if self._current() is None:
+                raise Exception("Modelos do Brasileirão não encontrados no registry")
             return True
 
         except Exception as e:
@@ -66,12 +86,15 @@ class BrasileiraoPredictionEngine:
     def predict_match(self, home_team: str, away_team: str) -> Dict:
         """Predizer resultado do jogo"""
         try:
-            if not self.models_loaded:
-                if not self.load_models():
-                    raise Exception("Modelos não disponíveis")
+            # Snapshot da versão atual: modelos e encoders do mesmo artefato
+            loaded = self._current()
+            if loaded is None:
+                raise Exception("Modelos não disponíveis")
+            models = loaded.model['models']
+            encoders = loaded.model.get('encoders', {})
 
             # Verificar se times existem nos encoders
-            if not self.encoders.get('home_team') or not self.encoders.get('away_team'):
+            if not encoders.get('home_team') or not encoders.get('away_team'):
                 raise Exception("Encoders não disponíveis")
 
             # Mapear nomes de times para códigos conhecidos
@@ -103,8 +126,8 @@ class BrasileiraoPredictionEngine:
             away_team_clean = team_mapping.get(away_team.lower(), away_team)
 
             # Verificar se times existem nos dados de treino
-            home_classes = list(self.encoders['home_team'].classes_)
-            away_classes = list(self.encoders['away_team'].classes_)
+            home_classes = list(encoders['home_team'].classes_)
+            away_classes = list(encoders['away_team'].classes_)
 
             if home_team_clean not in home_classes:
                 raise Exception(f"Time {home_team_clean} não encontrado nos dados de treino")
@@ -113,8 +136,8 @@ class BrasileiraoPredictionEngine:
                 raise Exception(f"Time {away_team_clean} não encontrado nos dados de treino")
 
             # Encode times
-            home_encoded = self.encoders['home_team'].transform([home_team_clean])[0]
-            away_encoded = self.encoders['away_team'].transform([away_team_clean])[0]
+            home_encoded = encoders['home_team'].transform([home_team_clean])[0]
+            away_encoded = encoders['away_team'].transform([away_team_clean])[0]
 
             # Criar features (valores padrão para strength)
             features = np.array([[
@@ -128,7 +151,7 @@ class BrasileiraoPredictionEngine:
 
             # Fazer predições com todos os modelos
             predictions = {}
-            for model_name, model in self.models.items():
+            for model_name, model in models.items():
                 try:
                     pred = model.predict(features)[0]
                     predictions[model_name] = pred
@@ -155,7 +178,8 @@ class BrasileiraoPredictionEngine:
                 'ensemble_prediction': ensemble_pred,
                 'confidence': confidence,
                 'individual_predictions': predictions,
-                'models_used': list(self.models.keys()),
+                'models_used': list(models.keys()),
+                'model_version': loaded.tag,
                 'prediction_timestamp': datetime.now().isoformat()
             }
 
@@ -217,6 +241,7 @@ async def get_system_status() -> Dict:
                 "models_count": len(prediction_engine.models),
                 "encoders_available": len(prediction_engine.encoders) > 0,
                 "models_dir": prediction_engine.models_dir,
+                "model_version": prediction_engine.model_version,
                 "supported_teams": list(prediction_engine.encoders.get('home_team', {}).classes_ if prediction_engine.encoders.get('home_team') else [])
             }
         }
@@ -297,6 +322,7 @@ async def reload_models() -> Dict:
         prediction_engine.models_loaded = False
         prediction_engine.models = {}
         prediction_engine.encoders = {}
+        prediction_engine.registry.evict(REGISTRY_NAME)
 
         success = prediction_engine.load_models()
 
@@ -304,6 +330,7 @@ async def reload_models() -> Dict:
             "status": "success" if success else "error",
             "models_loaded": prediction_engine.models_loaded,
             "models_count": len(prediction_engine.models),
+            "model_version": prediction_engine.model_version,
             "reload_timestamp": datetime.now().isoformat()
         }
 
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from typing import Dict, Optional
 from datetime import datetime
 
-from app.services.data_synchronizer import data_synchronizer
+from app.api.deps import get_data_synchronizer
+from app.core.database import run_sync_db
+from app.core.job_runner import job_runner, get_job_metrics
 from app.services.scheduler import football_scheduler
 
 router = APIRouter()
 
 @router.post("/full")
-async def trigger_full_sync(background_tasks: BackgroundTasks):
+async def trigger_full_sync(background_tasks: BackgroundTasks, data_synchronizer=Depends(get_data_synchronizer)):
     """
     Trigger a complete data synchronization.
     This will sync teams, matches, odds, and generate predictions.
@@ -26,7 +28,7 @@ async def trigger_full_sync(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Failed to start sync: {str(e)}")
 
 @router.post("/quick")
-async def trigger_quick_sync():
+async def trigger_quick_sync(data_synchronizer=Depends(get_data_synchronizer)):
     """
     Trigger a quick synchronization for live data updates.
     Updates match scores, status, and live odds.
@@ -43,7 +45,7 @@ async def trigger_quick_sync():
         raise HTTPException(status_code=500, detail=f"Quick sync failed: {str(e)}")
 
 @router.post("/matches")
-async def sync_matches(background_tasks: BackgroundTasks):
+async def sync_matches(background_tasks: BackgroundTasks, data_synchronizer=Depends(get_data_synchronizer)):
     """Sync only match data"""
     try:
         background_tasks.add_task(data_synchronizer._sync_matches)
@@ -57,7 +59,7 @@ async def sync_matches(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Failed to sync matches: {str(e)}")
 
 @router.post("/odds")
-async def sync_odds(background_tasks: BackgroundTasks):
+async def sync_odds(background_tasks: BackgroundTasks, data_synchronizer=Depends(get_data_synchronizer)):
     """Sync betting odds"""
     try:
         background_tasks.add_task(data_synchronizer._sync_odds)
@@ -71,7 +73,7 @@ async def sync_odds(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=f"Failed to sync odds: {str(e)}")
 
 @router.post("/predictions")
-async def sync_predictions(background_tasks: BackgroundTasks):
+async def sync_predictions(background_tasks: BackgroundTasks, data_synchronizer=Depends(get_data_synchronizer)):
     """Generate predictions for matches"""
     try:
         background_tasks.add_task(data_synchronizer._sync_predictions)
@@ -109,7 +111,7 @@ async def get_sync_status():
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
 @router.get("/health")
-async def health_check():
+async def health_check(data_synchronizer=Depends(get_data_synchronizer)):
     """Check health of all external services"""
     try:
         health_status = await data_synchronizer.health_check()
@@ -152,6 +154,39 @@ async def get_scheduler_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get scheduler status: {str(e)}")
 
+@router.get("/jobs")
+async def get_jobs_status():
+    """Job runner status: leader, every registered job, next and last run"""
+    return job_runner.get_status()
+
+@router.get("/jobs/metrics")
+async def get_jobs_metrics(hours: int = Query(24, ge=1, le=24 * 30)):
+    """
+    Per-job metrics from the persisted run history:
+    runs, errors, skipped overlaps, duration, items processed and API calls
+    """
+    try:
+        metrics = await run_sync_db(get_job_metrics, hours)
+        return {"hours": hours, "jobs": metrics, "timestamp": datetime.now().isoformat()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get job metrics: {str(e)}")
+
+@router.post("/jobs/{job_id}/run")
+async def run_job_now(job_id: str, background_tasks: BackgroundTasks):
+    """
+    Run a registered job now on this worker (overlap control still applies:
+    if the job is already running here or on another worker, the run is skipped)
+    """
+    if job_id not in job_runner.jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+
+    background_tasks.add_task(job_runner.run_job, job_id, True)
+    return {
+        "message": f"Job {job_id} started",
+        "status": "running",
+        "timestamp": datetime.now().isoformat()
+    }
+
 @router.post("/manual/{sync_type}")
 async def manual_sync(sync_type: str):
     """
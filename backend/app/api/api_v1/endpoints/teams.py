@@ -6,6 +6,7 @@ import re
 
 from app.core.database import get_db
 from app.core.rate_limiter import limiter
+from app.core.response_cache import cached_response, NS_TEAMS
 from app.models import Team, TeamStatistics, Match
 
 router = APIRouter()
@@ -490,6 +491,7 @@ async def get_team_history(
 
 @router.get("/{team_id}/stats")
 @limiter.limit("60/minute")
+@cached_response(NS_TEAMS, ttl=600)
 async def get_team_stats(
     request: Request,
     team_id: int,
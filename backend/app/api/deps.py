@@ -0,0 +1,54 @@
+"""
+🔌 DEPENDÊNCIAS DA API
+Serviços pesados injetados via Depends(): o módulo do serviço (sklearn, pandas,
+clientes HTTP) só é importado e instanciado na primeira requisição que o usa,
+não no import de app.main
+
+    @router.get("/status")
+    async def status(manager=Depends(get_ml_manager)):
+        ...
+
+Nos testes, troque a instância com app.dependency_overrides[get_ml_manager].
+"""
+
+
+def get_ml_manager():
+    """MLManager global (ML engine + engine matemático)"""
+    from app.services.ml_manager import get_ml_manager
+    return get_ml_manager()
+
+
+def get_ml_training_service():
+    """MLTrainingService novo por requisição"""
+    from app.services.ml_training_service import MLTrainingService
+    return MLTrainingService()
+
+
+def get_universal_ml_trainer():
+    """Trainer universal com dados reais (todas as ligas)"""
+    from app.services.ml_trainer_real_data import get_universal_ml_trainer
+    return get_universal_ml_trainer()
+
+
+def get_automated_ml_retraining():
+    """Serviço de retreinamento automático"""
+    from app.services.automated_ml_retraining import get_automated_ml_retraining
+    return get_automated_ml_retraining()
+
+
+def get_data_synchronizer():
+    """DataSynchronizer global"""
+    from app.services.data_synchronizer import get_data_synchronizer
+    return get_data_synchronizer()
+
+
+def get_global_match_system():
+    """Sistema global de partidas"""
+    from app.services.global_match_system import get_global_match_system
+    return get_global_match_system()
+
+
+def get_api_football_service():
+    """Cliente da API-Football"""
+    from app.services.api_football_service import APIFootballService
+    return APIFootballService()
@@ -35,6 +35,11 @@ class Settings(BaseSettings):
     API_SPORTS_KEY: str = ""
     FOOTYSTATS_API_KEY: str = ""
 
+    # API-Football quotas (plano Pro: 300 req/min, 7500 req/dia)
+    API_SPORTS_REQUESTS_PER_MINUTE: int = 300
+    API_SPORTS_DAILY_LIMIT: int = 7500
+    API_SPORTS_MAX_CONCURRENT: int = 5
+
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
@@ -42,6 +47,20 @@ class Settings(BaseSettings):
 
     # ML Model paths
     MODEL_PATH: str = "models/"
+    FEATURE_STORE_PATH: str = "feature_store/"
+    MODEL_REGISTRY_PATH: str = "models/registry/"
+    MODEL_REGISTRY_KEEP_VERSIONS: int = 5
+
+    # AI Agent (Ollama local)
+    OLLAMA_BASE_URL: str = "http://localhost:11434"
+    AI_AGENT_MAX_CONCURRENT: int = 4  # Análises simultâneas (alinhar com OLLAMA_NUM_PARALLEL)
+    AI_AGENT_TIMEOUT: float = 120.0  # Segundos por análise antes do fallback
+
+    # Job runner (um líder por deploy, eleito via Redis)
+    JOB_RUNNER_ENABLED: bool = True
+    JOB_RUNNER_GROUPS: str = "pipeline,sync,tickets,retraining,maintenance"
+    JOB_LEADER_TTL_SECONDS: int = 30
+    JOB_RUNS_RETENTION_DAYS: int = 30
 
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 100
@@ -66,6 +85,12 @@ class Settings(BaseSettings):
         # Use SQLite for development to avoid PostgreSQL dependency issues
         return "sqlite:///./football_analytics_dev.db"
 
+    def api_sports_headers(self) -> dict:
+        """Headers da API-Sports; a chave é validada no primeiro uso, não no import"""
+        if not self.API_SPORTS_KEY:
+            raise ValueError("API_SPORTS_KEY não configurada. Configure no arquivo .env")
+        return {"x-apisports-key": self.API_SPORTS_KEY}
+
     class Config:
         env_file = ".env"  # Changed to use .env file
         case_sensitive = True
@@ -1,6 +1,13 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
 engine = create_engine(
@@ -23,4 +30,85 @@ def get_db():
 
 def get_db_session():
     """Get a database session (without yield - for direct use)"""
-    return SessionLocal()
\ No newline at end of file
+    return SessionLocal()
+
+
+# ========== ASYNC (endpoints de leitura) ==========
+
+# Driver async equivalente a cada driver síncrono
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_engine_lock = threading.Lock()
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_database_url(url: Optional[str] = None) -> str:
+    """URL síncrona -> URL async (sqlite -> aiosqlite, postgresql -> asyncpg)"""
+    url = make_url(url or settings.get_database_url())
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS and url.drivername != ASYNC_DRIVERS[backend]:
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Engine async criada na primeira utilização (o driver só é importado aqui)"""
+    global _async_engine
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                url = get_async_database_url()
+                options = {'pool_pre_ping': True}
+                if not url.startswith('sqlite'):
+                    options.update(pool_size=10, max_overflow=20)
+                _async_engine = create_async_engine(url, **options)
+                AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def get_async_db():
+    """Dependency: AsyncSession (queries não bloqueiam o event loop)"""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Fechar o pool async (chamar no shutdown)"""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        AsyncSessionLocal.configure(bind=None)
+
+
+# ========== COMPATIBILIDADE: CÓDIGO SÍNCRONO ==========
+
+T = TypeVar('T')
+
+SYNC_DB_MAX_WORKERS = 8
+_sync_db_executor = ThreadPoolExecutor(max_workers=SYNC_DB_MAX_WORKERS, thread_name_prefix='sync-db')
+
+
+async def run_sync_db(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Executa código síncrono que recebe uma Session num threadpool limitado
+
+    Para serviços ainda não portados: `await run_sync_db(service_fn, arg)`
+    chama `service_fn(db, arg)` com uma Session própria, fora do event loop.
+    No máximo SYNC_DB_MAX_WORKERS execuções simultâneas; as demais aguardam
+    na fila sem ocupar o loop.
+    """
+    def call():
+        db: Session = SessionLocal()
+        try:
+            return func(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_sync_db_executor, call)
@@ -0,0 +1,405 @@
+"""
+🗄️ FEATURE STORE - Dataset Parquet particionado (competition/season)
+Fonte única de features para os treinadores:
+- Partições Hive: <dataset>/competition=X/season=Y/part-*.parquet
+- Ingestão append-only: só entram linhas com chave ainda não gravada
+- Leitura com pushdown de colunas, partições e filtros via pyarrow.dataset
+- manifest.json com hash (sha256) de cada arquivo, calculado na escrita
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ('competition', 'season')
+UNKNOWN_PARTITION = 'unknown'
+MANIFEST_NAME = 'manifest.json'
+SCHEMA_NAME = '_common_metadata'
+
+# Datasets alimentados pelo banco (sync_finished_matches)
+MATCHES_DATASET = 'matches'
+MATCH_STATISTICS_DATASET = 'match_statistics'
+FINISHED_STATUSES = ('FT', 'FINISHED', 'AET', 'PEN')
+
+_ID_NAMESPACE = uuid.UUID('6f1c2d8e-3b4a-4f5e-9a7b-0c1d2e3f4a5b')
+
+
+def partition_value(value: Any) -> str:
+    """Valor de partição como texto seguro para caminho (vazio -> 'unknown')"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return UNKNOWN_PARTITION
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    for char in ('/', '\\', '=', '%'):
+        text = text.replace(char, '-')
+    return text or UNKNOWN_PARTITION
+
+
+def stable_id(*parts: Any) -> str:
+    """UUID determinístico a partir dos campos naturais do registro"""
+    return str(uuid.uuid5(_ID_NAMESPACE, '|'.join('' if pd.isna(p) else str(p) for p in parts)))
+
+
+class FeatureStore:
+    """
+    📦 Dataset Parquet particionado com manifest
+    Thread-safe para escritas no mesmo processo; o manifest é a fonte da
+    verdade (arquivos fora dele são ignorados na leitura).
+    """
+
+    def __init__(self, root, partitioning: Sequence[str] = PARTITION_COLUMNS):
+        self.root = Path(root)
+        self.partitioning = list(partitioning)
+        self._lock = threading.Lock()
+
+    # ========== MANIFEST ==========
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def manifest(self) -> Dict:
+        """Conteúdo atual do manifest (vazio se o store ainda não existe)"""
+        if not self.manifest_path.exists():
+            return {'format_version': 1, 'datasets': {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict):
+        manifest['updated_at'] = datetime.now().isoformat()
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _files(
+        self,
+        dataset: str,
+        competitions: Optional[Iterable[Any]] = None,
+        seasons: Optional[Iterable[Any]] = None,
+        manifest: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Entradas do manifest, já podadas pelas partições pedidas"""
+        entry = (manifest or self.manifest())['datasets'].get(dataset)
+        if not entry:
+            return []
+
+        wanted = {}
+        if competitions is not None:
+            wanted['competition'] = {partition_value(c) for c in competitions}
+        if seasons is not None:
+            wanted['season'] = {partition_value(s) for s in seasons}
+
+        return [
+            file for file in entry['files']
+            if all(file['partition'].get(column) in values for column, values in wanted.items())
+        ]
+
+    def datasets(self) -> List[str]:
+        return sorted(self.manifest()['datasets'])
+
+    def partitions(self, dataset: str) -> List[Dict[str, str]]:
+        """Partições existentes de um dataset"""
+        seen = {tuple(sorted(f['partition'].items())) for f in self._files(dataset)}
+        return [dict(p) for p in sorted(seen)]
+
+    def dataset_hash(self, dataset: str) -> Optional[str]:
+        """Hash de conteúdo do dataset inteiro, derivado dos hashes do manifest"""
+        files = self._files(dataset)
+        if not files:
+            return None
+        digest = hashlib.sha256()
+        for file in sorted(files, key=lambda f: f['path']):
+            digest.update(f"{file['path']}:{file['sha256']}\n".encode())
+        return digest.hexdigest()
+
+    # ========== SCHEMA ==========
+
+    def _schema_path(self, dataset: str) -> Path:
+        return self.root / dataset / SCHEMA_NAME
+
+    def schema(self, dataset: str) -> Optional[pa.Schema]:
+        """Schema unificado das colunas gravadas (sem as colunas de partição)"""
+        path = self._schema_path(dataset)
+        return pq.read_schema(path) if path.exists() else None
+
+    def columns(self, dataset: str) -> List[str]:
+        schema = self.schema(dataset)
+        return (schema.names + self.partitioning) if schema is not None else []
+
+    def _unify(self, dataset: str, table: pa.Table) -> pa.Table:
+        """Alinha os tipos da nova parte com o schema do dataset e atualiza o schema"""
+        current = self.schema(dataset)
+        unified = table.schema if current is None else pa.unify_schemas(
+            [current, table.schema], promote_options='permissive'
+        )
+        target = pa.schema([unified.field(name) for name in table.schema.names])
+        if target != table.schema:
+            table = table.cast(target)
+        if current is None or unified != current:
+            pq.write_metadata(unified.remove_metadata(), self._schema_path(dataset))
+        return table
+
+    # ========== ESCRITA ==========
+
+    def append(self, dataset: str, df: pd.DataFrame, key: str = 'id') -> Dict:
+        """
+        Grava as linhas novas de df (append-only, deduplicado por key)
+
+        Args:
+            dataset: Nome do dataset (subdiretório do store)
+            df: Linhas com a coluna key e, se houver, as colunas de partição
+            key: Coluna com a chave única da linha
+
+        Returns:
+            Dict com linhas gravadas/ignoradas e os arquivos criados
+        """
+        summary = {'dataset': dataset, 'rows_written': 0, 'rows_skipped': 0, 'files': []}
+        if df.empty:
+            return summary
+        if key not in df.columns:
+            raise ValueError(f"Coluna chave '{key}' ausente no dataset '{dataset}'")
+
+        df = df.copy()
+        for column in self.partitioning:
+            values = df[column] if column in df.columns else pd.Series(None, index=df.index, dtype=object)
+            df[column] = values.map(partition_value)
+
+        with self._lock:
+            manifest = self.manifest()
+            partitions = df[self.partitioning].drop_duplicates()
+            known = self.known_keys(
+                dataset, key,
+                competitions=partitions['competition'] if 'competition' in self.partitioning else None,
+                seasons=partitions['season'] if 'season' in self.partitioning else None,
+                manifest=manifest
+            )
+
+            fresh = df[~df[key].isin(known)].drop_duplicates(subset=[key], keep='last')
+            summary['rows_skipped'] = len(df) - len(fresh)
+            if fresh.empty:
+                return summary
+
+            (self.root / dataset).mkdir(parents=True, exist_ok=True)
+            data_columns = [c for c in fresh.columns if c not in self.partitioning]
+            table = self._unify(dataset, pa.Table.from_pandas(fresh[data_columns], preserve_index=False))
+            fresh_partitions = fresh[self.partitioning].reset_index(drop=True)
+
+            entry = manifest['datasets'].setdefault(dataset, {'key': key, 'files': []})
+            for values, group in fresh_partitions.groupby(self.partitioning, sort=True):
+                values = values if isinstance(values, tuple) else (values,)
+                partition = dict(zip(self.partitioning, values))
+                file = self._write_part(dataset, partition, table.take(pa.array(group.index)))
+                entry['files'].append(file)
+                summary['files'].append(file)
+                summary['rows_written'] += file['rows']
+
+            self._write_manifest(manifest)
+
+        logger.info(
+            f"Feature store '{dataset}': {summary['rows_written']} linhas novas em "
+            f"{len(summary['files'])} arquivo(s), {summary['rows_skipped']} já existentes"
+        )
+        return summary
+
+    def _write_part(self, dataset: str, partition: Dict[str, str], table: pa.Table) -> Dict:
+        """Serializa a parte em memória, calcula o hash desses bytes e grava no disco"""
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression='snappy')
+        payload = sink.getvalue()
+        sha256 = hashlib.sha256(memoryview(payload)).hexdigest()
+
+        relative_dir = Path(*[f"{column}={partition[column]}" for column in self.partitioning])
+        name = f"part-{datetime.now():%Y%m%d%H%M%S}-{sha256[:12]}.parquet"
+        path = self.root / dataset / relative_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix('.parquet.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(memoryview(payload))
+        os.replace(tmp_path, path)
+
+        return {
+            'path': str(relative_dir / name),
+            'partition': partition,
+            'rows': table.num_rows,
+            'bytes': payload.size,
+            'sha256': sha256,
+            'created_at': datetime.now().isoformat()
+        }
+
+    # ========== LEITURA ==========
+
+    def _dataset(self, dataset: str, files: List[Dict]) -> ds.Dataset:
+        partition_schema = pa.schema([(column, pa.string()) for column in self.partitioning])
+        schema = self.schema(dataset)
+        for field in partition_schema:
+            schema = schema.append(field)
+
+        base_dir = self.root / dataset
+        return ds.dataset(
+            [str(base_dir / f['path']) for f in files],
+            schema=schema,
+            format='parquet',
+            partitioning=ds.HivePartitioning(partition_schema, segment_encoding='none'),
+            partition_base_dir=str(base_dir)
+        )
+
+    def read(
+        self,
+        dataset: str,
+        columns: Optional[List[str]] = None,
+        competitions: Optional[Iterable[Any]] = None,
+        seasons: Optional[Iterable[Any]] = None,
+        filters: Optional[List] = None
+    ) -> pd.DataFrame:
+        """
+        Lê só as colunas e partições pedidas
+
+        Args:
+            dataset: Nome do dataset
+            columns: Colunas a carregar (None = todas)
+            competitions: Partições de competição (None = todas)
+            seasons: Partições de temporada (None = todas)
+            filters: Filtros no formato do pyarrow, ex. [('status', '=', 'FT')]
+        """
+        files = self._files(dataset, competitions, seasons)
+        if not files:
+            return pd.DataFrame(columns=columns or self.columns(dataset))
+
+        expression = pq.filters_to_expression(filters) if filters else None
+        table = self._dataset(dataset, files).to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+    def known_keys(
+        self,
+        dataset: str,
+        key: str = 'id',
+        competitions: Optional[Iterable[Any]] = None,
+        seasons: Optional[Iterable[Any]] = None,
+        manifest: Optional[Dict] = None
+    ) -> Set:
+        """Chaves já gravadas (lê apenas a coluna chave)"""
+        files = self._files(dataset, competitions, seasons, manifest=manifest)
+        if not files:
+            return set()
+        return set(self._dataset(dataset, files).to_table(columns=[key]).column(key).to_pylist())
+
+    def verify(self, dataset: Optional[str] = None) -> Dict:
+        """Confere os hashes do manifest contra os arquivos no disco"""
+        report = {'checked': 0, 'missing': [], 'corrupted': []}
+        manifest = self.manifest()
+        names = [dataset] if dataset else list(manifest['datasets'])
+
+        for name in names:
+            for file in self._files(name, manifest=manifest):
+                path = self.root / name / file['path']
+                report['checked'] += 1
+                if not path.exists():
+                    report['missing'].append(f"{name}/{file['path']}")
+                    continue
+                digest = hashlib.sha256()
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(chunk)
+                if digest.hexdigest() != file['sha256']:
+                    report['corrupted'].append(f"{name}/{file['path']}")
+
+        report['ok'] = not report['missing'] and not report['corrupted']
+        return report
+
+
+# ========== SINCRONIZAÇÃO COM O BANCO ==========
+
+def _statistics_columns() -> List[str]:
+    from sqlalchemy import Float, Integer
+    from app.models.statistics import MatchStatistics
+
+    return [
+        column.name for column in MatchStatistics.__table__.columns
+        if isinstance(column.type, (Integer, Float)) and column.name not in ('id', 'match_id')
+    ]
+
+
+def sync_finished_matches(store: FeatureStore, db, chunk_size: int = 1000) -> Dict[str, int]:
+    """
+    Acrescenta ao store os jogos finalizados (e estatísticas) que ainda não estão lá
+
+    Só os ids são comparados com o store; as linhas completas são carregadas
+    apenas para os jogos novos, em blocos de chunk_size.
+    """
+    from sqlalchemy.orm import aliased
+    from app.models.match import Match
+    from app.models.statistics import MatchStatistics
+    from app.models.team import Team
+
+    finished = (
+        Match.status.in_(FINISHED_STATUSES),
+        Match.home_score.isnot(None),
+        Match.away_score.isnot(None)
+    )
+    summary = {MATCHES_DATASET: 0, MATCH_STATISTICS_DATASET: 0}
+
+    # Resultados
+    known = store.known_keys(MATCHES_DATASET, 'match_id')
+    new_ids = [match_id for (match_id,) in db.query(Match.id).filter(*finished) if match_id not in known]
+
+    home, away = aliased(Team), aliased(Team)
+    match_columns = [
+        Match.id.label('match_id'), Match.external_id, Match.league.label('competition'), Match.season,
+        Match.match_date, Match.status, Match.home_team_id, Match.away_team_id,
+        home.name.label('home_team'), away.name.label('away_team'),
+        home.country.label('home_country'), away.country.label('away_country'),
+        Match.home_score, Match.away_score, Match.home_score_ht, Match.away_score_ht
+    ]
+    for start in range(0, len(new_ids), chunk_size):
+        rows = db.query(*match_columns).outerjoin(
+            home, home.id == Match.home_team_id
+        ).outerjoin(
+            away, away.id == Match.away_team_id
+        ).filter(Match.id.in_(new_ids[start:start + chunk_size])).all()
+
+        df = pd.DataFrame(rows, columns=[c.key for c in match_columns])
+        df['match_date'] = pd.to_datetime(df['match_date'], utc=True)
+        summary[MATCHES_DATASET] += store.append(MATCHES_DATASET, df, key='match_id')['rows_written']
+
+    # Estatísticas (costumam chegar depois do resultado, por isso são um dataset próprio)
+    stat_names = _statistics_columns()
+    known = store.known_keys(MATCH_STATISTICS_DATASET, 'match_id')
+    new_ids = [
+        match_id for (match_id,) in db.query(MatchStatistics.match_id).join(
+            Match, Match.id == MatchStatistics.match_id
+        ).filter(*finished)
+        if match_id not in known
+    ]
+
+    stat_columns = [
+        MatchStatistics.match_id, Match.league.label('competition'), Match.season
+    ] + [getattr(MatchStatistics, name) for name in stat_names]
+    for start in range(0, len(new_ids), chunk_size):
+        rows = db.query(*stat_columns).join(
+            Match, Match.id == MatchStatistics.match_id
+        ).filter(MatchStatistics.match_id.in_(new_ids[start:start + chunk_size])).all()
+
+        df = pd.DataFrame(rows, columns=[c.key for c in stat_columns])
+        df[stat_names] = df[stat_names].astype(float)
+        summary[MATCH_STATISTICS_DATASET] += store.append(MATCH_STATISTICS_DATASET, df, key='match_id')['rows_written']
+
+    logger.info(
+        f"Feature store sincronizado: {summary[MATCHES_DATASET]} jogos e "
+        f"{summary[MATCH_STATISTICS_DATASET]} estatísticas novas"
+    )
+    return summary
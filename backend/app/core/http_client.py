@@ -0,0 +1,53 @@
+"""
+🌐 Cliente HTTP compartilhado (keep-alive + HTTP/2)
+
+Um único httpx.AsyncClient por event loop, reaproveitando conexões TLS entre
+requests. O pool é por loop porque vários jobs síncronos chamam
+`asyncio.run(...)` a cada execução, e conexões httpx não podem atravessar loops.
+"""
+import asyncio
+import importlib.util
+import logging
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 exige o pacote `h2` (httpx[http2]); sem ele, fica em HTTP/1.1 keep-alive
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=60.0
+)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Obter o cliente compartilhado do event loop atual (cria na primeira chamada)"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=DEFAULT_TIMEOUT,
+            limits=DEFAULT_LIMITS
+        )
+        _clients[loop] = client
+        logger.debug(f"🌐 Novo cliente HTTP compartilhado (http2={HTTP2_AVAILABLE})")
+
+    return client
+
+
+async def close_async_client():
+    """Fechar o cliente do event loop atual (chamar no shutdown)"""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+
+    if client is not None and not client.is_closed:
+        await client.aclose()
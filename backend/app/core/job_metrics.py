@@ -0,0 +1,52 @@
+"""
+📏 JOB METRICS
+Contadores da execução corrente de um job (itens processados, chamadas à API)
+
+O job_runner cria um JobMetrics por execução e o deixa num ContextVar;
+o código chamado pelo job (inclusive em threads via asyncio.to_thread e em
+`asyncio.run` dentro delas) soma nele sem precisar recebê-lo por parâmetro.
+Fora de um job as funções de contagem não fazem nada.
+"""
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class JobMetrics:
+    """Contadores de uma execução"""
+    items_processed: int = 0
+    api_calls: int = 0
+
+
+_current: "contextvars.ContextVar[Optional[JobMetrics]]" = contextvars.ContextVar('job_metrics', default=None)
+
+
+def current_job_metrics() -> Optional[JobMetrics]:
+    """Contadores do job em execução (None fora de jobs)"""
+    return _current.get()
+
+
+def count_api_calls(n: int = 1):
+    """Somar chamadas a APIs externas ao job em execução"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.api_calls += n
+
+
+def count_items(n: int = 1):
+    """Somar itens processados ao job em execução"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.items_processed += n
+
+
+@contextmanager
+def collect_job_metrics(metrics: JobMetrics) -> Iterator[JobMetrics]:
+    """Tornar `metrics` o destino das contagens dentro do bloco"""
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
@@ -0,0 +1,524 @@
+"""
+⏱️ JOB RUNNER
+Runtime único dos jobs agendados (substitui os schedulers paralelos)
+
+- Todos os workers agendam os mesmos jobs, mas só o líder executa: eleição
+  por lock no Redis (SET NX PX + renovação a cada ttl/3). Com N workers do
+  uvicorn cada job roda uma vez, e se o líder cair outro assume em até ttl
+- Sobreposição por job: no máximo `max_concurrency` execuções simultâneas
+  (padrão 1). Uma execução que encontra a anterior ainda rodando é pulada e
+  registrada como 'skipped'. O lock por job no Redis cobre a troca de líder
+  no meio de um job lento
+- Histórico persistido em job_runs: duração, itens processados e chamadas à
+  API (contadas via app.core.job_metrics)
+- Pausa compartilhada: pause_jobs/resume_jobs gravam o estado no Redis (ao
+  lado do lock de liderança) e o run_job consulta antes de executar, então
+  pausar em qualquer worker para o job no líder
+- Sem Redis (DEV_MODE_NO_REDIS): o processo é sempre líder
+
+Jobs síncronos rodam em thread (asyncio.to_thread); jobs async no event loop.
+"""
+import asyncio
+import importlib
+import inspect
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.base import BaseTrigger
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core import redis as redis_module
+from app.core.config import settings
+from app.core.database import run_sync_db
+from app.core.job_metrics import JobMetrics, collect_job_metrics
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY_PREFIX = 'jobs:leader'
+JOB_LOCK_PREFIX = 'jobs:lock'
+PAUSED_KEY_PREFIX = 'jobs:paused'
+
+STATUS_SUCCESS = 'success'
+STATUS_ERROR = 'error'
+STATUS_SKIPPED = 'skipped'
+STATUS_PAUSED = 'paused'
+
+MISFIRE_GRACE_SECONDS = 60
+
+# Renovar/soltar só se o token ainda for nosso (não mexer no lock de outro worker)
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _active_redis():
+    """Cliente Redis ativo, ou None em modo sem Redis"""
+    client = redis_module.redis_client
+    if isinstance(client, redis_module.NoOpRedisClient):
+        return None
+    return client
+
+
+def _resolve(target: Union[Callable, str]) -> Callable:
+    """'pacote.modulo:objeto.metodo' -> callable (import só na primeira execução)"""
+    if not isinstance(target, str):
+        return target
+    module_name, _, attr_path = target.partition(':')
+    obj = importlib.import_module(module_name)
+    for attr in attr_path.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _items_from_result(result: Any, items_key: Union[str, Tuple[str, ...], None]) -> int:
+    """Somar as chaves `items_key` do dict retornado pelo job"""
+    if items_key is None or not isinstance(result, dict):
+        return 0
+    keys = (items_key,) if isinstance(items_key, str) else items_key
+    total = 0
+    for key in keys:
+        value = result.get(key)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            total += int(value)
+        elif isinstance(value, (list, dict)):
+            total += len(value)
+    return total
+
+
+@dataclass
+class JobSpec:
+    """
+    Declaração de um job
+
+    func: callable ou caminho 'modulo:atributo' (resolvido na primeira execução)
+    trigger: 'interval', 'cron' ou trigger do APScheduler; argumentos em trigger_args
+    lock_ttl: segundos que o lock do job vale no Redis (teto da duração esperada)
+    items_key: chave(s) do dict retornado somadas em items_processed
+    """
+    id: str
+    func: Union[Callable, str]
+    trigger: Union[str, BaseTrigger]
+    trigger_args: Dict[str, Any] = field(default_factory=dict)
+    name: str = ''
+    group: str = 'default'
+    max_concurrency: int = 1
+    lock_ttl: int = 3600
+    run_at_start: bool = False
+    items_key: Union[str, Tuple[str, ...], None] = None
+
+
+class LeaderElection:
+    """Lock de liderança no Redis com renovação"""
+
+    def __init__(self, key: str, ttl_seconds: int):
+        self.key = key
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+    def _set_leader(self, leader: bool):
+        if leader != self.is_leader:
+            if leader:
+                logger.info(f"👑 Job runner: {self.token} assumiu a liderança ({self.key})")
+            else:
+                logger.warning(f"⚠️ Job runner: {self.token} perdeu a liderança ({self.key})")
+        self.is_leader = leader
+
+    async def refresh(self) -> bool:
+        """Renovar a liderança (ou tentar assumi-la). Retorna se é líder"""
+        client = _active_redis()
+        if client is None:
+            self._set_leader(True)
+            return True
+
+        try:
+            leader = False
+            if self.is_leader:
+                leader = bool(await client.eval(_RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+            if not leader:
+                leader = bool(await client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except Exception as e:
+            # Sem Redis não dá para garantir líder único: não executar
+            logger.warning(f"⚠️ Job runner: eleição indisponível ({e})")
+            leader = False
+
+        self._set_leader(leader)
+        return leader
+
+    async def release(self):
+        client = _active_redis()
+        if client is not None and self.is_leader:
+            try:
+                await client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+            except Exception as e:
+                logger.warning(f"⚠️ Job runner: falha ao liberar liderança ({e})")
+        self.is_leader = False
+
+
+class JobRunner:
+    """
+    Agenda e executa JobSpecs
+
+    Uso:
+        job_runner.register(JobSpec('update_live', run_update_live_matches, 'interval', {'minutes': 2}))
+        await job_runner.start()   # lifespan da API
+        ...
+        await job_runner.stop()
+    """
+
+    def __init__(self, name: str = 'main', leader_ttl: Optional[int] = None, persist_history: bool = True):
+        self.name = name
+        self.election = LeaderElection(
+            f"{LEADER_KEY_PREFIX}:{name}", leader_ttl or settings.JOB_LEADER_TTL_SECONDS
+        )
+        self.persist_history = persist_history
+        self.jobs: Dict[str, JobSpec] = {}
+        self.scheduler: Optional[AsyncIOScheduler] = None
+        self._running: Dict[str, int] = {}
+        self._last_runs: Dict[str, Dict] = {}
+        self._paused: set = set()
+        self._election_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.scheduler is not None and self.scheduler.running
+
+    @property
+    def is_leader(self) -> bool:
+        return self.election.is_leader
+
+    # ========== REGISTRO ==========
+
+    def register(self, spec: JobSpec):
+        """Registrar (ou substituir) um job; se o runner já roda, agenda na hora"""
+        self.jobs[spec.id] = spec
+        if self.is_running:
+            self._schedule(spec)
+
+    def unregister(self, job_id: str):
+        self.jobs.pop(job_id, None)
+        if self.is_running and self.scheduler.get_job(job_id):
+            self.scheduler.remove_job(job_id)
+
+    def _schedule(self, spec: JobSpec):
+        extra = {'next_run_time': datetime.now()} if spec.run_at_start else {}
+        self.scheduler.add_job(
+            self.run_job,
+            trigger=spec.trigger,
+            args=[spec.id],
+            id=spec.id,
+            name=spec.name or spec.id,
+            replace_existing=True,
+            coalesce=True,
+            # +1: a execução sobreposta chega ao run_job e fica registrada como 'skipped'
+            max_instances=spec.max_concurrency + 1,
+            misfire_grace_time=MISFIRE_GRACE_SECONDS,
+            **extra,
+            **spec.trigger_args
+        )
+
+    async def pause_jobs(self, job_ids: Iterable[str]):
+        """Pausar jobs em todos os workers (o líder lê o estado no Redis a cada execução)"""
+        client = _active_redis()
+        for job_id in job_ids:
+            if client is not None:
+                await client.set(f"{PAUSED_KEY_PREFIX}:{job_id}", self.election.token)
+            self._paused.add(job_id)
+            if self.is_running and self.scheduler.get_job(job_id):
+                self.scheduler.pause_job(job_id)
+
+    async def resume_jobs(self, job_ids: Iterable[str]):
+        client = _active_redis()
+        for job_id in job_ids:
+            if client is not None:
+                await client.delete(f"{PAUSED_KEY_PREFIX}:{job_id}")
+            self._paused.discard(job_id)
+            if self.is_running and self.scheduler.get_job(job_id):
+                self.scheduler.resume_job(job_id)
+
+    async def is_paused(self, job_id: str) -> bool:
+        """Pausado por qualquer worker (Redis) ou, sem Redis, por este processo"""
+        client = _active_redis()
+        if client is None:
+            return job_id in self._paused
+        try:
+            return await client.get(f"{PAUSED_KEY_PREFIX}:{job_id}") is not None
+        except Exception as e:
+            logger.warning(f"⚠️ Job {job_id}: estado de pausa indisponível ({e})")
+            return job_id in self._paused
+
+    # ========== CICLO DE VIDA ==========
+
+    async def start(self):
+        """Eleger (ou não) este processo e iniciar o agendamento"""
+        if self.is_running:
+            logger.warning("⚠️ Job runner já está rodando")
+            return
+
+        await self.election.refresh()
+
+        self.scheduler = AsyncIOScheduler()
+        for spec in self.jobs.values():
+            self._schedule(spec)
+        self.scheduler.start()
+        self._election_task = asyncio.create_task(self._election_loop())
+
+        logger.info(
+            f"⏱️ Job runner '{self.name}' iniciado com {len(self.jobs)} jobs "
+            f"({'líder' if self.is_leader else 'standby'})"
+        )
+
+    async def stop(self):
+        if self._election_task is not None:
+            self._election_task.cancel()
+            self._election_task = None
+        if self.is_running:
+            self.scheduler.shutdown(wait=False)
+        self.scheduler = None
+        await self.election.release()
+        logger.info(f"⏹️ Job runner '{self.name}' parado")
+
+    async def run_forever(self):
+        """Para processos dedicados (scripts): roda até ser cancelado"""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def _election_loop(self):
+        interval = self.election.ttl_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            await self.election.refresh()
+
+    # ========== EXECUÇÃO ==========
+
+    async def run_job(self, job_id: str, force: bool = False) -> Dict:
+        """
+        Executar um job agora
+
+        Args:
+            force: executar mesmo sem ser líder ou com o job pausado (trigger
+                manual). O controle de sobreposição continua valendo.
+        """
+        spec = self.jobs[job_id]
+        if not force and not self.is_leader:
+            return {'job_id': job_id, 'status': 'standby'}
+        if not force and await self.is_paused(job_id):
+            return {'job_id': job_id, 'status': STATUS_PAUSED}
+
+        started_at = datetime.now()
+
+        if self._running.get(job_id, 0) >= spec.max_concurrency:
+            logger.warning(f"⏭️ Job {job_id}: execução anterior ainda em andamento, pulando")
+            return await self._record(spec, STATUS_SKIPPED, started_at, 0.0, JobMetrics(), 'overlap')
+
+        lock = await self._acquire_job_lock(spec)
+        if lock is None:
+            logger.warning(f"⏭️ Job {job_id}: em execução em outro worker, pulando")
+            return await self._record(spec, STATUS_SKIPPED, started_at, 0.0, JobMetrics(), 'locked')
+
+        self._running[job_id] = self._running.get(job_id, 0) + 1
+        metrics = JobMetrics()
+        status, error = STATUS_SUCCESS, None
+        start = time.perf_counter()
+        try:
+            result = await self._call(spec, metrics)
+            metrics.items_processed += _items_from_result(result, spec.items_key)
+        except Exception as e:
+            status, error = STATUS_ERROR, str(e)
+            logger.error(f"❌ Job {job_id} falhou: {e}", exc_info=True)
+        finally:
+            self._running[job_id] -= 1
+            await self._release_job_lock(lock)
+
+        return await self._record(spec, status, started_at, time.perf_counter() - start, metrics, error)
+
+    @staticmethod
+    async def _call(spec: JobSpec, metrics: JobMetrics) -> Any:
+        target = _resolve(spec.func)
+        with collect_job_metrics(metrics):
+            if inspect.iscoroutinefunction(target):
+                return await target()
+            # to_thread copia o contexto: o job soma nos mesmos JobMetrics
+            result = await asyncio.to_thread(target)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    async def _acquire_job_lock(self, spec: JobSpec) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Reservar uma das `max_concurrency` vagas do job no Redis
+
+        Returns:
+            (chave, token) reservados, (None, token) sem Redis, None se todas ocupadas
+        """
+        token = self.election.token
+        client = _active_redis()
+        if client is None:
+            return None, token
+
+        try:
+            for slot in range(spec.max_concurrency):
+                key = f"{JOB_LOCK_PREFIX}:{spec.id}:{slot}"
+                if await client.set(key, token, nx=True, ex=spec.lock_ttl):
+                    return key, token
+            return None
+        except Exception as e:
+            # A liderança já foi validada há menos de ttl: seguir sem o lock do job
+            logger.warning(f"⚠️ Job {spec.id}: lock indisponível ({e}), executando mesmo assim")
+            return None, token
+
+    @staticmethod
+    async def _release_job_lock(lock: Tuple[Optional[str], str]):
+        key, token = lock
+        client = _active_redis()
+        if key is None or client is None:
+            return
+        try:
+            await client.eval(_RELEASE_SCRIPT, 1, key, token)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao liberar lock {key} ({e})")
+
+    async def _record(
+        self,
+        spec: JobSpec,
+        status: str,
+        started_at: datetime,
+        duration: float,
+        metrics: JobMetrics,
+        error: Optional[str]
+    ) -> Dict:
+        row = {
+            'job_id': spec.id,
+            'runner': self.name,
+            'worker': self.election.token,
+            'status': status,
+            'started_at': started_at,
+            'finished_at': datetime.now(),
+            'duration_seconds': round(duration, 3),
+            'items_processed': metrics.items_processed,
+            'api_calls': metrics.api_calls,
+            'error': error[:500] if error else None
+        }
+        self._last_runs[spec.id] = row
+
+        if status != STATUS_SKIPPED:
+            logger.info(
+                f"⏱️ Job {spec.id}: {status} em {duration:.1f}s "
+                f"({metrics.items_processed} itens, {metrics.api_calls} chamadas API)"
+            )
+
+        if self.persist_history:
+            try:
+                await run_sync_db(_save_run, row)
+            except Exception as e:
+                logger.error(f"❌ Falha ao gravar histórico do job {spec.id}: {e}")
+        return row
+
+    # ========== STATUS ==========
+
+    def get_status(self) -> Dict:
+        jobs = []
+        for spec in self.jobs.values():
+            job = self.scheduler.get_job(spec.id) if self.is_running else None
+            last_run = self._last_runs.get(spec.id)
+            jobs.append({
+                'id': spec.id,
+                'name': spec.name or spec.id,
+                'group': spec.group,
+                'trigger': str(job.trigger) if job else str(spec.trigger),
+                'next_run': job.next_run_time.isoformat() if job and job.next_run_time else None,
+                'paused': spec.id in self._paused or (job is not None and job.next_run_time is None),
+                'running': self._running.get(spec.id, 0),
+                'last_run': {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in last_run.items()
+                } if last_run else None
+            })
+
+        return {
+            'runner': self.name,
+            'worker': self.election.token,
+            'is_running': self.is_running,
+            'is_leader': self.is_leader,
+            'total_jobs': len(jobs),
+            'jobs': jobs
+        }
+
+
+def _save_run(db: Session, row: Dict):
+    from app.models.job_run import JobRun
+
+    db.add(JobRun(**row))
+    db.commit()
+
+
+def get_job_metrics(db: Session, hours: int = 24) -> List[Dict]:
+    """Métricas por job a partir do histórico (últimas `hours` horas)"""
+    from app.models.job_run import JobRun
+
+    since = datetime.now() - timedelta(hours=hours)
+    executed = JobRun.status != STATUS_SKIPPED
+    rows = db.query(
+        JobRun.job_id,
+        func.count(JobRun.id),
+        func.sum(case((JobRun.status == STATUS_ERROR, 1), else_=0)),
+        func.sum(case((JobRun.status == STATUS_SKIPPED, 1), else_=0)),
+        func.avg(case((executed, JobRun.duration_seconds))),
+        func.max(JobRun.duration_seconds),
+        func.sum(JobRun.items_processed),
+        func.sum(JobRun.api_calls),
+        func.max(JobRun.started_at)
+    ).filter(
+        JobRun.started_at >= since
+    ).group_by(JobRun.job_id).order_by(JobRun.job_id).all()
+
+    return [
+        {
+            'job_id': job_id,
+            'runs': runs,
+            'errors': int(errors or 0),
+            'skipped': int(skipped or 0),
+            'avg_duration_seconds': round(avg_duration, 3) if avg_duration is not None else None,
+            'max_duration_seconds': round(max_duration or 0.0, 3),
+            'items_processed': int(items or 0),
+            'api_calls': int(api_calls or 0),
+            'last_started_at': last_started.isoformat() if last_started else None
+        }
+        for job_id, runs, errors, skipped, avg_duration, max_duration, items, api_calls, last_started in rows
+    ]
+
+
+def prune_job_runs(db: Session, days: Optional[int] = None) -> int:
+    """Apagar histórico mais velho que `days` (padrão: JOB_RUNS_RETENTION_DAYS)"""
+    from app.models.job_run import JobRun
+
+    cutoff = datetime.now() - timedelta(days=days or settings.JOB_RUNS_RETENTION_DAYS)
+    deleted = db.query(JobRun).filter(JobRun.started_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+# Runtime compartilhado da API (jobs registrados por app.services.job_registry)
+job_runner = JobRunner()
@@ -0,0 +1,56 @@
+"""
+💤 LAZY IMPORTS
+Dependências pesadas (tensorflow, xgboost, lightgbm, transformers, scrapers)
+importadas só no primeiro uso, não no import do módulo
+
+    tf = lazy_module('tensorflow')      # nada é importado aqui
+    tf.constant(1)                       # importa tensorflow neste ponto
+
+Se o pacote não estiver instalado, o ModuleNotFoundError aparece no primeiro
+uso (na rota/job que precisa dele), e não derruba o boot da API.
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """Proxy de módulo: importa na primeira leitura de atributo"""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'carregado' if self.is_loaded else 'não carregado'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Módulo importado sob demanda (ver docstring do módulo)"""
+    return LazyModule(name)
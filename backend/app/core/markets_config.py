@@ -233,6 +233,28 @@ MARKET_PRIORITY = [
     # ... resto em ordem alfabética
 ]
 
+# Seleções decididas só pelo placar final, por mercado de MARKET_IDS
+# Cada uma vira uma máscara sobre a matriz de placares (same_match_pricing),
+# o que permite precificar combinadas no mesmo jogo pela probabilidade conjunta
+SCORE_SETTLED_SELECTIONS = {
+    "1X2": ["HOME_WIN", "DRAW", "AWAY_WIN"],
+    "DOUBLE_CHANCE": ["1X", "12", "X2"],
+    "OVER_UNDER": [
+        f"{side}_{line}_5" for line in range(6) for side in ("OVER", "UNDER")
+    ],
+    "BTTS": ["BTTS_YES", "BTTS_NO"],
+    "CORRECT_SCORE": [
+        f"SCORE_{home}_{away}" for home in range(4) for away in range(4)
+    ],
+    "EXACT_GOALS": [
+        "EXACTLY_0_GOALS", "EXACTLY_1_GOAL", "EXACTLY_2_GOALS", "EXACTLY_3_GOALS", "4_OR_MORE_GOALS"
+    ],
+    "ODD_EVEN": ["ODD_GOALS", "EVEN_GOALS"],
+    "CLEAN_SHEET": ["HOME_CLEAN_SHEET", "AWAY_CLEAN_SHEET"],
+    "FIRST_GOAL": ["NO_GOAL", "FIRST_GOAL_HOME", "FIRST_GOAL_AWAY"],
+    "WIN_TO_NIL": ["HOME_WIN_TO_NIL", "AWAY_WIN_TO_NIL"],
+}
+
 def get_market_id(market_name: str) -> int:
     """Retorna o ID do mercado na API-Football"""
     return MARKET_IDS.get(market_name)
@@ -0,0 +1,331 @@
+"""
+🗃️ MODEL REGISTRY - Artefatos de ML versionados, carregados sob demanda
+Ponto único de gravação/leitura dos modelos treinados:
+- <root>/<nome>/<versão>.joblib + manifest.json (versões, sha256, metadados, versão atual)
+- Carregamento preguiçoso com joblib.load(mmap_mode='r'): os arrays numpy ficam
+  mapeados do disco e as páginas são compartilhadas entre os workers
+- Promoção = troca atômica do manifest (os.replace); cada processo percebe
+  na próxima leitura (stat do manifest) e troca o modelo em memória
+- get() devolve um LoadedModel imutável: quem o segura usa sempre o mesmo
+  artefato, mesmo que uma nova versão seja promovida no meio da predição
+- Gravações do manifest (register/promote/rollback/poda) são serializadas entre
+  processos por flock em <nome>/manifest.lock
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'manifest.lock'
+
+
+class ModelIntegrityError(Exception):
+    """Artefato no disco não bate com o sha256 do manifest"""
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """Versão de um modelo carregada em memória"""
+    name: str
+    version: str
+    model: Any
+    sha256: str
+    metadata: Dict = field(default_factory=dict)
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def tag(self) -> str:
+        """Identificação gravada junto das predições (ex.: 'btts_classifier@20261016...')"""
+        return f"{self.name}@{self.version}"
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    📦 Registro de modelos com cache quente por processo
+    Thread-safe no mesmo processo. Entre processos, o manifest é a fonte da
+    verdade e cada leitura-alteração-gravação dele roda sob flock, então
+    workers e jobs de treino podem registrar/promover ao mesmo tempo.
+    """
+
+    def __init__(self, root, keep_versions: int = 5, mmap_mode: Optional[str] = 'r'):
+        self.root = Path(root)
+        self.keep_versions = keep_versions
+        self.mmap_mode = mmap_mode
+        # nome -> (assinatura do manifest, modelo carregado)
+        self._cache: Dict[str, Tuple[Optional[Tuple[int, int]], Optional[LoadedModel]]] = {}
+        self._lock = threading.RLock()
+
+    # ========== MANIFEST ==========
+
+    def _model_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def _manifest_path(self, name: str) -> Path:
+        return self._model_dir(name) / MANIFEST_NAME
+
+    def _signature(self, name: str) -> Optional[Tuple[int, int]]:
+        """(inode, mtime) do manifest: os.replace sempre gera um inode novo"""
+        try:
+            stat = self._manifest_path(name).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def manifest(self, name: str) -> Dict:
+        path = self._manifest_path(name)
+        if not path.exists():
+            return {'name': name, 'current': None, 'versions': []}
+        with open(path) as f:
+            return json.load(f)
+
+    @contextmanager
+    def _manifest_lock(self, name: str):
+        """Lock do processo + flock exclusivo no manifest.lock do modelo"""
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(model_dir / LOCK_NAME, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_manifest(self, name: str, manifest: Dict):
+        manifest['updated_at'] = datetime.now().isoformat()
+        path = self._manifest_path(name)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def versions(self, name: str) -> List[Dict]:
+        return self.manifest(name)['versions']
+
+    def current_version(self, name: str) -> Optional[str]:
+        return self.manifest(name)['current']
+
+    def list_models(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.parent.name for p in self.root.glob(f'*/{MANIFEST_NAME}'))
+
+    # ========== GRAVAÇÃO / PROMOÇÃO ==========
+
+    def register(self, name: str, model: Any, metadata: Optional[Dict] = None, promote: bool = True) -> Dict:
+        """
+        Gravar uma nova versão do modelo (sem compressão, para permitir mmap)
+
+        Com promote=True a versão vira a atual: todos os processos passam a
+        servi-la na próxima leitura.
+        """
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = model_dir / f".{os.getpid()}-{threading.get_ident()}.joblib.tmp"
+        joblib.dump(model, tmp_path)
+        sha256 = file_sha256(tmp_path)
+        version = f"{datetime.now():%Y%m%d%H%M%S%f}-{sha256[:8]}"
+        filename = f"{version}.joblib"
+        os.replace(tmp_path, model_dir / filename)
+
+        entry = {
+            'version': version,
+            'file': filename,
+            'sha256': sha256,
+            'size_bytes': (model_dir / filename).stat().st_size,
+            'created_at': datetime.now().isoformat(),
+            'metadata': metadata or {}
+        }
+
+        with self._manifest_lock(name):
+            manifest = self.manifest(name)
+            manifest['versions'].append(entry)
+            if promote:
+                manifest['current'] = version
+            self._prune(name, manifest)
+            self._write_manifest(name, manifest)
+
+        logger.info(f"🗃️ Modelo {name} registrado: versão {version}{' (promovida)' if promote else ''}")
+        return entry
+
+    def promote(self, name: str, version: str) -> Dict:
+        """Tornar `version` a versão servida (também usado para rollback)"""
+        with self._manifest_lock(name):
+            entry = self._set_current(name, self.manifest(name), version)
+        logger.info(f"🗃️ Modelo {name}: versão {version} promovida")
+        return entry
+
+    def rollback(self, name: str) -> Optional[Dict]:
+        """Voltar para a versão registrada antes da atual"""
+        with self._manifest_lock(name):
+            manifest = self.manifest(name)
+            versions = [v['version'] for v in manifest['versions']]
+            if manifest['current'] not in versions or versions.index(manifest['current']) == 0:
+                return None
+            version = versions[versions.index(manifest['current']) - 1]
+            entry = self._set_current(name, manifest, version)
+        logger.info(f"🗃️ Modelo {name}: rollback para a versão {version}")
+        return entry
+
+    def _set_current(self, name: str, manifest: Dict, version: str) -> Dict:
+        """Gravar `version` como atual (chamado com o _manifest_lock já adquirido)"""
+        entry = next((v for v in manifest['versions'] if v['version'] == version), None)
+        if entry is None:
+            raise KeyError(f"Versão {version} não encontrada para o modelo {name}")
+        manifest['current'] = version
+        self._write_manifest(name, manifest)
+        return entry
+
+    def remove(self, name: str) -> bool:
+        """Apagar todas as versões do modelo"""
+        with self._lock:
+            self._cache.pop(name, None)
+            if not self._model_dir(name).exists():
+                return False
+            with self._manifest_lock(name):
+                shutil.rmtree(self._model_dir(name))
+        logger.info(f"🗃️ Modelo {name} removido do registro")
+        return True
+
+    def _prune(self, name: str, manifest: Dict):
+        """Manter só as keep_versions mais recentes (a atual nunca é apagada)"""
+        excess = len(manifest['versions']) - self.keep_versions
+        if excess <= 0:
+            return
+        removable = [v for v in manifest['versions'] if v['version'] != manifest['current']][:excess]
+        for entry in removable:
+            manifest['versions'].remove(entry)
+            try:
+                (self._model_dir(name) / entry['file']).unlink()
+            except FileNotFoundError:
+                pass
+
+    # ========== LEITURA ==========
+
+    def _load(self, name: str, entry: Dict) -> LoadedModel:
+        path = self._model_dir(name) / entry['file']
+        if file_sha256(path) != entry['sha256']:
+            raise ModelIntegrityError(f"{path}: sha256 diferente do manifest")
+        model = joblib.load(path, mmap_mode=self.mmap_mode)
+        logger.info(f"🗃️ Modelo {name} carregado: versão {entry['version']}")
+        return LoadedModel(name=name, version=entry['version'], model=model,
+                           sha256=entry['sha256'], metadata=entry.get('metadata', {}))
+
+    def get(self, name: str, fallback: Optional[Callable[[], Any]] = None) -> Optional[LoadedModel]:
+        """
+        Versão atual do modelo, carregada na primeira leitura e mantida em cache
+
+        Se outro processo promoveu uma versão nova, ela é carregada e trocada
+        aqui; se a carga falhar, a versão anterior continua sendo servida.
+        `fallback` (opcional) monta o artefato a partir dos arquivos antigos
+        quando o modelo ainda não existe no registro; o resultado é registrado.
+        """
+        signature = self._signature(name)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with self._lock:
+            signature = self._signature(name)
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            previous = cached[1] if cached else None
+
+            if signature is None:
+                if fallback is None:
+                    return None
+                return self._adopt(name, fallback)
+
+            manifest = self.manifest(name)
+            entry = next((v for v in manifest['versions'] if v['version'] == manifest['current']), None)
+            loaded = previous
+            if entry is None:
+                loaded = None
+            elif previous is None or previous.version != entry['version']:
+                try:
+                    loaded = self._load(name, entry)
+                except Exception as e:
+                    logger.error(f"❌ Falha ao carregar {name}@{entry['version']}: {e}")
+
+            self._cache[name] = (signature, loaded)
+            return loaded
+
+    def _adopt(self, name: str, fallback: Callable[[], Any]) -> Optional[LoadedModel]:
+        """Registrar artefato legado (arquivos fora do registro) na primeira leitura"""
+        try:
+            model = fallback()
+        except Exception as e:
+            logger.warning(f"⚠️ Modelo {name} não encontrado no registro nem nos arquivos antigos: {e}")
+            return None
+        if model is None:
+            return None
+        self.register(name, model, metadata={'source': 'legacy'})
+        return self.get(name)
+
+    def evict(self, name: Optional[str] = None):
+        """Descartar o cache do processo (próxima leitura volta ao disco)"""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+
+    # ========== STATUS ==========
+
+    def verify(self, name: Optional[str] = None) -> Dict:
+        """Confere os hashes do manifest contra os arquivos no disco"""
+        report = {'checked': 0, 'missing': [], 'corrupted': []}
+        for model_name in ([name] if name else self.list_models()):
+            for entry in self.versions(model_name):
+                path = self._model_dir(model_name) / entry['file']
+                report['checked'] += 1
+                if not path.exists():
+                    report['missing'].append(f"{model_name}@{entry['version']}")
+                elif file_sha256(path) != entry['sha256']:
+                    report['corrupted'].append(f"{model_name}@{entry['version']}")
+        report['ok'] = not report['missing'] and not report['corrupted']
+        return report
+
+    def get_status(self) -> Dict:
+        models = {}
+        for name in self.list_models():
+            manifest = self.manifest(name)
+            cached = self._cache.get(name)
+            loaded = cached[1] if cached else None
+            models[name] = {
+                'current': manifest['current'],
+                'versions': [v['version'] for v in manifest['versions']],
+                'loaded_version': loaded.version if loaded else None,
+                'loaded_at': loaded.loaded_at.isoformat() if loaded else None,
+                'metadata': next((v.get('metadata', {}) for v in manifest['versions']
+                                  if v['version'] == manifest['current']), {})
+            }
+        return {'root': str(self.root), 'models': models}
+
+
+# Instância global: um cache por processo, artefatos compartilhados no disco
+model_registry = ModelRegistry(settings.MODEL_REGISTRY_PATH, keep_versions=settings.MODEL_REGISTRY_KEEP_VERSIONS)
@@ -0,0 +1,318 @@
+"""
+⚡ RESPONSE CACHE
+Cache de respostas dos endpoints de leitura (Redis + fallback em memória)
+
+- @cached_response(namespace, ttl): TTL por endpoint, chave pelos parâmetros
+- Singleflight: requests simultâneos com a mesma chave aguardam um único cálculo
+  (em processo via Future, entre workers via lock no Redis)
+- ETag / If-None-Match -> 304 Not Modified
+- invalidate_response_cache(*namespaces): chamado pelos jobs que escrevem no banco
+  (incrementa a versão do namespace; entradas antigas expiram pelo TTL)
+- Sem Redis (NoOpRedisClient ou Redis fora do ar): LRU em processo
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import redis as redis_module
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Namespaces usados pelos endpoints cacheados
+NS_DASHBOARD = 'dashboard'
+NS_PREDICTIONS = 'predictions'
+NS_VALUE_BETS = 'value_bets'
+NS_TEAMS = 'teams'
+ALL_NAMESPACES = (NS_DASHBOARD, NS_PREDICTIONS, NS_VALUE_BETS, NS_TEAMS)
+
+KEY_PREFIX = 'rc'
+LOCK_TIMEOUT_MS = 10_000
+LOCK_POLL_SECONDS = 0.05
+REDIS_RETRY_SECONDS = 30
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+
+class _Uncacheable(Exception):
+    """Endpoint retornou um Response pronto (ex: erro): repassar sem cachear"""
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+class ResponseCache:
+    """Armazenamento das respostas (Redis com fallback LRU em processo)"""
+
+    def __init__(self, local_maxsize: int = 1024):
+        self.local = TTLCache(maxsize=local_maxsize)
+        self.local_versions: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._redis_down_until = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'coalesced': 0}
+
+    # ========== BACKEND ==========
+
+    @property
+    def redis(self):
+        """Cliente Redis ativo, ou None para usar o LRU em processo"""
+        client = redis_module.redis_client
+        if isinstance(client, redis_module.NoOpRedisClient):
+            return None
+        if time.monotonic() < self._redis_down_until:
+            return None
+        return client
+
+    def _redis_failed(self, error: Exception):
+        if self._redis_down_until < time.monotonic():
+            logger.warning(f"⚠️ Response cache: Redis indisponível, usando LRU em processo ({error})")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def _version(self, namespace: str) -> int:
+        client = self.redis
+        if client is not None:
+            try:
+                return int(await client.get(f"{KEY_PREFIX}:ver:{namespace}") or 0)
+            except Exception as e:
+                self._redis_failed(e)
+        return self.local_versions.get(namespace, 0)
+
+    async def get(self, key: str) -> Optional[Tuple[str, str]]:
+        client = self.redis
+        if client is not None:
+            try:
+                raw = await client.get(key)
+                if raw is None:
+                    return None
+                etag, body = raw.split('\n', 1)
+                return etag, body
+            except Exception as e:
+                self._redis_failed(e)
+        return self.local.get(key)
+
+    async def set(self, key: str, etag: str, body: str, ttl: int):
+        client = self.redis
+        if client is not None:
+            try:
+                await client.setex(key, ttl, f"{etag}\n{body}")
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        self.local.set(key, (etag, body), ttl=ttl)
+
+    async def _acquire_lock(self, key: str) -> bool:
+        """Lock entre workers; sem Redis o singleflight em processo basta"""
+        client = self.redis
+        if client is None:
+            return True
+        try:
+            return bool(await client.set(f"{key}:lock", '1', nx=True, px=LOCK_TIMEOUT_MS))
+        except Exception as e:
+            self._redis_failed(e)
+            return True
+
+    async def _release_lock(self, key: str):
+        client = self.redis
+        if client is not None:
+            try:
+                await client.delete(f"{key}:lock")
+            except Exception as e:
+                self._redis_failed(e)
+
+    # ========== CHAVES ==========
+
+    async def build_key(self, namespace: str, endpoint: str, params: Dict) -> str:
+        version = await self._version(namespace)
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"{KEY_PREFIX}:{namespace}:v{version}:{endpoint}:{digest}"
+
+    # ========== CÁLCULO COM SINGLEFLIGHT ==========
+
+    async def get_or_compute(self, key: str, ttl: int, compute: Callable) -> Tuple[Tuple[str, str], bool]:
+        """
+        Retorna ((etag, body), hit). Apenas um cálculo por chave em andamento.
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and not inflight.done():
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(inflight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = await self._compute_with_lock(key, ttl, compute)
+            future.set_result(entry)
+            return entry, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # marca como lida mesmo sem ninguém aguardando
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _compute_with_lock(self, key: str, ttl: int, compute: Callable) -> Tuple[str, str]:
+        locked = await self._acquire_lock(key)
+        if not locked:
+            # Outro worker está calculando: esperar o resultado até o timeout do lock
+            deadline = time.monotonic() + LOCK_TIMEOUT_MS / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_SECONDS)
+                cached = await self.get(key)
+                if cached is not None:
+                    self.stats['coalesced'] += 1
+                    return cached
+
+        try:
+            result = await compute()
+            if isinstance(result, Response):
+                raise _Uncacheable(result)
+            body = JSONResponse(content=jsonable_encoder(result)).body.decode()
+            etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+            await self.set(key, etag, body, ttl)
+            return etag, body
+        finally:
+            if locked:
+                await self._release_lock(key)
+
+    # ========== INVALIDAÇÃO ==========
+
+    async def ainvalidate(self, *namespaces: str):
+        """Invalida namespaces (async, para uso dentro de endpoints)"""
+        namespaces = namespaces or ALL_NAMESPACES
+        self._invalidate_local(namespaces)
+        client = self.redis
+        if client is not None:
+            try:
+                for namespace in namespaces:
+                    await client.incr(f"{KEY_PREFIX}:ver:{namespace}")
+            except Exception as e:
+                self._redis_failed(e)
+
+    def invalidate(self, *namespaces: str):
+        """
+        Invalida namespaces (síncrono, para jobs do scheduler em threads)
+
+        Usa um cliente Redis síncrono de curta duração: o cliente async
+        global pertence ao event loop da API.
+        """
+        namespaces = namespaces or ALL_NAMESPACES
+        self._invalidate_local(namespaces)
+        if self.redis is None:
+            return
+
+        try:
+            import redis as sync_redis
+            client = sync_redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+            try:
+                pipe = client.pipeline()
+                for namespace in namespaces:
+                    pipe.incr(f"{KEY_PREFIX}:ver:{namespace}")
+                pipe.execute()
+            finally:
+                client.close()
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _invalidate_local(self, namespaces):
+        for namespace in namespaces:
+            self.local_versions[namespace] = self.local_versions.get(namespace, 0) + 1
+        logger.debug(f"♻️ Response cache invalidado: {', '.join(namespaces)}")
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_response_cache(*namespaces: str):
+    """Hook para jobs de sync/predictions após escrever no banco"""
+    try:
+        response_cache.invalidate(*namespaces)
+    except Exception as e:
+        logger.error(f"❌ Erro ao invalidar response cache: {e}")
+
+
+def _etag_matches(request: Optional[Request], etag: str) -> bool:
+    if request is None:
+        return False
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    return header.strip() == '*' or etag in [tag.strip() for tag in header.split(',')]
+
+
+def cached_response(namespace: str, ttl: int):
+    """
+    Decorator de cache para endpoints GET que retornam JSON
+
+    A chave usa o nome do endpoint e os parâmetros simples (path/query);
+    dependências como Session e Request ficam de fora. Aplicar abaixo de
+    @router.get e @limiter.limit.
+
+    Args:
+        namespace: Grupo de invalidação (ex: NS_PREDICTIONS)
+        ttl: Tempo de vida em segundos
+    """
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+        accepts_request = 'request' in signature.parameters
+        endpoint = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Optional[Request] = kwargs.get('request')
+            if not accepts_request:
+                kwargs.pop('request', None)
+
+            params = {
+                name: value for name, value in kwargs.items()
+                if name != 'request' and isinstance(value, _SIMPLE_TYPES)
+            }
+            key = await response_cache.build_key(namespace, endpoint, params)
+
+            async def compute():
+                return await func(*args, **kwargs)
+
+            try:
+                (etag, body), hit = await response_cache.get_or_compute(key, ttl, compute)
+            except _Uncacheable as uncacheable:
+                return uncacheable.response
+            response_cache.stats['hits' if hit else 'misses'] += 1
+
+            headers = {
+                'ETag': etag,
+                'Cache-Control': f'private, max-age={ttl}',
+                'X-Cache': 'HIT' if hit else 'MISS',
+            }
+            if _etag_matches(request, etag):
+                response_cache.stats['not_modified'] += 1
+                return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type='application/json', headers=headers)
+
+        if not accepts_request:
+            # Endpoint não recebe Request: injetar para ler If-None-Match
+            parameters = list(signature.parameters.values()) + [
+                inspect.Parameter('request', inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            ]
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,24 @@
-from .neural_network_predictor import NeuralNetworkPredictor
-from .ensemble_model import EnsemblePredictor
+"""
+Modelos de ML. Os preditores pesados (tensorflow, xgboost, lightgbm) são
+importados no primeiro acesso: `from app.ml.dixon_coles import ...` não os carrega.
+"""
+import importlib
+
+_LAZY_EXPORTS = {
+    'NeuralNetworkPredictor': '.neural_network_predictor',
+    'EnsemblePredictor': '.ensemble_model',
+    'SentimentAnalyzer': '.sentiment_analyzer',  # Requer tweepy, textblob, transformers (opcional)
+}
 # from .feature_engineering import FeatureEngineer  # Arquivo não existe
 # from .model_trainer import ModelTrainer  # Arquivo não existe
 # from .pattern_recognition import PatternRecognizer  # Arquivo não existe
-# from .sentiment_analyzer import SentimentAnalyzer  # Requer tweepy, textblob (opcional)
\ No newline at end of file
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
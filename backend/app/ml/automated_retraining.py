@@ -23,7 +23,6 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 from sklearn.preprocessing import StandardScaler
 import joblib
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class AutomatedRetrainingSystem:
@@ -451,6 +450,7 @@ async def run_daily_retraining():
     return await automated_retraining_system.run_daily_retraining_check()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # Para teste
     import asyncio
     asyncio.run(run_daily_retraining())
\ No newline at end of file
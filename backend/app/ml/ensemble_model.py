@@ -6,21 +6,29 @@ from sklearn.svm import SVC
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import cross_val_score, GridSearchCV
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-import xgboost as xgb
-import lightgbm as lgb
 from typing import Dict, List, Tuple, Optional
 import joblib
 import logging
+import os
 from datetime import datetime
+from app.core.lazy_imports import lazy_module
+from app.core.model_registry import ModelRegistry, model_registry
+from .dixon_coles import DixonColesModel
 from .poisson_predictor import PoissonPredictor, integrate_poisson_with_ensemble
 
+# Boosting libs are imported when the first EnsemblePredictor is built
+xgb = lazy_module('xgboost')
+lgb = lazy_module('lightgbm')
+
 logger = logging.getLogger(__name__)
 
 class EnsemblePredictor:
     """Advanced Ensemble Model combining multiple algorithms"""
 
-    def __init__(self, model_path: str = "models/", use_poisson: bool = True):
-        self.model_path = model_path
+    def __init__(self, model_path: str = "models/", use_poisson: bool = True,
+                 registry: Optional[ModelRegistry] = None):
+        self.model_path = model_path  # legacy .pkl files, adopted by the registry on first read
+        self.registry = registry or model_registry
         self.models = {}
         self.scalers = {}
         self.feature_selectors = {}
@@ -228,8 +236,12 @@ class EnsemblePredictor:
             'ensemble_score': ensemble_score
         }
 
-        # Save to disk
-        joblib.dump(model_data, f"{self.model_path}ensemble_{prediction_type}.pkl")
+        # Save as a new promoted version (serving workers swap on their next prediction)
+        entry = self.registry.register(f"ensemble_{prediction_type}", model_data, metadata={
+            'ensemble_score': ensemble_score,
+            'feature_count': len(feature_columns),
+            'best_models': [name for name, _ in best_models]
+        })
 
         # Store in memory
         self.models[prediction_type] = model_data
@@ -238,19 +250,33 @@ class EnsemblePredictor:
             'ensemble_score': ensemble_score,
             'individual_scores': model_scores,
             'best_models': best_models,
-            'feature_count': len(feature_columns)
+            'feature_count': len(feature_columns),
+            'model_version': entry['version']
         }
 
-    def predict_ensemble(self, data: pd.DataFrame, prediction_type: str, league_avg_goals: float = 2.7) -> Dict:
-        """Make predictions using ensemble model with Poisson integration"""
-        if prediction_type not in self.models:
-            try:
-                model_data = joblib.load(f"{self.model_path}ensemble_{prediction_type}.pkl")
-                self.models[prediction_type] = model_data
-            except FileNotFoundError:
-                raise ValueError(f"Ensemble model for {prediction_type} not found")
+    def _get_model(self, prediction_type: str):
+        """Current registry version of the ensemble (hot cache, reloaded after promotion)"""
+        legacy_path = f"{self.model_path}ensemble_{prediction_type}.pkl"
+        return self.registry.get(
+            f"ensemble_{prediction_type}",
+            fallback=lambda: joblib.load(legacy_path) if os.path.exists(legacy_path) else None
+        )
 
-        model_data = self.models[prediction_type]
+    def predict_ensemble(self, data: pd.DataFrame, prediction_type: str, league_avg_goals: float = 2.7,
+                         strength_model: Optional[DixonColesModel] = None) -> Dict:
+        """Make predictions using ensemble model with Poisson integration
+
+        With a fitted strength_model (TeamStrengthService.get_model()), the Poisson
+        side uses Dixon-Coles ratings for rows carrying home_team_id/away_team_id/league;
+        league_avg_goals and the constant home advantage are only the fallback.
+        """
+        loaded = self._get_model(prediction_type)
+        if loaded is None:
+            raise ValueError(f"Ensemble model for {prediction_type} not found")
+
+        # Use one snapshot for the whole call, even if a new version is promoted meanwhile
+        model_data = loaded.model
+        self.models[prediction_type] = model_data
         ensemble_model = model_data['ensemble_model']
         scaler = model_data['scaler']
         feature_columns = model_data['feature_columns']
@@ -294,7 +320,11 @@ class EnsemblePredictor:
                     poisson_result = self.poisson_predictor.predict_match(
                         home_team_data,
                         away_team_data,
-                        league_avg_goals
+                        league_avg_goals,
+                        strength_model=strength_model,
+                        home_team_id=data.iloc[idx].get('home_team_id'),
+                        away_team_id=data.iloc[idx].get('away_team_id'),
+                        league_id=data.iloc[idx].get('league')
                     )
                     poisson_predictions.append(poisson_result)
 
@@ -334,7 +364,8 @@ class EnsemblePredictor:
             'probabilities': probabilities.tolist(),
             'confidence_scores': confidence_scores,
             'individual_predictions': individual_predictions,
-            'ensemble_agreement': self._calculate_agreement(individual_predictions)
+            'ensemble_agreement': self._calculate_agreement(individual_predictions),
+            'model_version': loaded.tag
         }
 
         # Add Poisson predictions if available
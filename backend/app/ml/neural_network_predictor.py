@@ -1,8 +1,5 @@
 import numpy as np
 import pandas as pd
-import tensorflow as tf
-from tensorflow import keras
-from tensorflow.keras import layers
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from typing import Dict, List, Tuple, Optional
@@ -11,6 +8,13 @@ import os
 from datetime import datetime, timedelta
 import logging
 
+from app.core.lazy_imports import lazy_module
+
+# TensorFlow só é importado quando um modelo é construído/carregado
+tf = lazy_module('tensorflow')
+keras = lazy_module('tensorflow.keras')
+layers = lazy_module('tensorflow.keras.layers')
+
 logger = logging.getLogger(__name__)
 
 class NeuralNetworkPredictor:
@@ -58,7 +62,7 @@ class NeuralNetworkPredictor:
         # Create models directory if it doesn't exist
         os.makedirs(model_path, exist_ok=True)
 
-    def _build_model(self, config: Dict) -> keras.Model:
+    def _build_model(self, config: Dict) -> 'keras.Model':
         """Build neural network model with specified configuration"""
         model = keras.Sequential()
 
@@ -11,9 +11,11 @@ given number of events happening in a fixed interval of time.
 
 import numpy as np
 from scipy.stats import poisson
-from typing import Dict, Tuple
+from typing import Dict, Hashable, Optional, Tuple
 import logging
 
+from .dixon_coles import DixonColesModel
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +28,11 @@ class PoissonPredictor:
     - Team defensive strength
     - Home advantage
     - League average goals
+
+    When a fitted DixonColesModel is passed to predict_match, expected goals
+    come from its attack/defence ratings and per-league home advantage, and
+    markets from its score matrix; home_advantage and league_avg_goals are
+    only the fallback for unfitted models or unknown fixtures.
     """
 
     def __init__(self, home_advantage: float = 1.3):
@@ -220,11 +227,34 @@ class PoissonPredictor:
             'btts_no': prob_btts_no
         }
 
+    def _markets_from_matrix(self, matrix: np.ndarray) -> Tuple[Dict, Dict, Dict, Dict]:
+        """1X2, over/under 2.5 and 3.5 and BTTS from a score matrix P(home=i, away=j)"""
+        goals = np.arange(matrix.shape[0])
+        home, away = goals[:, None], goals[None, :]
+        total = home + away
+
+        def under(threshold: float) -> Dict[str, float]:
+            prob_under = float(matrix[total < threshold].sum())
+            return {f'over_{threshold}': 1.0 - prob_under, f'under_{threshold}': prob_under}
+
+        prob_btts_yes = float(matrix[1:, 1:].sum())
+        match_probs = {
+            'home_win': float(matrix[home > away].sum()),
+            'draw': float(np.trace(matrix)),
+            'away_win': float(matrix[home < away].sum())
+        }
+        btts = {'btts_yes': prob_btts_yes, 'btts_no': 1.0 - prob_btts_yes}
+        return match_probs, under(2.5), under(3.5), btts
+
     def predict_match(
         self,
         home_team_data: Dict[str, float],
         away_team_data: Dict[str, float],
-        league_avg_goals: float = 2.7
+        league_avg_goals: float = 2.7,
+        strength_model: Optional[DixonColesModel] = None,
+        home_team_id: Optional[Hashable] = None,
+        away_team_id: Optional[Hashable] = None,
+        league_id: Optional[Hashable] = None
     ) -> Dict[str, any]:
         """
         Full match prediction using Poisson distribution.
@@ -233,10 +263,21 @@ class PoissonPredictor:
             home_team_data: Dict with 'goals_scored_avg' and 'goals_conceded_avg'
             away_team_data: Dict with 'goals_scored_avg' and 'goals_conceded_avg'
             league_avg_goals: Average goals per match in the league
+            strength_model: Fitted Dixon-Coles model; used when both team ids
+                are given, instead of the averages and constant home advantage
+            home_team_id: Home team id in strength_model
+            away_team_id: Away team id in strength_model
+            league_id: League id in strength_model
 
         Returns:
             Complete prediction including all markets
         """
+        if (
+            strength_model is not None and strength_model.is_fitted
+            and home_team_id is not None and away_team_id is not None
+        ):
+            return self._predict_with_strength_model(strength_model, home_team_id, away_team_id, league_id)
+
         # Calculate team strengths
         home_attack = self.calculate_attack_strength(
             home_team_data['goals_scored_avg'],
@@ -294,6 +335,48 @@ class PoissonPredictor:
             away_expected
         )
 
+        return self._build_prediction(
+            match_probs, over_under_2_5, over_under_3_5, btts,
+            home_expected, away_expected,
+            (home_attack, home_defense), (away_attack, away_defense)
+        )
+
+    def _predict_with_strength_model(
+        self,
+        model: DixonColesModel,
+        home_team_id: Hashable,
+        away_team_id: Hashable,
+        league_id: Optional[Hashable]
+    ) -> Dict[str, any]:
+        """predict_match from fitted Dixon-Coles ratings (lookup + score matrix)"""
+        lambda_home, lambda_away = model.predict_lambdas([home_team_id], [away_team_id], [league_id])
+        matrix = model.score_matrices(lambda_home, lambda_away)[0]
+        match_probs, over_under_2_5, over_under_3_5, btts = self._markets_from_matrix(matrix)
+
+        def strengths(team_id: Hashable) -> Tuple[float, float]:
+            idx = model.team_index.get(team_id)
+            if idx is None:
+                return 1.0, 1.0
+            return float(np.exp(model.attack[idx])), float(np.exp(model.defence[idx]))
+
+        return self._build_prediction(
+            match_probs, over_under_2_5, over_under_3_5, btts,
+            float(lambda_home[0]), float(lambda_away[0]),
+            strengths(home_team_id), strengths(away_team_id)
+        )
+
+    def _build_prediction(
+        self,
+        match_probs: Dict[str, float],
+        over_under_2_5: Dict[str, float],
+        over_under_3_5: Dict[str, float],
+        btts: Dict[str, float],
+        home_expected: float,
+        away_expected: float,
+        home_strength: Tuple[float, float],
+        away_strength: Tuple[float, float]
+    ) -> Dict[str, any]:
+        """Assemble the predict_match result from market probabilities"""
         # Determine most likely outcome
         max_prob = max(
             match_probs['home_win'],
@@ -333,12 +416,12 @@ class PoissonPredictor:
             },
             'team_strengths': {
                 'home': {
-                    'attack': home_attack,
-                    'defense': home_defense
+                    'attack': home_strength[0],
+                    'defense': home_strength[1]
                 },
                 'away': {
-                    'attack': away_attack,
-                    'defense': away_defense
+                    'attack': away_strength[0],
+                    'defense': away_strength[1]
                 }
             }
         }
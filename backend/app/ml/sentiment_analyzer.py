@@ -6,12 +6,14 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 import logging
-from textblob import TextBlob
-import tweepy
-from newspaper import Article
 import feedparser
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-import torch
+
+from app.core.lazy_imports import lazy_module
+
+# NLP/scraping libs are imported on first use (transformers pulls in torch)
+textblob = lazy_module('textblob')
+newspaper = lazy_module('newspaper')
+transformers = lazy_module('transformers')
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +41,14 @@ class SentimentAnalyzer:
         """Initialize various sentiment analysis models"""
         try:
             # Hugging Face transformer model for sports sentiment
-            self.sentiment_models['sports'] = pipeline(
+            self.sentiment_models['sports'] = transformers.pipeline(
                 "sentiment-analysis",
                 model="cardiffnlp/twitter-roberta-base-sentiment-latest",
                 tokenizer="cardiffnlp/twitter-roberta-base-sentiment-latest"
             )
 
             # Financial sentiment model (useful for transfer news impact)
-            self.sentiment_models['financial'] = pipeline(
+            self.sentiment_models['financial'] = transformers.pipeline(
                 "sentiment-analysis",
                 model="ProsusAI/finbert"
             )
@@ -56,7 +58,7 @@ class SentimentAnalyzer:
         except Exception as e:
             logger.error(f"Error initializing sentiment models: {e}")
             # Fallback to TextBlob
-            self.sentiment_models['textblob'] = TextBlob
+            self.sentiment_models['textblob'] = textblob.TextBlob
 
     async def analyze_team_sentiment(self, team_name: str, days_back: int = 7) -> Dict:
         """Analyze sentiment around a team from multiple sources"""
@@ -256,7 +258,7 @@ class SentimentAnalyzer:
     async def _fetch_article_content(self, url: str) -> str:
         """Fetch and extract main content from article URL"""
         try:
-            article = Article(url)
+            article = newspaper.Article(url)
             article.download()
             article.parse()
             return article.text
@@ -327,7 +329,7 @@ class SentimentAnalyzer:
 
         # Use TextBlob as fallback
         try:
-            blob = TextBlob(text)
+            blob = textblob.TextBlob(text)
             polarity = blob.sentiment.polarity
             subjectivity = blob.sentiment.subjectivity
 
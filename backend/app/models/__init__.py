@@ -7,4 +7,7 @@ from .player import Player, PlayerInjury
 from .statistics import MatchStatistics, TeamStatistics
 from .user import User
 from .user_bankroll import UserBankroll, BankrollHistory
-from .user_ticket import UserTicket, TicketSelection
\ No newline at end of file
+from .user_ticket import UserTicket, TicketSelection
+from .value_bet import ValueBetScan, ValueBetRanking
+from .performance_rollup import PerformanceRollup
+from .job_run import JobRun
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index
+from app.core.database import Base
+
+
+class JobRun(Base):
+    """
+    Execução de um job agendado (histórico do job_runner)
+
+    status: success, error, skipped (execução anterior ainda em andamento
+    neste ou em outro worker)
+    """
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String, nullable=False)
+    runner = Column(String, nullable=False, default='')  # nome do runtime (leader key)
+    worker = Column(String, nullable=False, default='')  # host:pid:token do processo
+    status = Column(String, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float, nullable=False, default=0.0)
+    items_processed = Column(Integer, nullable=False, default=0)
+    api_calls = Column(Integer, nullable=False, default=0)
+    error = Column(String)
+
+    __table_args__ = (
+        Index('ix_job_runs_job_started', 'job_id', 'started_at'),
+        Index('ix_job_runs_started_at', 'started_at'),
+    )
+
+    def __repr__(self):
+        return f"<JobRun({self.job_id} {self.status} {self.duration_seconds:.1f}s)>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -58,5 +58,11 @@ class Match(Base):
     predictions = relationship("Prediction", back_populates="match")
     prediction_logs = relationship("PredictionLog", back_populates="match")
 
+    __table_args__ = (
+        Index('ix_matches_status_match_date', 'status', 'match_date'),  # status IN (...) + janela de datas
+        Index('ix_matches_home_team_date', 'home_team_id', 'match_date'),  # forma / H2H
+        Index('ix_matches_away_team_date', 'away_team_id', 'match_date'),
+    )
+
     def __repr__(self):
         return f"<Match({self.home_team.name if self.home_team else 'TBD'} vs {self.away_team.name if self.away_team else 'TBD'})>"
\ No newline at end of file
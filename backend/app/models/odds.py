@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -58,6 +58,14 @@ class Odds(Base):
     # Relationships
     match = relationship("Match", back_populates="odds")
 
+    __table_args__ = (
+        # Odds mais recentes por partida/mercado (ORDER BY odds_timestamp DESC)
+        Index('ix_odds_match_market_timestamp', 'match_id', 'market', 'odds_timestamp'),
+        # Parcial: só odds ativas
+        Index('ix_odds_active_match', 'match_id',
+              sqlite_where=is_active == True, postgresql_where=is_active == True),
+    )
+
     @property
     def market_type(self):
         """Alias for 'market' field for backward compatibility"""
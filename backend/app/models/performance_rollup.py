@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class PerformanceRollup(Base):
+    """
+    Agregado diário de resultados (GREEN/RED) por modelo, mercado e liga
+
+    Mantido incrementalmente quando predições são liquidadas:
+    - source='predictions': tabela predictions (ResultsUpdater)
+    - source='prediction_logs': tabela prediction_logs (PredictionLogger)
+    """
+    __tablename__ = "performance_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, nullable=False)  # predictions, prediction_logs
+    bucket_date = Column(Date, nullable=False)  # dia da predição
+    model_name = Column(String, nullable=False, default='')
+    model_version = Column(String, nullable=False, default='')
+    market_type = Column(String, nullable=False, default='')
+    league = Column(String, nullable=False, default='')
+
+    total = Column(Integer, nullable=False, default=0)  # predições liquidadas
+    greens = Column(Integer, nullable=False, default=0)
+    reds = Column(Integer, nullable=False, default=0)
+    profit_loss = Column(Float, nullable=False, default=0.0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    feedback_sum = Column(Float, nullable=False, default=0.0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            'source', 'bucket_date', 'model_name', 'model_version', 'market_type', 'league',
+            name='uq_performance_rollups_bucket'
+        ),
+    )
+
+    def __repr__(self):
+        return f"<PerformanceRollup({self.source} {self.bucket_date} {self.model_version} {self.market_type}: {self.greens}/{self.total})>"
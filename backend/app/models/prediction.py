@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -67,6 +67,16 @@ class Prediction(Base):
     # Relationships
     match = relationship("Match", back_populates="predictions")
 
+    __table_args__ = (
+        Index('ix_predictions_match_market_type', 'match_id', 'market_type', 'prediction_type'),
+        Index('ix_predictions_market_confidence', 'market_type', 'confidence_score'),  # /featured
+        Index('ix_predictions_model_version', 'model_version'),
+        Index('ix_predictions_predicted_at', 'predicted_at'),
+        # Parcial: só predições ainda sem resultado (pendentes)
+        Index('ix_predictions_pending', 'match_id',
+              sqlite_where=actual_outcome.is_(None), postgresql_where=actual_outcome.is_(None)),
+    )
+
     def __repr__(self):
         return f"<Prediction(match_id={self.match_id}, type='{self.prediction_type}', outcome='{self.predicted_outcome}')>"
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, JSON, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, JSON, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -62,6 +62,10 @@ class PredictionLog(Base):
     home_team = relationship("Team", foreign_keys=[home_team_id])
     away_team = relationship("Team", foreign_keys=[away_team_id])
 
+    __table_args__ = (
+        Index('ix_prediction_logs_match_id', 'match_id'),
+    )
+
     def __repr__(self):
         return f"<PredictionLog(match_id={self.match_id}, predicted={self.predicted_outcome}, actual={self.actual_outcome}, correct={self.was_correct})>"
 
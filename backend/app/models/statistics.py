@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -100,6 +100,10 @@ class TeamStatistics(Base):
     # Relationships
     team = relationship("Team", back_populates="statistics")
 
+    __table_args__ = (
+        Index('ix_team_statistics_team_season', 'team_id', 'season'),
+    )
+
     # Propriedades calculadas para compatibilidade
     @property
     def goals_scored_avg(self):
@@ -3,7 +3,7 @@
 
 Sistema completo de gerenciamento de apostas pessoais
 """
-from sqlalchemy import Column, Integer, Float, DateTime, Text, String, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, Float, DateTime, Text, String, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -168,6 +168,10 @@ class TicketSelection(Base):
     ticket = relationship("UserTicket", back_populates="selections")
     match = relationship("Match")
 
+    __table_args__ = (
+        Index('ix_ticket_selections_match_id', 'match_id'),
+    )
+
     def check_result(self, match_result: dict):
         """
         Verifica o resultado da seleção baseado no resultado da partida
@@ -0,0 +1,77 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ValueBetScan(Base):
+    """Execução do scan de value bets (um snapshot ranqueado por execução)"""
+    __tablename__ = "value_bet_scans"
+
+    id = Column(Integer, primary_key=True, index=True)
+    matches_analyzed = Column(Integer, default=0)
+    matches_with_odds = Column(Integer, default=0)
+    value_bets_found = Column(Integer, default=0)
+    strength_source = Column(String)  # dixon_coles, team_statistics
+    elapsed_seconds = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    rankings = relationship("ValueBetRanking", back_populates="scan", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<ValueBetScan(id={self.id}, value_bets={self.value_bets_found})>"
+
+
+class ValueBetRanking(Base):
+    """Value bet pré-calculado, já na ordem de exibição do endpoint de scan"""
+    __tablename__ = "value_bet_rankings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scan_id = Column(Integer, ForeignKey("value_bet_scans.id", ondelete="CASCADE"), nullable=False)
+    rank = Column(Integer, nullable=False)  # posição global (rating, edge)
+    match_rank = Column(Integer, nullable=False)  # posição dentro do jogo (diversificação)
+
+    match_id = Column(Integer, ForeignKey("matches.id"), nullable=False)
+    match_name = Column(String, nullable=False)
+    market_type = Column(String, nullable=False)
+    market_name = Column(String)
+    selection = Column(String, nullable=False)
+    market_odds = Column(Float, nullable=False)
+    fair_odds = Column(Float)
+    our_probability = Column(Float)
+    implied_probability = Column(Float)
+    edge = Column(Float, nullable=False)
+    kelly_stake = Column(Float)
+    value_rating = Column(String)
+    confidence = Column(Float)
+    bookmaker = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    scan = relationship("ValueBetScan", back_populates="rankings")
+
+    __table_args__ = (
+        Index('ix_value_bet_rankings_scan_rank', 'scan_id', 'rank'),
+    )
+
+    def to_dict(self) -> dict:
+        """Mesmo formato de ValueBet.to_dict()"""
+        return {
+            'match_id': self.match_id,
+            'match_name': self.match_name,
+            'market_type': self.market_type,
+            'market_name': self.market_name,
+            'selection': self.selection,
+            'market_odds': self.market_odds,
+            'fair_odds': self.fair_odds,
+            'our_probability': self.our_probability,
+            'implied_probability': self.implied_probability,
+            'edge': self.edge,
+            'kelly_stake': self.kelly_stake,
+            'value_rating': self.value_rating,
+            'confidence': self.confidence,
+            'bookmaker': self.bookmaker,
+            'created_at': self.created_at,
+        }
+
+    def __repr__(self):
+        return f"<ValueBetRanking(rank={self.rank}, match_id={self.match_id}, edge={self.edge})>"
@@ -1,5 +1,23 @@
-from .football_data_service import FootballDataService
-from .odds_service import OddsService
-from .weather_service import WeatherService
-from .prediction_service import PredictionService
-from .analytics_service import AnalyticsService
\ No newline at end of file
+"""
+Serviços. As classes abaixo são importadas no primeiro acesso: importar
+`app.services.<modulo>` não carrega os demais serviços (scipy, sklearn...).
+"""
+import importlib
+
+_LAZY_EXPORTS = {
+    'FootballDataService': '.football_data_service',
+    'OddsService': '.odds_service',
+    'WeatherService': '.weather_service',
+    'PredictionService': '.prediction_service',
+    'AnalyticsService': '.analytics_service',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,21 +4,26 @@ Analisa predictions pendentes usando AI Agent (Ollama local)
 
 Características:
 - Processa predictions com ai_analyzed = False
-- Batch processing (100 por vez)
-- Atualiza banco com análises contextuais
+- Batch processing (100 por vez), análises em paralelo no Ollama
+- Match, times e few-shot carregados uma vez por batch
+- Atualiza banco com análises contextuais (escrita em lote no final)
 - Zero custo (100% local via Ollama)
 - Integrado ao scheduler (roda a cada 2h)
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.database import SessionLocal
+from app.core.http_client import close_async_client
 from app.models.prediction import Prediction
 from app.models.match import Match
 from app.services.ai_agent_service import AIAgentService
+from app.services.few_shot_memory import FewShotMemory
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +31,16 @@ logger = logging.getLogger(__name__)
 class AIAgentBatchService:
     """Serviço de processamento em lote do AI Agent"""
 
-    def __init__(self, db: Session = None):
+    def __init__(self, db: Session = None, ai_agent: AIAgentService = None):
         """
         Inicializa batch service
 
         Args:
             db: Sessão do banco de dados (opcional, cria uma se não fornecida)
+            ai_agent: AI Agent (opcional, padrão llama3.1:8b no Ollama local)
         """
         self.db = db or SessionLocal()
-        self.ai_agent = AIAgentService(model="llama3.1:8b")
+        self.ai_agent = ai_agent or AIAgentService(model="llama3.1:8b")
         self.stats = {
             'processed': 0,
             'success': 0,
@@ -46,10 +52,36 @@ class AIAgentBatchService:
         self,
         limit: int = 100,
         min_confidence: float = 0.0
+    ) -> Dict:
+        """
+        Processa predictions pendentes de análise AI (wrapper síncrono)
+
+        Args:
+            limit: Máximo de predictions a processar por batch
+            min_confidence: Confidence mínima para processar (filtro)
+
+        Returns:
+            Estatísticas do processamento
+        """
+        async def run() -> Dict:
+            try:
+                return await self.aprocess_unanalyzed_predictions(limit, min_confidence)
+            finally:
+                await close_async_client()
+
+        return asyncio.run(run())
+
+    async def aprocess_unanalyzed_predictions(
+        self,
+        limit: int = 100,
+        min_confidence: float = 0.0
     ) -> Dict:
         """
         Processa predictions pendentes de análise AI
 
+        Predictions cuja análise falha (timeout, Ollama fora) continuam
+        pendentes e entram no próximo batch.
+
         Args:
             limit: Máximo de predictions a processar por batch
             min_confidence: Confidence mínima para processar (filtro)
@@ -57,7 +89,7 @@ class AIAgentBatchService:
         Returns:
             Estatísticas do processamento
         """
-        if not self.ai_agent.is_available():
+        if not await self.ai_agent.server_available():
             logger.error("❌ AI Agent não disponível (Ollama não conectado)")
             logger.error("🔧 Inicie Ollama: ollama serve")
             return {
@@ -69,7 +101,7 @@ class AIAgentBatchService:
         logger.info(f"🧠 Iniciando batch analysis (limit={limit}, min_confidence={min_confidence})")
 
         try:
-            # Buscar predictions não analisadas
+            # Buscar predictions não analisadas (com match e times)
             pending_predictions = self._get_pending_predictions(limit, min_confidence)
 
             if not pending_predictions:
@@ -82,24 +114,54 @@ class AIAgentBatchService:
 
             logger.info(f"📊 {len(pending_predictions)} predictions pendentes encontradas")
 
-            # Processar cada prediction
+            updates = []
+            to_analyze = []
+
             for prediction in pending_predictions:
-                try:
-                    self._analyze_single_prediction(prediction)
-                    self.stats['success'] += 1
+                if not prediction.match:
+                    logger.warning(f"⚠️ Match {prediction.match_id} não encontrado para prediction {prediction.id}")
+                    updates.append({
+                        'id': prediction.id,
+                        'ai_analyzed': True,
+                        'ai_analyzed_at': datetime.utcnow(),
+                        'ai_recommendation': "SKIP",
+                        'ai_analysis': "Match não encontrado"
+                    })
+                    self.stats['skipped'] += 1
+                    self.stats['processed'] += 1
+                    continue
+                to_analyze.append(prediction)
+
+            # Few-shot carregado uma vez para o batch inteiro
+            few_shot_examples = FewShotMemory(self.db).get_learning_examples(limit=10) if to_analyze else []
+
+            analyses = await self.ai_agent.abatch_analyze(
+                [
+                    {
+                        'match_data': self._build_match_data(prediction.match, prediction),
+                        'ml_prediction': self._build_ml_prediction(prediction)
+                    }
+                    for prediction in to_analyze
+                ],
+                [self._build_context_data(prediction.match, prediction) for prediction in to_analyze],
+                few_shot_examples=few_shot_examples
+            )
+
+            for prediction, analysis in zip(to_analyze, analyses):
+                self.stats['processed'] += 1
 
-                except Exception as e:
-                    logger.error(f"❌ Erro ao analisar prediction {prediction.id}: {e}")
+                if analysis.get('ai_available') is False:
+                    logger.error(f"❌ Erro ao analisar prediction {prediction.id}: análise AI indisponível")
                     self.stats['failed'] += 1
+                    continue
 
-                self.stats['processed'] += 1
-
-                # Commit a cada 10 predictions
-                if self.stats['processed'] % 10 == 0:
-                    self.db.commit()
-                    logger.info(f"✅ {self.stats['processed']}/{len(pending_predictions)} processadas")
+                updates.append(self._build_analysis_update(prediction, analysis))
+                self.stats['success'] += 1
+                logger.debug(f"✅ Prediction {prediction.id} analisada: {analysis['recommendation']} (confidence: {analysis['adjusted_confidence']:.2%})")
 
-            # Commit final
+            # Escrita em lote no final
+            if updates:
+                self.db.execute(update(Prediction), updates)
             self.db.commit()
 
             logger.info(f"🎉 Batch analysis concluída: {self.stats}")
@@ -133,7 +195,10 @@ class AIAgentBatchService:
         Returns:
             Lista de predictions pendentes
         """
-        query = self.db.query(Prediction).filter(
+        query = self.db.query(Prediction).options(
+            joinedload(Prediction.match).joinedload(Match.home_team),
+            joinedload(Prediction.match).joinedload(Match.away_team)
+        ).filter(
             Prediction.ai_analyzed == False,
             Prediction.confidence_score >= min_confidence
         )
@@ -143,44 +208,6 @@ class AIAgentBatchService:
 
         return query.limit(limit).all()
 
-    def _analyze_single_prediction(self, prediction: Prediction):
-        """
-        Analisa uma única prediction com AI Agent
-
-        Args:
-            prediction: Objeto Prediction do banco
-        """
-        # Buscar dados do match
-        match = self.db.query(Match).filter(
-            Match.id == prediction.match_id
-        ).first()
-
-        if not match:
-            logger.warning(f"⚠️ Match {prediction.match_id} não encontrado para prediction {prediction.id}")
-            prediction.ai_analyzed = True
-            prediction.ai_analyzed_at = datetime.utcnow()
-            prediction.ai_recommendation = "SKIP"
-            prediction.ai_analysis = "Match não encontrado"
-            self.stats['skipped'] += 1
-            return
-
-        # Preparar dados para análise
-        match_data = self._build_match_data(match, prediction)
-        ml_prediction = self._build_ml_prediction(prediction)
-        context_data = self._build_context_data(match, prediction)
-
-        # Executar análise AI
-        analysis = self.ai_agent.analyze_prediction(
-            match_data=match_data,
-            ml_prediction=ml_prediction,
-            context_data=context_data
-        )
-
-        # Atualizar prediction com resultado da análise
-        self._update_prediction_with_analysis(prediction, analysis)
-
-        logger.debug(f"✅ Prediction {prediction.id} analisada: {analysis['recommendation']} (confidence: {analysis['adjusted_confidence']:.2%})")
-
     def _build_match_data(self, match: Match, prediction: Prediction) -> Dict:
         """Constrói dicionário de dados do match"""
         return {
@@ -234,23 +261,26 @@ class AIAgentBatchService:
 
         return context
 
-    def _update_prediction_with_analysis(self, prediction: Prediction, analysis: Dict):
+    def _build_analysis_update(self, prediction: Prediction, analysis: Dict) -> Dict:
         """
-        Atualiza prediction com resultado da análise AI
+        Constrói a linha de UPDATE da prediction com o resultado da análise AI
 
         Args:
             prediction: Objeto Prediction
             analysis: Resultado da análise AI
         """
-        prediction.ai_analyzed = True
-        prediction.ai_analyzed_at = datetime.utcnow()
-        prediction.ai_recommendation = analysis.get('recommendation', 'MONITOR')
-        prediction.ai_analysis = analysis.get('explanation', '')
-
         # Calcular ajuste de confidence
         ml_confidence = prediction.confidence_score or 0.5
         adjusted_confidence = analysis.get('adjusted_confidence', ml_confidence)
-        prediction.ai_confidence_delta = adjusted_confidence - ml_confidence
+
+        return {
+            'id': prediction.id,
+            'ai_analyzed': True,
+            'ai_analyzed_at': datetime.utcnow(),
+            'ai_recommendation': analysis.get('recommendation', 'MONITOR'),
+            'ai_analysis': analysis.get('explanation', ''),
+            'ai_confidence_delta': adjusted_confidence - ml_confidence
+        }
 
 
 # Função standalone para usar no scheduler
@@ -268,7 +298,10 @@ async def analyze_unanalyzed_predictions(limit: int = 100) -> Dict:
     logger.info("🧠 [SCHEDULER] Iniciando AI Agent batch processing")
 
     batch_service = AIAgentBatchService()
-    result = batch_service.process_unanalyzed_predictions(limit=limit)
+    try:
+        result = await batch_service.aprocess_unanalyzed_predictions(limit=limit)
+    finally:
+        batch_service.db.close()
 
     if result.get('success'):
         stats = result.get('stats', {})
@@ -5,15 +5,28 @@ Usa Ollama (local) + LangChain para refinar predictions do ML
 Stack:
 - Ollama (Llama 3.1 8B/70B) - FREE, local
 - LangChain - Orchestration
+- Batch: API HTTP do Ollama em paralelo (limite de concorrência + timeout)
 - Zero custo de API
 """
+import asyncio
 import logging
 import json
 from typing import Dict, List, Optional
 from datetime import datetime
 
+import httpx
+
+from app.core.config import settings
+from app.core.http_client import close_async_client, get_async_client
+
 logger = logging.getLogger(__name__)
 
+# Mesmos parâmetros do cliente LangChain
+OLLAMA_OPTIONS = {
+    'temperature': 0.3,  # Baixa temperatura = mais consistente
+    'num_ctx': 4096,     # Contexto grande para análises
+}
+
 
 class AIAgentService:
     """
@@ -21,14 +34,26 @@ class AIAgentService:
     Usa LLM local (Ollama) sem custos
     """
 
-    def __init__(self, model: str = "llama3.1:8b"):
+    def __init__(
+        self,
+        model: str = "llama3.1:8b",
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_concurrent: Optional[int] = None
+    ):
         """
         Inicializa AI Agent
 
         Args:
             model: Modelo Ollama (llama3.1:8b, llama3.1:70b, mistral:7b)
+            base_url: URL do servidor Ollama (padrão: settings.OLLAMA_BASE_URL)
+            timeout: Segundos por análise no batch (padrão: settings.AI_AGENT_TIMEOUT)
+            max_concurrent: Análises simultâneas no batch (padrão: settings.AI_AGENT_MAX_CONCURRENT)
         """
         self.model = model
+        self.base_url = (base_url or settings.OLLAMA_BASE_URL).rstrip('/')
+        self.timeout = timeout or settings.AI_AGENT_TIMEOUT
+        self.max_concurrent = max_concurrent or settings.AI_AGENT_MAX_CONCURRENT
         self.llm = None
         self._initialize_llm()
 
@@ -39,8 +64,8 @@ class AIAgentService:
 
             self.llm = Ollama(
                 model=self.model,
-                temperature=0.3,  # Baixa temperatura = mais consistente
-                num_ctx=4096,     # Contexto grande para análises
+                base_url=self.base_url,
+                **OLLAMA_OPTIONS
             )
             logger.info(f"✅ AI Agent inicializado com modelo: {self.model}")
 
@@ -251,41 +276,130 @@ IMPORTANTE:
             'ai_available': False
         }
 
-    def batch_analyze(
+    # ========== BATCH CONCORRENTE ==========
+
+    async def server_available(self) -> bool:
+        """Verifica se o servidor Ollama responde (não depende do LangChain)"""
+        try:
+            response = await get_async_client().get(f"{self.base_url}/api/tags", timeout=5.0)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def _generate(self, prompt: str) -> str:
+        """Chamada direta a /api/generate do Ollama (sem streaming)"""
+        response = await get_async_client().post(
+            f"{self.base_url}/api/generate",
+            json={
+                'model': self.model,
+                'prompt': prompt,
+                'stream': False,
+                'options': OLLAMA_OPTIONS
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()['response']
+
+    async def analyze_prediction_async(
+        self,
+        match_data: Dict,
+        ml_prediction: Dict,
+        context_data: Dict,
+        few_shot_examples: List[Dict] = None
+    ) -> Dict:
+        """
+        Versão assíncrona de analyze_prediction (usada pelo batch)
+
+        Timeout ou erro do servidor → _fallback_analysis (ai_available=False)
+        """
+        prompt = self._build_analysis_prompt(match_data, ml_prediction, context_data, few_shot_examples)
+
+        try:
+            response = await asyncio.wait_for(self._generate(prompt), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ Timeout ({self.timeout:.0f}s) na análise: {match_data.get('home_team')} vs {match_data.get('away_team')}")
+            return self._fallback_analysis(ml_prediction)
+        except Exception as e:
+            logger.error(f"❌ Erro na análise AI: {e}")
+            return self._fallback_analysis(ml_prediction)
+
+        return self._parse_llm_response(response, ml_prediction)
+
+    async def abatch_analyze(
         self,
         predictions: List[Dict],
         context_data_list: List[Dict],
-        max_concurrent: int = 5
+        max_concurrent: Optional[int] = None,
+        few_shot_examples: List[Dict] = None
     ) -> List[Dict]:
         """
-        Analisa múltiplas predictions em batch
+        Analisa múltiplas predictions em paralelo (no máximo max_concurrent por vez)
 
         Args:
             predictions: Lista de predictions com match_data e ml_prediction
             context_data_list: Lista de contextos correspondentes
             max_concurrent: Máximo de análises simultâneas
+            few_shot_examples: Exemplos GREEN/RED carregados uma vez para o batch
 
         Returns:
-            Lista de análises
+            Lista de análises, na mesma ordem de predictions
+
+        Quem chama confere server_available() antes de montar os contextos
+        (NewsAPI etc.); com o Ollama fora, cada análise vira fallback.
         """
-        if not self.is_available():
-            logger.warning("AI Agent não disponível para batch analysis")
-            return [self._fallback_analysis(p['ml_prediction']) for p in predictions]
+        if not predictions:
+            return []
+
+        semaphore = asyncio.Semaphore(max_concurrent or self.max_concurrent)
+
+        async def analyze(prediction: Dict, context: Dict) -> Dict:
+            async with semaphore:
+                return await self.analyze_prediction_async(
+                    match_data=prediction['match_data'],
+                    ml_prediction=prediction['ml_prediction'],
+                    context_data=context,
+                    few_shot_examples=few_shot_examples
+                )
 
-        results = []
+        results = await asyncio.gather(*(
+            analyze(prediction, context) for prediction, context in zip(predictions, context_data_list)
+        ))
+
+        failed = sum(1 for r in results if r.get('ai_available') is False)
+        logger.info(f"✅ Batch analysis concluída: {len(results) - failed}/{len(results)} predictions analisadas")
+        return list(results)
+
+    def batch_analyze(
+        self,
+        predictions: List[Dict],
+        context_data_list: List[Dict],
+        max_concurrent: int = 5,
+        few_shot_examples: List[Dict] = None
+    ) -> List[Dict]:
+        """
+        Analisa múltiplas predictions em batch (wrapper síncrono de abatch_analyze)
 
-        # Processar em lotes para não sobrecarregar
-        for i in range(0, len(predictions), max_concurrent):
-            batch = predictions[i:i + max_concurrent]
-            batch_contexts = context_data_list[i:i + max_concurrent]
+        Args:
+            predictions: Lista de predictions com match_data e ml_prediction
+            context_data_list: Lista de contextos correspondentes
+            max_concurrent: Máximo de análises simultâneas
+            few_shot_examples: Exemplos GREEN/RED compartilhados pelo batch
 
-            for pred, context in zip(batch, batch_contexts):
-                analysis = self.analyze_prediction(
-                    match_data=pred['match_data'],
-                    ml_prediction=pred['ml_prediction'],
-                    context_data=context
+        Returns:
+            Lista de análises
+        """
+        async def run() -> List[Dict]:
+            try:
+                if not await self.server_available():
+                    logger.warning(f"AI Agent não disponível para batch analysis ({self.base_url})")
+                    return [self._fallback_analysis(p['ml_prediction']) for p in predictions]
+                return await self.abatch_analyze(
+                    predictions, context_data_list,
+                    max_concurrent=max_concurrent,
+                    few_shot_examples=few_shot_examples
                 )
-                results.append(analysis)
+            finally:
+                await close_async_client()
 
-        logger.info(f"✅ Batch analysis concluída: {len(results)} predictions analisadas")
-        return results
+        return asyncio.run(run())
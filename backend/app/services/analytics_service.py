@@ -1,5 +1,3 @@
-import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
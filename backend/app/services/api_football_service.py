@@ -16,21 +16,38 @@ Dados Disponíveis:
 - Eventos ao vivo e lineups
 """
 
-import httpx
 import asyncio
+import time
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.http_client import get_async_client
 from app.core.redis import redis_client
+from app.services.api_request_scheduler import api_request_scheduler
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Máximo de fixtures por request no parâmetro `ids` da API-Football
+FIXTURE_IDS_BATCH_SIZE = 20
+
+
+def chunk_fixture_ids(fixture_ids, size: int = FIXTURE_IDS_BATCH_SIZE) -> List[List[int]]:
+    """Deduplicar IDs de fixtures e dividir em lotes de até `size`"""
+    unique_ids = list(dict.fromkeys(int(fid) for fid in fixture_ids))
+    return [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+
+
 class APIFootballService:
     """Serviço para integração com API-Football (api-sports.io)"""
 
-    def __init__(self):
+    def __init__(self, quota_manager=None):
+        """
+        Args:
+            quota_manager: APIQuotaManager opcional. Se informado, a quota diária
+                do scheduler é alinhada com o banco e cada request é registrado.
+        """
         self.base_url = "https://v3.football.api-sports.io"
         self.api_key = settings.API_SPORTS_KEY
         self.headers = {
@@ -38,43 +55,86 @@ class APIFootballService:
             "Content-Type": "application/json"
         }
         self.cache_ttl = 300  # 5 minutes
-        self.rate_limit_delay = 1.0  # Delay entre requests (ajustável)
+        # Mantido por compatibilidade: o ritmo agora é controlado pelo
+        # api_request_scheduler (token bucket por minuto + quota diária)
+        self.rate_limit_delay = 0.0
+        self.scheduler = api_request_scheduler
+        self.quota_manager = quota_manager
+
+        if quota_manager is not None:
+            self.scheduler.sync_with_quota_manager(quota_manager)
 
     async def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """Fazer requisição à API com tratamento de erros e rate limiting"""
         try:
-            # Aguardar para respeitar rate limit
-            await asyncio.sleep(self.rate_limit_delay)
+            async with self.scheduler.slot() as allowed:
+                if not allowed:
+                    logger.warning("Quota diária da API esgotada!")
+                    return {'response': [], 'errors': ['Daily quota exhausted']}
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
+                start = time.perf_counter()
+                client = get_async_client()
                 response = await client.get(
                     f"{self.base_url}/{endpoint}",
                     headers=self.headers,
                     params=params or {}
                 )
+                elapsed_ms = (time.perf_counter() - start) * 1000
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    # Verificar se a resposta foi bem-sucedida
-                    if data.get('response') is not None:
-                        return data
-                    else:
-                        logger.error(f"API retornou erro: {data.get('errors', 'Unknown error')}")
-                        return {'response': [], 'errors': data.get('errors', [])}
+            self.scheduler.update_from_headers(response.headers)
 
-                elif response.status_code == 429:
-                    logger.warning("Rate limit atingido!")
-                    return {'response': [], 'errors': ['Rate limit exceeded']}
+            if response.status_code == 200:
+                data = response.json()
 
+                # Verificar se a resposta foi bem-sucedida
+                if data.get('response') is not None:
+                    self._record_quota(endpoint, params, 200, elapsed_ms, len(data.get('response') or []))
+                    return data
                 else:
-                    logger.error(f"Erro na API: {response.status_code} - {response.text}")
-                    return {'response': [], 'errors': [f'HTTP {response.status_code}']}
+                    logger.error(f"API retornou erro: {data.get('errors', 'Unknown error')}")
+                    self._record_quota(endpoint, params, 200, elapsed_ms, error=str(data.get('errors')))
+                    return {'response': [], 'errors': data.get('errors', [])}
+
+            elif response.status_code == 429:
+                logger.warning("Rate limit atingido!")
+                self._record_quota(endpoint, params, 429, elapsed_ms, error='Rate limit exceeded')
+                return {'response': [], 'errors': ['Rate limit exceeded']}
+
+            else:
+                logger.error(f"Erro na API: {response.status_code} - {response.text}")
+                self._record_quota(endpoint, params, response.status_code, elapsed_ms, error=response.text[:500])
+                return {'response': [], 'errors': [f'HTTP {response.status_code}']}
 
         except Exception as e:
             logger.error(f"Erro ao fazer requisição: {e}")
             return {'response': [], 'errors': [str(e)]}
 
+    def _record_quota(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        http_status: int,
+        response_time_ms: float,
+        results_count: int = 0,
+        error: Optional[str] = None
+    ):
+        """Registrar o request no APIQuotaManager (se configurado)"""
+        if self.quota_manager is None:
+            return
+
+        try:
+            self.quota_manager.record_request(
+                endpoint=endpoint,
+                success=error is None,
+                results_count=results_count,
+                http_status=http_status,
+                response_time_ms=response_time_ms,
+                error_message=error,
+                params=params
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao registrar quota do request {endpoint}: {e}")
+
     async def get_leagues(self, country: str = None, season: int = None) -> List[Dict]:
         """
         Obter ligas disponíveis
@@ -232,6 +292,39 @@ class APIFootballService:
 
         return fixtures[0] if fixtures else {}
 
+    async def get_fixtures_by_ids(self, fixture_ids: List[int]) -> Dict[int, Dict]:
+        """
+        🎯 MÉTODO OTIMIZADO: Obter vários fixtures por ID em lotes de 20
+
+        Usa o parâmetro `ids` da API (id-id-id): 1 request a cada 20 jogos
+        em vez de 1 request por jogo. Os lotes rodam em paralelo, limitados
+        pelo api_request_scheduler. NÃO USA CACHE (usado para jogos ao vivo).
+
+        Args:
+            fixture_ids: IDs dos fixtures na API-Football
+
+        Returns:
+            Dict fixture_id -> dados do fixture (IDs não encontrados ficam de fora)
+        """
+        batches = chunk_fixture_ids(fixture_ids)
+        if not batches:
+            return {}
+
+        results = await asyncio.gather(*(
+            self._make_request('fixtures', {'ids': '-'.join(str(fid) for fid in batch)})
+            for batch in batches
+        ))
+
+        fixtures = {}
+        for result in results:
+            for fixture in result.get('response', []):
+                fixture_id = fixture.get('fixture', {}).get('id')
+                if fixture_id is not None:
+                    fixtures[int(fixture_id)] = fixture
+
+        logger.info(f"📥 {len(fixtures)}/{sum(len(b) for b in batches)} fixtures obtidos em {len(batches)} requests")
+        return fixtures
+
     async def get_fixture_details(self, fixture_id: int) -> Dict:
         """
         Obter detalhes completos de uma partida específica
@@ -429,9 +522,6 @@ class APIFootballService:
 
                 logger.info(f"✅ {league_name}: {len(finished_fixtures)} jogos finalizados coletados")
 
-                # Respeitar rate limit
-                await asyncio.sleep(self.rate_limit_delay)
-
             except Exception as e:
                 error_msg = f"Erro ao coletar {league_name}: {str(e)}"
                 logger.error(error_msg)
@@ -494,9 +584,6 @@ class APIFootballService:
 
                 logger.info(f"✅ {league_name}: {len(finished_fixtures)} jogos finalizados coletados")
 
-                # Respeitar rate limit
-                await asyncio.sleep(self.rate_limit_delay)
-
             except Exception as e:
                 error_msg = f"Erro ao coletar {league_name}: {str(e)}"
                 logger.error(error_msg)
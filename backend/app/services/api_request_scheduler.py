@@ -0,0 +1,185 @@
+"""
+🚦 API REQUEST SCHEDULER
+Controle de ritmo das chamadas à API-Football
+
+- Token bucket para a quota por minuto do plano
+- Contador da quota diária (sincronizável com o APIQuotaManager e com os
+  headers x-ratelimit-* devolvidos pela API)
+- Limite de N requests simultâneos em voo
+
+Substitui o `asyncio.sleep(rate_limit_delay)` fixo antes de cada request:
+o tempo de espera passa a ser apenas o necessário para não estourar a quota.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Dict, Mapping, Optional
+
+from app.core.config import settings
+from app.core.job_metrics import count_api_calls
+
+logger = logging.getLogger(__name__)
+
+
+class APIRequestScheduler:
+    """Token bucket (por minuto) + quota diária + concorrência limitada"""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 300,
+        daily_limit: int = 7500,
+        max_concurrent: int = 5
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.daily_limit = daily_limit
+        self.max_concurrent = max_concurrent
+
+        self._refill_rate = requests_per_minute / 60.0  # tokens por segundo
+        self._tokens = float(requests_per_minute)
+        self._last_refill = time.monotonic()
+
+        self._day = date.today()
+        self._daily_used = 0
+        self._daily_remaining = daily_limit
+
+        self._total_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+        # Semáforos são presos ao event loop em que são usados
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    # ------------------------------------------------------------------
+    # Estado interno (sempre com self._lock)
+    # ------------------------------------------------------------------
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(float(self.requests_per_minute), self._tokens + elapsed * self._refill_rate)
+
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._daily_used = 0
+            self._daily_remaining = self.daily_limit
+
+    def _try_take(self) -> Optional[float]:
+        """
+        Tentar consumir um token.
+
+        Returns:
+            0.0 se consumiu, segundos a esperar se o bucket está vazio,
+            None se a quota diária acabou
+        """
+        with self._lock:
+            self._refill()
+
+            if self._daily_remaining <= 0:
+                return None
+
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self._daily_used += 1
+                self._daily_remaining -= 1
+                return 0.0
+
+            return (1.0 - self._tokens) / self._refill_rate
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    async def acquire(self) -> bool:
+        """
+        Aguardar até haver token disponível.
+
+        Returns:
+            False se a quota diária está esgotada (não adianta esperar)
+        """
+        while True:
+            wait = self._try_take()
+            if wait is None:
+                return False
+            if wait == 0.0:
+                count_api_calls()
+                return True
+
+            self._total_wait_seconds += wait
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Reservar uma vaga de execução (concorrência + token).
+
+        Uso:
+            async with scheduler.slot() as allowed:
+                if allowed:
+                    ... fazer request ...
+        """
+        async with self._semaphore():
+            yield await self.acquire()
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Ajustar o estado com os headers de rate limit da API-Football:
+        - x-ratelimit-requests-remaining: quota diária restante
+        - x-ratelimit-remaining: requests restantes no minuto corrente
+        """
+        daily_remaining = headers.get('x-ratelimit-requests-remaining')
+        minute_remaining = headers.get('x-ratelimit-remaining')
+
+        with self._lock:
+            if daily_remaining is not None and str(daily_remaining).isdigit():
+                self._daily_remaining = int(daily_remaining)
+            if minute_remaining is not None and str(minute_remaining).isdigit():
+                self._tokens = min(self._tokens, float(minute_remaining))
+
+    def sync_with_quota_manager(self, quota_manager) -> int:
+        """
+        Alinhar a quota diária com o APIQuotaManager (fonte persistida no banco)
+
+        Returns:
+            Requests restantes hoje
+        """
+        available = quota_manager.get_available_requests()
+        with self._lock:
+            self._refill()
+            self._daily_remaining = min(self._daily_remaining, available)
+            return self._daily_remaining
+
+    def get_stats(self) -> Dict:
+        """Estatísticas atuais do scheduler"""
+        with self._lock:
+            self._refill()
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'max_concurrent': self.max_concurrent,
+                'tokens_available': round(self._tokens, 2),
+                'daily_limit': self.daily_limit,
+                'daily_used': self._daily_used,
+                'daily_remaining': self._daily_remaining,
+                'total_wait_seconds': round(self._total_wait_seconds, 2)
+            }
+
+
+# Instância global compartilhada por todos os APIFootballService do processo
+api_request_scheduler = APIRequestScheduler(
+    requests_per_minute=settings.API_SPORTS_REQUESTS_PER_MINUTE,
+    daily_limit=settings.API_SPORTS_DAILY_LIMIT,
+    max_concurrent=settings.API_SPORTS_MAX_CONCURRENT
+)
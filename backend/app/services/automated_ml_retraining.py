@@ -13,15 +13,14 @@ from dataclasses import dataclass
 import joblib
 import os
 from pathlib import Path
-import schedule
 import time
-from threading import Thread
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.metrics import accuracy_score, classification_report
 from sklearn.model_selection import train_test_split
 import logging
 
-logging.basicConfig(level=logging.INFO)
+from app.core.model_registry import ModelRegistry, model_registry
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -55,9 +54,12 @@ class RetrainingResult:
     model_path: str
     validation_report: Dict[str, Any]
     timestamp: datetime
+    model_version: Optional[str] = None
 
 class AutomatedMLRetraining:
-    def __init__(self):
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        # Modelos versionados no registry; models_dir guarda só os arquivos antigos (adotados na 1ª leitura)
+        self.registry = registry or model_registry
         self.models_dir = Path("models/automated")
         self.retraining_data_dir = Path("retraining_data")
         self.performance_log_dir = Path("logs")
@@ -74,7 +76,7 @@ class AutomatedMLRetraining:
             "auto_retrain_schedule": "daily", # daily, weekly, disabled
             "max_retrain_frequency": 1,      # Máximo 1 retreino por dia
             "validation_split": 0.2,         # 20% para validação
-            "backup_models": True            # Manter backup dos modelos antigos
+            "backup_models": True            # Versões anteriores ficam no registry (rollback)
         }
 
         # Performance tracking
@@ -103,25 +105,17 @@ class AutomatedMLRetraining:
             }
         }
 
-        # Inicializar agendamento
-        self._setup_scheduled_retraining()
-
-    def _setup_scheduled_retraining(self):
-        """Configura o agendamento automático de retreino"""
-        if self.config["auto_retrain_schedule"] == "daily":
-            schedule.every().day.at("02:00").do(self._run_scheduled_retraining)
-        elif self.config["auto_retrain_schedule"] == "weekly":
-            schedule.every().sunday.at("02:00").do(self._run_scheduled_retraining)
+        # Agendamento: job 'automated_retraining' do job_runner (app/services/job_registry.py)
 
-        # Iniciar thread do scheduler
-        scheduler_thread = Thread(target=self._run_scheduler, daemon=True)
-        scheduler_thread.start()
-
-    def _run_scheduler(self):
-        """Executa o scheduler em background"""
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Verificar a cada minuto
+    def is_retraining_day(self, when: Optional[datetime] = None) -> bool:
+        """Se o retreino agendado deve rodar no dia (config auto_retrain_schedule)"""
+        when = when or datetime.now()
+        schedule_mode = self.config["auto_retrain_schedule"]
+        if schedule_mode == "daily":
+            return True
+        if schedule_mode == "weekly":
+            return when.weekday() == 6  # domingo
+        return False
 
     async def evaluate_retraining_triggers(self) -> List[RetrainingTrigger]:
         """
@@ -164,13 +158,13 @@ class AutomatedMLRetraining:
             if test_data.empty:
                 return None
 
-            # Carregar modelo
-            model_path = self.models_dir / f"{model_name}.joblib"
-            if not model_path.exists():
-                logger.warning(f"Modelo {model_name} não encontrado em {model_path}")
+            # Carregar modelo (versão atual do registry)
+            loaded = self._get_model(model_name)
+            if loaded is None:
+                logger.warning(f"Modelo {model_name} não encontrado no registry")
                 return None
 
-            model = joblib.load(model_path)
+            model = loaded.model
             model_config = self.supported_models[model_name]
 
             # Preparar features
@@ -202,6 +196,16 @@ class AutomatedMLRetraining:
             logger.error(f"Erro ao avaliar performance do modelo {model_name}: {str(e)}")
             return None
 
+    def _get_model(self, model_name: str):
+        """
+        Versão atual do modelo no registry (cache quente, troca após promoção)
+        """
+        legacy_path = self.models_dir / f"{model_name}.joblib"
+        return self.registry.get(
+            model_name,
+            fallback=lambda: joblib.load(legacy_path) if legacy_path.exists() else None
+        )
+
     async def _load_recent_test_data(self, model_name: str) -> pd.DataFrame:
         """
         Carrega dados de teste recentes para avaliação
@@ -345,14 +349,10 @@ class AutomatedMLRetraining:
                 X, y, test_size=self.config["validation_split"], random_state=42
             )
 
-            # 5. Backup do modelo atual (se existir)
+            # 5. Accuracy do modelo atual (a versão atual continua no registry para rollback)
             old_accuracy = 0
-            old_model_path = self.models_dir / f"{model_name}.joblib"
-            if old_model_path.exists():
+            if self._get_model(model_name) is not None:
                 old_accuracy = await self._get_model_accuracy(model_name)
-                if self.config["backup_models"]:
-                    backup_path = self.models_dir / f"{model_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.joblib"
-                    joblib.dump(joblib.load(old_model_path), backup_path)
 
             # 6. Treinar novo modelo
             new_model = model_config["model_class"](**model_config["params"])
@@ -366,9 +366,15 @@ class AutomatedMLRetraining:
             # 8. Decidir se aceitar o novo modelo
             improvement = new_accuracy - old_accuracy
             if improvement >= -0.02:  # Aceitar se não piorar mais que 2%
-                # Salvar novo modelo
-                new_model_path = self.models_dir / f"{model_name}.joblib"
-                joblib.dump(new_model, new_model_path)
+                # Registrar e promover: os workers trocam de versão na próxima leitura
+                entry = self.registry.register(model_name, new_model, metadata={
+                    "accuracy": new_accuracy,
+                    "previous_accuracy": old_accuracy,
+                    "training_samples": len(training_data),
+                    "features": model_config["features"],
+                    "trigger": trigger.trigger_type
+                })
+                new_model_path = self.registry.root / model_name / entry["file"]
 
                 # Atualizar log de retreino
                 await self._update_retraining_log(model_name, trigger, new_accuracy)
@@ -392,7 +398,8 @@ class AutomatedMLRetraining:
                     training_duration=training_duration,
                     model_path=str(new_model_path),
                     validation_report=validation_report,
-                    timestamp=datetime.now()
+                    timestamp=datetime.now(),
+                    model_version=entry["version"]
                 )
             else:
                 logger.warning(f"Novo modelo para {model_name} rejeitado. "
@@ -624,27 +631,23 @@ class AutomatedMLRetraining:
         except Exception as e:
             logger.error(f"Erro ao atualizar histórico de performance para {model_name}: {str(e)}")
 
-    def _run_scheduled_retraining(self):
+    async def run_scheduled_retraining(self) -> Dict[str, Any]:
         """
-        Executa retreino agendado (chamado pelo scheduler)
+        Executa retreino agendado (chamado pelo job_runner às 02:00)
         """
+        if not self.is_retraining_day():
+            return {"skipped": True, "models_retrained": 0}
+
         logger.info("Executando retreino agendado...")
 
-        # Executar em thread separada para não bloquear
-        async def run_async_retraining():
-            triggers = await self.evaluate_retraining_triggers()
-            if triggers:
-                results = await self.run_bulk_retraining()
-                logger.info(f"Retreino agendado concluído. {len(results)} modelos processados.")
-            else:
-                logger.info("Nenhum modelo precisa de retreino no momento.")
+        triggers = await self.evaluate_retraining_triggers()
+        if not triggers:
+            logger.info("Nenhum modelo precisa de retreino no momento.")
+            return {"skipped": False, "models_retrained": 0}
 
-        # Executar de forma assíncrona
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(run_async_retraining())
-        loop.close()
+        results = await self.run_bulk_retraining()
+        logger.info(f"Retreino agendado concluído. {len(results)} modelos processados.")
+        return {"skipped": False, "models_retrained": len(results)}
 
     async def run_bulk_retraining(self) -> List[RetrainingResult]:
         """
@@ -691,6 +694,7 @@ class AutomatedMLRetraining:
                 new_data_count = await self._count_new_training_data(model_name)
 
                 status["models"][model_name] = {
+                    "current_version": self.registry.current_version(model_name),
                     "current_performance": performance.__dict__ if performance else None,
                     "new_data_samples": new_data_count,
                     "needs_retraining": (
@@ -725,5 +729,20 @@ class AutomatedMLRetraining:
             logger.error(f"Erro ao obter status de retreino: {str(e)}")
             return {"error": str(e)}
 
-# Instância global do serviço
-automated_ml_retraining = AutomatedMLRetraining()
\ No newline at end of file
+# Instância global do serviço (criada no primeiro uso)
+_automated_ml_retraining = None
+
+
+def get_automated_ml_retraining() -> AutomatedMLRetraining:
+    """Retorna a instância global do serviço de retreinamento"""
+    global _automated_ml_retraining
+    if _automated_ml_retraining is None:
+        _automated_ml_retraining = AutomatedMLRetraining()
+    return _automated_ml_retraining
+
+
+def __getattr__(name):
+    # mantém `automated_ml_retraining` (job_registry, scripts) sem instanciar no import
+    if name == 'automated_ml_retraining':
+        return get_automated_ml_retraining()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
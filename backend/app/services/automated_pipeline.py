@@ -11,12 +11,16 @@ Jobs:
 """
 import logging
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_
 
 from app.core.database import get_db_session
+from app.core.response_cache import (
+    invalidate_response_cache, NS_DASHBOARD, NS_PREDICTIONS, NS_VALUE_BETS
+)
 from app.models import Match, Prediction
 from app.services.api_football_service import APIFootballService
+from app.services.performance_rollup_service import PerformanceRollupService
 from app.ml.ensemble_model import generate_match_predictions
 
 logger = logging.getLogger(__name__)
@@ -227,7 +231,10 @@ class AutomatedPipeline:
         window_start = now - timedelta(hours=2)
         window_end = now + timedelta(hours=3)
 
-        potential_live = db.query(Match).filter(
+        potential_live = db.query(Match).options(
+            selectinload(Match.home_team),
+            selectinload(Match.away_team)
+        ).filter(
             and_(
                 Match.match_date.between(window_start, window_end),
                 Match.status.in_(['NS', '1H', '2H', 'HT', 'LIVE'])
@@ -236,30 +243,45 @@ class AutomatedPipeline:
 
         logger.info(f"🔍 {len(potential_live)} jogos potencialmente ao vivo")
 
-        for match in potential_live:
-            try:
-                # Buscar status atualizado da API
-                import asyncio
-                fixture_data = asyncio.run(self.api_service.get_fixture_by_id(int(match.external_id)))
+        matches_by_fixture = {
+            int(match.external_id): match
+            for match in potential_live
+            if match.external_id and str(match.external_id).isdigit()
+        }
+        if not matches_by_fixture:
+            return stats
 
-                if not fixture_data:
-                    continue
+        # Buscar status atualizado de todos os jogos em lotes de 20 (ids=)
+        import asyncio
+        try:
+            fixtures = asyncio.run(self.api_service.get_fixtures_by_ids(list(matches_by_fixture)))
+        except Exception as e:
+            logger.error(f"Erro ao buscar fixtures ao vivo: {e}")
+            stats['errors'] += 1
+            return stats
 
-                old_status = match.status
-                new_status = fixture_data['fixture']['status']['short']
+        # Comparar resposta com o banco e alterar apenas o que mudou
+        for fixture_id, match in matches_by_fixture.items():
+            fixture_data = fixtures.get(fixture_id)
+            if not fixture_data:
+                continue
 
-                # Atualizar status
-                match.status = new_status
+            try:
+                old_status = match.status
+                fixture_status = fixture_data['fixture']['status']
+                new_status = fixture_status['short']
 
-                # Atualizar placar
+                changes = {'status': new_status}
                 if fixture_data['goals']['home'] is not None:
-                    match.home_score = fixture_data['goals']['home']
+                    changes['home_score'] = fixture_data['goals']['home']
                 if fixture_data['goals']['away'] is not None:
-                    match.away_score = fixture_data['goals']['away']
+                    changes['away_score'] = fixture_data['goals']['away']
+                if fixture_status.get('elapsed') is not None:
+                    changes['minute'] = fixture_status['elapsed']
 
-                # Marcar tempo decorrido
-                if 'elapsed' in fixture_data['fixture']['status']:
-                    match.elapsed_time = fixture_data['fixture']['status']['elapsed']
+                for field, value in changes.items():
+                    if getattr(match, field) != value:
+                        setattr(match, field, value)
 
                 if new_status in ['1H', '2H', 'HT']:
                     stats['live_matches_found'] += 1
@@ -270,12 +292,17 @@ class AutomatedPipeline:
                     stats['finished'] += 1
                     logger.info(f"✅ FINALIZADO: {match.home_team.name if match.home_team else '?'} {match.home_score}-{match.away_score} {match.away_team.name if match.away_team else '?'}")
 
-                db.commit()
-
             except Exception as e:
                 logger.error(f"Erro ao atualizar jogo {match.id}: {e}")
                 stats['errors'] += 1
-                db.rollback()
+
+        # Um único commit: o ORM envia apenas os UPDATEs dos jogos alterados
+        try:
+            db.commit()
+        except Exception as e:
+            logger.error(f"Erro ao salvar atualização live: {e}")
+            stats['errors'] += 1
+            db.rollback()
 
         logger.info(f"✅ Atualização live concluída: {stats['live_matches_found']} ao vivo, {stats['finished']} finalizados")
 
@@ -379,12 +406,15 @@ class AutomatedPipeline:
 
         Estratégia:
         1. Manter apenas melhores singles (confidence > 70%)
-        2. Criar doubles com jogos diferentes (evitar correlação)
+        2. Criar doubles com jogos diferentes, ou no mesmo jogo quando os dois
+           mercados têm máscara de placar (probabilidade conjunta, não produto)
         3. Criar trebles balanceados (high + medium confidence)
         4. Criar multiples selecionados (4-5 jogos, confidence médio > 65%)
         """
         import itertools
         from datetime import timedelta
+        from app.services.ml_prediction_generator import MLPredictionGenerator
+        from app.services.same_match_pricing import can_price_jointly, has_redundant_leg, price_legs
 
         logger.info("🎯 Criando combinações inteligentes a partir dos singles v3...")
 
@@ -398,7 +428,7 @@ class AutomatedPipeline:
         # Buscar singles v3 não validados COM MATCHES FUTUROS (NS)
         from app.models import Match
 
-        singles = db.query(Prediction).join(Match).filter(
+        singles = db.query(Prediction).join(Match).options(selectinload(Prediction.match)).filter(
             and_(
                 Prediction.model_version == 'ml_generator_v3',
                 Prediction.prediction_type == 'SINGLE',
@@ -452,7 +482,15 @@ class AutomatedPipeline:
         logger.info(f"   Pool para combinações: {len(combo_pool)}")
         logger.info(f"   Target doubles: {target_doubles}")
 
-        # 🎲 CRIAR DOUBLES (2 jogos)
+        # Matrizes de placares dos jogos do pool (pernas no mesmo jogo)
+        score_matrices = MLPredictionGenerator(db).get_score_matrices(
+            list({p.match_id: p.match for p in combo_pool}.values())
+        )
+
+        def legs_of(combo):
+            return [(p.match_id, p.market_type, p.predicted_probability) for p in combo]
+
+        # 🎲 CRIAR DOUBLES (2 jogos ou 2 mercados do mesmo jogo)
 
         doubles_created = 0
         for combo in itertools.combinations(combo_pool, 2):
@@ -460,15 +498,26 @@ class AutomatedPipeline:
                 break
 
             pred1, pred2 = combo
+            same_match = pred1.match_id == pred2.match_id
 
-            # Evitar mesmo jogo
-            if pred1.match_id == pred2.match_id:
+            # Mesmo jogo só com probabilidade conjunta disponível
+            if same_match and (
+                score_matrices.get(pred1.match_id) is None
+                or not can_price_jointly([pred1.market_type, pred2.market_type])
+            ):
                 continue
 
             # Calcular probabilidade combinada
-            combined_prob = pred1.predicted_probability * pred2.predicted_probability if (pred1.predicted_probability and pred2.predicted_probability) else 0.5
+            combined_prob = price_legs(legs_of(combo), score_matrices) if (pred1.predicted_probability and pred2.predicted_probability) else 0.5
             combined_conf = (pred1.confidence_score + pred2.confidence_score) / 2
 
+            # Mesmo jogo: descartar pernas impossíveis juntas ou redundantes (uma implica a outra)
+            if same_match and (
+                combined_prob <= 0
+                or has_redundant_leg(score_matrices[pred1.match_id], [pred1.market_type, pred2.market_type])
+            ):
+                continue
+
             # Criar double
             double = Prediction(
                 match_id=pred1.match_id,  # Usar primeiro jogo como referência
@@ -478,7 +527,10 @@ class AutomatedPipeline:
                 predicted_probability=combined_prob,
                 confidence_score=combined_conf,
                 model_version='ml_generator_v3_combo',
-                analysis_summary=f"Double: Match {pred1.match_id} + {pred2.match_id}",
+                analysis_summary=(
+                    f"Double (mesmo jogo): Match {pred1.match_id}" if same_match
+                    else f"Double: Match {pred1.match_id} + {pred2.match_id}"
+                ),
                 key_factors=[
                     f"Pred1: {pred1.market_type} ({pred1.confidence_score*100:.1f}%)",
                     f"Pred2: {pred2.market_type} ({pred2.confidence_score*100:.1f}%)"
@@ -512,7 +564,7 @@ class AutomatedPipeline:
                 continue
 
             # Calcular probabilidade e confidence combinados
-            combined_prob = (pred1.predicted_probability * pred2.predicted_probability * pred3.predicted_probability) if all([pred1.predicted_probability, pred2.predicted_probability, pred3.predicted_probability]) else 0.4
+            combined_prob = price_legs(legs_of(combo), score_matrices) if all([pred1.predicted_probability, pred2.predicted_probability, pred3.predicted_probability]) else 0.4
             combined_conf = (pred1.confidence_score + pred2.confidence_score + pred3.confidence_score) / 3
 
             # Filtrar: confidence médio > 60%
@@ -563,10 +615,9 @@ class AutomatedPipeline:
                     continue
 
                 # Calcular métricas
-                combined_prob = 1.0
-                for p in combo:
-                    if p.predicted_probability:
-                        combined_prob *= p.predicted_probability
+                combined_prob = price_legs(
+                    [leg for leg in legs_of(combo) if leg[2]], score_matrices
+                )
 
                 combined_conf = sum(p.confidence_score for p in combo) / len(combo)
 
@@ -639,6 +690,8 @@ class AutomatedPipeline:
 
         logger.info(f"🔍 {len(finished_with_predictions)} jogos finalizados para resolver")
 
+        rollup = PerformanceRollupService(db)
+
         for match in finished_with_predictions:
             try:
                 # Determinar resultado real
@@ -652,8 +705,10 @@ class AutomatedPipeline:
                 # Atualizar todas predictions desse jogo
                 for prediction in match.predictions:
                     if prediction.actual_outcome is None:
+                        before = rollup.prediction_contribution(prediction, match.league)
                         prediction.actual_outcome = actual
                         prediction.is_winner = (prediction.predicted_outcome == actual)
+                        rollup.track(before, rollup.prediction_contribution(prediction, match.league))
                         stats['predictions_resolved'] += 1
 
                 stats['matches_cleaned'] += 1
@@ -663,6 +718,8 @@ class AutomatedPipeline:
             except Exception as e:
                 logger.error(f"Erro ao limpar jogo {match.id}: {e}")
 
+        # Rollups no mesmo commit das predictions resolvidas
+        rollup.flush()
         db.commit()
 
         logger.info(f"✅ Limpeza concluída: {stats['matches_cleaned']} jogos, {stats['predictions_resolved']} predictions resolvidas")
@@ -718,7 +775,9 @@ def run_import_upcoming_matches(days: int = 7):
     """Job: Importar jogos futuros"""
     db = get_db_session()
     try:
-        return automated_pipeline.import_upcoming_matches(db, days)
+        result = automated_pipeline.import_upcoming_matches(db, days)
+        invalidate_response_cache(NS_DASHBOARD, NS_PREDICTIONS, NS_VALUE_BETS)
+        return result
     finally:
         db.close()
 
@@ -727,7 +786,9 @@ def run_update_live_matches():
     """Job: Atualizar jogos ao vivo"""
     db = get_db_session()
     try:
-        return automated_pipeline.update_live_matches(db)
+        result = automated_pipeline.update_live_matches(db)
+        invalidate_response_cache(NS_DASHBOARD, NS_PREDICTIONS, NS_VALUE_BETS)
+        return result
     finally:
         db.close()
 
@@ -736,7 +797,9 @@ def run_generate_predictions():
     """Job: Gerar predictions"""
     db = get_db_session()
     try:
-        return automated_pipeline.generate_predictions_for_new_matches(db)
+        result = automated_pipeline.generate_predictions_for_new_matches(db)
+        invalidate_response_cache(NS_DASHBOARD, NS_PREDICTIONS)
+        return result
     finally:
         db.close()
 
@@ -745,7 +808,9 @@ def run_cleanup_finished():
     """Job: Limpar finalizados"""
     db = get_db_session()
     try:
-        return automated_pipeline.cleanup_finished_matches_from_predictions(db)
+        result = automated_pipeline.cleanup_finished_matches_from_predictions(db)
+        invalidate_response_cache(NS_DASHBOARD, NS_PREDICTIONS)
+        return result
     finally:
         db.close()
 
@@ -754,7 +819,9 @@ def run_normalize_leagues():
     """Job: Normalizar ligas"""
     db = get_db_session()
     try:
-        return automated_pipeline.normalize_league_names(db)
+        result = automated_pipeline.normalize_league_names(db)
+        invalidate_response_cache()
+        return result
     finally:
         db.close()
 
@@ -765,7 +832,13 @@ def run_ai_batch_analysis():
 
     Analisa TOP predictions do ML com AI Agent para refinamento contextual
     Executa a cada 12 horas
+
+    Contexto (um por jogo) e few-shot são carregados antes das chamadas ao
+    Ollama, que rodam em paralelo; as atualizações são gravadas em lote.
     """
+    import asyncio
+    from sqlalchemy import update
+    from app.core.http_client import close_async_client
     from app.services.ai_agent_service import AIAgentService
     from app.services.context_analyzer import get_context_analyzer
     from app.services.few_shot_memory import get_few_shot_memory
@@ -775,9 +848,21 @@ def run_ai_batch_analysis():
     db = get_db_session()
     ai_agent = AIAgentService()
 
+    async def ai_available():
+        try:
+            return await ai_agent.server_available()
+        finally:
+            await close_async_client()
+
+    async def analyze_batch(items, contexts, few_shot_examples):
+        try:
+            return await ai_agent.abatch_analyze(items, contexts, few_shot_examples=few_shot_examples)
+        finally:
+            await close_async_client()
+
     try:
-        # Verificar se AI Agent está disponível
-        if not ai_agent.is_available():
+        # Verificar se AI Agent está disponível antes de montar contextos (NewsAPI)
+        if not asyncio.run(ai_available()):
             logger.warning("⚠️ AI Agent não disponível (Ollama offline). Pulando análise AI.")
             return {
                 'analyzed': 0,
@@ -786,20 +871,16 @@ def run_ai_batch_analysis():
                 'ai_available': False
             }
 
-        context_analyzer = get_context_analyzer(db)
-        memory = get_few_shot_memory(db)
-
         # Buscar TOP 100 predictions com maior confidence que ainda não foram analisadas por AI
         # IMPORTANTE: Apenas para jogos FUTUROS (não finalizados)
-        from datetime import datetime, timedelta
-
         # Buscar predictions de QUALQUER fonte (ML ou usuário) que atendem os critérios:
         # 1. Alta confidence (>= 60%)
         # 2. Ainda não analisadas por AI (None ou False)
         # 3. Jogos futuros (não finalizados)
-        from sqlalchemy import or_
-
-        top_predictions = db.query(Prediction).join(Match).filter(
+        top_predictions = db.query(Prediction).join(Match).options(
+            selectinload(Prediction.match).selectinload(Match.home_team),
+            selectinload(Prediction.match).selectinload(Match.away_team)
+        ).filter(
             and_(
                 Prediction.confidence_score >= 0.60,  # Mínimo 60% de confidence
                 Prediction.match_id.isnot(None),
@@ -832,24 +913,44 @@ def run_ai_batch_analysis():
             'ai_available': True
         }
 
+        context_analyzer = get_context_analyzer(db)
+        memory = get_few_shot_memory(db)
+
+        # Few-shot examples: uma vez para o batch
+        few_shot_examples = memory.get_learning_examples(limit=10)
+
+        # Análise de contexto: uma vez por jogo (várias predictions por jogo)
+        contexts_by_match = {}
+        items, contexts, selected = [], [], []
+
         for prediction in top_predictions:
-            try:
-                match = prediction.match
-                if not match:
-                    stats['skipped'] += 1
-                    continue
+            match = prediction.match
+            if not match:
+                stats['skipped'] += 1
+                continue
 
+            if match.id not in contexts_by_match:
+                try:
+                    contexts_by_match[match.id] = context_analyzer.analyze_match_context(match)
+                except Exception as e:
+                    logger.error(f"❌ Erro no contexto do jogo {match.id}: {e}")
+                    contexts_by_match[match.id] = None
+
+            if contexts_by_match[match.id] is None:
+                stats['errors'] += 1
+                continue
+
+            items.append({
                 # Preparar dados do jogo
-                match_data = {
+                'match_data': {
                     'match_id': match.id,
                     'home_team': match.home_team.name if match.home_team else 'Unknown',
                     'away_team': match.away_team.name if match.away_team else 'Unknown',
                     'league': match.league,
                     'match_date': match.match_date.isoformat() if match.match_date else None,
-                }
-
+                },
                 # Preparar prediction ML
-                ml_pred = {
+                'ml_prediction': {
                     'predicted_outcome': prediction.predicted_outcome,
                     'confidence': prediction.confidence_score,
                     'probability_home': prediction.probability_home,
@@ -857,51 +958,47 @@ def run_ai_batch_analysis():
                     'probability_away': prediction.probability_away,
                     'markets': [prediction.market_type] if prediction.market_type else ['1X2']
                 }
-
-                # Análise de contexto
-                context_data = context_analyzer.analyze_match_context(match)
-
-                # Few-shot examples
-                few_shot_examples = memory.get_learning_examples(limit=10)
-
-                # Executar análise AI
-                ai_analysis = ai_agent.analyze_prediction(
-                    match_data=match_data,
-                    ml_prediction=ml_pred,
-                    context_data=context_data,
-                    few_shot_examples=few_shot_examples
-                )
-
-                # Atualizar prediction com análise AI
-                old_confidence = prediction.confidence_score
-                new_confidence = ai_analysis.get('adjusted_confidence', old_confidence)
-
-                prediction.confidence_score = new_confidence
-                prediction.ai_analysis = ai_analysis.get('explanation', '')
-                prediction.ai_recommendation = ai_analysis.get('recommendation', 'MONITOR')
-                prediction.ai_risk_level = ai_analysis.get('risk_level', 'MEDIUM')
-                prediction.ai_analyzed = True
-                prediction.ai_analyzed_at = datetime.now()
-
-                # Estatísticas
-                stats['analyzed'] += 1
-                if new_confidence > old_confidence:
-                    stats['upgraded'] += 1
-                elif new_confidence < old_confidence:
-                    stats['downgraded'] += 1
-
-                # Commit a cada 10 predictions para evitar perder progresso
-                if stats['analyzed'] % 10 == 0:
-                    db.commit()
-                    logger.info(f"✅ {stats['analyzed']} predictions analisadas...")
-
-            except Exception as e:
-                logger.error(f"❌ Erro ao analisar prediction {prediction.id}: {e}")
+            })
+            contexts.append(contexts_by_match[match.id])
+            selected.append(prediction)
+
+        # Executar análises AI em paralelo
+        analyses = asyncio.run(analyze_batch(items, contexts, few_shot_examples)) if items else []
+
+        updates = []
+        for prediction, ai_analysis in zip(selected, analyses):
+            # Timeout/erro do Ollama: prediction continua pendente para o próximo job
+            if ai_analysis.get('ai_available') is False:
+                logger.error(f"❌ Erro ao analisar prediction {prediction.id}: análise AI indisponível")
                 stats['errors'] += 1
                 continue
 
-        # Commit final
+            # Atualizar prediction com análise AI
+            old_confidence = prediction.confidence_score
+            new_confidence = ai_analysis.get('adjusted_confidence', old_confidence)
+
+            updates.append({
+                'id': prediction.id,
+                'confidence_score': new_confidence,
+                'ai_analysis': ai_analysis.get('explanation', ''),
+                'ai_recommendation': ai_analysis.get('recommendation', 'MONITOR'),
+                'ai_risk_level': ai_analysis.get('risk_level', 'MEDIUM'),
+                'ai_analyzed': True,
+                'ai_analyzed_at': datetime.now()
+            })
+
+            # Estatísticas
+            stats['analyzed'] += 1
+            if new_confidence > old_confidence:
+                stats['upgraded'] += 1
+            elif new_confidence < old_confidence:
+                stats['downgraded'] += 1
+
+        # Escrita em lote
+        if updates:
+            db.execute(update(Prediction), updates)
         db.commit()
+        invalidate_response_cache(NS_PREDICTIONS)
 
         logger.info(f"""
         ✅ Análise AI em lote concluída:
@@ -1,4 +1,4 @@
-import itertools
+import heapq
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -194,164 +194,266 @@ class CombinationService:
         """Generate double bet combinations"""
         doubles = []
 
-        for combo in itertools.combinations(selections, 2):
+        for combo in self._search_combinations(selections, 2, min_odds, max_odds, min_confidence=0.6,
+                                               min_probability=0.25, min_ev=0.05, top_k=20):
             sel1, sel2 = combo
 
-            # Skip if same match
-            if sel1.match_id == sel2.match_id:
-                continue
-
-            # Calculate combined odds
+            # Calculate combined values (selections already filtered and ranked)
             combined_odds = sel1.odds * sel2.odds
-
-            # Check if within target range
-            if min_odds <= combined_odds <= max_odds:
-                combined_probability = sel1.probability * sel2.probability
-                combined_confidence = (sel1.confidence + sel2.confidence) / 2
-
-                # Additional filters
-                if combined_confidence >= 0.6 and combined_probability >= 0.25:
-                    expected_value = (combined_probability * combined_odds) - 1
-
-                    if expected_value > 0.05:  # At least 5% positive expected value
-                        doubles.append({
-                            "id": f"double_{sel1.match_id}_{sel2.match_id}",
-                            "type": "double",
-                            "selections": [
-                                {
-                                    "match_id": sel1.match_id,
-                                    "match_name": sel1.match_name,
-                                    "market": sel1.market,
-                                    "selection": sel1.selection,
-                                    "odds": sel1.odds,
-                                    "probability": sel1.probability
-                                },
-                                {
-                                    "match_id": sel2.match_id,
-                                    "match_name": sel2.match_name,
-                                    "market": sel2.market,
-                                    "selection": sel2.selection,
-                                    "odds": sel2.odds,
-                                    "probability": sel2.probability
-                                }
-                            ],
-                            "combined_odds": round(combined_odds, 2),
-                            "combined_probability": round(combined_probability, 4),
-                            "combined_confidence": round(combined_confidence, 3),
-                            "expected_value": round(expected_value, 4),
-                            "kelly_percentage": min(expected_value / (combined_odds - 1), 0.15),
-                            "risk_level": self._calculate_risk_level(combined_confidence, len(combo)),
-                            "correlation_check": self._check_correlation(sel1, sel2)
-                        })
-
-        # Sort by expected value descending
-        doubles.sort(key=lambda x: x["expected_value"], reverse=True)
-        return doubles[:20]  # Return top 20
+            combined_probability = sel1.probability * sel2.probability
+            combined_confidence = (sel1.confidence + sel2.confidence) / 2
+            expected_value = (combined_probability * combined_odds) - 1
+
+            doubles.append({
+                "id": f"double_{sel1.match_id}_{sel2.match_id}",
+                "type": "double",
+                "selections": [
+                    {
+                        "match_id": sel1.match_id,
+                        "match_name": sel1.match_name,
+                        "market": sel1.market,
+                        "selection": sel1.selection,
+                        "odds": sel1.odds,
+                        "probability": sel1.probability
+                    },
+                    {
+                        "match_id": sel2.match_id,
+                        "match_name": sel2.match_name,
+                        "market": sel2.market,
+                        "selection": sel2.selection,
+                        "odds": sel2.odds,
+                        "probability": sel2.probability
+                    }
+                ],
+                "combined_odds": round(combined_odds, 2),
+                "combined_probability": round(combined_probability, 4),
+                "combined_confidence": round(combined_confidence, 3),
+                "expected_value": round(expected_value, 4),
+                "kelly_percentage": min(expected_value / (combined_odds - 1), 0.15),
+                "risk_level": self._calculate_risk_level(combined_confidence, len(combo)),
+                "correlation_check": self._check_correlation(sel1, sel2)
+            })
+
+        return doubles  # Top 20 by expected value
 
     async def _generate_trebles(self, selections: List[BetSelection], min_odds: float, max_odds: float) -> List[Dict]:
         """Generate treble bet combinations"""
         trebles = []
 
-        for combo in itertools.combinations(selections, 3):
+        # Conservative filters for trebles
+        for combo in self._search_combinations(selections, 3, min_odds, max_odds, min_confidence=0.65,
+                                               min_probability=0.15, min_ev=0.03, top_k=15):
             sel1, sel2, sel3 = combo
 
-            # Skip if any matches are the same
-            match_ids = {sel1.match_id, sel2.match_id, sel3.match_id}
-            if len(match_ids) != 3:
-                continue
-
-            # Calculate combined odds
             combined_odds = sel1.odds * sel2.odds * sel3.odds
-
-            # Check if within target range
-            if min_odds <= combined_odds <= max_odds:
-                combined_probability = sel1.probability * sel2.probability * sel3.probability
-                combined_confidence = (sel1.confidence + sel2.confidence + sel3.confidence) / 3
-
-                # More conservative filters for trebles
-                if combined_confidence >= 0.65 and combined_probability >= 0.15:
-                    expected_value = (combined_probability * combined_odds) - 1
-
-                    if expected_value > 0.03:  # At least 3% positive expected value
-                        trebles.append({
-                            "id": f"treble_{sel1.match_id}_{sel2.match_id}_{sel3.match_id}",
-                            "type": "treble",
-                            "selections": [
-                                {
-                                    "match_id": sel.match_id,
-                                    "match_name": sel.match_name,
-                                    "market": sel.market,
-                                    "selection": sel.selection,
-                                    "odds": sel.odds,
-                                    "probability": sel.probability
-                                } for sel in combo
-                            ],
-                            "combined_odds": round(combined_odds, 2),
-                            "combined_probability": round(combined_probability, 4),
-                            "combined_confidence": round(combined_confidence, 3),
-                            "expected_value": round(expected_value, 4),
-                            "kelly_percentage": min(expected_value / (combined_odds - 1), 0.10),
-                            "risk_level": self._calculate_risk_level(combined_confidence, len(combo)),
-                            "diversification_score": self._calculate_diversification(combo)
-                        })
-
-        # Sort by expected value descending
-        trebles.sort(key=lambda x: x["expected_value"], reverse=True)
-        return trebles[:15]  # Return top 15
+            combined_probability = sel1.probability * sel2.probability * sel3.probability
+            combined_confidence = (sel1.confidence + sel2.confidence + sel3.confidence) / 3
+            expected_value = (combined_probability * combined_odds) - 1
+
+            trebles.append({
+                "id": f"treble_{sel1.match_id}_{sel2.match_id}_{sel3.match_id}",
+                "type": "treble",
+                "selections": [
+                    {
+                        "match_id": sel.match_id,
+                        "match_name": sel.match_name,
+                        "market": sel.market,
+                        "selection": sel.selection,
+                        "odds": sel.odds,
+                        "probability": sel.probability
+                    } for sel in combo
+                ],
+                "combined_odds": round(combined_odds, 2),
+                "combined_probability": round(combined_probability, 4),
+                "combined_confidence": round(combined_confidence, 3),
+                "expected_value": round(expected_value, 4),
+                "kelly_percentage": min(expected_value / (combined_odds - 1), 0.10),
+                "risk_level": self._calculate_risk_level(combined_confidence, len(combo)),
+                "diversification_score": self._calculate_diversification(combo)
+            })
+
+        return trebles  # Top 15 by expected value
 
     async def _generate_multiples(self, selections: List[BetSelection], min_odds: float, max_odds: float, size: int) -> List[Dict]:
         """Generate multiple bet combinations (4+ selections)"""
         multiples = []
 
-        for combo in itertools.combinations(selections, size):
-            # Skip if any matches are the same
-            match_ids = {sel.match_id for sel in combo}
-            if len(match_ids) != size:
-                continue
-
-            # Calculate combined odds
+        # Very conservative filters for multiples
+        for combo in self._search_combinations(selections, size, min_odds, max_odds, min_confidence=0.70,
+                                               min_probability=0.08, min_ev=0.02, top_k=10):
             combined_odds = 1.0
+            combined_probability = 1.0
             for sel in combo:
                 combined_odds *= sel.odds
+                combined_probability *= sel.probability
 
-            # Check if within target range
-            if min_odds <= combined_odds <= max_odds:
-                combined_probability = 1.0
-                for sel in combo:
-                    combined_probability *= sel.probability
-
-                combined_confidence = sum(sel.confidence for sel in combo) / len(combo)
-
-                # Very conservative filters for multiples
-                if combined_confidence >= 0.70 and combined_probability >= 0.08:
-                    expected_value = (combined_probability * combined_odds) - 1
-
-                    if expected_value > 0.02:  # At least 2% positive expected value
-                        multiples.append({
-                            "id": f"multiple_{size}_{'_'.join(str(sel.match_id) for sel in combo)}",
-                            "type": f"{size}-fold",
-                            "selections": [
-                                {
-                                    "match_id": sel.match_id,
-                                    "match_name": sel.match_name,
-                                    "market": sel.market,
-                                    "selection": sel.selection,
-                                    "odds": sel.odds,
-                                    "probability": sel.probability
-                                } for sel in combo
-                            ],
-                            "combined_odds": round(combined_odds, 2),
-                            "combined_probability": round(combined_probability, 4),
-                            "combined_confidence": round(combined_confidence, 3),
-                            "expected_value": round(expected_value, 4),
-                            "kelly_percentage": min(expected_value / (combined_odds - 1), 0.05),
-                            "risk_level": self._calculate_risk_level(combined_confidence, len(combo)),
-                            "diversification_score": self._calculate_diversification(combo)
-                        })
+            combined_confidence = sum(sel.confidence for sel in combo) / len(combo)
+            expected_value = (combined_probability * combined_odds) - 1
 
-        # Sort by expected value descending
-        multiples.sort(key=lambda x: x["expected_value"], reverse=True)
-        return multiples[:10]  # Return top 10
+            multiples.append({
+                "id": f"multiple_{size}_{'_'.join(str(sel.match_id) for sel in combo)}",
+                "type": f"{size}-fold",
+                "selections": [
+                    {
+                        "match_id": sel.match_id,
+                        "match_name": sel.match_name,
+                        "market": sel.market,
+                        "selection": sel.selection,
+                        "odds": sel.odds,
+                        "probability": sel.probability
+                    } for sel in combo
+                ],
+                "combined_odds": round(combined_odds, 2),
+                "combined_probability": round(combined_probability, 4),
+                "combined_confidence": round(combined_confidence, 3),
+                "expected_value": round(expected_value, 4),
+                "kelly_percentage": min(expected_value / (combined_odds - 1), 0.05),
+                "risk_level": self._calculate_risk_level(combined_confidence, len(combo)),
+                "diversification_score": self._calculate_diversification(combo)
+            })
+
+        return multiples  # Top 10 by expected value
+
+    def _search_combinations(self, selections: List[BetSelection], size: int, min_odds: float, max_odds: float,
+                             min_confidence: float, min_probability: float, min_ev: float,
+                             top_k: int) -> List[Tuple[BetSelection, ...]]:
+        """
+        Top-k combinations of `size` selections from distinct matches, best expected value first
+
+        Same result as filtering every itertools.combinations tuple and keeping the first
+        top_k after a stable sort by round(EV, 4), without enumerating them: selections are
+        sorted by log-odds and a depth-first search drops every branch whose odds product can
+        no longer land in [min_odds, max_odds], or whose confidence / probability / EV bound
+        cannot pass the filters or beat the worst entry of the top-k heap. The last selection
+        of each branch is resolved for all candidates at once with NumPy, with distinct
+        matches enforced through match bitsets. Exact values are recomputed in the original
+        selection order, so odds boundaries and EV ties come out as in the exhaustive loop.
+        """
+        all_odds = np.array([sel.odds for sel in selections], dtype=float)
+        all_prob = np.array([sel.probability for sel in selections], dtype=float)
+        all_conf = np.array([sel.confidence for sel in selections], dtype=float)
+
+        # Decimal odds <= 0 never give a positive EV (and have no log)
+        original = np.flatnonzero(all_odds > 0)
+        n = len(original)
+        if size < 1 or top_k <= 0 or size > n or max_odds <= 0 or min_odds > max_odds:
+            return []
+
+        odds = all_odds[original]
+        probability = all_prob[original]
+        confidence = all_conf[original]
+
+        order = np.argsort(np.log(odds), kind="stable")
+        log_odds = np.log(odds)[order]
+        sorted_prob = probability[order]
+        sorted_conf = confidence[order]
+        sorted_value = sorted_prob * odds[order]
+        cumulative = np.concatenate([[0.0], np.cumsum(log_odds)])
+
+        # Maximum over positions >= j (padded so position n is the empty suffix)
+        def suffix_max(values: np.ndarray, empty: float) -> np.ndarray:
+            return np.concatenate([np.maximum.accumulate(values[::-1])[::-1], [empty]])
+
+        max_value = suffix_max(sorted_value, 0.0)
+        max_prob = suffix_max(sorted_prob, 0.0)
+        max_conf = suffix_max(sorted_conf, -np.inf)
+
+        # One bit per match: Python ints for the prefix, uint64 words for the vectorized level
+        match_codes = {}
+        codes = [match_codes.setdefault(selections[original[p]].match_id, len(match_codes)) for p in order]
+        bits = [1 << code for code in codes]
+        words = np.zeros((n, len(match_codes) // 64 + 1), dtype=np.uint64)
+        for position, code in enumerate(codes):
+            words[position, code // 64] |= np.uint64(1) << np.uint64(code % 64)
+
+        log_min = math.log(min_odds) if min_odds > 0 else -np.inf
+        log_max = math.log(max_odds)
+        slack = 1 + 1e-9  # bounds are products taken in another order than the exact values
+        heap: List[Tuple[float, Tuple[int, ...], Tuple[int, ...]]] = []
+
+        def ev_floor() -> float:
+            # Rounded EV ties are decided by position, so keep anything within one rounding step
+            if len(heap) < top_k:
+                return min_ev
+            return max(min_ev, heap[0][0] - 1e-4)
+
+        def resolve_last(start: int, log_sum: float, value: float, prob: float, conf: float,
+                         prefix: Tuple[int, ...]):
+            lo = max(start, int(np.searchsorted(log_odds, log_min - log_sum - 1e-9, side="left")))
+            hi = int(np.searchsorted(log_odds, log_max - log_sum + 1e-9, side="right"))
+            if lo >= hi:
+                return
+            positions = np.arange(lo, hi)
+            keep = (
+                (sorted_value[positions] * value * slack - 1 >= ev_floor())
+                & (sorted_prob[positions] * prob * slack >= min_probability)
+                & ((sorted_conf[positions] + conf) / size >= min_confidence - 1e-9)
+            )
+            if prefix:
+                used = np.bitwise_or.reduce(words[list(prefix)], axis=0)
+                keep &= ~(words[positions] & used).any(axis=1)
+            positions = positions[keep]
+            if not len(positions):
+                return
+
+            # Exact values, multiplied / summed left to right in the original selection order
+            combos = np.empty((len(positions), size), dtype=np.int64)
+            combos[:, :-1] = original[order[list(prefix)]]
+            combos[:, -1] = original[order[positions]]
+            combos.sort(axis=1)
+            combined_odds = all_odds[combos[:, 0]]
+            combined_probability = all_prob[combos[:, 0]]
+            combined_confidence = all_conf[combos[:, 0]]
+            for column in range(1, size):
+                combined_odds = combined_odds * all_odds[combos[:, column]]
+                combined_probability = combined_probability * all_prob[combos[:, column]]
+                combined_confidence = combined_confidence + all_conf[combos[:, column]]
+            combined_confidence = combined_confidence / size
+            expected_value = combined_probability * combined_odds - 1
+
+            passed = (
+                (min_odds <= combined_odds) & (combined_odds <= max_odds)
+                & (combined_confidence >= min_confidence) & (combined_probability >= min_probability)
+                & (expected_value > min_ev) & (expected_value >= ev_floor())
+            )
+            for row, ev in zip(combos[passed].tolist(), expected_value[passed].tolist()):
+                entry = (round(ev, 4), tuple(-i for i in row), tuple(row))
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+
+        def extend(start: int, depth: int, log_sum: float, value: float, prob: float, conf: float,
+                   mask: int, prefix: Tuple[int, ...]):
+            remaining = size - depth
+            if remaining == 1:
+                resolve_last(start, log_sum, value, prob, conf, prefix)
+                return
+            rest = remaining - 1
+            for j in range(start, n - rest):
+                # Cheapest completion from here only grows with j: nothing further can fit
+                if log_sum + cumulative[j + remaining] - cumulative[j] > log_max + 1e-9:
+                    break
+                if log_sum + log_odds[j] + cumulative[n] - cumulative[n - rest] < log_min - 1e-9:
+                    continue
+                if bits[j] & mask:
+                    continue
+                next_value = value * sorted_value[j]
+                next_prob = prob * sorted_prob[j]
+                next_conf = conf + sorted_conf[j]
+                if next_value * max_value[j + 1] ** rest * slack - 1 < ev_floor():
+                    continue
+                if next_prob * max_prob[j + 1] ** rest * slack < min_probability:
+                    continue
+                if (next_conf + rest * max_conf[j + 1]) / size < min_confidence - 1e-9:
+                    continue
+                extend(j + 1, depth + 1, log_sum + log_odds[j], next_value, next_prob, next_conf,
+                       mask | bits[j], prefix + (j,))
+
+        extend(0, 0, 0.0, 1.0, 1.0, 0.0, 0, ())
+
+        ranked = sorted(heap, key=lambda entry: (-entry[0], entry[2]))
+        return [tuple(selections[i] for i in entry[2]) for entry in ranked]
 
     def _generate_single_bets(self, selections: List[BetSelection], min_odds: float, max_odds: float) -> List[Dict]:
         """Generate high-value single bet recommendations"""
@@ -16,11 +16,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 # Configurações da API
-API_KEY = settings.API_SPORTS_KEY
-if not API_KEY:
-    raise ValueError("API_SPORTS_KEY não configurada. Configure no arquivo .env")
 BASE_URL = "https://v3.football.api-sports.io"
-HEADERS = {"x-apisports-key": API_KEY}
 
 # 🎯 LIGAS PRINCIPAIS (IDs da API-Sports)
 MAIN_LEAGUES = {
@@ -151,7 +147,7 @@ class DailyMatchesImporter:
         try:
             response = requests.get(
                 f"{BASE_URL}/fixtures",
-                headers=HEADERS,
+                headers=settings.api_sports_headers(),
                 params={
                     "league": league_id,
                     "season": 2025,
@@ -7,6 +7,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db_session
 from app.core.redis import redis_client
+from app.core.response_cache import response_cache, NS_DASHBOARD, NS_PREDICTIONS, NS_VALUE_BETS
 from app.models.team import Team
 from app.models.match import Match
 from app.models.odds import Odds
@@ -70,6 +71,9 @@ class DataSynchronizer:
             # Update last sync time
             await redis_client.setex("last_full_sync", 3600, datetime.now().isoformat())
 
+            # Cached API responses are now stale
+            await response_cache.ainvalidate()
+
             logger.info(f"✅ Full sync completed: {results}")
 
         except Exception as e:
@@ -101,6 +105,9 @@ class DataSynchronizer:
             # Update last quick sync time
             await redis_client.setex("last_quick_sync", 300, datetime.now().isoformat())
 
+            # Cached API responses are now stale
+            await response_cache.ainvalidate(NS_DASHBOARD, NS_PREDICTIONS, NS_VALUE_BETS)
+
             logger.info(f"⚡ Quick sync completed: {results}")
 
         except Exception as e:
@@ -645,5 +652,20 @@ class DataSynchronizer:
 
         return health_status
 
-# Global instance
-data_synchronizer = DataSynchronizer()
\ No newline at end of file
+# Global instance (created on first use, not at import)
+_data_synchronizer = None
+
+
+def get_data_synchronizer() -> DataSynchronizer:
+    """Return the shared DataSynchronizer"""
+    global _data_synchronizer
+    if _data_synchronizer is None:
+        _data_synchronizer = DataSynchronizer()
+    return _data_synchronizer
+
+
+def __getattr__(name):
+    # `from app.services.data_synchronizer import data_synchronizer` keeps working
+    if name == 'data_synchronizer':
+        return get_data_synchronizer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -14,10 +14,11 @@ import logging
 import json
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, and_
 
 from app.models import Prediction, BetCombination, Match
+from app.services.performance_rollup_service import PerformanceRollupService
 
 logger = logging.getLogger(__name__)
 
@@ -48,8 +49,11 @@ class FewShotMemory:
         """
         examples = []
 
-        # Buscar predictions resolvidas (com resultado real)
-        resolved_predictions = self.db.query(Prediction).filter(
+        # Buscar predictions resolvidas (com resultado real), já com match e times
+        resolved_predictions = self.db.query(Prediction).options(
+            joinedload(Prediction.match).joinedload(Match.home_team),
+            joinedload(Prediction.match).joinedload(Match.away_team)
+        ).filter(
             and_(
                 Prediction.actual_outcome.isnot(None),
                 Prediction.is_winner.isnot(None)
@@ -141,9 +145,14 @@ class FewShotMemory:
                 logger.error(f"Prediction {prediction_id} não encontrada")
                 return False
 
+            league = prediction.match.league if prediction.match else None
+            rollup = PerformanceRollupService(self.db)
+            before = rollup.prediction_contribution(prediction, league)
+
             # Atualizar resultado
             prediction.actual_outcome = actual_outcome
             prediction.is_winner = (prediction.predicted_outcome == actual_outcome)
+            rollup.track(before, rollup.prediction_contribution(prediction, league))
 
             # Adicionar notas do usuário
             if user_notes:
@@ -152,6 +161,7 @@ class FewShotMemory:
                 else:
                     prediction.analysis_summary = f"Feedback usuário: {user_notes}"
 
+            rollup.flush()
             self.db.commit()
 
             label = 'GREEN ✅' if prediction.is_winner else 'RED ❌'
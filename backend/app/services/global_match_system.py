@@ -23,7 +23,6 @@ from app.services.prediction_service import PredictionService
 import httpx
 
 # Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -536,12 +535,28 @@ class GlobalMatchSystem:
             'last_updated': datetime.now().isoformat()
         }
 
-# Instância global do sistema
-global_match_system = GlobalMatchSystem()
+# Instância global do sistema (criada no primeiro uso)
+_global_match_system = None
+
+
+def get_global_match_system() -> GlobalMatchSystem:
+    """Retorna a instância global do sistema"""
+    global _global_match_system
+    if _global_match_system is None:
+        _global_match_system = GlobalMatchSystem()
+    return _global_match_system
+
+
+def __getattr__(name):
+    if name == 'global_match_system':
+        return get_global_match_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 async def run_daily_analysis():
     """Executa análise diária completa"""
     logger.info("🌍 Iniciando análise diária global")
+    global_match_system = get_global_match_system()
 
     # 1. Descobrir jogos
     matches = await global_match_system.discover_matches_globally()
@@ -558,9 +573,10 @@ async def run_daily_analysis():
 async def start_global_monitoring():
     """Inicia monitoramento global contínuo"""
     logger.info("🔴 Iniciando monitoramento global contínuo")
-    await global_match_system.monitor_live_matches_globally()
+    await get_global_match_system().monitor_live_matches_globally()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # Para teste
     import asyncio
     asyncio.run(run_daily_analysis())
\ No newline at end of file
@@ -2,7 +2,7 @@
 ⏰ AGENDADOR GLOBAL - SISTEMA AUTOMATIZADO
 Executa tarefas automáticas para monitoramento e análise mundial
 
-Tarefas Agendadas:
+Tarefas Agendadas (jobs do job_runner, grupo 'global' em app/services/job_registry.py):
 1. Descoberta de jogos - 6:00 UTC (diariamente)
 2. Geração de previsões - 8:00 UTC (diariamente)
 3. Monitoramento ao vivo - Contínuo
@@ -15,14 +15,22 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List
-import schedule
-import time
+from app.core.job_runner import job_runner
 from app.services.global_match_system import global_match_system, run_daily_analysis
 from app.ml.automated_retraining import automated_retraining_system, run_daily_retraining
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Jobs desta classe no job_runner
+GLOBAL_JOB_IDS = (
+    'global_daily_discovery',
+    'global_daily_predictions',
+    'global_performance_analysis',
+    'global_weekly_retraining',
+    'global_data_cleanup',
+    'global_health_check',
+)
+
 class GlobalScheduler:
     """Agendador global para tarefas automatizadas"""
 
@@ -31,36 +39,6 @@ class GlobalScheduler:
         self.active_tasks = {}
         self.execution_history = []
 
-    def setup_schedules(self):
-        """Configura todos os agendamentos"""
-        logger.info("⏰ Configurando agendamentos globais")
-
-        # 1. Descoberta de jogos - Diariamente às 6:00 UTC
-        schedule.every().day.at("06:00").do(self.run_daily_discovery).tag('discovery')
-
-        # 2. Geração de previsões - Diariamente às 8:00 UTC
-        schedule.every().day.at("08:00").do(self.run_daily_predictions).tag('predictions')
-
-        # 3. Análise de performance - Diariamente às 23:00 UTC
-        schedule.every().day.at("23:00").do(self.run_daily_performance_analysis).tag('analysis')
-
-        # 4. Retreino de ML - Domingos às 4:00 UTC
-        schedule.every().sunday.at("04:00").do(self.run_weekly_retraining).tag('retraining')
-
-        # 5. Limpeza de dados antigos - Sábados às 2:00 UTC
-        schedule.every().saturday.at("02:00").do(self.run_data_cleanup).tag('cleanup')
-
-        # 6. Verificação de saúde do sistema - A cada 4 horas
-        schedule.every(4).hours.do(self.run_health_check).tag('health')
-
-        logger.info("✅ Agendamentos configurados:")
-        logger.info("   📊 06:00 UTC - Descoberta de jogos")
-        logger.info("   🧠 08:00 UTC - Geração de previsões")
-        logger.info("   📈 23:00 UTC - Análise de performance")
-        logger.info("   🔄 Dom 04:00 UTC - Retreino de ML")
-        logger.info("   🧹 Sáb 02:00 UTC - Limpeza de dados")
-        logger.info("   ❤️ A cada 4h - Verificação de saúde")
-
     async def run_daily_discovery(self):
         """Executa descoberta diária de jogos"""
         task_name = "daily_discovery"
@@ -90,6 +68,8 @@ class GlobalScheduler:
 
             logger.info(f"✅ {task_name}: {len(matches)} jogos descobertos")
 
+            return result
+
         except Exception as e:
             logger.error(f"❌ Erro em {task_name}: {e}")
             self.active_tasks[task_name]['status'] = 'error'
@@ -124,6 +104,8 @@ class GlobalScheduler:
 
             logger.info(f"✅ {task_name}: {len(predictions)} previsões geradas")
 
+            return result
+
         except Exception as e:
             logger.error(f"❌ Erro em {task_name}: {e}")
             self.active_tasks[task_name]['status'] = 'error'
@@ -160,6 +142,8 @@ class GlobalScheduler:
 
             logger.info(f"✅ {task_name}: {accuracy_analysis.get('total_matches', 0)} jogos analisados")
 
+            return result
+
         except Exception as e:
             logger.error(f"❌ Erro em {task_name}: {e}")
             self.active_tasks[task_name]['status'] = 'error'
@@ -196,6 +180,8 @@ class GlobalScheduler:
 
             logger.info(f"✅ {task_name}: {retrain_result.get('status', 'unknown')}")
 
+            return result
+
         except Exception as e:
             logger.error(f"❌ Erro em {task_name}: {e}")
             self.active_tasks[task_name]['status'] = 'error'
@@ -230,6 +216,8 @@ class GlobalScheduler:
 
             logger.info(f"✅ {task_name}: {cleanup_stats['files_removed']} arquivos removidos")
 
+            return result
+
         except Exception as e:
             logger.error(f"❌ Erro em {task_name}: {e}")
             self.active_tasks[task_name]['status'] = 'error'
@@ -274,6 +262,8 @@ class GlobalScheduler:
             else:
                 logger.debug(f"✅ Sistema saudável - Score: {health_score:.2f}")
 
+            return result
+
         except Exception as e:
             logger.error(f"❌ Erro em {task_name}: {e}")
             self.active_tasks[task_name]['status'] = 'error'
@@ -342,25 +332,17 @@ class GlobalScheduler:
         return max(0.0, score)
 
     async def start_scheduler(self):
-        """Inicia o agendador"""
+        """
+        Inicia o monitoramento ao vivo contínuo
+
+        As tarefas periódicas rodam no job_runner (grupo 'global')
+        """
         self.running = True
         logger.info("🚀 Iniciando agendador global")
-
-        # Configurar agendamentos
-        self.setup_schedules()
+        await job_runner.resume_jobs(GLOBAL_JOB_IDS)
 
         # Executar monitoramento ao vivo em background
-        asyncio.create_task(self._start_live_monitoring())
-
-        # Loop principal do agendador
-        while self.running:
-            try:
-                schedule.run_pending()
-                await asyncio.sleep(60)  # Verificar a cada minuto
-
-            except Exception as e:
-                logger.error(f"❌ Erro no agendador: {e}")
-                await asyncio.sleep(300)  # Aguardar 5 minutos em caso de erro
+        await self._start_live_monitoring()
 
     async def _start_live_monitoring(self):
         """Inicia monitoramento ao vivo em background"""
@@ -374,23 +356,20 @@ class GlobalScheduler:
             await asyncio.sleep(600)
             await self._start_live_monitoring()
 
-    def stop_scheduler(self):
+    async def stop_scheduler(self):
         """Para o agendador"""
         logger.info("⏹️ Parando agendador global")
         self.running = False
-        schedule.clear()
+        await job_runner.pause_jobs(GLOBAL_JOB_IDS)
 
     def get_scheduler_status(self) -> Dict:
         """Retorna status do agendador"""
         return {
             'running': self.running,
             'next_jobs': [
-                {
-                    'job': str(job.job_func.__name__),
-                    'next_run': job.next_run.isoformat() if job.next_run else None,
-                    'tags': list(job.tags)
-                }
-                for job in schedule.jobs
+                {'job': job['id'], 'next_run': job['next_run'], 'tags': [job['group']]}
+                for job in job_runner.get_status()['jobs']
+                if job['id'] in GLOBAL_JOB_IDS
             ],
             'active_tasks': self.active_tasks,
             'execution_history': self.execution_history[-10:],  # Últimas 10 execuções
@@ -404,11 +383,12 @@ async def start_global_scheduler():
     """Inicia agendador global"""
     await global_scheduler.start_scheduler()
 
-def stop_global_scheduler():
+async def stop_global_scheduler():
     """Para agendador global"""
-    global_scheduler.stop_scheduler()
+    await global_scheduler.stop_scheduler()
 
 if __name__ == "__main__":
-    # Para teste
-    import asyncio
-    asyncio.run(start_global_scheduler())
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO)
+    # Processo dedicado: só os jobs do grupo 'global'
+    from app.services.job_registry import run_standalone_runner
+    asyncio.run(run_standalone_runner(['global'], name='global'))
\ No newline at end of file
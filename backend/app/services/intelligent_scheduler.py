@@ -1,17 +1,17 @@
 """
 ⏰ INTELLIGENT SCHEDULER - Scheduler inteligente com rate limiting rigoroso
 Executa tarefas de coleta respeitando limites das APIs para não deixar dados "pela metade"
+
+Agendamento: jobs do job_runner, grupo 'collectors' (app/services/job_registry.py)
 """
 
 import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import schedule
-import time
-import threading
 from dataclasses import dataclass
 
+from app.core.job_runner import job_runner
 from app.services.gradual_population_service import gradual_population_service
 from app.services.api_sports_collector import api_sports_collector
 from app.core.database import get_db_session
@@ -19,6 +19,16 @@ from app.models.match import Match
 
 logger = logging.getLogger(__name__)
 
+# Jobs desta classe no job_runner
+COLLECTOR_JOB_IDS = (
+    'collect_live_matches',
+    'populate_gradually',
+    'collect_brazilian_leagues',
+    'collect_spanish_leagues',
+    'reset_api_rate_limits',
+    'collectors_daily_report',
+)
+
 @dataclass
 class ApiRateLimit:
     """Controle rigoroso de rate limits por API"""
@@ -37,7 +47,6 @@ class IntelligentScheduler:
 
     def __init__(self):
         self.is_running = False
-        self.scheduler_thread = None
 
         # Rate limits rigorosos para cada API
         self.api_limits = {
@@ -70,88 +79,30 @@ class IntelligentScheduler:
             'api_calls_made': {}
         }
 
-    def start_scheduler(self):
+    async def start_scheduler(self):
         """
-        🚀 Iniciar scheduler em thread separada
+        🚀 Retomar os jobs de coleta no job_runner
         """
         if self.is_running:
             logger.warning("⚠️ Scheduler já está rodando")
             return
 
-        logger.info("🚀 INICIANDO SCHEDULER INTELIGENTE...")
-
-        # Agendar tarefas com intervalos seguros
-        self._schedule_tasks()
-
+        await job_runner.resume_jobs(COLLECTOR_JOB_IDS)
         self.is_running = True
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.scheduler_thread.start()
-
         logger.info("✅ Scheduler iniciado com sucesso")
 
-    def stop_scheduler(self):
+    async def stop_scheduler(self):
         """
-        🛑 Parar scheduler
+        🛑 Pausar os jobs de coleta
         """
         if not self.is_running:
             logger.warning("⚠️ Scheduler não está rodando")
             return
 
+        await job_runner.pause_jobs(COLLECTOR_JOB_IDS)
         self.is_running = False
-        schedule.clear()
         logger.info("🛑 Scheduler parado")
 
-    def _schedule_tasks(self):
-        """
-        📅 Agendar tarefas com horários inteligentes
-        """
-        # 1. Coleta de jogos ao vivo: A cada 15 minutos (alta prioridade)
-        schedule.every(15).minutes.do(self._collect_live_matches_safely)
-
-        # 2. População gradual: A cada 2 horas (respeitando rate limits)
-        schedule.every(2).hours.do(self._populate_gradually_safely)
-
-        # 3. Coleta de ligas brasileiras: 3x por dia (8h, 14h, 20h)
-        schedule.every().day.at("08:00").do(self._collect_brazilian_leagues_safely)
-        schedule.every().day.at("14:00").do(self._collect_brazilian_leagues_safely)
-        schedule.every().day.at("20:00").do(self._collect_brazilian_leagues_safely)
-
-        # 4. Coleta de La Liga: 2x por dia (12h, 18h)
-        schedule.every().day.at("12:00").do(self._collect_spanish_leagues_safely)
-        schedule.every().day.at("18:00").do(self._collect_spanish_leagues_safely)
-
-        # 5. Limpeza de rate limits: A cada hora (exato)
-        schedule.every().hour.at(":00").do(self._reset_rate_limits)
-
-        # 6. Relatório diário: 23:30
-        schedule.every().day.at("23:30").do(self._generate_daily_report)
-
-        logger.info("📅 Tarefas agendadas:")
-        logger.info("  ⚡ Jogos ao vivo: a cada 15 minutos")
-        logger.info("  🔄 População gradual: a cada 2 horas")
-        logger.info("  🇧🇷 Brasileirão: 8h, 14h, 20h")
-        logger.info("  🇪🇸 La Liga: 12h, 18h")
-        logger.info("  🧹 Reset rate limits: a cada hora")
-        logger.info("  📊 Relatório: 23:30")
-
-    def _run_scheduler(self):
-        """
-        🔄 Loop principal do scheduler
-        """
-        while self.is_running:
-            try:
-                schedule.run_pending()
-                time.sleep(30)  # Check a cada 30 segundos
-            except Exception as e:
-                logger.error(f"❌ Erro no scheduler: {e}")
-                time.sleep(60)  # Wait mais tempo em caso de erro
-
-    def _collect_live_matches_safely(self):
-        """
-        ⚡ Coletar jogos ao vivo com segurança
-        """
-        asyncio.run(self._async_collect_live_matches_safely())
-
     async def _async_collect_live_matches_safely(self):
         """
         ⚡ Implementação async da coleta de jogos ao vivo
@@ -186,12 +137,6 @@ class IntelligentScheduler:
         except Exception as e:
             logger.error(f"❌ Erro na coleta de jogos ao vivo: {e}")
 
-    def _populate_gradually_safely(self):
-        """
-        🔄 População gradual com controle rigoroso
-        """
-        asyncio.run(self._async_populate_gradually_safely())
-
     async def _async_populate_gradually_safely(self):
         """
         🔄 População gradual com controle rigoroso
@@ -415,7 +360,11 @@ class IntelligentScheduler:
                 }
                 for name, limit in self.api_limits.items()
             },
-            'next_scheduled_jobs': [str(job) for job in schedule.jobs]
+            'next_scheduled_jobs': [
+                f"{job['id']} -> {job['next_run']}"
+                for job in job_runner.get_status()['jobs']
+                if job['id'] in COLLECTOR_JOB_IDS
+            ]
         }
 
 # Instância global
@@ -0,0 +1,179 @@
+"""
+📋 JOB REGISTRY
+Todos os jobs agendados do sistema, executados pelo job_runner (líder eleito)
+
+Grupos (ativos conforme settings.JOB_RUNNER_GROUPS):
+- pipeline: pipeline automático (app/core/scheduler.py)
+- sync: sincronização de dados (FootballDataScheduler)
+- tickets: análise de tickets dos usuários (TicketAnalysisScheduler)
+- retraining: retreino agendado do AutomatedMLRetraining
+- maintenance: limpeza do histórico job_runs
+- global: descoberta/previsões globais (GlobalScheduler)
+- collectors: coleta com rate limit por API (IntelligentScheduler)
+- green_red: análise GREEN/RED 1X2 (green_red_scheduler.py, fora do pacote app)
+
+Os callables são referenciados por caminho: nada é importado até o job rodar.
+"""
+import logging
+from typing import Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.database import get_db_session
+from app.core.job_runner import JobRunner, JobSpec, job_runner, prune_job_runs
+
+logger = logging.getLogger(__name__)
+
+PIPELINE = 'app.services.automated_pipeline'
+CORE_JOBS = 'app.core.scheduler'
+SYNC = 'app.services.scheduler:football_scheduler'
+GLOBAL = 'app.services.global_scheduler:global_scheduler'
+COLLECTORS = 'app.services.intelligent_scheduler:intelligent_scheduler'
+
+
+def run_prune_job_runs():
+    """Job: apagar histórico de execuções mais velho que JOB_RUNS_RETENTION_DAYS"""
+    db = get_db_session()
+    try:
+        return {'deleted': prune_job_runs(db)}
+    finally:
+        db.close()
+
+
+JOBS: List[JobSpec] = [
+    # ========== PIPELINE ==========
+    JobSpec('import_upcoming', f'{PIPELINE}:run_import_upcoming_matches', 'cron',
+            {'hour': '0,6,12,18', 'minute': 0}, name='Importar Jogos Próximos 7 Dias (00h, 06h, 12h, 18h)',
+            group='pipeline', items_key=('total_imported', 'total_updated')),
+    JobSpec('update_live', f'{PIPELINE}:run_update_live_matches', 'interval', {'minutes': 2},
+            name='Atualizar Jogos AO VIVO (a cada 2 min)', group='pipeline', lock_ttl=600,
+            items_key='updated'),
+    JobSpec('generate_predictions', f'{PIPELINE}:run_generate_predictions', 'interval', {'hours': 6},
+            name='Gerar Predictions ML (a cada 6h)', group='pipeline', items_key='predictions_created'),
+    JobSpec('ai_batch_analysis', f'{PIPELINE}:run_ai_batch_analysis', 'interval', {'hours': 2},
+            name='🧠 Análise AI em Lote (a cada 2h)', group='pipeline', items_key='analyzed'),
+    JobSpec('ml_retraining', f'{PIPELINE}:run_ml_retraining_sync', 'cron', {'hour': 2, 'minute': 0},
+            name='🤖 ML Retraining (diário 02:00)', group='pipeline', lock_ttl=4 * 3600,
+            items_key='total_samples'),
+    JobSpec('cleanup_finished', f'{PIPELINE}:run_cleanup_finished', 'interval', {'hours': 1},
+            name='Limpar Jogos Finalizados (a cada 1h)', group='pipeline', items_key='predictions_resolved'),
+    JobSpec('normalize_leagues', f'{PIPELINE}:run_normalize_leagues', 'cron', {'hour': 3, 'minute': 0},
+            name='Normalizar Nomes de Ligas (diário 03:00)', group='pipeline', items_key='leagues_normalized'),
+    JobSpec('cleanup_predictions', 'app.services.predictions_cleanup:run_cleanup_job_for_scheduler', 'cron',
+            {'hour': 4, 'minute': 0}, name='🧹 Limpeza de Predictions (diário 04:00)', group='pipeline'),
+    JobSpec('value_bet_scan', f'{CORE_JOBS}:value_bet_scan_job', 'interval', {'minutes': 10},
+            name='💎 Scan de Value Bets (a cada 10 min)', group='pipeline', lock_ttl=600,
+            run_at_start=True, items_key='matches_analyzed'),
+    JobSpec('update_results', f'{CORE_JOBS}:update_results_job', 'interval', {'hours': 1},
+            name='[LEGACY] Atualização de Resultados (a cada 1h)', group='pipeline',
+            items_key='results_updated'),
+    JobSpec('clean_old_matches', f'{CORE_JOBS}:clean_old_matches_job', 'cron', {'hour': 0, 'minute': 30},
+            name='[LEGACY] Limpeza de Jogos Antigos (00:30)', group='pipeline', items_key='marked_finished'),
+
+    # ========== SYNC ==========
+    JobSpec('full_sync_daily', f'{SYNC}._full_sync_job', 'cron', {'hour': 6, 'minute': 0},
+            name='Daily Full Sync', group='sync', items_key=('teams', 'matches', 'odds', 'predictions')),
+    JobSpec('match_sync_regular', f'{SYNC}._match_sync_job', 'cron', {'hour': '8-23/2'},
+            name='Regular Match Sync', group='sync', items_key=('matches', 'live_updates')),
+    JobSpec('live_sync_frequent', f'{SYNC}._live_sync_job', 'interval', {'minutes': 5},
+            name='Live Data Sync', group='sync', lock_ttl=600, items_key=('live_matches', 'updated_odds')),
+    JobSpec('odds_sync_regular', f'{SYNC}._odds_sync_job', 'interval', {'minutes': 5},
+            name='Odds Sync', group='sync', lock_ttl=600, items_key=('new_odds', 'updated_odds')),
+    JobSpec('predictions_generation', f'{SYNC}._predictions_job', 'interval', {'hours': 4},
+            name='Predictions Generation', group='sync', items_key='predictions'),
+    JobSpec('health_check', f'{SYNC}._health_check_job', 'interval', {'minutes': 15},
+            name='Health Check', group='sync', lock_ttl=600),
+    JobSpec('cache_cleanup', f'{SYNC}._cleanup_job', 'cron', {'hour': 3, 'minute': 0},
+            name='Cache Cleanup', group='sync'),
+    JobSpec('stuck_matches_cleanup', f'{SYNC}._stuck_matches_cleanup_job', 'interval', {'hours': 1},
+            name='Stuck Matches Cleanup', group='sync'),
+
+    # ========== TICKETS ==========
+    JobSpec('ticket_analyzer', 'app.services.ticket_scheduler:run_ticket_analysis', 'interval',
+            {'minutes': 15}, name='Ticket Analyzer', group='tickets', run_at_start=True,
+            items_key='analyzed'),
+
+    # ========== RETRAINING ==========
+    JobSpec('automated_retraining',
+            'app.services.automated_ml_retraining:automated_ml_retraining.run_scheduled_retraining',
+            'cron', {'hour': 2, 'minute': 0}, name='Retreino Agendado (02:00)', group='retraining',
+            lock_ttl=4 * 3600, items_key='models_retrained'),
+
+    # ========== MAINTENANCE ==========
+    JobSpec('prune_job_runs', 'app.services.job_registry:run_prune_job_runs', 'cron',
+            {'hour': 5, 'minute': 0}, name='Limpeza do Histórico de Jobs (05:00)', group='maintenance',
+            items_key='deleted'),
+
+    # ========== GLOBAL ==========
+    JobSpec('global_daily_discovery', f'{GLOBAL}.run_daily_discovery', 'cron', {'hour': 6, 'minute': 0},
+            name='Descoberta de Jogos (06:00)', group='global', items_key='matches_discovered'),
+    JobSpec('global_daily_predictions', f'{GLOBAL}.run_daily_predictions', 'cron', {'hour': 8, 'minute': 0},
+            name='Geração de Previsões (08:00)', group='global', items_key='predictions_generated'),
+    JobSpec('global_performance_analysis', f'{GLOBAL}.run_daily_performance_analysis', 'cron',
+            {'hour': 23, 'minute': 0}, name='Análise de Performance (23:00)', group='global',
+            items_key='matches_analyzed'),
+    JobSpec('global_weekly_retraining', f'{GLOBAL}.run_weekly_retraining', 'cron',
+            {'day_of_week': 'sun', 'hour': 4, 'minute': 0}, name='Retreino de ML (Dom 04:00)',
+            group='global', lock_ttl=4 * 3600, items_key='training_samples'),
+    JobSpec('global_data_cleanup', f'{GLOBAL}.run_data_cleanup', 'cron',
+            {'day_of_week': 'sat', 'hour': 2, 'minute': 0}, name='Limpeza de Dados (Sáb 02:00)',
+            group='global', items_key='files_removed'),
+    JobSpec('global_health_check', f'{GLOBAL}.run_health_check', 'interval', {'hours': 4},
+            name='Verificação de Saúde (a cada 4h)', group='global'),
+
+    # ========== COLLECTORS ==========
+    JobSpec('collect_live_matches', f'{COLLECTORS}._async_collect_live_matches_safely', 'interval',
+            {'minutes': 15}, name='Jogos ao Vivo (a cada 15 min)', group='collectors', lock_ttl=900),
+    JobSpec('populate_gradually', f'{COLLECTORS}._async_populate_gradually_safely', 'interval',
+            {'hours': 2}, name='População Gradual (a cada 2h)', group='collectors'),
+    JobSpec('collect_brazilian_leagues', f'{COLLECTORS}._collect_brazilian_leagues_safely', 'cron',
+            {'hour': '8,14,20', 'minute': 0}, name='Brasileirão (8h, 14h, 20h)', group='collectors'),
+    JobSpec('collect_spanish_leagues', f'{COLLECTORS}._collect_spanish_leagues_safely', 'cron',
+            {'hour': '12,18', 'minute': 0}, name='La Liga (12h, 18h)', group='collectors'),
+    JobSpec('reset_api_rate_limits', f'{COLLECTORS}._reset_rate_limits', 'cron', {'minute': 0},
+            name='Reset Rate Limits (a cada hora)', group='collectors'),
+    JobSpec('collectors_daily_report', f'{COLLECTORS}._generate_daily_report', 'cron',
+            {'hour': 23, 'minute': 30}, name='Relatório Diário (23:30)', group='collectors'),
+
+    # ========== GREEN/RED ==========
+    JobSpec('green_red_analyzer', 'green_red_scheduler:run_green_red_analysis', 'interval',
+            {'minutes': 30}, name='Green/Red Analyzer', group='green_red', run_at_start=True,
+            items_key='total_analyzed'),
+]
+
+
+def enabled_groups() -> List[str]:
+    return [group.strip() for group in settings.JOB_RUNNER_GROUPS.split(',') if group.strip()]
+
+
+def register_jobs(runner: JobRunner = job_runner, groups: Optional[Iterable[str]] = None) -> int:
+    """Registrar no runner os jobs dos grupos (padrão: settings.JOB_RUNNER_GROUPS)"""
+    groups = set(enabled_groups() if groups is None else groups)
+    count = 0
+    for spec in JOBS:
+        if spec.group in groups:
+            runner.register(spec)
+            count += 1
+    return count
+
+
+async def start_job_runner(runner: JobRunner = job_runner, groups: Optional[Iterable[str]] = None):
+    """Registrar os jobs e iniciar o runner (lifespan da API)"""
+    count = register_jobs(runner, groups)
+    await runner.start()
+    logger.info(f"📋 {count} jobs registrados no job runner")
+
+
+async def stop_job_runner(runner: JobRunner = job_runner):
+    await runner.stop()
+
+
+async def run_standalone_runner(groups: Iterable[str], name: str):
+    """
+    Processo dedicado (scripts) para alguns grupos
+
+    Tem eleição própria (`name`), mas o lock por job é compartilhado:
+    um job nunca roda ao mesmo tempo aqui e no runner da API.
+    """
+    runner = JobRunner(name=name)
+    register_jobs(runner, groups)
+    await runner.run_forever()
@@ -15,11 +15,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 # API-Sports PRO
-API_KEY = settings.API_SPORTS_KEY
-if not API_KEY:
-    raise ValueError("API_SPORTS_KEY não configurada. Configure no arquivo .env")
 BASE_URL = 'https://v3.football.api-sports.io'
-HEADERS = {'x-apisports-key': API_KEY}
 
 
 class LiveStatsService:
@@ -77,7 +73,7 @@ class LiveStatsService:
             # Buscar dados do jogo
             url = f"{BASE_URL}/fixtures"
             params = {'id': fixture_id}
-            response = requests.get(url, headers=HEADERS, params=params, timeout=10)
+            response = requests.get(url, headers=settings.api_sports_headers(), params=params, timeout=10)
             response.raise_for_status()
 
             fixture_data = response.json()
@@ -89,13 +85,13 @@ class LiveStatsService:
 
             # Buscar estatísticas
             stats_url = f"{BASE_URL}/fixtures/statistics"
-            stats_response = requests.get(stats_url, headers=HEADERS, params=params, timeout=10)
+            stats_response = requests.get(stats_url, headers=settings.api_sports_headers(), params=params, timeout=10)
             stats_response.raise_for_status()
             stats_data = stats_response.json()
 
             # Buscar eventos (gols, cartões, etc)
             events_url = f"{BASE_URL}/fixtures/events"
-            events_response = requests.get(events_url, headers=HEADERS, params=params, timeout=10)
+            events_response = requests.get(events_url, headers=settings.api_sports_headers(), params=params, timeout=10)
             events_response.raise_for_status()
             events_data = events_response.json()
 
@@ -0,0 +1,200 @@
+"""
+📦 CARREGAMENTO EM LOTE PARA PÁGINAS DE PARTIDAS
+
+Camada de leitura compartilhada pelos endpoints /predictions/featured,
+/predictions/live e /predictions/upcoming (Session ou AsyncSession).
+
+Em vez de buscar times, odds e predição linha a linha (4-5 queries por jogo),
+carrega tudo para a página inteira com um número constante de queries
+(IN-lists) e devolve mapas em memória indexados por id.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import Match, Odds, Prediction, Team
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MatchPageContext:
+    """Dados auxiliares de uma página de partidas, indexados por id"""
+    teams: Dict[int, Team] = field(default_factory=dict)
+    latest_1x2_odds: Dict[int, Odds] = field(default_factory=dict)  # match_id -> odds 1X2 mais recente
+    active_odds: Dict[int, List[Odds]] = field(default_factory=dict)  # match_id -> odds ativas
+    predictions: Dict[int, Prediction] = field(default_factory=dict)  # match_id -> predição 1X2
+
+    def team_name(self, team_id: int) -> str:
+        team = self.teams.get(team_id)
+        return team.name if team else "Unknown"
+
+
+def _unique_ids(values: Iterable[Optional[int]]) -> List[int]:
+    return list({v for v in values if v is not None})
+
+
+# ========== STATEMENTS (compartilhados entre Session e AsyncSession) ==========
+
+def _teams_stmt(matches: List[Match]):
+    team_ids = _unique_ids(
+        [m.home_team_id for m in matches] + [m.away_team_id for m in matches]
+    )
+    return select(Team).where(Team.id.in_(team_ids)) if team_ids else None
+
+
+def _latest_1x2_odds_stmt(match_ids: List[int]):
+    if not match_ids:
+        return None
+    return select(Odds).where(
+        Odds.match_id.in_(match_ids),
+        Odds.market == '1X2'
+    ).order_by(Odds.match_id, Odds.odds_timestamp.desc())
+
+
+def _active_odds_stmt(match_ids: List[int]):
+    if not match_ids:
+        return None
+    return select(Odds).where(
+        Odds.match_id.in_(match_ids),
+        Odds.is_active == True
+    ).order_by(Odds.match_id, Odds.id)
+
+
+def _1x2_predictions_stmt(match_ids: List[int], prediction_type: Optional[str] = None):
+    if not match_ids:
+        return None
+    stmt = select(Prediction).where(
+        Prediction.match_id.in_(match_ids),
+        Prediction.market_type == '1X2'
+    )
+    if prediction_type:
+        stmt = stmt.where(Prediction.prediction_type == prediction_type)
+    return stmt.order_by(Prediction.match_id, Prediction.id)
+
+
+def _by_id(teams) -> Dict[int, Team]:
+    return {team.id: team for team in teams}
+
+
+def _first_per_match(rows) -> Dict[int, object]:
+    first: Dict[int, object] = {}
+    for row in rows:
+        first.setdefault(row.match_id, row)
+    return first
+
+
+def _group_per_match(rows) -> Dict[int, List[Odds]]:
+    grouped: Dict[int, List[Odds]] = {}
+    for row in rows:
+        grouped.setdefault(row.match_id, []).append(row)
+    return grouped
+
+
+def _scalars(db: Session, stmt) -> list:
+    return db.execute(stmt).scalars().all() if stmt is not None else []
+
+
+async def _scalars_async(db: AsyncSession, stmt) -> list:
+    return (await db.execute(stmt)).scalars().all() if stmt is not None else []
+
+
+# ========== SESSION SÍNCRONA ==========
+
+def load_teams(db: Session, matches: List[Match]) -> Dict[int, Team]:
+    """Carrega mandantes e visitantes de todas as partidas em uma query"""
+    return _by_id(_scalars(db, _teams_stmt(matches)))
+
+
+def load_latest_1x2_odds(db: Session, match_ids: List[int]) -> Dict[int, Odds]:
+    """
+    Odds 1X2 mais recentes (qualquer bookmaker) por partida, em uma query.
+
+    Equivalente a `ORDER BY odds_timestamp DESC LIMIT 1` por partida.
+    """
+    return _first_per_match(_scalars(db, _latest_1x2_odds_stmt(match_ids)))
+
+
+def load_active_odds(db: Session, match_ids: List[int]) -> Dict[int, List[Odds]]:
+    """Todas as odds ativas por partida, em uma query"""
+    return _group_per_match(_scalars(db, _active_odds_stmt(match_ids)))
+
+
+def load_1x2_predictions(
+    db: Session,
+    match_ids: List[int],
+    prediction_type: Optional[str] = None
+) -> Dict[int, Prediction]:
+    """Primeira predição 1X2 (menor id) por partida, em uma query"""
+    return _first_per_match(_scalars(db, _1x2_predictions_stmt(match_ids, prediction_type)))
+
+
+def load_match_page_context(
+    db: Session,
+    matches: List[Match],
+    include_latest_1x2_odds: bool = False,
+    include_active_odds: bool = False,
+    include_predictions: bool = False,
+    prediction_type: Optional[str] = None
+) -> MatchPageContext:
+    """
+    Carrega times, odds e predições de uma página de partidas.
+
+    Custo: 1 query de times + 1 query por tipo de dado pedido,
+    independente do número de partidas.
+    """
+    match_ids = _unique_ids(m.id for m in matches)
+
+    context = MatchPageContext(teams=load_teams(db, matches))
+
+    if include_latest_1x2_odds:
+        context.latest_1x2_odds = load_latest_1x2_odds(db, match_ids)
+    if include_active_odds:
+        context.active_odds = load_active_odds(db, match_ids)
+    if include_predictions:
+        context.predictions = load_1x2_predictions(db, match_ids, prediction_type)
+
+    return context
+
+
+# ========== ASYNC SESSION ==========
+
+async def load_latest_1x2_odds_async(db: AsyncSession, match_ids: List[int]) -> Dict[int, Odds]:
+    """load_latest_1x2_odds para AsyncSession"""
+    return _first_per_match(await _scalars_async(db, _latest_1x2_odds_stmt(match_ids)))
+
+
+async def load_1x2_predictions_async(
+    db: AsyncSession,
+    match_ids: List[int],
+    prediction_type: Optional[str] = None
+) -> Dict[int, Prediction]:
+    """load_1x2_predictions para AsyncSession"""
+    return _first_per_match(await _scalars_async(db, _1x2_predictions_stmt(match_ids, prediction_type)))
+
+
+async def load_match_page_context_async(
+    db: AsyncSession,
+    matches: List[Match],
+    include_latest_1x2_odds: bool = False,
+    include_active_odds: bool = False,
+    include_predictions: bool = False,
+    prediction_type: Optional[str] = None
+) -> MatchPageContext:
+    """load_match_page_context para AsyncSession (mesmas queries)"""
+    match_ids = _unique_ids(m.id for m in matches)
+
+    context = MatchPageContext(teams=_by_id(await _scalars_async(db, _teams_stmt(matches))))
+
+    if include_latest_1x2_odds:
+        context.latest_1x2_odds = await load_latest_1x2_odds_async(db, match_ids)
+    if include_active_odds:
+        context.active_odds = _group_per_match(await _scalars_async(db, _active_odds_stmt(match_ids)))
+    if include_predictions:
+        context.predictions = await load_1x2_predictions_async(db, match_ids, prediction_type)
+
+    return context
@@ -407,11 +407,14 @@ class MLManager:
     async def _check_existing_models(self) -> Dict:
         """Verificar se modelos já existem"""
         try:
-            models_file = Path("app/ml/models/trained_models.joblib")
+            loaded = self.ml_engine._current_models()
+            entry = next((v for v in self.ml_engine.registry.versions(loaded.name)
+                          if v['version'] == loaded.version), {}) if loaded else {}
             return {
-                'models_exist': models_file.exists(),
-                'models_path': str(models_file),
-                'file_size': models_file.stat().st_size if models_file.exists() else 0
+                'models_exist': loaded is not None,
+                'models_path': str(self.ml_engine.registry.root / loaded.name / entry['file']) if entry else None,
+                'model_version': loaded.version if loaded else None,
+                'file_size': entry.get('size_bytes', 0)
             }
         except Exception as e:
             return {'models_exist': False, 'error': str(e)}
@@ -462,5 +465,19 @@ class MLManager:
         else:
             return {'status': 'NO_RETRAIN_NEEDED'}
 
-# Instância global do manager
-ml_manager = MLManager()
\ No newline at end of file
+# Instância global do manager (carrega os engines só no primeiro uso)
+_ml_manager = None
+
+
+def get_ml_manager() -> MLManager:
+    """Retorna o MLManager global"""
+    global _ml_manager
+    if _ml_manager is None:
+        _ml_manager = MLManager()
+    return _ml_manager
+
+
+def __getattr__(name):
+    if name == 'ml_manager':
+        return get_ml_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
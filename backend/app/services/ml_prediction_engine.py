@@ -24,6 +24,10 @@ warnings.filterwarnings('ignore')
 from app.services.football_data_service import FootballDataService
 from app.services.real_prediction_engine import RealPredictionEngine
 from app.core.config import settings
+from app.core.model_registry import model_registry
+
+# Nome dos modelos no registry (dict com result_models, goals_models, scalers...)
+REGISTRY_NAME = "ml_prediction_engine"
 
 class MLPredictionEngine:
     """
@@ -35,8 +39,9 @@ class MLPredictionEngine:
         self.real_engine = RealPredictionEngine()
 
         # Diretórios para modelos
-        self.models_dir = Path("app/ml/models")
+        self.models_dir = Path("app/ml/models")  # trained_models.joblib antigo, adotado pelo registry
         self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.registry = model_registry
 
         # Modelos para classificação de resultados (1X2)
         self.result_models = {
@@ -450,10 +455,11 @@ class MLPredictionEngine:
     async def predict_with_ml(self, home_team_id: str, away_team_id: str, match_date: datetime) -> Dict:
         """🔮 Fazer predições usando modelos de ML"""
         try:
-            # Carregar modelos
-            models_data = await self._load_models()
-            if not models_data:
+            # Carregar modelos (versão atual do registry, mantida durante toda a predição)
+            loaded = self._current_models()
+            if loaded is None:
                 return {"error": "Modelos não encontrados - execute o treinamento primeiro"}
+            models_data = loaded.model
 
             # Criar features para o jogo
             match_features = await self._create_match_features(home_team_id, away_team_id, match_date)
@@ -487,7 +493,8 @@ class MLPredictionEngine:
                 "mathematical_prediction": math_prediction,
                 "ensemble_prediction": ensemble_prediction,
                 "prediction_timestamp": datetime.now().isoformat(),
-                "engine_version": "ML_v1.0"
+                "engine_version": "ML_v1.0",
+                "model_version": loaded.tag
             }
 
         except Exception as e:
@@ -580,21 +587,30 @@ class MLPredictionEngine:
         return 0
 
     async def _save_models(self, models_data: Dict):
-        """Salvar modelos treinados"""
+        """Salvar modelos treinados (nova versão promovida no registry)"""
         try:
-            model_file = self.models_dir / "trained_models.joblib"
-            joblib.dump(models_data, model_file)
-            print(f"💾 Modelos salvos em {model_file}")
+            entry = self.registry.register(REGISTRY_NAME, models_data, metadata={
+                'training_date': models_data.get('training_date'),
+                'training_samples': models_data.get('training_samples'),
+                'feature_count': len(models_data.get('feature_columns', []))
+            })
+            print(f"💾 Modelos salvos: {REGISTRY_NAME}@{entry['version']}")
         except Exception as e:
             print(f"❌ Erro ao salvar modelos: {e}")
 
+    def _load_legacy_models(self) -> Optional[Dict]:
+        model_file = self.models_dir / "trained_models.joblib"
+        return joblib.load(model_file) if model_file.exists() else None
+
+    def _current_models(self):
+        """Versão atual dos modelos (LoadedModel) ou None se nunca treinados"""
+        return self.registry.get(REGISTRY_NAME, fallback=self._load_legacy_models)
+
     async def _load_models(self) -> Optional[Dict]:
         """Carregar modelos treinados"""
         try:
-            model_file = self.models_dir / "trained_models.joblib"
-            if model_file.exists():
-                return joblib.load(model_file)
-            return None
+            loaded = self._current_models()
+            return loaded.model if loaded else None
         except Exception as e:
             print(f"❌ Erro ao carregar modelos: {e}")
             return None
@@ -28,14 +28,16 @@ Tipos de predictions:
 Objetivo: Aprendizado acelerado do ML com dados GREEN/RED de qualidade
 """
 import logging
+import time
 from typing import List, Dict
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, case, insert
 import random
 
 from app.models import Match, Prediction, BetCombination
 from app.services.prediction_service import PredictionService
+from app.services.same_match_pricing import can_price_jointly, has_redundant_leg, joint_probability
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +174,12 @@ class MLPredictionGenerator:
         self._stats_cache = {}  # Cache de TeamStatistics por team_id
         self._odds_cache = {}   # Cache de Odds por match_id
         self._accuracy_cache = {}  # Cache de accuracy histórica por market
+        self._poisson_cache = {}   # Cache de PoissonPrediction por match_id
+
+        # Pipeline em lote: predictions/combinações ficam em memória até o flush
+        self._existing_keys = set()        # (match_id, market_type, prediction_type) já no banco
+        self._pending_predictions = []     # linhas para INSERT em lote
+        self._pending_combinations = []    # (campos, índices em _pending_predictions)
 
     def _convert_market_to_outcome(self, market: str) -> str:
         """
@@ -334,6 +342,20 @@ class MLPredictionGenerator:
 
         logger.info(f"📊 {len(future_matches)} jogos disponíveis (próximos 7 dias, max 100)")
 
+        timings = {}
+        phase_start = time.perf_counter()
+
+        # ========== FASE 1: CARGA (poucas queries para todos os jogos) ==========
+        self._preload(future_matches)
+
+        # Poisson de todos os jogos em uma passada (forças Dixon-Coles)
+        self._prefetch_poisson_analyses(future_matches)
+
+        timings['load'] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+
+        # ========== FASE 2: CÁLCULO EM MEMÓRIA ==========
+
         # Distribuição de predictions
         # 🎯 NOVA DISTRIBUIÇÃO (2025-10-17):
         # - 5% singles (apostas simples)
@@ -401,7 +423,26 @@ class MLPredictionGenerator:
             target=distribution['quads_multi']
         )
 
-        stats['total'] = sum([v for k, v in stats.items() if k != 'errors'])
+        timings['compute'] = time.perf_counter() - phase_start
+
+        # ========== FASE 3/4: INSERT EM LOTE + VÍNCULO DAS COMBINAÇÕES ==========
+        try:
+            timings.update(self._flush_pending())
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar predictions em lote: {e}")
+            self.db.rollback()
+            stats['errors'] += 1
+            for key in stats:
+                if key != 'errors':
+                    stats[key] = 0
+            return stats
+
+        stats['total'] = sum([v for k, v in stats.items() if k not in ('errors', 'timings')])
+        stats['timings'] = {phase: round(seconds, 3) for phase, seconds in timings.items()}
+
+        logger.info(
+            "⏱️ Fases: " + ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in stats['timings'].items())
+        )
 
         logger.info(f"""
         ✅ GERAÇÃO COMPLETA:
@@ -418,6 +459,117 @@ class MLPredictionGenerator:
 
         return stats
 
+    # ========== PIPELINE EM LOTE ==========
+
+    def _preload(self, matches: List[Match]):
+        """
+        Carrega de uma vez tudo que os geradores consultavam por mercado/jogo:
+        chaves já existentes, estatísticas dos times, odds de cada jogo e
+        accuracy histórica por mercado
+        """
+        from app.models import Odds, TeamStatistics
+
+        match_ids = [m.id for m in matches]
+
+        self._existing_keys = set(
+            self.db.query(
+                Prediction.match_id, Prediction.market_type, Prediction.prediction_type
+            ).filter(Prediction.match_id.in_(match_ids)).all()
+        )
+
+        # Última TeamStatistics de cada time (fallback do Poisson sem Dixon-Coles)
+        team_ids = {m.home_team_id for m in matches} | {m.away_team_id for m in matches}
+        for team_stats in self.db.query(TeamStatistics).filter(
+            TeamStatistics.team_id.in_(team_ids)
+        ).order_by(TeamStatistics.team_id, TeamStatistics.created_at.desc()):
+            self._stats_cache.setdefault(team_stats.team_id, team_stats)
+        for team_id in team_ids:
+            self._stats_cache.setdefault(team_id, None)
+
+        # Primeira odd de cada jogo (mesmo registro que .first() retornava)
+        for odds in self.db.query(Odds).filter(Odds.match_id.in_(match_ids)).order_by(Odds.id):
+            self._odds_cache.setdefault(odds.match_id, odds)
+        for match_id in match_ids:
+            self._odds_cache.setdefault(match_id, None)
+
+        try:
+            rows = self.db.query(
+                Prediction.market_type,
+                func.count(Prediction.id).label('total'),
+                func.sum(case((Prediction.is_winner == True, 1), else_=0)).label('greens')
+            ).filter(
+                Prediction.market_type.in_(self.MARKETS),
+                Prediction.is_validated == True
+            ).group_by(Prediction.market_type).all()
+
+            for market in self.MARKETS:
+                self._accuracy_cache.setdefault(market, 0.5)
+            for row in rows:
+                if row.total:
+                    self._accuracy_cache[row.market_type] = (row.greens or 0) / row.total
+        except Exception as e:
+            logger.warning(f"Erro ao carregar accuracy histórica: {e}")
+
+    def _stage_prediction(self, match_id: int, prediction_type: str, pred_data: Dict) -> int:
+        """Adiciona prediction ao lote; retorna o índice usado para vincular combinações"""
+        self._pending_predictions.append({
+            'match_id': match_id,
+            'prediction_type': prediction_type,
+            **pred_data
+        })
+        self._existing_keys.add((match_id, pred_data['market_type'], prediction_type))
+        return len(self._pending_predictions) - 1
+
+    def _flush_pending(self) -> Dict[str, float]:
+        """
+        Grava o lote: um INSERT ... RETURNING para as predictions e um
+        INSERT para as combinações (prediction_ids resolvidos pelos índices)
+
+        Returns:
+            Tempo de cada fase em segundos
+        """
+        timings = {}
+        start = time.perf_counter()
+
+        ids = []
+        if self._pending_predictions:
+            # RETURNING não garante a ordem das linhas. Com sentinela implícita
+            # (PostgreSQL: insertmanyvalues, ainda em lote) sort_by_parameter_order
+            # devolve os ids na ordem de _pending_predictions. O SQLite não tem
+            # sentinela (cairia para um INSERT por linha), mas atribui rowids
+            # crescentes na ordem dos VALUES de cada statement, então ordenar basta
+            if self.db.get_bind().dialect.name == 'sqlite':
+                ids = sorted(self.db.execute(
+                    insert(Prediction).returning(Prediction.id),
+                    self._pending_predictions
+                ).scalars().all())
+            else:
+                ids = self.db.execute(
+                    insert(Prediction).returning(Prediction.id, sort_by_parameter_order=True),
+                    self._pending_predictions
+                ).scalars().all()
+
+        timings['insert_predictions'] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        if self._pending_combinations:
+            self.db.execute(insert(BetCombination), [
+                {**fields, 'prediction_ids': [ids[i] for i in indices]}
+                for fields, indices in self._pending_combinations
+            ])
+
+        self.db.commit()
+        timings['link_combinations'] = time.perf_counter() - start
+
+        logger.info(
+            f"💾 {len(ids)} predictions e {len(self._pending_combinations)} combinações gravadas em lote"
+        )
+        self._pending_predictions = []
+        self._pending_combinations = []
+        return timings
+
+    # ========== GERADORES ==========
+
     def _generate_singles(self, matches: List[Match], target: int) -> int:
         """Gera predictions singles (1 mercado, 1 jogo)"""
         created = 0
@@ -436,39 +588,32 @@ class MLPredictionGenerator:
 
                 try:
                     # Verificar se já existe prediction desse mercado para esse jogo
-                    existing = self.db.query(Prediction).filter(
-                        and_(
-                            Prediction.match_id == match.id,
-                            Prediction.market_type == market,
-                            Prediction.prediction_type == 'SINGLE'
-                        )
-                    ).first()
-
-                    if existing:
+                    if (match.id, market, 'SINGLE') in self._existing_keys:
                         continue
 
                     # Gerar prediction baseada no mercado
                     prediction_data = self._generate_prediction_for_market(match, market)
 
                     if prediction_data:
-                        prediction = Prediction(
-                            match_id=match.id,
-                            prediction_type='SINGLE',
-                            **prediction_data
-                        )
-                        self.db.add(prediction)
+                        self._stage_prediction(match.id, 'SINGLE', prediction_data)
                         market_created += 1
                         created += 1
 
                 except Exception as e:
                     logger.error(f"Erro ao criar single para match {match.id}, market {market}: {e}")
 
-            self.db.commit()
-
         return created
 
     def _generate_same_match_multiples(self, matches: List[Match], market_count: int, target: int) -> int:
-        """Gera predictions múltiplas no mesmo jogo (N mercados, 1 jogo)"""
+        """
+        Gera predictions múltiplas no mesmo jogo (N mercados, 1 jogo)
+
+        Pernas do mesmo jogo são correlacionadas: a combinada é precificada pela
+        probabilidade conjunta na matriz de placares do jogo (uma máscara por
+        mercado), não pelo produto das pernas. Combinações impossíveis
+        (ex: UNDER_0_5 + BTTS_YES) ou redundantes (HOME_WIN + OVER_0_5) são
+        descartadas.
+        """
         created = 0
 
         for match in matches:
@@ -480,49 +625,69 @@ class MLPredictionGenerator:
                 selected_markets = random.sample(self.MARKETS, min(market_count, len(self.MARKETS)))
 
                 # Gerar predictions para cada mercado
-                prediction_ids = []
-                total_confidence = 1.0
-
+                legs = []
                 for market in selected_markets:
                     pred_data = self._generate_prediction_for_market(match, market)
-
                     if pred_data:
-                        # Criar prediction individual
-                        prediction = Prediction(
-                            match_id=match.id,
-                            prediction_type=f"COMBO_{market_count}X",
-                            **pred_data
-                        )
-                        self.db.add(prediction)
-                        self.db.flush()
-
-                        prediction_ids.append(prediction.id)
-                        total_confidence *= pred_data['confidence_score']
+                        legs.append(pred_data)
+
+                if len(legs) == market_count:
+                    pricing = self._price_same_match_legs(match, legs)
+                    if pricing['combined_probability'] <= 0 or pricing['redundant']:
+                        continue  # Pernas mutuamente exclusivas ou uma implica outra
 
-                if len(prediction_ids) == market_count:
+                # Prediction individual (id resolvido no flush)
+                indices = [self._stage_prediction(match.id, f"COMBO_{market_count}X", leg) for leg in legs]
+
+                if len(indices) == market_count:
                     # Criar combinação
                     combo_type = {2: 'DOUBLE', 3: 'TREBLE', 4: 'QUAD'}.get(market_count, 'MULTIPLE')
-
-                    combination = BetCombination(
-                        combination_type=combo_type,
-                        selections_count=market_count,
-                        total_odds=1.0,  # Será calculado depois com odds reais
-                        prediction_ids=prediction_ids,
-                        combined_confidence=total_confidence,
-                        is_recommended=total_confidence >= 0.60,
-                        risk_level='MEDIUM' if total_confidence >= 0.60 else 'HIGH'
-                    )
-                    self.db.add(combination)
+                    total_confidence = pricing['combined_confidence']
+
+                    self._pending_combinations.append(({
+                        'combination_type': combo_type,
+                        'selections_count': market_count,
+                        'total_odds': 1.0,  # Será calculado depois com odds reais
+                        'combined_probability': pricing['combined_probability'],
+                        'combined_confidence': total_confidence,
+                        'is_recommended': total_confidence >= 0.60,
+                        'risk_level': 'MEDIUM' if total_confidence >= 0.60 else 'HIGH'
+                    }, indices))
                     created += 1
 
-                self.db.commit()
-
             except Exception as e:
                 logger.error(f"Erro ao criar combo para match {match.id}: {e}")
-                self.db.rollback()
 
         return created
 
+    def _price_same_match_legs(self, match: Match, legs: List[Dict]) -> Dict:
+        """
+        Probabilidade conjunta e confidence de pernas do mesmo jogo
+
+        A confidence combinada é o produto das confidences (calibradas por
+        mercado) corrigido pela correlação: conjunta / produto das pernas.
+        Sem matriz de placares ou com mercado fora do registro de máscaras,
+        mantém o produto das pernas.
+        """
+        markets = [leg['market_type'] for leg in legs]
+        independent_probability = 1.0
+        total_confidence = 1.0
+        for leg in legs:
+            independent_probability *= leg['predicted_probability']
+            total_confidence *= leg['confidence_score']
+
+        score_matrix = self.get_score_matrix(match)
+        if score_matrix is None or not can_price_jointly(markets, score_matrix):
+            return {'combined_probability': independent_probability, 'combined_confidence': total_confidence,
+                    'redundant': False}
+
+        joint = joint_probability(score_matrix, markets)
+        if independent_probability > 0:
+            total_confidence = min(1.0, total_confidence * joint / independent_probability)
+
+        return {'combined_probability': joint, 'combined_confidence': total_confidence,
+                'redundant': has_redundant_leg(score_matrix, markets)}
+
     def _generate_multi_match_combinations(self, matches: List[Match], match_count: int, target: int) -> int:
         """Gera predictions combinando múltiplos jogos"""
         created = 0
@@ -531,12 +696,17 @@ class MLPredictionGenerator:
             logger.warning(f"Não há jogos suficientes para combos de {match_count} jogos")
             return 0
 
-        while created < target:
+        # Sorteios sem nenhum mercado aprovado não podem travar o job
+        max_attempts = max(target * 50, 100)
+        attempts = 0
+
+        while created < target and attempts < max_attempts:
+            attempts += 1
             try:
                 # Selecionar jogos aleatórios
                 selected_matches = random.sample(matches, match_count)
 
-                prediction_ids = []
+                indices = []
                 total_confidence = 1.0
 
                 # Para cada jogo, escolher 1 mercado aleatório
@@ -545,37 +715,27 @@ class MLPredictionGenerator:
                     pred_data = self._generate_prediction_for_market(match, market)
 
                     if pred_data:
-                        prediction = Prediction(
-                            match_id=match.id,
-                            prediction_type=f"MULTI_{match_count}X",
-                            **pred_data
-                        )
-                        self.db.add(prediction)
-                        self.db.flush()
-
-                        prediction_ids.append(prediction.id)
+                        indices.append(self._stage_prediction(match.id, f"MULTI_{match_count}X", pred_data))
                         total_confidence *= pred_data['confidence_score']
 
-                if len(prediction_ids) == match_count:
+                if len(indices) == match_count:
                     combo_type = {2: 'DOUBLE', 3: 'TREBLE', 4: 'QUAD'}.get(match_count, 'MULTIPLE')
 
-                    combination = BetCombination(
-                        combination_type=combo_type,
-                        selections_count=match_count,
-                        total_odds=1.0,
-                        prediction_ids=prediction_ids,
-                        combined_confidence=total_confidence,
-                        is_recommended=total_confidence >= 0.50,
-                        risk_level='LOW' if total_confidence >= 0.70 else 'MEDIUM' if total_confidence >= 0.50 else 'HIGH'
-                    )
-                    self.db.add(combination)
+                    self._pending_combinations.append(({
+                        'combination_type': combo_type,
+                        'selections_count': match_count,
+                        'total_odds': 1.0,
+                        'combined_confidence': total_confidence,
+                        'is_recommended': total_confidence >= 0.50,
+                        'risk_level': 'LOW' if total_confidence >= 0.70 else 'MEDIUM' if total_confidence >= 0.50 else 'HIGH'
+                    }, indices))
                     created += 1
 
-                self.db.commit()
-
             except Exception as e:
                 logger.error(f"Erro ao criar multi-combo: {e}")
-                self.db.rollback()
+
+        if created < target:
+            logger.warning(f"Multi-combos de {match_count} jogos: {created}/{target} após {attempts} tentativas")
 
         return created
 
@@ -590,8 +750,6 @@ class MLPredictionGenerator:
             return self._accuracy_cache[market]
 
         try:
-            from sqlalchemy import func, case
-
             # Buscar predictions validadas desse market
             validated = self.db.query(
                 func.count(Prediction.id).label('total'),
@@ -674,52 +832,85 @@ class MLPredictionGenerator:
             logger.warning(f"Erro ao calcular edge: {e}")
             return 0.0
 
-    def _select_best_1x2_outcome(self, match: Match) -> tuple:
+    def _prefetch_poisson_analyses(self, matches: List[Match]):
         """
-        Seleciona o MELHOR outcome entre HOME_WIN, DRAW, AWAY_WIN
+        Calcula Poisson de todos os jogos em uma única passada vetorizada
 
-        Returns:
-            Tuple (market, probability, edge) ou (None, None, None) se nenhum passar nos filtros
+        Usa as forças Dixon-Coles ajustadas (lookup de parâmetros). Jogos sem
+        modelo ajustado ficam para o fallback via TeamStatistics.
         """
+        from app.services.team_strength_service import team_strength_service
+
+        pending = [m for m in matches if m.id not in self._poisson_cache]
+        if not pending:
+            return
+
         try:
-            from app.models import TeamStatistics, Odds
-            from app.services.poisson_service import PoissonService
+            analyses = team_strength_service.analyze_matches(pending)
+        except Exception as e:
+            logger.warning(f"⚠️ Dixon-Coles indisponível, usando TeamStatistics: {e}")
+            analyses = None
 
-            # Buscar stats e calcular Poisson (com cache)
-            cache_key = f"poisson_{match.id}"
+        if analyses:
+            for match, analysis in zip(pending, analyses):
+                self._poisson_cache[match.id] = analysis
 
-            if not hasattr(self, '_poisson_cache'):
-                self._poisson_cache = {}
+    def _get_poisson_analysis(self, match: Match):
+        """
+        Poisson do jogo (cache por match_id)
 
-            if cache_key not in self._poisson_cache:
-                # Buscar stats
-                home_stats = self._stats_cache.get(match.home_team_id)
-                away_stats = self._stats_cache.get(match.away_team_id)
+        1. Forças Dixon-Coles ajustadas sobre os jogos finalizados
+        2. Fallback: médias de TeamStatistics com Poisson independente
+        """
+        from app.models import TeamStatistics
+        from app.services.poisson_service import poisson_service
 
-                if match.home_team_id not in self._stats_cache:
-                    home_stats = self.db.query(TeamStatistics).filter(
-                        TeamStatistics.team_id == match.home_team_id
-                    ).order_by(TeamStatistics.created_at.desc()).first()
-                    self._stats_cache[match.home_team_id] = home_stats
+        if match.id not in self._poisson_cache:
+            self._prefetch_poisson_analyses([match])
 
-                if match.away_team_id not in self._stats_cache:
-                    away_stats = self.db.query(TeamStatistics).filter(
-                        TeamStatistics.team_id == match.away_team_id
+        if match.id not in self._poisson_cache:
+            for team_id in (match.home_team_id, match.away_team_id):
+                if team_id not in self._stats_cache:
+                    self._stats_cache[team_id] = self.db.query(TeamStatistics).filter(
+                        TeamStatistics.team_id == team_id
                     ).order_by(TeamStatistics.created_at.desc()).first()
-                    self._stats_cache[match.away_team_id] = away_stats
 
-                # Calcular Poisson
-                poisson = PoissonService()
-                self._poisson_cache[cache_key] = poisson.analyze_match(
-                    home_goals_avg=home_stats.goals_scored_avg if home_stats else 1.5,
-                    away_goals_avg=away_stats.goals_scored_avg if away_stats else 1.3,
-                    home_conceded_avg=home_stats.goals_conceded_avg if home_stats else 1.2,
-                    away_conceded_avg=away_stats.goals_conceded_avg if away_stats else 1.1,
-                    market_odds={},
-                    league_avg=2.7
-                )
+            home_stats = self._stats_cache.get(match.home_team_id)
+            away_stats = self._stats_cache.get(match.away_team_id)
+
+            self._poisson_cache[match.id] = poisson_service.analyze_match(
+                home_goals_avg=home_stats.goals_scored_avg if home_stats else 1.5,
+                away_goals_avg=away_stats.goals_scored_avg if away_stats else 1.3,
+                home_conceded_avg=home_stats.goals_conceded_avg if home_stats else 1.2,
+                away_conceded_avg=away_stats.goals_conceded_avg if away_stats else 1.1,
+                market_odds={}
+            )
+
+        return self._poisson_cache[match.id]
+
+    def get_score_matrices(self, matches: List[Match]) -> Dict:
+        """Matrizes de placares de vários jogos (Poisson calculado em uma passada)"""
+        self._prefetch_poisson_analyses(matches)
+        return {match.id: self.get_score_matrix(match) for match in matches}
+
+    def get_score_matrix(self, match: Match):
+        """Matriz de placares do jogo (a mesma do Poisson em cache) ou None"""
+        try:
+            return self._get_poisson_analysis(match).score_matrix
+        except Exception as e:
+            logger.warning(f"Matriz de placares indisponível para match {match.id}: {e}")
+            return None
+
+    def _select_best_1x2_outcome(self, match: Match) -> tuple:
+        """
+        Seleciona o MELHOR outcome entre HOME_WIN, DRAW, AWAY_WIN
 
-            poisson_analysis = self._poisson_cache[cache_key]
+        Returns:
+            Tuple (market, probability, edge) ou (None, None, None) se nenhum passar nos filtros
+        """
+        try:
+            # Calcular Poisson (com cache)
+            poisson_analysis = self._get_poisson_analysis(match)
 
             # Analisar os 3 outcomes
             outcomes = {}
@@ -771,8 +962,7 @@ class MLPredictionGenerator:
         Para outros: Aplica thresholds específicos e calibração de confidence
         """
         try:
-            from app.models import TeamStatistics, Odds
-            from app.services.poisson_service import PoissonService
+            from app.models import Odds
 
             # 🎯 LÓGICA ESPECIAL PARA 1X2: Selecionar apenas o MELHOR outcome
             if market in ['HOME_WIN', 'DRAW', 'AWAY_WIN']:
@@ -784,8 +974,7 @@ class MLPredictionGenerator:
 
                 # Se chegou aqui, é o melhor outcome - continuar com a geração
                 # Buscar dados do Poisson (já está em cache)
-                cache_key = f"poisson_{match.id}"
-                poisson_analysis = self._poisson_cache.get(cache_key)
+                poisson_analysis = self._poisson_cache.get(match.id)
 
                 if not poisson_analysis:
                     return None
@@ -834,20 +1023,6 @@ class MLPredictionGenerator:
                 }
 
             # 🎯 LÓGICA NORMAL PARA OUTROS MARKETS (BTTS, O/U, etc)
-            # Buscar stats dos times (COM CACHE)
-            if match.home_team_id not in self._stats_cache:
-                self._stats_cache[match.home_team_id] = self.db.query(TeamStatistics).filter(
-                    TeamStatistics.team_id == match.home_team_id
-                ).order_by(TeamStatistics.created_at.desc()).first()
-
-            if match.away_team_id not in self._stats_cache:
-                self._stats_cache[match.away_team_id] = self.db.query(TeamStatistics).filter(
-                    TeamStatistics.team_id == match.away_team_id
-                ).order_by(TeamStatistics.created_at.desc()).first()
-
-            home_stats = self._stats_cache.get(match.home_team_id)
-            away_stats = self._stats_cache.get(match.away_team_id)
-
             # Buscar odds reais do mercado (COM CACHE)
             if match.id not in self._odds_cache:
                 self._odds_cache[match.id] = self.db.query(Odds).filter(Odds.match_id == match.id).first()
@@ -855,23 +1030,7 @@ class MLPredictionGenerator:
             odds_record = self._odds_cache.get(match.id)
 
             # Calcular TODAS as probabilidades via Poisson (COM CACHE POR MATCH)
-            cache_key = f"poisson_{match.id}"
-
-            if not hasattr(self, '_poisson_cache'):
-                self._poisson_cache = {}
-
-            if cache_key not in self._poisson_cache:
-                poisson = PoissonService()
-                self._poisson_cache[cache_key] = poisson.analyze_match(
-                    home_goals_avg=home_stats.goals_scored_avg if home_stats else 1.5,
-                    away_goals_avg=away_stats.goals_scored_avg if away_stats else 1.3,
-                    home_conceded_avg=home_stats.goals_conceded_avg if home_stats else 1.2,
-                    away_conceded_avg=away_stats.goals_conceded_avg if away_stats else 1.1,
-                    market_odds={},
-                    league_avg=2.7
-                )
-
-            poisson_analysis = self._poisson_cache[cache_key]
+            poisson_analysis = self._get_poisson_analysis(match)
 
             # Verificar se o mercado existe no Poisson
             if market not in poisson_analysis.probabilities:
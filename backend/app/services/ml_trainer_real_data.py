@@ -18,9 +18,10 @@ from sklearn.metrics import accuracy_score, classification_report, confusion_mat
 import joblib
 import os
 
+from app.core.config import settings
 from app.core.database import get_db_session
-from app.models.match import Match
-from app.models.team import Team
+from app.core.feature_store import FeatureStore, MATCHES_DATASET, sync_finished_matches
+from app.core.model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -38,16 +39,19 @@ class MLTrainerRealData:
         # Lista de ligas para treinar (None = todas as ligas)
         self.league_filter = league_filter
 
-        # Diretório para salvar modelos - agora universal
+        # Nome no registry (e diretório antigo, adotado na primeira leitura)
         if league_filter and len(league_filter) == 1:
             # Modelo específico de uma liga
             league_name = league_filter[0].lower().replace(' ', '_').replace('ã', 'a')
             self.models_dir = f"models/{league_name}_real"
+            self.registry_name = f"{league_name}_real_data"
         else:
             # Modelo universal para todas as ligas
             self.models_dir = "models/universal_real"
+            self.registry_name = "universal_real_data"
 
-        os.makedirs(self.models_dir, exist_ok=True)
+        self.registry = model_registry
+        self.model_version = None
 
     async def train_models_with_real_data(self) -> Dict:
         """
@@ -115,24 +119,24 @@ class MLTrainerRealData:
                         feature_names, model.feature_importances_
                     ))
 
-                # Salvar modelo em disco
-                model_path = os.path.join(self.models_dir, f"{model_name}_real_data.joblib")
-                joblib.dump(model, model_path)
-
                 logger.info(f"✅ {model_name}: Train={train_score:.3f}, Test={test_score:.3f}")
 
-            # 5. Salvar metadados
+            results['performance'] = self._calculate_ensemble_performance(X_test, y_test)
+
+            # 5. Salvar modelos + metadados como uma versão no registry (promovida)
             metadata = {
                 'feature_names': feature_names,
                 'training_date': datetime.now().isoformat(),
                 'total_samples': len(training_data),
                 'encoders': self.encoders
             }
-
-            metadata_path = os.path.join(self.models_dir, "training_metadata.joblib")
-            joblib.dump(metadata, metadata_path)
-
-            results['performance'] = self._calculate_ensemble_performance(X_test, y_test)
+            entry = self.registry.register(self.registry_name, {'models': self.models, **metadata}, metadata={
+                'training_date': metadata['training_date'],
+                'total_samples': metadata['total_samples'],
+                'ensemble_accuracy': results['performance'].get('ensemble_accuracy')
+            })
+            self.model_version = entry['version']
+            results['model_version'] = entry['version']
 
         except Exception as e:
             logger.error(f"❌ Erro no treinamento ML: {e}")
@@ -146,61 +150,47 @@ class MLTrainerRealData:
 
     async def _load_training_data_from_db(self) -> pd.DataFrame:
         """
-        📊 Carregar dados de treinamento do banco
+        📊 Carregar dados de treinamento do feature store
+        Acrescenta os jogos finalizados novos e lê só as colunas e ligas usadas
         """
-        data = []
+        store = FeatureStore(settings.FEATURE_STORE_PATH)
 
         with get_db_session() as session:
-            # Buscar jogos finalizados com resultados
-            query = session.query(Match).filter(
-                Match.home_score.isnot(None),
-                Match.away_score.isnot(None),
-                Match.status == 'FINISHED'
-            )
-
-            # Filtrar por ligas se especificado
-            if self.league_filter:
-                query = query.filter(Match.league.in_(self.league_filter))
-
-            finished_matches = query.all()
-
-            logger.info(f"📊 Encontrados {len(finished_matches)} jogos finalizados")
-
-            for match in finished_matches:
-                try:
-                    # Buscar informações dos times
-                    home_team = session.query(Team).filter(Team.id == match.home_team_id).first()
-                    away_team = session.query(Team).filter(Team.id == match.away_team_id).first()
-
-                    if home_team and away_team:
-                        # Determinar resultado
-                        if match.home_score > match.away_score:
-                            result = 'home_win'
-                        elif match.away_score > match.home_score:
-                            result = 'away_win'
-                        else:
-                            result = 'draw'
-
-                        # Criar registro de dados
-                        data.append({
-                            'home_team': home_team.name,
-                            'away_team': away_team.name,
-                            'home_country': home_team.country or 'Unknown',
-                            'away_country': away_team.country or 'Unknown',
-                            'league': match.league,
-                            'home_score': match.home_score,
-                            'away_score': match.away_score,
-                            'total_goals': match.home_score + match.away_score,
-                            'result': result,
-                            'match_date': match.match_date,
-                            'source': match.external_id
-                        })
-
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro processando match {match.id}: {e}")
-                    continue
-
-        return pd.DataFrame(data)
+            sync_finished_matches(store, session)
+
+        # Jogos finalizados com resultados (filtrando as partições das ligas, se especificado)
+        matches = store.read(
+            MATCHES_DATASET,
+            columns=['competition', 'home_team', 'away_team', 'home_country', 'away_country',
+                     'home_score', 'away_score', 'match_date', 'external_id'],
+            competitions=self.league_filter,
+            filters=[('status', '=', 'FINISHED')]
+        )
+
+        logger.info(f"📊 Encontrados {len(matches)} jogos finalizados")
+
+        # Jogos sem os dois times cadastrados ficam de fora
+        matches = matches.dropna(subset=['home_team', 'away_team'])
+
+        data = pd.DataFrame({
+            'home_team': matches['home_team'],
+            'away_team': matches['away_team'],
+            'home_country': matches['home_country'].fillna('Unknown'),
+            'away_country': matches['away_country'].fillna('Unknown'),
+            'league': matches['competition'],
+            'home_score': matches['home_score'],
+            'away_score': matches['away_score'],
+            'total_goals': matches['home_score'] + matches['away_score'],
+            'result': np.select(
+                [matches['home_score'] > matches['away_score'], matches['away_score'] > matches['home_score']],
+                ['home_win', 'away_win'],
+                default='draw'
+            ),
+            'match_date': matches['match_date'],
+            'source': matches['external_id']
+        })
+
+        return data.reset_index(drop=True)
 
     def _prepare_features(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, List[str]]:
         """
@@ -320,9 +310,12 @@ class MLTrainerRealData:
         🔮 Predizer resultado de um jogo
         """
         try:
-            if not self.models:
-                # Tentar carregar modelos salvos
-                await self._load_saved_models()
+            # Versão atual do registry (modelos e encoders do mesmo treino)
+            loaded = self._current()
+            if loaded is None:
+                raise ValueError("Nenhum modelo treinado encontrado")
+            models = loaded.model['models']
+            encoders = loaded.model.get('encoders', {})
 
             # Preparar dados do jogo
             match_data = pd.DataFrame([{
@@ -334,7 +327,7 @@ class MLTrainerRealData:
             }])
 
             # Aplicar mesmas transformações
-            for column, encoder in self.encoders.items():
+            for column, encoder in encoders.items():
                 if column in match_data.columns:
                     try:
                         match_data[f'{column}_encoded'] = encoder.transform(match_data[column].astype(str))
@@ -360,7 +353,7 @@ class MLTrainerRealData:
             predictions = {}
             probabilities = {}
 
-            for model_name, model in self.models.items():
+            for model_name, model in models.items():
                 pred = model.predict(X)[0]
                 predictions[model_name] = pred
 
@@ -378,32 +371,58 @@ class MLTrainerRealData:
                 'ensemble_prediction': ensemble_prediction,
                 'individual_predictions': predictions,
                 'probabilities': probabilities,
-                'confidence': votes.count(ensemble_prediction) / len(votes)
+                'confidence': votes.count(ensemble_prediction) / len(votes),
+                'model_version': loaded.tag
             }
 
         except Exception as e:
             logger.error(f"❌ Erro na predição: {e}")
             return {'error': str(e)}
 
-    async def _load_saved_models(self):
+    def _load_legacy_models(self) -> Optional[Dict]:
         """
-        📁 Carregar modelos salvos do disco
+        📁 Modelos gravados em models_dir antes do registry
         """
-        try:
-            metadata_path = os.path.join(self.models_dir, "training_metadata.joblib")
-            if os.path.exists(metadata_path):
-                metadata = joblib.load(metadata_path)
-                self.encoders = metadata.get('encoders', {})
+        if not os.path.isdir(self.models_dir):
+            return None
 
-            for model_file in os.listdir(self.models_dir):
-                if model_file.endswith('_real_data.joblib'):
-                    model_name = model_file.replace('_real_data.joblib', '')
-                    model_path = os.path.join(self.models_dir, model_file)
-                    self.models[model_name] = joblib.load(model_path)
+        bundle = {'models': {}}
+        metadata_path = os.path.join(self.models_dir, "training_metadata.joblib")
+        if os.path.exists(metadata_path):
+            bundle.update(joblib.load(metadata_path))
 
-        except Exception as e:
-            logger.error(f"❌ Erro carregando modelos: {e}")
+        for model_file in os.listdir(self.models_dir):
+            if model_file.endswith('_real_data.joblib'):
+                model_name = model_file.replace('_real_data.joblib', '')
+                bundle['models'][model_name] = joblib.load(os.path.join(self.models_dir, model_file))
 
-# Instâncias globais
-ml_trainer_real_data = MLTrainerRealData()  # Para compatibilidade
-universal_ml_trainer = MLTrainerRealData(league_filter=None)  # Universal para todas as ligas
\ No newline at end of file
+        return bundle if bundle['models'] else None
+
+    def _current(self):
+        """
+        📁 Versão atual dos modelos no registry (cache quente por processo)
+        """
+        loaded = self.registry.get(self.registry_name, fallback=self._load_legacy_models)
+        if loaded is not None:
+            self.models = loaded.model['models']
+            self.encoders = loaded.model.get('encoders', {})
+            self.model_version = loaded.version
+        return loaded
+
+# Instância global (criada no primeiro acesso)
+_universal_ml_trainer = None
+
+
+def get_universal_ml_trainer() -> MLTrainerRealData:
+    """Trainer universal, para todas as ligas"""
+    global _universal_ml_trainer
+    if _universal_ml_trainer is None:
+        _universal_ml_trainer = MLTrainerRealData(league_filter=None)
+    return _universal_ml_trainer
+
+
+def __getattr__(name):
+    # `ml_trainer_real_data` (mesma configuração) mantido para compatibilidade
+    if name in ('universal_ml_trainer', 'ml_trainer_real_data'):
+        return get_universal_ml_trainer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,13 +4,15 @@ Sistema integrado para comparar odds de múltiplas casas de apostas
 """
 
 import asyncio
-import aiohttp
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import os
 from app.core.config import get_settings
+from app.core.lazy_imports import lazy_module
+
+aiohttp = lazy_module('aiohttp')  # só as buscas de odds usam
 
 settings = get_settings()
 
@@ -0,0 +1,225 @@
+"""
+📊 PERFORMANCE ROLLUP SERVICE
+Agregados diários de GREEN/RED por (modelo, mercado, liga), mantidos incrementalmente
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Match, Prediction, PredictionLog, PerformanceRollup
+
+logger = logging.getLogger(__name__)
+
+SOURCE_PREDICTIONS = 'predictions'
+SOURCE_PREDICTION_LOGS = 'prediction_logs'
+
+KEY_FIELDS = ('source', 'bucket_date', 'model_name', 'model_version', 'market_type', 'league')
+VALUE_FIELDS = ('total', 'greens', 'reds', 'profit_loss', 'confidence_sum', 'feedback_sum')
+
+RollupKey = Tuple[str, date, str, str, str, str]
+Contribution = Tuple[RollupKey, Tuple[float, ...]]
+
+
+def _bucket(value: Optional[datetime]) -> date:
+    return (value or datetime.now()).date()
+
+
+class PerformanceRollupService:
+    """
+    Mantém a tabela performance_rollups
+
+    Uso ao liquidar predições (na mesma transação de quem liquida):
+        before = rollup.prediction_contribution(pred, league)
+        ... atualiza pred ...
+        rollup.track(before, rollup.prediction_contribution(pred, league))
+        rollup.flush()
+
+    A contribuição anterior é subtraída, então re-liquidar uma predição
+    não conta duas vezes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._deltas: Dict[RollupKey, list] = {}
+
+    # ========== CONTRIBUIÇÕES ==========
+
+    @staticmethod
+    def prediction_contribution(pred: Prediction, league: Optional[str]) -> Optional[Contribution]:
+        """Contribuição de uma Prediction (None se ainda não liquidada)"""
+        if pred.actual_outcome is None:
+            return None
+
+        key = (
+            SOURCE_PREDICTIONS, _bucket(pred.predicted_at), '',
+            pred.model_version or '', pred.market_type or '', league or ''
+        )
+        return key, (
+            1,
+            1 if pred.is_winner is True else 0,
+            1 if pred.is_winner is False else 0,
+            pred.profit_loss or 0.0,
+            pred.confidence_score or 0.0,
+            0.0
+        )
+
+    @staticmethod
+    def log_contribution(log: PredictionLog) -> Optional[Contribution]:
+        """Contribuição de um PredictionLog (None se ainda não analisado)"""
+        if log.analyzed_at is None:
+            return None
+
+        key = (
+            SOURCE_PREDICTION_LOGS, _bucket(log.created_at), log.model_name or '',
+            log.model_version or '', '1X2', log.league or ''
+        )
+        return key, (
+            1,
+            1 if log.was_correct else 0,
+            0 if log.was_correct else 1,
+            0.0,
+            log.confidence_score or 0.0,
+            log.feedback_score or 0.0
+        )
+
+    def track(self, before: Optional[Contribution], after: Optional[Contribution]):
+        """Acumula a diferença entre a contribuição antiga e a nova"""
+        for contribution, sign in ((before, -1), (after, 1)):
+            if contribution is None:
+                continue
+            key, values = contribution
+            delta = self._deltas.setdefault(key, [0] * len(VALUE_FIELDS))
+            for i, value in enumerate(values):
+                delta[i] += sign * value
+
+    def flush(self):
+        """Aplica os deltas acumulados (UPDATE += ou INSERT). Não faz commit."""
+        for key, delta in self._deltas.items():
+            if not any(delta):
+                continue
+
+            filters = [getattr(PerformanceRollup, field) == value for field, value in zip(KEY_FIELDS, key)]
+            result = self.db.execute(
+                update(PerformanceRollup).where(*filters).values({
+                    field: getattr(PerformanceRollup, field) + value
+                    for field, value in zip(VALUE_FIELDS, delta)
+                }).execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                self.db.execute(insert(PerformanceRollup).values(
+                    **dict(zip(KEY_FIELDS, key)), **dict(zip(VALUE_FIELDS, delta))
+                ))
+
+        self._deltas.clear()
+
+    # ========== RECONSTRUÇÃO ==========
+
+    def rebuild(self) -> int:
+        """
+        Recalcula todos os agregados a partir de predictions e prediction_logs
+
+        Usado para backfill ou correção; o fluxo normal é incremental.
+        """
+        self.db.execute(delete(PerformanceRollup))
+
+        prediction_keys = (
+            literal(SOURCE_PREDICTIONS),
+            func.coalesce(func.date(Prediction.predicted_at), func.current_date()),
+            literal(''),
+            func.coalesce(Prediction.model_version, ''),
+            func.coalesce(Prediction.market_type, ''),
+            func.coalesce(Match.league, '')
+        )
+        predictions = select(
+            *prediction_keys,
+            func.count(),
+            func.sum(case((Prediction.is_winner == True, 1), else_=0)),
+            func.sum(case((Prediction.is_winner == False, 1), else_=0)),
+            func.sum(func.coalesce(Prediction.profit_loss, 0.0)),
+            func.sum(func.coalesce(Prediction.confidence_score, 0.0)),
+            literal(0.0)
+        ).select_from(Prediction).join(Match, Match.id == Prediction.match_id).where(
+            Prediction.actual_outcome.isnot(None)
+        ).group_by(*prediction_keys[1:])
+
+        log_keys = (
+            literal(SOURCE_PREDICTION_LOGS),
+            func.coalesce(func.date(PredictionLog.created_at), func.current_date()),
+            func.coalesce(PredictionLog.model_name, ''),
+            func.coalesce(PredictionLog.model_version, ''),
+            literal('1X2'),
+            func.coalesce(PredictionLog.league, '')
+        )
+        logs = select(
+            *log_keys,
+            func.count(),
+            func.sum(case((PredictionLog.was_correct == True, 1), else_=0)),
+            func.sum(case((PredictionLog.was_correct == True, 0), else_=1)),
+            literal(0.0),
+            func.sum(func.coalesce(PredictionLog.confidence_score, 0.0)),
+            func.sum(func.coalesce(PredictionLog.feedback_score, 0.0))
+        ).where(PredictionLog.analyzed_at.isnot(None)).group_by(*log_keys[1:])
+
+        columns = list(KEY_FIELDS + VALUE_FIELDS)
+        inserted = 0
+        for stmt in (predictions, logs):
+            inserted += self.db.execute(insert(PerformanceRollup).from_select(columns, stmt)).rowcount or 0
+
+        self.db.commit()
+        logger.info(f"✅ Performance rollups reconstruídos: {inserted} buckets")
+        return inserted
+
+    # ========== LEITURA ==========
+
+    def green_red_totals(self) -> Dict:
+        """Totais GREEN/RED de todas as predictions liquidadas"""
+        row = self.db.execute(
+            select(
+                func.coalesce(func.sum(PerformanceRollup.total), 0),
+                func.coalesce(func.sum(PerformanceRollup.greens), 0),
+                func.coalesce(func.sum(PerformanceRollup.reds), 0),
+                func.coalesce(func.sum(PerformanceRollup.profit_loss), 0.0)
+            ).where(PerformanceRollup.source == SOURCE_PREDICTIONS)
+        ).one()
+        return {'total': int(row[0]), 'greens': int(row[1]), 'reds': int(row[2]), 'profit_loss': float(row[3])}
+
+    def model_overview(self, since: date) -> Dict:
+        """Totais por modelo e por liga dos prediction_logs analisados desde `since`"""
+        window = (
+            PerformanceRollup.source == SOURCE_PREDICTION_LOGS,
+            PerformanceRollup.bucket_date >= since
+        )
+        sums = (
+            func.sum(PerformanceRollup.total),
+            func.sum(PerformanceRollup.greens),
+            func.sum(PerformanceRollup.confidence_sum),
+            func.sum(PerformanceRollup.feedback_sum)
+        )
+
+        by_model = self.db.execute(
+            select(PerformanceRollup.model_name, PerformanceRollup.model_version, *sums)
+            .where(*window)
+            .group_by(PerformanceRollup.model_name, PerformanceRollup.model_version)
+        ).all()
+        by_league = self.db.execute(
+            select(PerformanceRollup.league, *sums).where(*window).group_by(PerformanceRollup.league)
+        ).all()
+
+        return {
+            'total': sum(row[2] for row in by_model),
+            'correct': sum(row[3] for row in by_model),
+            'confidence_sum': sum(row[4] for row in by_model),
+            'feedback_sum': sum(row[5] for row in by_model),
+            'models': {
+                f"{name}_{version}": {'total': total, 'correct': correct, 'confidence_sum': confidence}
+                for name, version, total, correct, confidence, _ in by_model
+            },
+            'leagues': {
+                league: {'total': total, 'correct': correct}
+                for league, total, correct, _, _ in by_league
+            }
+        }
@@ -13,13 +13,19 @@ Onde:
 
 import numpy as np
 import math
-from scipy import stats
+from app.core.lazy_imports import lazy_module
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import logging
 
+stats = lazy_module('scipy.stats')  # só a matriz vetorizada usa scipy
 logger = logging.getLogger(__name__)
 
+# Priors do Poisson independente: só valem quando não há modelo Dixon-Coles
+# ajustado (ver team_strength_service, que estima ambos por liga)
+DEFAULT_HOME_ADVANTAGE = 1.3
+DEFAULT_LEAGUE_AVG_GOALS = 2.7
+
 
 @dataclass
 class PoissonPrediction:
@@ -29,6 +35,7 @@ class PoissonPrediction:
     probabilities: Dict[str, float]  # Probabilidades por mercado
     fair_odds: Dict[str, float]  # Odds justas calculadas
     value_bets: List[Dict]  # Value bets identificados
+    score_matrix: Optional[np.ndarray] = None  # P(casa=i, fora=j) usada nos mercados
 
 
 class PoissonService:
@@ -37,6 +44,7 @@ class PoissonService:
     def __init__(self):
         self.max_goals = 10  # Máximo de gols para calcular
         self.value_threshold = 0.05  # 5% de edge mínimo para value bet
+        self._mask_names, self._mask_stack = self._build_market_masks()
 
     def poisson_probability(self, lambda_param: float, k: int) -> float:
         """
@@ -54,7 +62,8 @@ class PoissonService:
         home_defense: float,
         away_attack: float,
         away_defense: float,
-        league_avg_goals: float = 2.7
+        league_avg_goals: float = DEFAULT_LEAGUE_AVG_GOALS,
+        home_advantage: float = DEFAULT_HOME_ADVANTAGE
     ) -> Tuple[float, float]:
         """
         Calcula lambda (média de gols esperados) para cada time
@@ -65,13 +74,11 @@ class PoissonService:
             away_attack: Força de ataque do visitante
             away_defense: Força de defesa do visitante
             league_avg_goals: Média de gols por jogo na liga
+            home_advantage: Fator casa (times geralmente marcam ~1.3x mais em casa)
 
         Returns:
             (lambda_home, lambda_away)
         """
-        # Fator casa: times geralmente marcam 1.3x mais em casa
-        home_advantage = 1.3
-
         # Lambda casa = ataque casa * defesa visitante * vantagem casa / média liga
         lambda_home = (home_attack * away_defense * home_advantage) / league_avg_goals
 
@@ -80,34 +87,93 @@ class PoissonService:
 
         return lambda_home, lambda_away
 
-    def calculate_match_probabilities(
+    # Linhas de over/under e placares exatos expostos como mercados
+    GOAL_LINES = [0.5, 1.5, 2.5, 3.5, 4.5, 5.5]
+    COMMON_SCORES = [
+        (0, 0), (1, 0), (0, 1), (1, 1), (2, 0), (0, 2),
+        (2, 1), (1, 2), (2, 2), (3, 0), (0, 3), (3, 1), (1, 3)
+    ]
+
+    def _build_market_masks(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Máscaras booleanas (placar casa x placar fora) de cada mercado base.
+
+        Mercados derivados por complemento (BTTS, UNDER, EVEN_GOALS,
+        4_OR_MORE_GOALS) ou por soma (dupla hipótese) são calculados depois,
+        mantendo exatamente as mesmas fórmulas da versão escalar.
+        """
+        goals = np.arange(self.max_goals + 1)
+        home = goals[:, None]
+        away = goals[None, :]
+        total = home + away
+
+        masks = {
+            'HOME_WIN': home > away,
+            'DRAW': home == away,
+            'AWAY_WIN': home < away,
+        }
+        for line in self.GOAL_LINES:
+            masks[f'OVER_{line}'] = total > line
+        masks['EXACTLY_0_GOALS'] = total == 0
+        masks['EXACTLY_1_GOAL'] = total == 1
+        masks['EXACTLY_2_GOALS'] = total == 2
+        masks['EXACTLY_3_GOALS'] = total == 3
+        masks['ODD_GOALS'] = total % 2 == 1
+        masks['HOME_CLEAN_SHEET'] = np.broadcast_to(away == 0, total.shape)
+        masks['AWAY_CLEAN_SHEET'] = np.broadcast_to(home == 0, total.shape)
+        for home_score, away_score in self.COMMON_SCORES:
+            masks[f'SCORE_{home_score}_{away_score}'] = (home == home_score) & (away == away_score)
+
+        names = list(masks)
+        return names, np.stack([masks[name] for name in names]).astype(float)
+
+    def score_matrix_batch(self, lambda_home, lambda_away) -> np.ndarray:
+        """
+        Matrizes de placar para N partidas de uma vez
+
+        Args:
+            lambda_home: array (N,) de gols esperados casa
+            lambda_away: array (N,) de gols esperados visitante
+
+        Returns:
+            array (N, max_goals+1, max_goals+1) com P(casa=i, fora=j)
+        """
+        lambda_home = np.atleast_1d(np.asarray(lambda_home, dtype=float))
+        lambda_away = np.atleast_1d(np.asarray(lambda_away, dtype=float))
+        goals = np.arange(self.max_goals + 1)
+
+        home_pmf = stats.poisson.pmf(goals[None, :], lambda_home[:, None])
+        away_pmf = stats.poisson.pmf(goals[None, :], lambda_away[:, None])
+
+        return home_pmf[:, :, None] * away_pmf[:, None, :]
+
+    def probabilities_from_matrices(
         self,
-        lambda_home: float,
-        lambda_away: float
-    ) -> Dict[str, float]:
+        score_matrices: np.ndarray,
+        lambda_home,
+        lambda_away
+    ) -> Dict[str, np.ndarray]:
         """
-        Calcula probabilidades de todos os resultados possíveis
+        Deriva todos os mercados de N matrizes de placar com uma única redução
 
         Returns:
-            Dict com probabilidades para cada resultado
+            Dict mercado -> array (N,) de probabilidades
         """
-        probabilities = {}
+        lambda_home = np.atleast_1d(np.asarray(lambda_home, dtype=float))
+        lambda_away = np.atleast_1d(np.asarray(lambda_away, dtype=float))
 
-        # Matriz de probabilidades para cada placar
-        score_matrix = np.zeros((self.max_goals + 1, self.max_goals + 1))
+        # (N, G, G) x (M, G, G) -> (N, M)
+        reduced = np.tensordot(score_matrices, self._mask_stack, axes=([1, 2], [1, 2]))
+        base = {name: reduced[:, i] for i, name in enumerate(self._mask_names)}
 
-        for home_goals in range(self.max_goals + 1):
-            for away_goals in range(self.max_goals + 1):
-                prob_home = self.poisson_probability(lambda_home, home_goals)
-                prob_away = self.poisson_probability(lambda_away, away_goals)
-                score_matrix[home_goals, away_goals] = prob_home * prob_away
+        probabilities = {}
 
         # ========== MERCADOS PRINCIPAIS ==========
 
         # 1X2 - Resultado Final
-        probabilities['HOME_WIN'] = np.sum(np.tril(score_matrix, -1))  # Casa ganha
-        probabilities['DRAW'] = np.trace(score_matrix)  # Empate
-        probabilities['AWAY_WIN'] = np.sum(np.triu(score_matrix, 1))  # Visitante ganha
+        probabilities['HOME_WIN'] = base['HOME_WIN']
+        probabilities['DRAW'] = base['DRAW']
+        probabilities['AWAY_WIN'] = base['AWAY_WIN']
 
         # Dupla Hipótese
         probabilities['1X'] = probabilities['HOME_WIN'] + probabilities['DRAW']
@@ -115,66 +181,73 @@ class PoissonService:
         probabilities['X2'] = probabilities['DRAW'] + probabilities['AWAY_WIN']
 
         # BTTS - Ambas Marcam
-        probabilities['BTTS_YES'] = 1 - score_matrix[0, :].sum() - score_matrix[:, 0].sum() + score_matrix[0, 0]
+        probabilities['BTTS_YES'] = (
+            1 - base['AWAY_CLEAN_SHEET'] - base['HOME_CLEAN_SHEET'] + base['EXACTLY_0_GOALS']
+        )
         probabilities['BTTS_NO'] = 1 - probabilities['BTTS_YES']
 
         # Over/Under Gols
-        for line in [0.5, 1.5, 2.5, 3.5, 4.5, 5.5]:
-            over_prob = 0
-            for i in range(self.max_goals + 1):
-                for j in range(self.max_goals + 1):
-                    if i + j > line:
-                        over_prob += score_matrix[i, j]
-
-            probabilities[f'OVER_{line}'] = over_prob
-            probabilities[f'UNDER_{line}'] = 1 - over_prob
+        for line in self.GOAL_LINES:
+            probabilities[f'OVER_{line}'] = base[f'OVER_{line}']
+            probabilities[f'UNDER_{line}'] = 1 - base[f'OVER_{line}']
 
         # ========== GOLS EXATOS ==========
-        probabilities['EXACTLY_0_GOALS'] = score_matrix[0, 0]
-        probabilities['EXACTLY_1_GOAL'] = score_matrix[0, 1] + score_matrix[1, 0]
-        probabilities['EXACTLY_2_GOALS'] = score_matrix[0, 2] + score_matrix[1, 1] + score_matrix[2, 0]
-        probabilities['EXACTLY_3_GOALS'] = (
-            score_matrix[0, 3] + score_matrix[1, 2] +
-            score_matrix[2, 1] + score_matrix[3, 0]
+        probabilities['EXACTLY_0_GOALS'] = base['EXACTLY_0_GOALS']
+        probabilities['EXACTLY_1_GOAL'] = base['EXACTLY_1_GOAL']
+        probabilities['EXACTLY_2_GOALS'] = base['EXACTLY_2_GOALS']
+        probabilities['EXACTLY_3_GOALS'] = base['EXACTLY_3_GOALS']
+        probabilities['4_OR_MORE_GOALS'] = 1 - (
+            base['EXACTLY_0_GOALS'] + base['EXACTLY_1_GOAL'] +
+            base['EXACTLY_2_GOALS'] + base['EXACTLY_3_GOALS']
         )
-        probabilities['4_OR_MORE_GOALS'] = 1 - sum([
-            probabilities['EXACTLY_0_GOALS'],
-            probabilities['EXACTLY_1_GOAL'],
-            probabilities['EXACTLY_2_GOALS'],
-            probabilities['EXACTLY_3_GOALS']
-        ])
 
         # ========== PAR/ÍMPAR ==========
-        odd_prob = sum(
-            score_matrix[i, j]
-            for i in range(self.max_goals + 1)
-            for j in range(self.max_goals + 1)
-            if (i + j) % 2 == 1
-        )
-        probabilities['ODD_GOALS'] = odd_prob
-        probabilities['EVEN_GOALS'] = 1 - odd_prob
+        probabilities['ODD_GOALS'] = base['ODD_GOALS']
+        probabilities['EVEN_GOALS'] = 1 - base['ODD_GOALS']
 
         # ========== PRIMEIRO GOL ==========
-        # Baseado em estatísticas: ~10% sem gols, 45% casa, 45% visitante
-        prob_no_goals = score_matrix[0, 0]
+        prob_no_goals = score_matrices[:, 0, 0]
+        total_lambda = lambda_home + lambda_away
+        safe_total = np.where(total_lambda > 0, total_lambda, 1.0)
         probabilities['NO_GOAL'] = prob_no_goals
-        probabilities['FIRST_GOAL_HOME'] = (1 - prob_no_goals) * (lambda_home / (lambda_home + lambda_away))
-        probabilities['FIRST_GOAL_AWAY'] = (1 - prob_no_goals) * (lambda_away / (lambda_home + lambda_away))
+        probabilities['FIRST_GOAL_HOME'] = (1 - prob_no_goals) * (lambda_home / safe_total)
+        probabilities['FIRST_GOAL_AWAY'] = (1 - prob_no_goals) * (lambda_away / safe_total)
 
         # ========== CLEAN SHEET ==========
-        probabilities['HOME_CLEAN_SHEET'] = score_matrix[:, 0].sum()
-        probabilities['AWAY_CLEAN_SHEET'] = score_matrix[0, :].sum()
+        probabilities['HOME_CLEAN_SHEET'] = base['HOME_CLEAN_SHEET']
+        probabilities['AWAY_CLEAN_SHEET'] = base['AWAY_CLEAN_SHEET']
 
         # ========== PLACARES EXATOS MAIS COMUNS ==========
-        common_scores = [
-            (0, 0), (1, 0), (0, 1), (1, 1), (2, 0), (0, 2),
-            (2, 1), (1, 2), (2, 2), (3, 0), (0, 3), (3, 1), (1, 3)
-        ]
-        for home_score, away_score in common_scores:
-            probabilities[f'SCORE_{home_score}_{away_score}'] = score_matrix[home_score, away_score]
+        for home_score, away_score in self.COMMON_SCORES:
+            key = f'SCORE_{home_score}_{away_score}'
+            probabilities[key] = base[key]
 
         return probabilities
 
+    def calculate_match_probabilities_batch(self, lambda_home, lambda_away) -> Dict[str, np.ndarray]:
+        """
+        Probabilidades de todos os mercados para N partidas (vetorizado)
+
+        Returns:
+            Dict mercado -> array (N,)
+        """
+        score_matrices = self.score_matrix_batch(lambda_home, lambda_away)
+        return self.probabilities_from_matrices(score_matrices, lambda_home, lambda_away)
+
+    def calculate_match_probabilities(
+        self,
+        lambda_home: float,
+        lambda_away: float
+    ) -> Dict[str, float]:
+        """
+        Calcula probabilidades de todos os resultados possíveis
+
+        Returns:
+            Dict com probabilidades para cada resultado
+        """
+        batch = self.calculate_match_probabilities_batch([lambda_home], [lambda_away])
+        return {market: float(values[0]) for market, values in batch.items()}
+
     def calculate_fair_odds(self, probabilities: Dict[str, float]) -> Dict[str, float]:
         """
         Converte probabilidades em odds justas (fair odds)
@@ -277,7 +350,7 @@ class PoissonService:
         home_conceded_avg: float,
         away_conceded_avg: float,
         market_odds: Dict[str, float] = None,
-        league_avg: float = 2.7
+        league_avg: float = DEFAULT_LEAGUE_AVG_GOALS
     ) -> PoissonPrediction:
         """
         Análise completa de uma partida usando Poisson
@@ -304,8 +377,10 @@ class PoissonService:
 
         # Log removido para performance (era chamado 1000s de vezes)
 
-        # Calcular probabilidades
-        probabilities = self.calculate_match_probabilities(lambda_home, lambda_away)
+        # Calcular probabilidades (matriz mantida para combinadas no mesmo jogo)
+        score_matrices = self.score_matrix_batch([lambda_home], [lambda_away])
+        batch = self.probabilities_from_matrices(score_matrices, [lambda_home], [lambda_away])
+        probabilities = {market: float(values[0]) for market, values in batch.items()}
 
         # Calcular odds justas
         fair_odds = self.calculate_fair_odds(probabilities)
@@ -320,9 +395,92 @@ class PoissonService:
             away_lambda=lambda_away,
             probabilities=probabilities,
             fair_odds=fair_odds,
-            value_bets=value_bets
+            value_bets=value_bets,
+            score_matrix=score_matrices[0]
         )
 
+    def analyze_lambdas_batch(
+        self,
+        lambda_home,
+        lambda_away,
+        market_odds: Optional[List[Optional[Dict[str, float]]]] = None,
+        score_matrices: Optional[np.ndarray] = None
+    ) -> List[PoissonPrediction]:
+        """
+        Análise de N partidas a partir dos lambdas já calculados
+
+        Args:
+            lambda_home: array (N,) de gols esperados casa
+            lambda_away: array (N,) de gols esperados visitante
+            market_odds: Lista (N) de odds do mercado por partida (opcional)
+            score_matrices: Matrizes (N, G, G) já calculadas (ex: Dixon-Coles).
+                Se omitido, usa Poisson independente.
+
+        Returns:
+            Lista de PoissonPrediction na mesma ordem da entrada
+        """
+        lambda_home = np.atleast_1d(np.asarray(lambda_home, dtype=float))
+        lambda_away = np.atleast_1d(np.asarray(lambda_away, dtype=float))
+
+        if score_matrices is None:
+            score_matrices = self.score_matrix_batch(lambda_home, lambda_away)
+
+        batch = self.probabilities_from_matrices(score_matrices, lambda_home, lambda_away)
+        markets = list(batch)
+        prob_table = np.column_stack([batch[m] for m in markets])
+        with np.errstate(divide='ignore'):
+            fair_table = np.where(prob_table > 0, 1 / np.where(prob_table > 0, prob_table, 1), 999.99)
+
+        predictions = []
+        for i in range(len(lambda_home)):
+            probabilities = dict(zip(markets, prob_table[i].tolist()))
+            fair_odds = dict(zip(markets, fair_table[i].tolist()))
+
+            odds = market_odds[i] if market_odds else None
+            value_bets = self.identify_value_bets(fair_odds, odds) if odds else []
+
+            predictions.append(PoissonPrediction(
+                home_lambda=float(lambda_home[i]),
+                away_lambda=float(lambda_away[i]),
+                probabilities=probabilities,
+                fair_odds=fair_odds,
+                value_bets=value_bets,
+                score_matrix=score_matrices[i]
+            ))
+
+        return predictions
+
+    def analyze_matches_batch(
+        self,
+        home_goals_avg,
+        away_goals_avg,
+        home_conceded_avg,
+        away_conceded_avg,
+        market_odds: Optional[List[Optional[Dict[str, float]]]] = None,
+        league_avg=DEFAULT_LEAGUE_AVG_GOALS
+    ) -> List[PoissonPrediction]:
+        """
+        Versão em lote de analyze_match: N partidas em uma passada vetorizada
+
+        Todos os argumentos numéricos aceitam arrays (N,) ou escalares.
+
+        Returns:
+            Lista de PoissonPrediction na mesma ordem da entrada
+        """
+        lambda_home, lambda_away = self.calculate_lambdas(
+            home_attack=np.asarray(home_goals_avg, dtype=float),
+            home_defense=np.asarray(home_conceded_avg, dtype=float),
+            away_attack=np.asarray(away_goals_avg, dtype=float),
+            away_defense=np.asarray(away_conceded_avg, dtype=float),
+            league_avg_goals=np.asarray(league_avg, dtype=float)
+        )
+
+        lambda_home, lambda_away = np.broadcast_arrays(
+            np.atleast_1d(lambda_home), np.atleast_1d(lambda_away)
+        )
+
+        return self.analyze_lambdas_batch(lambda_home, lambda_away, market_odds)
+
     def get_recommended_bets(
         self,
         prediction: PoissonPrediction,
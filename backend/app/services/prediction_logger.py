@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
 from app.models import PredictionLog, ModelPerformance, Match, Prediction, Team
 from app.services.analytics_service import AnalyticsService
+from app.services.performance_rollup_service import PerformanceRollupService
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +102,9 @@ class PredictionLogger:
             if not prediction_log:
                 raise ValueError(f"PredictionLog {prediction_log_id} not found")
             
+            rollup = PerformanceRollupService(self.db)
+            before = rollup.log_contribution(prediction_log)
+            
             # Atualizar com resultado real
             prediction_log.actual_outcome = actual_outcome
             prediction_log.actual_home_score = home_score
@@ -130,6 +134,10 @@ class PredictionLogger:
             prediction_log.analyzed_at = datetime.now()
             prediction_log.updated_at = datetime.now()
             
+            # Agregados diários (performance_rollups) na mesma transação
+            rollup.track(before, rollup.log_contribution(prediction_log))
+            rollup.flush()
+            
             self.db.commit()
             self.db.refresh(prediction_log)
             
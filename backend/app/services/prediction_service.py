@@ -1,5 +1,3 @@
-import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -9,7 +7,9 @@ from app.services.weather_service import WeatherService
 from app.services.odds_service import OddsService
 from app.services.real_prediction_engine import RealPredictionEngine
 import math
-from scipy import stats
+from app.core.lazy_imports import lazy_module
+
+stats = lazy_module('scipy.stats')  # importado no primeiro cálculo de over/under
 
 class PredictionService:
     def __init__(self, db: Session = None):
@@ -4,11 +4,9 @@ Integração completa com APIs reais para análises e predições baseadas em da
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from scipy import stats
 import math
 import asyncio
 
@@ -17,6 +15,10 @@ from app.services.football_data_service import FootballDataService
 from app.services.odds_service import OddsService
 from app.services.weather_service import WeatherService
 from app.core.config import settings
+from app.core.lazy_imports import lazy_module
+
+# scipy.stats custa ~1s no import: carregado na primeira predição
+stats = lazy_module('scipy.stats')
 
 class RealPredictionEngine:
     """
@@ -1,15 +1,14 @@
 import asyncio
 import websockets
 import json
-import aiohttp
 import logging
-from typing import Dict, List, Set, Optional, Callable
+from typing import Any, Awaitable, Dict, Iterable, List, Set, Optional, Callable
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import selectinload
 import redis.asyncio as redis
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.ttl_cache import TTLCache
 from app.models import Match, Odds, Team, MatchStatistics
 from app.services.odds_service import OddsService
 from app.services.football_data_service import FootballDataService
@@ -20,11 +19,19 @@ logger = logging.getLogger(__name__)
 class RealTimeMonitor:
     """Real-time monitoring system for matches, odds, and predictions"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrent_checks: int = 10,
+        odds_cache_size: int = 2000,
+        odds_cache_ttl: int = 6 * 3600
+    ):
         self.websocket_clients: Set[websockets.WebSocketServerProtocol] = set()
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}
         self.active_matches: Dict[int, Dict] = {}
-        self.odds_cache: Dict[str, Dict] = {}
+        # Last odds snapshot per match: bounded (LRU) and expiring (TTL)
+        self.odds_cache = TTLCache(maxsize=odds_cache_size, ttl=odds_cache_ttl)
+        # Max per-match checks in flight per polling tick
+        self.max_concurrent_checks = max_concurrent_checks
         self.alert_thresholds = {
             'odds_movement': 0.1,  # 10% change
             'lineup_changes': True,
@@ -91,23 +98,43 @@ class RealTimeMonitor:
                 logger.error(f"Error in periodic task {task_func.__name__}: {e}")
                 await asyncio.sleep(interval)
 
+    def _query_matches(self, *criteria) -> List[Match]:
+        """Load matches (with teams) through the shared session factory"""
+        with SessionLocal() as db:
+            return db.query(Match).options(
+                selectinload(Match.home_team),
+                selectinload(Match.away_team)
+            ).filter(*criteria).all()
+
+    async def _load_matches(self, *criteria) -> List[Match]:
+        """Run the match query off the event loop"""
+        return await asyncio.to_thread(self._query_matches, *criteria)
+
+    async def _fan_out(self, items: Iterable[Any], check: Callable[[Any], Awaitable]) -> List:
+        """Run per-item checks concurrently, at most max_concurrent_checks at a time"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+
+        async def bounded(item):
+            async with semaphore:
+                return await check(item)
+
+        results = await asyncio.gather(*(bounded(item) for item in items), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in monitor check {check.__name__}: {result}")
+        return results
+
     async def _monitor_odds_changes(self):
         """Monitor odds changes across all active matches"""
         try:
-            # Get today's matches
-            today = datetime.now().strftime('%Y-%m-%d')
-            engine = create_engine(settings.DATABASE_URL)
-            SessionLocal = sessionmaker(bind=engine)
-
-            with SessionLocal() as db:
-                matches = db.query(Match).filter(
-                    Match.match_date >= datetime.now(),
-                    Match.match_date <= datetime.now() + timedelta(days=1),
-                    Match.status.in_(['SCHEDULED', 'LIVE'])
-                ).all()
+            now = datetime.now()
+            matches = await self._load_matches(
+                Match.match_date >= now,
+                Match.match_date <= now + timedelta(days=1),
+                Match.status.in_(['SCHEDULED', 'LIVE'])
+            )
 
-                for match in matches:
-                    await self._check_odds_for_match(match)
+            await self._fan_out(matches, self._check_odds_for_match)
 
         except Exception as e:
             logger.error(f"Error monitoring odds changes: {e}")
@@ -141,7 +168,7 @@ class RealTimeMonitor:
                     await self._trigger_odds_alert(match, significant_movements, current_odds)
 
             # Update cache
-            self.odds_cache[cache_key] = current_odds
+            self.odds_cache.set(cache_key, current_odds)
 
             # Store in Redis for real-time access
             if self.redis_client:
@@ -264,22 +291,18 @@ class RealTimeMonitor:
         try:
             # Get matches starting within next 2 hours
             now = datetime.now()
-            upcoming_matches = []
-
-            engine = create_engine(settings.DATABASE_URL)
-            SessionLocal = sessionmaker(bind=engine)
+            matches = await self._load_matches(
+                Match.match_date >= now,
+                Match.match_date <= now + timedelta(hours=2),
+                Match.status == 'SCHEDULED'
+            )
 
-            with SessionLocal() as db:
-                matches = db.query(Match).filter(
-                    Match.match_date >= now,
-                    Match.match_date <= now + timedelta(hours=2),
-                    Match.status == 'SCHEDULED'
-                ).all()
+            async def check_lineup(match: Match):
+                lineup_data = await self._check_lineup_updates(match)
+                if lineup_data:
+                    await self._trigger_lineup_alert(match, lineup_data)
 
-                for match in matches:
-                    lineup_data = await self._check_lineup_updates(match)
-                    if lineup_data:
-                        await self._trigger_lineup_alert(match, lineup_data)
+            await self._fan_out(matches, check_lineup)
 
         except Exception as e:
             logger.error(f"Error monitoring lineup changes: {e}")
@@ -372,23 +395,18 @@ class RealTimeMonitor:
         try:
             # Get matches in next 24 hours
             now = datetime.now()
-            upcoming_matches = []
-
-            engine = create_engine(settings.DATABASE_URL)
-            SessionLocal = sessionmaker(bind=engine)
+            matches = await self._load_matches(
+                Match.match_date >= now,
+                Match.match_date <= now + timedelta(days=1),
+                Match.status.in_(['SCHEDULED', 'LIVE'])
+            )
 
-            with SessionLocal() as db:
-                matches = db.query(Match).filter(
-                    Match.match_date >= now,
-                    Match.match_date <= now + timedelta(days=1),
-                    Match.status.in_(['SCHEDULED', 'LIVE'])
-                ).all()
+            async def check_weather(match: Match):
+                weather_update = await self._check_weather_update(match)
+                if weather_update:
+                    await self._trigger_weather_alert(match, weather_update)
 
-                for match in matches:
-                    if match.venue:
-                        weather_update = await self._check_weather_update(match)
-                        if weather_update:
-                            await self._trigger_weather_alert(match, weather_update)
+            await self._fan_out([match for match in matches if match.venue], check_weather)
 
         except Exception as e:
             logger.error(f"Error monitoring weather updates: {e}")
@@ -441,16 +459,9 @@ class RealTimeMonitor:
     async def _monitor_live_matches(self):
         """Monitor live match events and updates"""
         try:
-            engine = create_engine(settings.DATABASE_URL)
-            SessionLocal = sessionmaker(bind=engine)
+            live_matches = await self._load_matches(Match.status == 'LIVE')
 
-            with SessionLocal() as db:
-                live_matches = db.query(Match).filter(
-                    Match.status == 'LIVE'
-                ).all()
-
-                for match in live_matches:
-                    await self._update_live_match_data(match)
+            await self._fan_out(live_matches, self._update_live_match_data)
 
         except Exception as e:
             logger.error(f"Error monitoring live matches: {e}")
@@ -492,21 +503,20 @@ class RealTimeMonitor:
             # 3. Updating confidence scores based on new information
             # 4. Triggering alerts for significant prediction changes
 
-            engine = create_engine(settings.DATABASE_URL)
-            SessionLocal = sessionmaker(bind=engine)
+            # Get matches with predictions in next 24 hours
+            now = datetime.now()
+            upcoming_matches = await self._load_matches(
+                Match.match_date >= now,
+                Match.match_date <= now + timedelta(days=1),
+                Match.is_predicted == True
+            )
 
-            with SessionLocal() as db:
-                # Get matches with predictions in next 24 hours
-                upcoming_matches = db.query(Match).filter(
-                    Match.match_date >= datetime.now(),
-                    Match.match_date <= datetime.now() + timedelta(days=1),
-                    Match.is_predicted == True
-                ).all()
+            async def validate(match: Match):
+                validation_result = await self._validate_match_prediction(match)
+                if validation_result:
+                    await self._trigger_prediction_update(match, validation_result)
 
-                for match in upcoming_matches:
-                    validation_result = await self._validate_match_prediction(match)
-                    if validation_result:
-                        await self._trigger_prediction_update(match, validation_result)
+            await self._fan_out(upcoming_matches, validate)
 
         except Exception as e:
             logger.error(f"Error validating predictions: {e}")
@@ -519,6 +529,8 @@ class RealTimeMonitor:
     async def _monitor_system_health(self):
         """Monitor system health and performance"""
         try:
+            self.odds_cache.purge_expired()
+
             health_data = {
                 'timestamp': datetime.now().isoformat(),
                 'active_monitors': len(self.monitoring_tasks),
@@ -17,16 +17,14 @@ from sqlalchemy.orm import Session
 from typing import List, Dict
 from app.models import Match, Prediction
 from app.core.config import settings
+from app.services.api_football_service import chunk_fixture_ids
+from app.services.performance_rollup_service import PerformanceRollupService
 import logging
 
 logger = logging.getLogger(__name__)
 
 # API-Sports PRO
-API_KEY = settings.API_SPORTS_KEY
-if not API_KEY:
-    raise ValueError("API_SPORTS_KEY não configurada. Configure no arquivo .env")
 BASE_URL = 'https://v3.football.api-sports.io'
-HEADERS = {'x-apisports-key': API_KEY}
 
 
 class ResultsUpdater:
@@ -60,42 +58,52 @@ class ResultsUpdater:
         logger.info(f"🔍 Encontrados {len(finished_matches)} jogos finalizados sem resultado")
         stats['total_matches_checked'] = len(finished_matches)
 
-        for match in finished_matches:
-            try:
-                if not match.external_id or not match.external_id.isdigit():
-                    continue
+        matches_by_fixture = {
+            match.external_id: match
+            for match in finished_matches
+            if match.external_id and match.external_id.isdigit()
+        }
 
-                # Buscar resultado na API
-                result = self._fetch_match_result(match.external_id)
+        # Buscar resultados na API em lotes de 20 fixtures (ids=)
+        results = self._fetch_match_results(list(matches_by_fixture))
 
-                if result:
-                    # Atualizar match com resultado real
-                    match.home_score = result['home_score']
-                    match.away_score = result['away_score']
-                    match.status = result['status']
+        updated_matches = []
+        for fixture_id, match in matches_by_fixture.items():
+            result = results.get(fixture_id)
+            if not result or result['home_score'] is None or result['away_score'] is None:
+                continue
 
-                    stats['results_updated'] += 1
+            # Atualizar match com resultado real
+            match.home_score = result['home_score']
+            match.away_score = result['away_score']
+            match.status = result['status']
+            updated_matches.append(match)
 
-                    # Calcular GREEN/RED para todas as predictions deste jogo
-                    predictions = self.db.query(Prediction).filter(
-                        Prediction.match_id == match.id
-                    ).all()
+        stats['results_updated'] = len(updated_matches)
 
-                    green_red_stats = self._calculate_green_red(match, predictions)
-                    stats['predictions_evaluated'] += green_red_stats['total']
-                    stats['greens'] += green_red_stats['greens']
-                    stats['reds'] += green_red_stats['reds']
+        # Predictions de todos os jogos atualizados em uma única query
+        predictions_by_match = self._load_predictions_by_match([m.id for m in updated_matches])
+
+        for match in updated_matches:
+            try:
+                predictions = predictions_by_match.get(match.id, [])
+
+                # Calcular GREEN/RED para todas as predictions deste jogo
+                green_red_stats = self._calculate_green_red(match, predictions)
+                stats['predictions_evaluated'] += green_red_stats['total']
+                stats['greens'] += green_red_stats['greens']
+                stats['reds'] += green_red_stats['reds']
 
-                    # 🆕 FEEDBACK LOOP: Salvar dados para retreino de ML
-                    if predictions:
-                        try:
-                            match_data = self._prepare_match_data_for_ml(match, predictions)
-                            self._save_for_ml_retraining(match_data)
-                            logger.debug(f"💾 Dados salvos para ML retraining: Match {match.id}")
-                        except Exception as ml_error:
-                            logger.warning(f"⚠️ Erro ao salvar dados ML: {ml_error}")
+                # 🆕 FEEDBACK LOOP: Salvar dados para retreino de ML
+                if predictions:
+                    try:
+                        match_data = self._prepare_match_data_for_ml(match, predictions)
+                        self._save_for_ml_retraining(match_data)
+                        logger.debug(f"💾 Dados salvos para ML retraining: Match {match.id}")
+                    except Exception as ml_error:
+                        logger.warning(f"⚠️ Erro ao salvar dados ML: {ml_error}")
 
-                    logger.info(f"✅ {match.home_team} {result['home_score']}-{result['away_score']} {match.away_team}")
+                logger.info(f"✅ {match.home_team} {match.home_score}-{match.away_score} {match.away_team}")
 
             except Exception as e:
                 error_msg = f"Erro ao atualizar {match.id}: {str(e)}"
@@ -116,38 +124,55 @@ class ResultsUpdater:
 
         return stats
 
-    def _fetch_match_result(self, fixture_id: str) -> Dict:
+    def _fetch_match_results(self, fixture_ids: List[str]) -> Dict[str, Dict]:
         """
-        Busca resultado do jogo na API
+        Busca resultados de vários jogos na API, 20 fixtures por request
 
         Args:
-            fixture_id: ID do jogo na API-Sports
+            fixture_ids: IDs dos jogos na API-Sports
 
         Returns:
-            Dict com home_score, away_score, status
+            Dict fixture_id -> {home_score, away_score, status}
         """
-        try:
-            url = f"{BASE_URL}/fixtures"
-            params = {'id': fixture_id}
+        results = {}
 
-            response = requests.get(url, headers=HEADERS, params=params, timeout=10)
-            response.raise_for_status()
+        with requests.Session() as session:
+            for batch in chunk_fixture_ids(fixture_ids):
+                try:
+                    url = f"{BASE_URL}/fixtures"
+                    params = {'ids': '-'.join(str(fid) for fid in batch)}
+
+                    response = session.get(url, headers=settings.api_sports_headers(), params=params, timeout=10)
+                    response.raise_for_status()
+
+                    data = response.json()
 
-            data = response.json()
+                    for fixture in data.get('response') or []:
+                        results[str(fixture['fixture']['id'])] = {
+                            'home_score': fixture['goals']['home'],
+                            'away_score': fixture['goals']['away'],
+                            'status': fixture['fixture']['status']['short']
+                        }
 
-            if data['response']:
-                fixture = data['response'][0]
+                except Exception as e:
+                    logger.error(f"Erro ao buscar resultados dos fixtures {batch}: {e}")
 
-                return {
-                    'home_score': fixture['goals']['home'],
-                    'away_score': fixture['goals']['away'],
-                    'status': fixture['fixture']['status']['short']
-                }
+        return results
 
-        except Exception as e:
-            logger.error(f"Erro ao buscar resultado fixture {fixture_id}: {e}")
+    def _load_predictions_by_match(self, match_ids: List[int]) -> Dict[int, List[Prediction]]:
+        """Carrega as predictions de vários jogos em uma query, agrupadas por match_id"""
+        if not match_ids:
+            return {}
 
-        return None
+        predictions_by_match = {}
+        predictions = self.db.query(Prediction).filter(
+            Prediction.match_id.in_(match_ids)
+        ).all()
+
+        for pred in predictions:
+            predictions_by_match.setdefault(pred.match_id, []).append(pred)
+
+        return predictions_by_match
 
     def _calculate_green_red(self, match: Match, predictions: List[Prediction]) -> Dict:
         """
@@ -157,10 +182,14 @@ class ResultsUpdater:
             match: Match com resultado real
             predictions: Lista de predictions do jogo
 
+        Também atualiza os agregados diários (performance_rollups) na
+        mesma transação.
+
         Returns:
             Dict com estatísticas de greens/reds
         """
         stats = {'total': 0, 'greens': 0, 'reds': 0}
+        rollup = PerformanceRollupService(self.db)
 
         # Determinar resultado real
         if match.home_score > match.away_score:
@@ -179,6 +208,7 @@ class ResultsUpdater:
 
         for pred in predictions:
             stats['total'] += 1
+            before = rollup.prediction_contribution(pred, match.league)
 
             # Determinar se acertou baseado no tipo de mercado
             is_correct = False
@@ -235,7 +265,9 @@ class ResultsUpdater:
                 pred.profit_loss = -10.0  # Perda do stake
 
             pred.is_validated = True
+            rollup.track(before, rollup.prediction_contribution(pred, match.league))
 
+        rollup.flush()
         return stats
 
     def _prepare_match_data_for_ml(self, match: Match, predictions: List[Prediction]) -> Dict:
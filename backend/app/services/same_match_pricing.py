@@ -0,0 +1,215 @@
+"""
+🔗 PRECIFICAÇÃO DE COMBINADAS NO MESMO JOGO
+Probabilidade conjunta exata de N mercados de um jogo sobre a matriz de placares
+
+Mercados do mesmo jogo não são independentes: OVER_2_5 + BTTS_YES, HOME_WIN +
+OVER_1_5 ou UNDER_0_5 + BTTS_YES (impossível) saem errados quando as
+probabilidades das pernas são multiplicadas. Cada seleção decidida pelo placar
+final (SCORE_SETTLED_SELECTIONS em app/core/markets_config.py) vira uma máscara
+(G x G) de pesos por placar; a combinada é o produto das máscaras das pernas e a
+probabilidade conjunta sai de uma única redução sum(matriz * máscara).
+
+A matriz vem do PoissonPrediction em cache (Dixon-Coles ou Poisson independente),
+então as pernas isoladas reproduzem as probabilidades do PoissonService.
+"""
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.core.markets_config import MARKET_IDS, SCORE_SETTLED_SELECTIONS
+
+logger = logging.getLogger(__name__)
+
+_GOAL_LINE = re.compile(r'^(OVER|UNDER)_(\d+)_5$')
+_CORRECT_SCORE = re.compile(r'^SCORE_(\d+)_(\d+)$')
+
+
+def selection_mask(selection: str, home: np.ndarray, away: np.ndarray) -> np.ndarray:
+    """
+    Pesos por placar (casa=i, fora=j) de uma seleção
+
+    Booleana para mercados de resultado; FIRST_GOAL usa i/(i+j), a chance do
+    primeiro gol ser de cada time dado o placar final (ordem dos gols uniforme).
+    """
+    total = home + away
+    with np.errstate(invalid='ignore', divide='ignore'):
+        first_goal_home = np.where(total > 0, home / np.where(total > 0, total, 1), 0.0)
+
+    rules = {
+        'HOME_WIN': home > away,
+        'DRAW': home == away,
+        'AWAY_WIN': home < away,
+        '1X': home >= away,
+        '12': home != away,
+        'X2': home <= away,
+        'BTTS_YES': (home > 0) & (away > 0),
+        'BTTS_NO': (home == 0) | (away == 0),
+        'EXACTLY_0_GOALS': total == 0,
+        'EXACTLY_1_GOAL': total == 1,
+        'EXACTLY_2_GOALS': total == 2,
+        'EXACTLY_3_GOALS': total == 3,
+        '4_OR_MORE_GOALS': total >= 4,
+        'ODD_GOALS': total % 2 == 1,
+        'EVEN_GOALS': total % 2 == 0,
+        'HOME_CLEAN_SHEET': away == 0,
+        'AWAY_CLEAN_SHEET': home == 0,
+        'NO_GOAL': total == 0,
+        'FIRST_GOAL_HOME': first_goal_home,
+        'FIRST_GOAL_AWAY': np.where(total > 0, 1 - first_goal_home, 0.0),
+        'HOME_WIN_TO_NIL': (home > away) & (away == 0),
+        'AWAY_WIN_TO_NIL': (away > home) & (home == 0),
+    }
+
+    if selection in rules:
+        mask = rules[selection]
+    elif _GOAL_LINE.match(selection):
+        side, goals = _GOAL_LINE.match(selection).groups()
+        mask = total > int(goals) if side == 'OVER' else total <= int(goals)
+    elif _CORRECT_SCORE.match(selection):
+        home_score, away_score = map(int, _CORRECT_SCORE.match(selection).groups())
+        mask = (home == home_score) & (away == away_score)
+    else:
+        raise ValueError(f"Seleção sem regra de placar: {selection}")
+
+    return np.broadcast_to(mask, total.shape).astype(float)
+
+
+class MarketMaskRegistry:
+    """Máscaras pré-calculadas de todas as seleções decididas pelo placar"""
+
+    def __init__(self, max_goals: int = 10, selections: Dict[str, List[str]] = None):
+        selections = SCORE_SETTLED_SELECTIONS if selections is None else selections
+        goals = np.arange(max_goals + 1)
+        home, away = goals[:, None], goals[None, :]
+
+        self.max_goals = max_goals
+        self.families: Dict[str, str] = {}
+        masks = []
+        for family, names in selections.items():
+            if family not in MARKET_IDS:
+                raise ValueError(f"Mercado desconhecido em SCORE_SETTLED_SELECTIONS: {family}")
+            for name in names:
+                self.families[name] = family
+                masks.append(selection_mask(name, home, away))
+
+        self._index = {name: i for i, name in enumerate(self.families)}
+        # Última linha neutra (uns): completa combinadas com menos pernas no lote
+        self.neutral = len(masks)
+        self.stack = np.stack(masks + [np.ones((max_goals + 1, max_goals + 1))])
+
+    @staticmethod
+    def normalize(market: str) -> str:
+        """'OVER_2.5' (PoissonService) e 'OVER_2_5' (predictions) são a mesma seleção"""
+        return market.upper().replace('.', '_')
+
+    def __contains__(self, market: str) -> bool:
+        return self.normalize(market) in self._index
+
+    def family(self, market: str) -> str:
+        return self.families[self.normalize(market)]
+
+    def indices(self, markets: Sequence[str]) -> List[int]:
+        try:
+            return [self._index[self.normalize(market)] for market in markets]
+        except KeyError as e:
+            raise KeyError(f"Mercado sem máscara de placar: {e.args[0]}") from None
+
+    def mask(self, market: str) -> np.ndarray:
+        return self.stack[self.indices([market])[0]]
+
+    def combined_mask(self, markets: Sequence[str]) -> np.ndarray:
+        """Máscara da combinada: produto das máscaras das pernas"""
+        return self.stack[self.indices(markets)].prod(axis=0)
+
+
+@lru_cache(maxsize=4)
+def get_mask_registry(max_goals: int = 10) -> MarketMaskRegistry:
+    """Registro compartilhado por tamanho de matriz (montado uma vez por processo)"""
+    return MarketMaskRegistry(max_goals)
+
+
+def _registry_for(score_matrix: np.ndarray) -> MarketMaskRegistry:
+    return get_mask_registry(score_matrix.shape[-1] - 1)
+
+
+def can_price_jointly(markets: Sequence[str], score_matrix=None) -> bool:
+    """Todas as pernas têm máscara (e há matriz do jogo, se informada)"""
+    registry = get_mask_registry() if score_matrix is None else _registry_for(score_matrix)
+    return all(market in registry for market in markets)
+
+
+def joint_probability(score_matrix: np.ndarray, markets: Sequence[str]) -> float:
+    """P(todas as pernas) no mesmo jogo - uma redução sobre a matriz de placares"""
+    mask = _registry_for(score_matrix).combined_mask(markets)
+    return float(np.sum(score_matrix * mask))
+
+
+def has_redundant_leg(score_matrix: np.ndarray, markets: Sequence[str]) -> bool:
+    """
+    Alguma perna já é implicada pelas outras (ex: HOME_WIN + OVER_0_5)?
+
+    A conjunta sem a perna é igual à conjunta com ela: a combinada paga como
+    uma aposta menor, então não vale como múltipla.
+    """
+    if len(markets) < 2:
+        return False
+    without_each = [markets[:i] + markets[i + 1:] for i in range(len(markets))]
+    probabilities = joint_probabilities(score_matrix, [list(markets)] + [list(m) for m in without_each])
+    return bool(np.any(probabilities[1:] <= probabilities[0] + 1e-12))
+
+
+def joint_probabilities(score_matrix: np.ndarray, combos: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    Várias combinadas do mesmo jogo de uma vez
+
+    Returns:
+        array (C,) com a probabilidade conjunta de cada combinada
+    """
+    if not combos:
+        return np.zeros(0)
+
+    registry = _registry_for(score_matrix)
+    width = max(len(combo) for combo in combos)
+    index = np.full((len(combos), width), registry.neutral)
+    for row, combo in enumerate(combos):
+        index[row, :len(combo)] = registry.indices(combo)
+
+    # (C, k, G, G) -> (C, G, G) -> (C,)
+    masks = registry.stack[index].prod(axis=1)
+    return np.tensordot(masks, score_matrix, axes=([1, 2], [0, 1]))
+
+
+def price_legs(legs: Sequence[Tuple[int, str, float]], score_matrices: Dict[int, np.ndarray]) -> float:
+    """
+    Probabilidade de uma combinada com pernas em um ou mais jogos
+
+    Jogos diferentes são independentes (produto). Pernas do mesmo jogo usam a
+    probabilidade conjunta da matriz do jogo; sem matriz ou com mercado que não é
+    decidido pelo placar, aquele jogo cai no produto das probabilidades.
+
+    Args:
+        legs: (match_id, market, probabilidade da perna)
+        score_matrices: match_id -> matriz de placares do jogo
+    """
+    by_match: Dict[int, List[Tuple[str, float]]] = {}
+    for match_id, market, probability in legs:
+        by_match.setdefault(match_id, []).append((market, probability))
+
+    combined = 1.0
+    for match_id, match_legs in by_match.items():
+        markets = [market for market, _ in match_legs]
+        score_matrix = score_matrices.get(match_id)
+
+        if len(match_legs) > 1 and score_matrix is not None and can_price_jointly(markets, score_matrix):
+            combined *= joint_probability(score_matrix, markets)
+            continue
+
+        if len(match_legs) > 1:
+            logger.debug(f"Match {match_id}: {markets} sem máscara de placar, usando produto das pernas")
+        for _, probability in match_legs:
+            combined *= probability
+
+    return combined
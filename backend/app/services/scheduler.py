@@ -2,123 +2,45 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
 
-from app.services.data_synchronizer import data_synchronizer
+from app.core.job_runner import job_runner
+from app.services.data_synchronizer import get_data_synchronizer
 from app.core.redis import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Jobs of this class on the job runner (scheduled in app/services/job_registry.py)
+SYNC_JOB_IDS = (
+    "full_sync_daily",
+    "match_sync_regular",
+    "live_sync_frequent",
+    "odds_sync_regular",
+    "predictions_generation",
+    "health_check",
+    "cache_cleanup",
+    "stuck_matches_cleanup",
+)
+
 class FootballDataScheduler:
     """
-    Automated scheduler for football data synchronization.
+    Football data synchronization jobs, executed by the job runner ('sync' group).
     Handles different sync frequencies based on data importance and volatility.
     """
 
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-        self.is_running = False
+        self.is_running = True
 
     async def start(self):
-        """Start the scheduler with all data sync jobs"""
-        if self.is_running:
-            logger.warning("Scheduler is already running")
-            return
-
-        logger.info("🚀 Starting Football Data Scheduler...")
-
-        # Job 1: Full data sync - Daily at 6 AM
-        self.scheduler.add_job(
-            self._full_sync_job,
-            CronTrigger(hour=6, minute=0),
-            id="full_sync_daily",
-            name="Daily Full Sync",
-            replace_existing=True
-        )
-
-        # Job 2: Match data sync - Every 2 hours during the day
-        self.scheduler.add_job(
-            self._match_sync_job,
-            CronTrigger(hour="8-23/2"),  # Every 2 hours from 8 AM to 11 PM
-            id="match_sync_regular",
-            name="Regular Match Sync",
-            replace_existing=True
-        )
-
-        # Job 3: Quick live sync - Every 5 minutes during match hours
-        self.scheduler.add_job(
-            self._live_sync_job,
-            IntervalTrigger(minutes=5),
-            id="live_sync_frequent",
-            name="Live Data Sync",
-            replace_existing=True
-        )
-
-        # Job 4: Odds sync - Every 5 minutes (ODDS SEMPRE FRESCAS!)
-        self.scheduler.add_job(
-            self._odds_sync_job,
-            IntervalTrigger(minutes=5),
-            id="odds_sync_regular",
-            name="Odds Sync",
-            replace_existing=True
-        )
-
-        # Job 5: Predictions generation - Every 4 hours
-        self.scheduler.add_job(
-            self._predictions_job,
-            IntervalTrigger(hours=4),
-            id="predictions_generation",
-            name="Predictions Generation",
-            replace_existing=True
-        )
-
-        # Job 6: Health check - Every 15 minutes
-        self.scheduler.add_job(
-            self._health_check_job,
-            IntervalTrigger(minutes=15),
-            id="health_check",
-            name="Health Check",
-            replace_existing=True
-        )
-
-        # Job 7: Cache cleanup - Daily at 3 AM
-        self.scheduler.add_job(
-            self._cleanup_job,
-            CronTrigger(hour=3, minute=0),
-            id="cache_cleanup",
-            name="Cache Cleanup",
-            replace_existing=True
-        )
-
-        # Job 8: Stuck matches cleanup - Every hour
-        self.scheduler.add_job(
-            self._stuck_matches_cleanup_job,
-            IntervalTrigger(hours=1),
-            id="stuck_matches_cleanup",
-            name="Stuck Matches Cleanup",
-            replace_existing=True
-        )
-
-        # Start the scheduler
-        self.scheduler.start()
+        """Resume the data sync jobs on the job runner"""
+        await job_runner.resume_jobs(SYNC_JOB_IDS)
         self.is_running = True
-
-        # Log scheduled jobs
-        jobs = self.scheduler.get_jobs()
-        logger.info(f"📅 Scheduler started with {len(jobs)} jobs:")
-        for job in jobs:
-            logger.info(f"  - {job.name} (ID: {job.id})")
+        logger.info("▶️ Football Data Scheduler: sync jobs resumed")
 
     async def stop(self):
-        """Stop the scheduler"""
-        if not self.is_running:
-            return
-
-        logger.info("⏹️ Stopping Football Data Scheduler...")
-        self.scheduler.shutdown()
+        """Pause the data sync jobs (the job runner itself keeps running)"""
+        await job_runner.pause_jobs(SYNC_JOB_IDS)
         self.is_running = False
+        logger.info("⏸️ Football Data Scheduler: sync jobs paused")
 
     async def _full_sync_job(self):
         """Job for complete data synchronization"""
@@ -130,7 +52,7 @@ class FootballDataScheduler:
             await redis_client.setex("sync_job_status:full", 3600, "running")
 
             # Run full sync
-            results = await data_synchronizer.full_sync()
+            results = await get_data_synchronizer().full_sync()
 
             # Log results
             duration = (datetime.now() - start_time).total_seconds()
@@ -138,10 +60,12 @@ class FootballDataScheduler:
 
             # Store sync stats
             await self._store_sync_stats("full_sync", results, duration)
+            return results
 
         except Exception as e:
             logger.error(f"❌ Full sync job failed: {str(e)}")
             await redis_client.setex("sync_job_status:full", 300, f"error: {str(e)}")
+            raise
 
     async def _match_sync_job(self):
         """Job for regular match data updates"""
@@ -153,18 +77,20 @@ class FootballDataScheduler:
 
             # Sync only matches and related data
             results = {
-                "matches": await data_synchronizer._sync_matches(),
-                "live_updates": await data_synchronizer._update_live_matches()
+                "matches": await get_data_synchronizer()._sync_matches(),
+                "live_updates": await get_data_synchronizer()._update_live_matches()
             }
 
             duration = (datetime.now() - start_time).total_seconds()
             logger.info(f"✅ Match sync completed in {duration:.1f}s: {results}")
 
             await self._store_sync_stats("match_sync", results, duration)
+            return results
 
         except Exception as e:
             logger.error(f"❌ Match sync job failed: {str(e)}")
             await redis_client.setex("sync_job_status:matches", 300, f"error: {str(e)}")
+            raise
 
     async def _live_sync_job(self):
         """Job for live data updates during match hours"""
@@ -177,7 +103,7 @@ class FootballDataScheduler:
             start_time = datetime.now()
 
             # Quick sync for live data
-            results = await data_synchronizer.quick_sync()
+            results = await get_data_synchronizer().quick_sync()
 
             duration = (datetime.now() - start_time).total_seconds()
 
@@ -186,9 +112,11 @@ class FootballDataScheduler:
                 logger.info(f"⚡ Live sync completed in {duration:.1f}s: {results}")
 
             await self._store_sync_stats("live_sync", results, duration)
+            return results
 
         except Exception as e:
             logger.error(f"❌ Live sync job failed: {str(e)}")
+            raise
 
     async def _odds_sync_job(self):
         """Job for odds updates"""
@@ -198,8 +126,8 @@ class FootballDataScheduler:
             start_time = datetime.now()
 
             # Sync odds
-            odds_count = await data_synchronizer._sync_odds()
-            live_odds = await data_synchronizer._update_live_odds()
+            odds_count = await get_data_synchronizer()._sync_odds()
+            live_odds = await get_data_synchronizer()._update_live_odds()
 
             results = {
                 "new_odds": odds_count,
@@ -210,9 +138,11 @@ class FootballDataScheduler:
             logger.info(f"✅ Odds sync completed in {duration:.1f}s: {results}")
 
             await self._store_sync_stats("odds_sync", results, duration)
+            return results
 
         except Exception as e:
             logger.error(f"❌ Odds sync job failed: {str(e)}")
+            raise
 
     async def _predictions_job(self):
         """Job for generating predictions"""
@@ -222,7 +152,7 @@ class FootballDataScheduler:
             start_time = datetime.now()
 
             # Generate predictions
-            predictions_count = await data_synchronizer._sync_predictions()
+            predictions_count = await get_data_synchronizer()._sync_predictions()
 
             results = {"predictions": predictions_count}
 
@@ -230,14 +160,16 @@ class FootballDataScheduler:
             logger.info(f"✅ Predictions job completed in {duration:.1f}s: {results}")
 
             await self._store_sync_stats("predictions", results, duration)
+            return results
 
         except Exception as e:
             logger.error(f"❌ Predictions job failed: {str(e)}")
+            raise
 
     async def _health_check_job(self):
         """Job for health monitoring"""
         try:
-            health_status = await data_synchronizer.health_check()
+            health_status = await get_data_synchronizer().health_check()
 
             # Store health status
             await redis_client.setex(
@@ -353,24 +285,14 @@ class FootballDataScheduler:
             logger.error(f"❌ Failed to store sync stats: {str(e)}")
 
     def get_job_status(self) -> Dict:
-        """Get current status of all scheduled jobs"""
-        if not self.is_running:
-            return {"status": "stopped", "jobs": []}
-
-        jobs = self.scheduler.get_jobs()
-        job_info = []
-
-        for job in jobs:
-            job_info.append({
-                "id": job.id,
-                "name": job.name,
-                "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
-                "trigger": str(job.trigger)
-            })
+        """Get current status of all scheduled sync jobs"""
+        status = job_runner.get_status()
+        jobs = [job for job in status["jobs"] if job["id"] in SYNC_JOB_IDS]
 
         return {
-            "status": "running",
-            "jobs": job_info,
+            "status": "running" if self.is_running and status["is_running"] else "stopped",
+            "is_leader": status["is_leader"],
+            "jobs": jobs,
             "total_jobs": len(jobs)
         }
 
@@ -380,15 +302,15 @@ class FootballDataScheduler:
 
         try:
             if sync_type == "full":
-                results = await data_synchronizer.full_sync()
+                results = await get_data_synchronizer().full_sync()
             elif sync_type == "quick":
-                results = await data_synchronizer.quick_sync()
+                results = await get_data_synchronizer().quick_sync()
             elif sync_type == "matches":
-                results = {"matches": await data_synchronizer._sync_matches()}
+                results = {"matches": await get_data_synchronizer()._sync_matches()}
             elif sync_type == "odds":
-                results = {"odds": await data_synchronizer._sync_odds()}
+                results = {"odds": await get_data_synchronizer()._sync_odds()}
             elif sync_type == "predictions":
-                results = {"predictions": await data_synchronizer._sync_predictions()}
+                results = {"predictions": await get_data_synchronizer()._sync_predictions()}
             else:
                 raise ValueError(f"Unknown sync type: {sync_type}")
 
@@ -0,0 +1,217 @@
+"""
+💪 TEAM STRENGTH SERVICE
+Forças de ataque/defesa ajustadas (Dixon-Coles) a partir dos jogos finalizados
+
+- Ajuste com decaimento temporal sobre a tabela `matches`
+- Parâmetros persistidos em MODEL_PATH (joblib) e cacheados em memória
+- Reajuste incremental (warm start) quando chegam novos resultados
+- Predição = lookup de parâmetros + matriz de placares vetorizada
+"""
+import copy
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.ml.dixon_coles import DixonColesModel, DEFAULT_HALF_LIFE_DAYS
+from app.models import Match
+from app.services.poisson_service import poisson_service, PoissonPrediction
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ['FT', 'AET', 'PEN', 'FINISHED']
+UNKNOWN_LEAGUE = 'UNKNOWN'
+
+
+class TeamStrengthService:
+    """Ajuste, cache e consulta do modelo Dixon-Coles"""
+
+    def __init__(
+        self,
+        params_path: Optional[str] = None,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        min_matches: int = 50
+    ):
+        self.params_path = params_path or os.path.join(settings.MODEL_PATH, 'dixon_coles_params.joblib')
+        self.half_life_days = half_life_days
+        self.min_matches = min_matches
+
+        # (modelo, meta) publicados juntos; o modelo publicado nunca é alterado,
+        # então a predição lê a referência sem lock
+        self._snapshot: Tuple[Optional[DixonColesModel], Dict] = (None, {})
+        self._loaded_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    # ========== AJUSTE ==========
+
+    def _results_signature(self, db: Session) -> Dict:
+        """Contagem e maior id dos jogos finalizados (muda quando chegam resultados)"""
+        count, max_id = db.query(func.count(Match.id), func.max(Match.id)).filter(
+            Match.status.in_(FINISHED_STATUSES),
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None),
+            Match.match_date.isnot(None)
+        ).one()
+        return {'n_results': int(count or 0), 'last_match_id': int(max_id or 0)}
+
+    def fit(self, db: Session) -> Dict:
+        """
+        Ajusta o modelo sobre todos os jogos finalizados e persiste os parâmetros
+
+        Returns:
+            Estatísticas do ajuste
+        """
+        rows = db.query(
+            Match.home_team_id, Match.away_team_id,
+            Match.home_score, Match.away_score,
+            Match.league, Match.match_date
+        ).filter(
+            Match.status.in_(FINISHED_STATUSES),
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None),
+            Match.match_date.isnot(None)
+        ).all()
+
+        if len(rows) < self.min_matches:
+            logger.info(f"💪 Dixon-Coles: apenas {len(rows)} jogos finalizados (mínimo {self.min_matches})")
+            return {'fitted': False, 'n_matches': len(rows)}
+
+        now = datetime.utcnow()
+        days_ago = np.array([
+            max((now - row.match_date.replace(tzinfo=None)).total_seconds() / 86400.0, 0.0)
+            for row in rows
+        ])
+
+        start = datetime.utcnow()
+        with self._lock:
+            # warm start numa cópia: quem está predizendo continua com o modelo anterior
+            current, _ = self._snapshot
+            model = copy.deepcopy(current) if current else DixonColesModel(half_life_days=self.half_life_days)
+            model.fit(
+                home_team_ids=[row.home_team_id for row in rows],
+                away_team_ids=[row.away_team_id for row in rows],
+                home_goals=[row.home_score for row in rows],
+                away_goals=[row.away_score for row in rows],
+                league_ids=[row.league or UNKNOWN_LEAGUE for row in rows],
+                days_ago=days_ago
+            )
+            meta = {
+                **self._results_signature(db),
+                'fitted_at': now.isoformat(),
+                'n_matches': len(rows),
+            }
+            self._save(model, meta)
+            self._snapshot = (model, meta)
+
+        elapsed = (datetime.utcnow() - start).total_seconds()
+        logger.info(
+            f"💪 Dixon-Coles ajustado: {len(rows)} jogos, {len(model.team_index)} times, "
+            f"{len(model.league_index)} ligas, rho={model.rho:+.3f} ({elapsed:.2f}s)"
+        )
+        return {'fitted': True, 'elapsed_seconds': elapsed, **meta}
+
+    def refit_if_stale(self, db: Session) -> Optional[Dict]:
+        """Reajusta (warm start) apenas se há resultados novos desde o último ajuste"""
+        model = self.get_model()
+        _, meta = self._snapshot
+        signature = self._results_signature(db)
+        if model is not None and all(meta.get(k) == v for k, v in signature.items()):
+            return None
+        return self.fit(db)
+
+    # ========== PERSISTÊNCIA / CACHE ==========
+
+    def _save(self, model: DixonColesModel, meta: Dict):
+        os.makedirs(os.path.dirname(self.params_path) or '.', exist_ok=True)
+        tmp_path = f"{self.params_path}.tmp"
+        joblib.dump({'model': model.to_dict(), 'meta': meta}, tmp_path)
+        os.replace(tmp_path, self.params_path)
+        self._loaded_mtime = os.path.getmtime(self.params_path)
+
+    def get_model(self) -> Optional[DixonColesModel]:
+        """Modelo em cache; recarrega do disco se outro processo reajustou"""
+        try:
+            mtime = os.path.getmtime(self.params_path)
+        except OSError:
+            return self._snapshot[0]
+
+        if mtime != self._loaded_mtime:
+            with self._lock:
+                if mtime != self._loaded_mtime:
+                    try:
+                        data = joblib.load(self.params_path)
+                        self._snapshot = (DixonColesModel.from_dict(data['model']), data.get('meta', {}))
+                        self._loaded_mtime = mtime
+                    except Exception as e:
+                        logger.warning(f"⚠️ Falha ao carregar parâmetros Dixon-Coles: {e}")
+        return self._snapshot[0]
+
+    def get_status(self) -> Dict:
+        self.get_model()
+        model, meta = self._snapshot
+        return {
+            'fitted': model is not None,
+            'teams': len(model.team_index) if model else 0,
+            'leagues': len(model.league_index) if model else 0,
+            'rho': float(model.rho) if model else None,
+            **meta
+        }
+
+    # ========== PREDIÇÃO ==========
+
+    def predict_lambdas(self, matches: Sequence[Match]):
+        """Gols esperados (home, away) para N jogos, ou None se não há modelo ajustado"""
+        model = self.get_model()
+        if model is None or not matches:
+            return None
+        return model.predict_lambdas(
+            [m.home_team_id for m in matches],
+            [m.away_team_id for m in matches],
+            [m.league or UNKNOWN_LEAGUE for m in matches]
+        )
+
+    def analyze_matches(
+        self,
+        matches: Sequence[Match],
+        market_odds: Optional[List[Optional[Dict[str, float]]]] = None
+    ) -> Optional[List[PoissonPrediction]]:
+        """
+        Análise completa de mercados para N jogos com matrizes Dixon-Coles
+
+        Returns:
+            Lista de PoissonPrediction (mesma ordem) ou None se não há modelo ajustado
+        """
+        model = self.get_model()
+        if model is None or not matches:
+            return None
+
+        lambda_home, lambda_away = model.predict_lambdas(
+            [m.home_team_id for m in matches],
+            [m.away_team_id for m in matches],
+            [m.league or UNKNOWN_LEAGUE for m in matches]
+        )
+        return poisson_service.analyze_lambdas_batch(
+            lambda_home, lambda_away,
+            market_odds=market_odds,
+            score_matrices=model.score_matrices(lambda_home, lambda_away)
+        )
+
+    def analyze_match(
+        self,
+        match: Match,
+        market_odds: Optional[Dict[str, float]] = None
+    ) -> Optional[PoissonPrediction]:
+        """Análise de um jogo com o modelo ajustado, ou None se não há modelo"""
+        analyses = self.analyze_matches([match], market_odds=[market_odds])
+        return analyses[0] if analyses else None
+
+
+# Instância global
+team_strength_service = TeamStrengthService()
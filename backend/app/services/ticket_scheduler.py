@@ -1,17 +1,19 @@
 """
 ⏰ TICKET ANALYSIS SCHEDULER
 Executa análise de tickets automaticamente em background
+(job 'ticket_analyzer' do job_runner, grupo 'tickets')
 """
 import logging
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 
 from app.core.database import SessionLocal
+from app.core.job_runner import job_runner
 from app.services.ticket_analyzer import analyze_all_tickets
 
 logger = logging.getLogger(__name__)
 
+TICKET_JOB_ID = 'ticket_analyzer'
+
 
 class TicketAnalysisScheduler:
     """Scheduler para análise automática de tickets"""
@@ -24,7 +26,6 @@ class TicketAnalysisScheduler:
             interval_minutes: Intervalo entre execuções em minutos (padrão: 15)
         """
         self.interval_minutes = interval_minutes
-        self.scheduler = BackgroundScheduler()
         self.last_run = None
         self.total_runs = 0
         self.is_running = False
@@ -33,7 +34,7 @@ class TicketAnalysisScheduler:
         """Job que executa a análise de tickets"""
         if self.is_running:
             logger.warning("⚠️  Análise já em execução, pulando...")
-            return
+            return None
 
         self.is_running = True
         logger.info("🎯 Executando análise automática de tickets...")
@@ -58,61 +59,34 @@ class TicketAnalysisScheduler:
             else:
                 logger.debug("ℹ️  Nenhum ticket novo para analisar")
 
+            return stats
+
         except Exception as e:
             logger.error(f"❌ Erro na análise automática de tickets: {e}", exc_info=True)
+            raise
         finally:
             db.close()
             self.is_running = False
 
-    def start(self):
-        """Inicia o scheduler"""
-        if self.scheduler.running:
-            logger.warning("⚠️  Scheduler já está rodando")
-            return
-
-        logger.info("🚀 Iniciando Ticket Analysis Scheduler...")
-        logger.info(f"⏰ Intervalo: {self.interval_minutes} minutos")
-
-        # Executar uma vez imediatamente ao iniciar
-        logger.info("▶️  Executando análise inicial...")
-        self._analyze_tickets_job()
-
-        # Agendar execução periódica
-        self.scheduler.add_job(
-            self._analyze_tickets_job,
-            trigger=IntervalTrigger(minutes=self.interval_minutes),
-            id='ticket_analyzer',
-            name='Ticket Analyzer',
-            replace_existing=True,
-            max_instances=1  # Evita execuções simultâneas
-        )
-
-        self.scheduler.start()
-        logger.info("✅ Ticket Analysis Scheduler iniciado com sucesso!")
-        logger.info(f"📅 Próxima execução em {self.interval_minutes} minutos")
-
-    def stop(self):
-        """Para o scheduler"""
-        if not self.scheduler.running:
-            logger.warning("⚠️  Scheduler não está rodando")
-            return
-
-        logger.info("🛑 Parando Ticket Analysis Scheduler...")
-        self.scheduler.shutdown(wait=True)
-        logger.info("✅ Scheduler parado com sucesso")
+    async def start(self):
+        """Retoma o job no job_runner"""
+        await job_runner.resume_jobs([TICKET_JOB_ID])
+        logger.info("▶️  Ticket Analysis Scheduler retomado")
+
+    async def stop(self):
+        """Pausa o job (o job_runner continua rodando)"""
+        await job_runner.pause_jobs([TICKET_JOB_ID])
+        logger.info("⏸️  Ticket Analysis Scheduler pausado")
 
     def get_stats(self):
         """Retorna estatísticas do scheduler"""
+        job = next((j for j in job_runner.get_status()['jobs'] if j['id'] == TICKET_JOB_ID), None)
         return {
-            'is_running': self.scheduler.running if self.scheduler else False,
+            'is_running': job is not None and not job['paused'] and job_runner.is_running,
             'interval_minutes': self.interval_minutes,
             'total_runs': self.total_runs,
             'last_run': self.last_run.isoformat() if self.last_run else None,
-            'next_run': (
-                self.scheduler.get_jobs()[0].next_run_time.isoformat()
-                if self.scheduler and self.scheduler.running and self.scheduler.get_jobs()
-                else None
-            )
+            'next_run': job['next_run'] if job else None
         }
 
 
@@ -128,13 +102,18 @@ def get_scheduler() -> TicketAnalysisScheduler:
     return _scheduler_instance
 
 
-def start_scheduler():
+async def start_scheduler():
     """Inicia o scheduler global"""
     scheduler = get_scheduler()
-    scheduler.start()
+    await scheduler.start()
 
 
-def stop_scheduler():
+async def stop_scheduler():
     """Para o scheduler global"""
     scheduler = get_scheduler()
-    scheduler.stop()
+    await scheduler.stop()
+
+
+def run_ticket_analysis():
+    """Entrada do job 'ticket_analyzer' no job_runner"""
+    return get_scheduler()._analyze_tickets_job()
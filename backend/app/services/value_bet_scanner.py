@@ -0,0 +1,393 @@
+"""
+💎 VALUE BET SCANNER
+Scan de value bets de TODAS as partidas ativas em uma passada vetorizada
+
+- Forças reais dos times: Dixon-Coles ajustado (fallback: TeamStatistics em lote)
+- Odds de todas as partidas em uma única query (melhor preço por seleção)
+- Matriz N partidas x K seleções: edge, Kelly e rating calculados com numpy
+- Resultado ranqueado persistido em value_bet_rankings pelo scheduler;
+  o endpoint de scan apenas pagina o snapshot mais recente
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.lazy_imports import lazy_module
+from app.core.markets_config import MARKET_NAMES
+from app.models import Match, Odds, TeamStatistics, ValueBetScan, ValueBetRanking
+from app.services.poisson_service import poisson_service
+from app.services.value_bet_detector import value_bet_detector
+
+pd = lazy_module('pandas')  # só o ranking por partida usa pandas
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ['NS', '1H', '2H', 'HT', 'LIVE']
+RATING_PRIORITY = {'PREMIUM': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+# Menor edge (%) gravado no snapshot: leituras com min_edge abaixo disso são recusadas
+SNAPSHOT_MIN_EDGE = 5.0
+
+# Colunas da tabela odds -> (mercado, seleção, key de probabilidade do detector)
+ODDS_COLUMNS = {
+    'home_win': ('1X2', 'home', '1X2_HOME'),
+    'draw': ('1X2', 'draw', '1X2_DRAW'),
+    'away_win': ('1X2', 'away', '1X2_AWAY'),
+    'over_1_5': ('OVER_UNDER', 'over_1_5', 'OVER_UNDER_1.5_OVER'),
+    'under_1_5': ('OVER_UNDER', 'under_1_5', 'OVER_UNDER_1.5_UNDER'),
+    'over_2_5': ('OVER_UNDER', 'over_2_5', 'OVER_UNDER_2.5_OVER'),
+    'under_2_5': ('OVER_UNDER', 'under_2_5', 'OVER_UNDER_2.5_UNDER'),
+    'over_3_5': ('OVER_UNDER', 'over_3_5', 'OVER_UNDER_3.5_OVER'),
+    'under_3_5': ('OVER_UNDER', 'under_3_5', 'OVER_UNDER_3.5_UNDER'),
+    'btts_yes': ('BTTS', 'btts_yes', 'BTTS_YES'),
+    'btts_no': ('BTTS', 'btts_no', 'BTTS_NO'),
+}
+
+
+class ValueBetScanner:
+    """Cálculo em lote e leitura paginada dos value bets"""
+
+    def __init__(self, min_edge: float = SNAPSHOT_MIN_EDGE, confidence: float = 0.7, kelly_fraction: float = 0.25):
+        self.min_edge = min_edge
+        self.confidence = confidence
+        self.kelly_fraction = kelly_fraction
+
+        # Colunas da matriz de seleções: todas as keys que o detector sabe precificar
+        self.prob_keys: List[str] = list(value_bet_detector._map_probabilities_to_markets({}))
+        self.key_index: Dict[str, int] = {key: i for i, key in enumerate(self.prob_keys)}
+
+    # ========== CARGA EM LOTE ==========
+
+    def _load_matches(self, db: Session) -> List[Match]:
+        """Todas as partidas ativas (sem limite), com os times já carregados"""
+        yesterday = datetime.now().date() - timedelta(days=1)
+        return db.query(Match).options(
+            selectinload(Match.home_team), selectinload(Match.away_team)
+        ).filter(
+            Match.status.in_(ACTIVE_STATUSES),
+            Match.match_date >= yesterday
+        ).order_by(Match.id).all()
+
+    def _load_best_odds(self, db: Session, match_ids: List[int]):
+        """
+        Uma query para as odds de todas as partidas
+
+        Returns:
+            (odds (N, K), bookmakers {(linha, coluna): nome}, seleções {coluna: (mercado, seleção)})
+        """
+        row_of = {match_id: i for i, match_id in enumerate(match_ids)}
+        best = np.zeros((len(match_ids), len(self.prob_keys)))
+        bookmakers: Dict[Tuple[int, int], str] = {}
+        selections: Dict[int, Tuple[str, str]] = {}
+
+        if not match_ids:
+            return best, bookmakers, selections
+
+        columns = [getattr(Odds, name) for name in ODDS_COLUMNS]
+        rows = db.query(
+            Odds.match_id, Odds.bookmaker, Odds.market,
+            Odds.over_under, Odds.over_odds, Odds.under_odds,
+            Odds.additional_markets, *columns
+        ).filter(
+            Odds.match_id.in_(match_ids),
+            Odds.is_active.isnot(False)
+        ).all()
+
+        def offer(row_idx: int, market: str, selection: str, prob_key: str, price, bookmaker: str):
+            col = self.key_index.get(prob_key)
+            if col is None or price is None:
+                return
+            try:
+                price = float(price)
+            except (TypeError, ValueError):
+                return
+            if price > best[row_idx, col]:
+                best[row_idx, col] = price
+                bookmakers[(row_idx, col)] = bookmaker
+                selections.setdefault(col, (market, selection))
+
+        for row in rows:
+            i = row_of[row.match_id]
+            for name, (market, selection, prob_key) in ODDS_COLUMNS.items():
+                offer(i, market, selection, prob_key, getattr(row, name), row.bookmaker)
+
+            # Linha genérica de over/under
+            if row.over_under is not None:
+                line = float(row.over_under)
+                suffix = f"{line:g}".replace('.', '_')
+                offer(i, 'OVER_UNDER', f'over_{suffix}', f'OVER_UNDER_{line}_OVER', row.over_odds, row.bookmaker)
+                offer(i, 'OVER_UNDER', f'under_{suffix}', f'OVER_UNDER_{line}_UNDER', row.under_odds, row.bookmaker)
+
+            # Mercados extras no JSON: mesma key que o detector usa
+            for selection, price in (row.additional_markets or {}).items():
+                prob_key = value_bet_detector._get_probability_key(row.market, selection)
+                offer(i, row.market, selection, prob_key, price, row.bookmaker)
+
+        return best, bookmakers, selections
+
+    def _team_statistics_lambdas(self, db: Session, matches: List[Match]):
+        """Fallback: últimas TeamStatistics de todos os times em uma query"""
+        team_ids = {m.home_team_id for m in matches} | {m.away_team_id for m in matches}
+        latest: Dict[int, TeamStatistics] = {}
+        for stats in db.query(TeamStatistics).filter(
+            TeamStatistics.team_id.in_(team_ids)
+        ).order_by(TeamStatistics.team_id, TeamStatistics.created_at.desc()):
+            latest.setdefault(stats.team_id, stats)
+
+        def averages(team_id, scored_default, conceded_default):
+            stats = latest.get(team_id)
+            if stats is None or not stats.games_played:
+                return scored_default, conceded_default
+            return stats.goals_for / stats.games_played, stats.goals_against / stats.games_played
+
+        home = np.array([averages(m.home_team_id, 1.5, 1.2) for m in matches], dtype=float).reshape(-1, 2)
+        away = np.array([averages(m.away_team_id, 1.3, 1.1) for m in matches], dtype=float).reshape(-1, 2)
+
+        return poisson_service.calculate_lambdas(
+            home_attack=home[:, 0], home_defense=home[:, 1],
+            away_attack=away[:, 0], away_defense=away[:, 1]
+        )
+
+    def _probability_matrix(self, db: Session, matches: List[Match]) -> Tuple[np.ndarray, str]:
+        """Probabilidades (N, K) na ordem de self.prob_keys"""
+        from app.services.team_strength_service import team_strength_service
+
+        score_matrices = None
+        source = 'team_statistics'
+        try:
+            model = team_strength_service.get_model()
+            if model is not None:
+                lambda_home, lambda_away = team_strength_service.predict_lambdas(matches)
+                score_matrices = model.score_matrices(lambda_home, lambda_away)
+                source = 'dixon_coles'
+        except Exception as e:
+            logger.warning(f"⚠️ Dixon-Coles indisponível no scan, usando TeamStatistics: {e}")
+
+        if score_matrices is None:
+            lambda_home, lambda_away = self._team_statistics_lambdas(db, matches)
+            score_matrices = poisson_service.score_matrix_batch(lambda_home, lambda_away)
+
+        probabilities = poisson_service.probabilities_from_matrices(score_matrices, lambda_home, lambda_away)
+        mapped = value_bet_detector._map_probabilities_to_markets(probabilities)
+        n = len(matches)
+        matrix = np.column_stack([np.broadcast_to(np.asarray(mapped[key], dtype=float), (n,)) for key in self.prob_keys])
+        return matrix, source
+
+    # ========== SCAN ==========
+
+    def compute(self, db: Session) -> Dict:
+        """
+        Calcula todos os value bets ranqueados (sem persistir)
+
+        Returns:
+            Dict com 'value_bets' (ordem de exibição) e contadores do scan
+        """
+        matches = self._load_matches(db)
+        result = {'matches_analyzed': len(matches), 'matches_with_odds': 0, 'value_bets': [], 'strength_source': None}
+        if not matches:
+            return result
+
+        odds, bookmakers, selections = self._load_best_odds(db, [m.id for m in matches])
+        has_odds = (odds > 0).any(axis=1)
+        result['matches_with_odds'] = int(has_odds.sum())
+        if not has_odds.any():
+            return result
+
+        priced = [m for m, ok in zip(matches, has_odds) if ok]
+        odds = odds[has_odds]
+        original_rows = np.flatnonzero(has_odds)
+        probs, result['strength_source'] = self._probability_matrix(db, priced)
+
+        # ========== PASSADA VETORIZADA ==========
+        with np.errstate(divide='ignore', invalid='ignore'):
+            edge = (odds * probs - 1) * 100
+            fair_odds = np.where(probs > 0, 1 / probs, 999.99)
+            implied = np.where(odds > 0, 1 / odds, 0.0)
+            kelly = (probs * (odds - 1) - (1 - probs)) / (odds - 1)
+        kelly = np.minimum(np.maximum(0, kelly * self.kelly_fraction), 0.05)
+
+        valid = (odds > 1) & (probs > 0) & (edge >= self.min_edge)
+        if self.confidence < value_bet_detector.min_confidence:
+            valid[:] = False
+
+        rows, cols = np.nonzero(valid)
+        if len(rows) == 0:
+            return result
+
+        edges = np.round(edge[rows, cols], 2)
+        thresholds = value_bet_detector.edge_thresholds
+        ratings = np.select(
+            [edges >= thresholds['PREMIUM'], edges >= thresholds['HIGH'], edges >= thresholds['MEDIUM']],
+            ['PREMIUM', 'HIGH', 'MEDIUM'],
+            default='LOW'
+        )
+        priority = np.vectorize(RATING_PRIORITY.get)(ratings)
+
+        # Ordenação (rating, edge) desc; estável na ordem partida/seleção
+        order = np.lexsort((-edges, -priority))
+        match_ids = np.array([m.id for m in priced])[rows[order]]
+        match_rank = pd.Series(match_ids).groupby(match_ids).cumcount().to_numpy() + 1
+
+        match_names = [f"{m.home_team.name} vs {m.away_team.name}" for m in priced]
+        now = datetime.now()
+        value_bets = []
+        for position, idx in enumerate(order):
+            i, k = rows[idx], cols[idx]
+            market_type, selection = selections[k]
+            value_bets.append({
+                'rank': position + 1,
+                'match_rank': int(match_rank[position]),
+                'match_id': int(match_ids[position]),
+                'match_name': match_names[i],
+                'market_type': market_type,
+                'market_name': MARKET_NAMES.get(market_type, market_type),
+                'selection': selection,
+                'market_odds': round(float(odds[i, k]), 2),
+                'fair_odds': round(float(fair_odds[i, k]), 2),
+                'our_probability': round(float(probs[i, k]), 4),
+                'implied_probability': round(float(implied[i, k]), 4),
+                'edge': float(edges[idx]),
+                'kelly_stake': round(float(kelly[i, k]), 4),
+                'value_rating': str(ratings[idx]),
+                'confidence': round(self.confidence, 2),
+                'bookmaker': bookmakers[(original_rows[i], k)],
+                'created_at': now,
+            })
+
+        result['value_bets'] = value_bets
+        return result
+
+    def run_scan(self, db: Session) -> Dict:
+        """
+        Calcula e persiste o snapshot ranqueado (substitui o anterior)
+
+        Chamado pelo scheduler; o endpoint só lê o resultado.
+        """
+        start = time.perf_counter()
+        try:
+            result = self.compute(db)
+
+            scan = ValueBetScan(
+                matches_analyzed=result['matches_analyzed'],
+                matches_with_odds=result['matches_with_odds'],
+                value_bets_found=len(result['value_bets']),
+                strength_source=result['strength_source'],
+                elapsed_seconds=round(time.perf_counter() - start, 3)
+            )
+            db.add(scan)
+            db.flush()
+
+            if result['value_bets']:
+                db.execute(insert(ValueBetRanking), [
+                    {**vb, 'scan_id': scan.id} for vb in result['value_bets']
+                ])
+
+            # Snapshot anterior sai na mesma transação
+            db.query(ValueBetRanking).filter(ValueBetRanking.scan_id != scan.id).delete(synchronize_session=False)
+            db.query(ValueBetScan).filter(ValueBetScan.id != scan.id).delete(synchronize_session=False)
+            db.commit()
+
+            logger.info(
+                f"💎 Scan de value bets: {scan.value_bets_found} value bets em "
+                f"{scan.matches_with_odds}/{scan.matches_analyzed} jogos com odds "
+                f"({scan.strength_source}, {scan.elapsed_seconds:.2f}s)"
+            )
+            return {
+                'scan_id': scan.id,
+                'matches_analyzed': scan.matches_analyzed,
+                'value_bets_found': scan.value_bets_found,
+                'elapsed_seconds': scan.elapsed_seconds
+            }
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Erro no scan de value bets: {e}")
+            return {'error': str(e)}
+
+    # ========== LEITURA ==========
+
+    def _page_queries(self, min_edge: float, offset: int, limit: int, max_per_match: int):
+        """
+        Statements da leitura paginada (compartilhados entre Session e AsyncSession)
+
+        Diversificação: no máximo max_per_match value bets por jogo. Dentro de um
+        jogo a ordem é por edge, então filtrar por match_rank equivale a pegar
+        os primeiros de cada jogo após o filtro de edge.
+
+        O snapshot só tem linhas com edge >= self.min_edge; um min_edge menor
+        devolveria silenciosamente o mesmo resultado, então é recusado.
+        """
+        if min_edge < self.min_edge:
+            raise ValueError(f"min_edge {min_edge} abaixo do mínimo do snapshot ({self.min_edge}%)")
+        latest_scan = select(ValueBetScan).order_by(ValueBetScan.id.desc()).limit(1)
+
+        def queries(scan_id: int):
+            found = and_(ValueBetRanking.scan_id == scan_id, ValueBetRanking.edge >= min_edge)
+            diversified = and_(found, ValueBetRanking.match_rank <= max_per_match)
+            return (
+                select(func.count(ValueBetRanking.id)).where(found),
+                select(func.count(ValueBetRanking.id)).where(diversified),
+                select(ValueBetRanking).where(diversified).order_by(ValueBetRanking.rank).offset(offset).limit(limit),
+            )
+
+        return latest_scan, queries
+
+    def _page_response(self, scan: ValueBetScan, found: int, available: int, page, offset: int, limit: int) -> Dict:
+        return {
+            'total_matches_analyzed': scan.matches_analyzed,
+            'total_value_bets_found': found,
+            'total_available': available,
+            'offset': offset,
+            'limit': limit,
+            'value_bets': [vb.to_dict() for vb in page],
+            'generated_at': scan.created_at.isoformat() if scan.created_at else None,
+            'scan_id': scan.id
+        }
+
+    def get_page(
+        self,
+        db: Session,
+        min_edge: float = 10.0,
+        offset: int = 0,
+        limit: int = 20,
+        max_per_match: int = 2
+    ) -> Optional[Dict]:
+        """Página do snapshot mais recente (None se ainda não houve scan)"""
+        latest_scan, queries = self._page_queries(min_edge, offset, limit, max_per_match)
+        scan = db.execute(latest_scan).scalars().first()
+        if scan is None:
+            return None
+
+        found_q, available_q, page_q = queries(scan.id)
+        return self._page_response(
+            scan, db.execute(found_q).scalar(), db.execute(available_q).scalar(),
+            db.execute(page_q).scalars().all(), offset, limit
+        )
+
+    async def get_page_async(
+        self,
+        db: AsyncSession,
+        min_edge: float = 10.0,
+        offset: int = 0,
+        limit: int = 20,
+        max_per_match: int = 2
+    ) -> Optional[Dict]:
+        """get_page para AsyncSession (endpoint de scan)"""
+        latest_scan, queries = self._page_queries(min_edge, offset, limit, max_per_match)
+        scan = (await db.execute(latest_scan)).scalars().first()
+        if scan is None:
+            return None
+
+        found_q, available_q, page_q = queries(scan.id)
+        return self._page_response(
+            scan, (await db.execute(found_q)).scalar(), (await db.execute(available_q)).scalar(),
+            (await db.execute(page_q)).scalars().all(), offset, limit
+        )
+
+
+value_bet_scanner = ValueBetScanner()
@@ -4,11 +4,13 @@ from datetime import datetime
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from app.services.scheduler import football_scheduler
-from app.services.data_synchronizer import data_synchronizer
-from app.services.ticket_scheduler import get_scheduler as get_ticket_scheduler
+from app.services.data_synchronizer import get_data_synchronizer
+from app.services.job_registry import start_job_runner, stop_job_runner
+from app.core.config import settings
+from app.core.job_runner import job_runner
 from app.core.redis import redis_client
-from app.core.scheduler import start_scheduler as start_automated_scheduler, stop_scheduler as stop_automated_scheduler
+from app.core.http_client import close_async_client
+from app.core.database import dispose_async_engine
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +22,6 @@ class FootballAnalyticsStartup:
 
     def __init__(self):
         self.scheduler_started = False
-        self.ticket_scheduler_started = False
-        self.automated_scheduler_started = False
         self.initial_sync_completed = False
 
     async def initialize_system(self):
@@ -58,23 +58,17 @@ class FootballAnalyticsStartup:
         logger.info("⏹️ Shutting down Football Analytics System...")
 
         try:
-            # Stop the data synchronization scheduler
+            # Stop the job runner (releases leadership so another worker takes over)
             if self.scheduler_started:
-                await football_scheduler.stop()
+                await stop_job_runner()
                 self.scheduler_started = False
+                logger.info("✅ Job runner stopped")
 
-            # Stop the ticket analysis scheduler
-            if self.ticket_scheduler_started:
-                ticket_scheduler = get_ticket_scheduler()
-                ticket_scheduler.stop()
-                self.ticket_scheduler_started = False
-                logger.info("✅ Ticket analysis scheduler stopped")
+            # Close pooled HTTP connections (API-Football)
+            await close_async_client()
 
-            # Stop the automated pipeline scheduler
-            if self.automated_scheduler_started:
-                stop_automated_scheduler()
-                self.automated_scheduler_started = False
-                logger.info("✅ Automated pipeline scheduler stopped")
+            # Close the async DB pool (read endpoints)
+            await dispose_async_engine()
 
             # Clear startup status
             await redis_client.delete("system_startup_status")
@@ -117,7 +111,7 @@ class FootballAnalyticsStartup:
                 logger.info("🔄 Performing initial data synchronization...")
 
                 # Start with a quick sync to get immediate data
-                quick_result = await data_synchronizer.quick_sync()
+                quick_result = await get_data_synchronizer().quick_sync()
                 logger.info(f"✅ Quick sync completed: {quick_result}")
 
                 # Schedule a full sync to run in the background
@@ -138,38 +132,26 @@ class FootballAnalyticsStartup:
         """Run a full sync in the background"""
         try:
             logger.info("🔄 Running background full sync...")
-            result = await data_synchronizer.full_sync()
+            result = await get_data_synchronizer().full_sync()
             logger.info(f"✅ Background full sync completed: {result}")
         except Exception as e:
             logger.error(f"❌ Background full sync failed: {str(e)}")
 
     async def _start_scheduler(self):
-        """Start the automated data synchronization scheduler"""
-        try:
-            await football_scheduler.start()
-            self.scheduler_started = True
-            logger.info("✅ Automated scheduler started")
-        except Exception as e:
-            logger.error(f"❌ Failed to start scheduler: {str(e)}")
-            # Don't raise here - manual sync is still possible
-
-        # Start ticket analysis scheduler
-        try:
-            ticket_scheduler = get_ticket_scheduler()
-            ticket_scheduler.start()
-            self.ticket_scheduler_started = True
-            logger.info("✅ Ticket analysis scheduler started")
-        except Exception as e:
-            logger.error(f"❌ Failed to start ticket scheduler: {str(e)}")
-            # Don't raise here - manual ticket analysis is still possible
+        """
+        Start the job runner with every scheduled job.
+        All workers schedule the jobs; only the elected leader executes them.
+        """
+        if not settings.JOB_RUNNER_ENABLED:
+            logger.info("ℹ️ Job runner disabled (JOB_RUNNER_ENABLED=false)")
+            return
 
-        # Start automated pipeline scheduler (NOVO - importação, live updates, predictions)
         try:
-            start_automated_scheduler()
-            self.automated_scheduler_started = True
-            logger.info("✅ Automated pipeline scheduler started")
+            await start_job_runner()
+            self.scheduler_started = True
+            logger.info("✅ Job runner started")
         except Exception as e:
-            logger.error(f"❌ Failed to start automated pipeline scheduler: {str(e)}")
+            logger.error(f"❌ Failed to start job runner: {str(e)}")
             # Don't raise here - manual execution is still possible
 
     async def _store_startup_status(self):
@@ -178,7 +160,6 @@ class FootballAnalyticsStartup:
             startup_status = {
                 "initialized_at": datetime.now().isoformat(),
                 "scheduler_started": self.scheduler_started,
-                "ticket_scheduler_started": self.ticket_scheduler_started,
                 "initial_sync_completed": self.initial_sync_completed,
                 "version": "1.0.0"
             }
@@ -196,21 +177,12 @@ class FootballAnalyticsStartup:
         """Get current system status"""
         try:
             startup_status = await redis_client.get("system_startup_status")
-            scheduler_status = football_scheduler.get_job_status()
-            health_status = await data_synchronizer.health_check()
-
-            # Get ticket scheduler status
-            ticket_scheduler_status = None
-            try:
-                ticket_scheduler = get_ticket_scheduler()
-                ticket_scheduler_status = ticket_scheduler.get_stats()
-            except Exception as e:
-                logger.error(f"Failed to get ticket scheduler status: {e}")
+            scheduler_status = job_runner.get_status()
+            health_status = await get_data_synchronizer().health_check()
 
             return {
                 "startup_status": startup_status.decode() if startup_status else None,
                 "scheduler": scheduler_status,
-                "ticket_scheduler": ticket_scheduler_status,
                 "health": health_status,
                 "is_ready": self.scheduler_started and self.initial_sync_completed
             }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Bet combination search (CombinationService)
+Compares the pruned, vectorized top-k search behind _generate_doubles /
+_generate_trebles / _generate_multiples with the previous loop, which
+filtered every itertools.combinations tuple in Python and sorted the
+survivors by expected value. Results are checked to be identical.
+
+Selections are shaped like _extract_bet_selections output: 1-4 markets
+per match, odds between 1.15 and 2.6 and model probabilities near the
+implied ones, so a few of them carry value.
+
+Usage:
+    python benchmarks/bench_combinations.py --selections 20 50 100 --sizes 2 3 4 5
+
+When a size has more tuples than --legacy-budget, the legacy loop is timed
+on the first --legacy-budget tuples and extrapolated (the cost per tuple is
+constant), and the comparison of results is skipped.
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.combination_service import BetSelection, CombinationService  # noqa: E402
+
+# size -> (min_confidence, min_probability, min_ev, top_k), as in the service
+FILTERS = {2: (0.6, 0.25, 0.05, 20), 3: (0.65, 0.15, 0.03, 15)}
+MULTIPLE_FILTERS = (0.70, 0.08, 0.02, 10)
+
+
+def synthetic_selections(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    selections, match_id = [], 0
+    while len(selections) < n:
+        match_id += 1
+        for market in rng.sample(["1X2", "Total Goals", "BTTS", "Corners"], rng.randint(1, 4)):
+            odds = round(rng.uniform(1.15, 2.6), 2)
+            probability = round(min(0.97, rng.uniform(0.9, 1.15) / odds), 3)
+            selections.append(BetSelection(
+                match_id=match_id, match_name=f"Match {match_id}", market=market, selection="Pick",
+                probability=probability, odds=odds, confidence=round(rng.uniform(0.6, 0.95), 2),
+                match_date=datetime(2024, 5, 1)
+            ))
+    return selections[:n]
+
+
+def legacy_search(selections: list, size: int, min_odds: float, max_odds: float, limit: int = None) -> list:
+    """Previous loop: every tuple checked in Python, survivors sorted by rounded EV"""
+    min_confidence, min_probability, min_ev, top_k = FILTERS.get(size, MULTIPLE_FILTERS)
+    ranked = []
+    for combo in itertools.islice(itertools.combinations(selections, size), limit):
+        if len({sel.match_id for sel in combo}) != size:
+            continue
+        combined_odds = 1.0
+        for sel in combo:
+            combined_odds *= sel.odds
+        if min_odds <= combined_odds <= max_odds:
+            combined_probability = 1.0
+            for sel in combo:
+                combined_probability *= sel.probability
+            combined_confidence = sum(sel.confidence for sel in combo) / len(combo)
+            if combined_confidence >= min_confidence and combined_probability >= min_probability:
+                expected_value = (combined_probability * combined_odds) - 1
+                if expected_value > min_ev:
+                    ranked.append(([sel.market + str(sel.match_id) for sel in combo], round(expected_value, 4)))
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked[:top_k]
+
+
+def pruned_search(service: CombinationService, selections: list, size: int, min_odds: float, max_odds: float) -> list:
+    if size == 2:
+        combos = asyncio.run(service._generate_doubles(selections, min_odds, max_odds))
+    elif size == 3:
+        combos = asyncio.run(service._generate_trebles(selections, min_odds, max_odds))
+    else:
+        combos = asyncio.run(service._generate_multiples(selections, min_odds, max_odds, size))
+    return [([s["market"] + str(s["match_id"]) for s in c["selections"]], c["expected_value"]) for c in combos]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--selections', type=int, nargs='+', default=[20, 50, 100])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2, 3, 4, 5])
+    parser.add_argument('--min-odds', type=float, default=1.5)
+    parser.add_argument('--max-odds', type=float, default=2.0)
+    parser.add_argument('--legacy-budget', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    service = CombinationService.__new__(CombinationService)
+    print(f"odds range [{args.min_odds}, {args.max_odds}]")
+    print(f"{'selections':>10} {'size':>5} {'tuples':>12} {'pruned (s)':>11} {'legacy (s)':>11} {'speedup':>8} {'same':>5}")
+
+    for n in args.selections:
+        selections = synthetic_selections(n)
+        for size in args.sizes:
+            tuples = math.comb(n, size)
+            pruned, result = timed(pruned_search, service, selections, size, args.min_odds, args.max_odds)
+
+            if tuples <= args.legacy_budget:
+                legacy, expected = timed(legacy_search, selections, size, args.min_odds, args.max_odds)
+                same = "yes" if result == expected else "NO"
+            else:
+                sample, _ = timed(legacy_search, selections, size, args.min_odds, args.max_odds, args.legacy_budget)
+                legacy = sample * tuples / args.legacy_budget
+                same = "-"
+
+            estimate = "~" if tuples > args.legacy_budget else ""
+            print(f"{n:>10} {size:>5} {tuples:>12,} {pruned:>11.4f} {estimate + f'{legacy:.3f}':>11} "
+                  f"{legacy / pruned:>7.0f}x {same:>5}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Head-to-head features
+Compares the indexed H2H computation with the previous per-row filter.
+
+Usage:
+    python benchmarks/bench_h2h_features.py --rows 10000 100000
+
+At large sizes the legacy loop is timed on a sample of rows and
+extrapolated (each row scans the full DataFrame, so the cost per row is
+constant for a given size).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from preprocess import FootballFeatureEngineer  # noqa: E402
+
+
+def synthetic_rows(n_rows: int, n_teams: int = 400, seed: int = 42) -> pd.DataFrame:
+    """Team-perspective rows over several seasons"""
+    rng = np.random.default_rng(seed)
+    teams = np.array([f"Team {i}" for i in range(n_teams)])
+    df = pd.DataFrame({
+        'team': rng.choice(teams, n_rows),
+        'opponent': rng.choice(teams, n_rows),
+        'result': rng.choice(['W', 'D', 'L'], n_rows),
+        'goals_for': rng.integers(0, 5, n_rows),
+        'goals_against': rng.integers(0, 5, n_rows),
+        'match_date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, n_rows), unit='D'),
+    })
+    return df.sort_values(['match_date', 'team'])
+
+
+def legacy_seconds_per_row(engineer: FootballFeatureEngineer, df: pd.DataFrame, sample: int) -> float:
+    """Time the previous per-row boolean filter on `sample` rows"""
+    limit = engineer.config['head_to_head_limit']
+    rows = df.sample(min(sample, len(df)), random_state=0)
+
+    start = time.perf_counter()
+    for _, row in rows.iterrows():
+        team, opponent = row['team'], row['opponent']
+        h2h_matches = df[
+            ((df['team'] == team) & (df['opponent'] == opponent)) |
+            ((df['team'] == opponent) & (df['opponent'] == team))
+        ]
+        h2h_matches = h2h_matches[h2h_matches['match_date'] < row['match_date']].tail(limit)
+        engineer._calculate_h2h_statistics(h2h_matches, team, opponent)
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--legacy-sample', type=int, default=500,
+                        help='Rows timed with the legacy loop before extrapolating')
+    args = parser.parse_args()
+
+    engineer = FootballFeatureEngineer()
+    print(f"{'rows':>10} {'indexed (s)':>12} {'legacy (s)':>12} {'speedup':>10}")
+
+    for n_rows in args.rows:
+        df = synthetic_rows(n_rows)
+
+        start = time.perf_counter()
+        engineer._engineer_head_to_head_features(df.copy())
+        indexed = time.perf_counter() - start
+
+        legacy = legacy_seconds_per_row(engineer, df, args.legacy_sample) * n_rows
+        print(f"{n_rows:>10} {indexed:>12.3f} {legacy:>12.1f} {legacy / indexed:>9.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Cold start of the API (`import app.main`)
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the cumulative import time of app.main plus the slowest modules.
+Heavy ML/scraping dependencies must stay out of the startup path: they are
+imported on first use (app.core.lazy_imports, app.api.deps).
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --budget 3.0 --top 20
+
+Exits with status 1 when the median cold start is over --budget seconds or a
+module from HEAVY_MODULES was imported, so it can guard the budget in CI.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Imported only by the routes/jobs that need them, never by `import app.main`
+HEAVY_MODULES = (
+    'tensorflow', 'torch', 'transformers', 'xgboost', 'lightgbm',
+    'sklearn', 'scipy.stats', 'pandas', 'aiohttp', 'scrapy', 'selenium',
+)
+
+DEFAULT_BUDGET_SECONDS = 3.0
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """`-X importtime` output -> [(module, self_us, cumulative_us)] in import order"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_startup(target: str = 'app.main') -> Dict:
+    """Import `target` in a fresh interpreter; cumulative time in seconds + imported modules"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    rows = parse_importtime(proc.stderr)
+    cumulative = {name: cumulative_us for name, _, cumulative_us in rows}
+    return {
+        'seconds': cumulative.get(target, 0) / 1e6,
+        'modules': cumulative,
+        'rows': rows,
+    }
+
+
+def heavy_modules_imported(modules) -> List[str]:
+    return [name for name in HEAVY_MODULES if name in modules]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help='max median seconds for import app.main')
+    parser.add_argument('--top', type=int, default=15, help='slowest modules to list (self time)')
+    args = parser.parse_args()
+
+    # first run warms the OS page cache and writes .pyc files; not timed
+    measure_startup()
+    results = [measure_startup() for _ in range(args.runs)]
+    timings = [r['seconds'] for r in results]
+    median = statistics.median(timings)
+
+    print(f"import app.main: median {median:.3f}s  min {min(timings):.3f}s  "
+          f"max {max(timings):.3f}s  ({args.runs} runs, budget {args.budget:.2f}s)")
+
+    last = results[-1]
+    print(f"\n{'self ms':>9} {'cum ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(last['rows'], key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+    heavy = heavy_modules_imported(last['modules'])
+    if heavy:
+        print(f"\n❌ heavy modules imported at startup: {', '.join(heavy)}")
+    if median > args.budget:
+        print(f"\n❌ cold start over budget: {median:.3f}s > {args.budget:.2f}s")
+    return 1 if heavy or median > args.budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK - Rolling team form (ingest.py)
+Times the vectorized pre-match form builder against:
+- legacy: the previous groupby().apply(_calculate_form) + merge, which only
+  computed one "last N" snapshot per team (copied onto every row, leaking
+  future results into past matches), and
+- loop: a per-match loop producing the same leak-free features as the
+  vectorized builder (the straightforward way to get per-match form).
+
+The classification_input parquet holds league tables (one row per team),
+so fixtures are generated from it: a double round-robin per season, with
+Poisson goals driven by each team's goals scored/conceded per game (GP/GC
+over J). --seasons replicates the schedule to scale up.
+
+Usage:
+    python benchmarks/bench_team_form.py --seasons 1 10 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingest import MLDataIngestor  # noqa: E402
+
+DEFAULT_INPUT = Path(__file__).resolve().parent.parent / 'classification_input' / 'classification_data.parquet'
+
+
+def fixtures_from_standings(standings: pd.DataFrame, n_seasons: int, seed: int = 42) -> pd.DataFrame:
+    """Raw match rows (home_team, away_team, score, match_date) shaped like the scraper output"""
+    rng = np.random.default_rng(seed)
+    teams = standings['Equipevde'].str.replace(r'\s*\(.*\)$', '', regex=True).to_numpy()
+    attack = (standings['GP'] / standings['J']).to_numpy()
+    defence = (standings['GC'] / standings['J']).to_numpy()
+    pairs = [(h, a) for h in range(len(teams)) for a in range(len(teams)) if h != a]
+
+    rows = []
+    for season in range(n_seasons):
+        start = pd.Timestamp(f"{2000 + season}-04-01")
+        for round_idx, order in enumerate(rng.permutation(len(pairs))):
+            home, away = pairs[order]
+            home_goals = rng.poisson(np.sqrt(attack[home] * defence[away]) * 1.1)
+            away_goals = rng.poisson(np.sqrt(attack[away] * defence[home]) * 0.9)
+            rows.append({
+                'home_team': teams[home],
+                'away_team': teams[away],
+                'score': f"{home_goals}-{away_goals}",
+                'match_date': start + pd.Timedelta(days=round_idx // 10),
+                'competition': 'brasileirao',
+                'season': str(2000 + season),
+            })
+    return pd.DataFrame(rows)
+
+
+def legacy_team_statistics(ingestor: MLDataIngestor, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Previous implementation: last-N snapshot per team merged back on 'team'
+
+    The original reset the index before taking team names from it, so the
+    merge key came out as integers and the merge raised. Timed here with
+    the team index kept, i.e. what it was meant to do.
+    """
+
+    def calculate_form(team_data: pd.DataFrame, window: int) -> dict:
+        if len(team_data) < window:
+            return {}
+        recent = team_data.tail(window)
+        results = recent['result'].tolist()
+        return {
+            f'form_last_{window}': ''.join(results),
+            f'wins_last_{window}': results.count('W'),
+            f'draws_last_{window}': results.count('D'),
+            f'losses_last_{window}': results.count('L'),
+            f'goals_for_avg_last_{window}': recent['goals_for'].mean(),
+            f'goals_against_avg_last_{window}': recent['goals_against'].mean(),
+        }
+
+    team_stats = df.groupby('team').agg({
+        'goals_for': ['mean', 'std', 'sum'],
+        'goals_against': ['mean', 'std', 'sum'],
+        'result': lambda x: (x == 'W').mean()
+    }).round(3)
+    team_stats.columns = ['goals_for_avg', 'goals_for_std', 'goals_for_total',
+                          'goals_against_avg', 'goals_against_std', 'goals_against_total', 'win_rate']
+
+    for window in ingestor.config['feature_windows']:
+        if len(df) >= window:
+            form_stats = df.groupby('team').apply(lambda x: calculate_form(x, window))
+            form_df = pd.DataFrame(form_stats.tolist())
+            form_df['team'] = form_stats.index
+            df = df.merge(form_df, on='team', how='left', suffixes=('', f'_last_{window}'))
+
+    return df.merge(team_stats, on='team', how='left')
+
+
+def per_match_loop(ingestor: MLDataIngestor, df: pd.DataFrame) -> pd.DataFrame:
+    """Same pre-match window features as the vectorized builder, one row at a time"""
+    df = df.assign(match_date=pd.to_datetime(df['match_date']))
+    features = {}
+    for _, games in df.sort_values('match_date', kind='mergesort').groupby('team'):
+        for i, (idx, _) in enumerate(games.iterrows()):
+            row = {}
+            for window in ingestor.config['feature_windows']:
+                recent = games.iloc[max(0, i - window):i]
+                results = recent['result']
+                played = results.isin(['W', 'D', 'L']).sum()
+                points = 3 * (results == 'W').sum() + (results == 'D').sum()
+                row.update({
+                    f'wins_last_{window}': (results == 'W').sum(),
+                    f'draws_last_{window}': (results == 'D').sum(),
+                    f'losses_last_{window}': (results == 'L').sum(),
+                    f'form_last_{window}': ''.join(results.dropna()),
+                    f'goals_for_avg_last_{window}': recent['goals_for'].mean(),
+                    f'goals_against_avg_last_{window}': recent['goals_against'].mean(),
+                    f'points_per_game_last_{window}': points / played if played else np.nan,
+                })
+            features[idx] = row
+    return df.join(pd.DataFrame.from_dict(features, orient='index'))
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT)
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--windows', type=int, nargs='+', default=[5, 10])
+    args = parser.parse_args()
+
+    standings = pd.read_parquet(args.input)
+    ingestor = MLDataIngestor()
+    ingestor.config['feature_windows'] = args.windows
+
+    print(f"{len(standings)} teams from {args.input.name}, windows {args.windows}")
+    print(f"{'seasons':>8} {'rows':>8} {'vectorized (s)':>15} {'legacy (s)':>11} {'loop (s)':>9} {'vs loop':>8}")
+
+    for n_seasons in args.seasons:
+        rows = ingestor._create_match_features(fixtures_from_standings(standings, n_seasons))
+
+        vectorized = timed(ingestor._add_team_statistics, rows.copy())
+        legacy = timed(legacy_team_statistics, ingestor, rows.copy())
+        loop = timed(per_match_loop, ingestor, rows.copy())
+
+        print(f"{n_seasons:>8} {len(rows):>8} {vectorized:>15.3f} {legacy:>11.3f} {loop:>9.2f} {loop / vectorized:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
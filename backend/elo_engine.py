@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+📈 ELO RATING ENGINE
+Incremental ELO ratings with array-backed state keyed by team id.
+Processes team-perspective match rows in chronological order and persists
+its state, so new results are applied without replaying history.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Set, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+RESULT_SCORES = {'W': 1.0, 'D': 0.5}
+
+
+class EloRatingEngine:
+    """ELO ratings for teams, updated one team-perspective row at a time"""
+
+    def __init__(self, k_factor: float = 32, initial_rating: float = 1500.0):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+
+        # Team id space: team name -> position in the state arrays
+        self.team_index = pd.Index([], dtype=object)
+        self.ratings = np.zeros(0)
+        self.known = np.zeros(0, dtype=bool)  # Team has appeared as 'team' at least once
+        self.last_date: Optional[pd.Timestamp] = None
+        self.rows_processed = 0
+        self.applied_keys: Set[str] = set()  # row_keys() of every row already applied
+
+    @staticmethod
+    def row_keys(teams: Sequence, opponents: Optional[Sequence], dates: Sequence) -> pd.Index:
+        """Identity of a team-perspective row: team|opponent|date"""
+        n = len(teams)
+        opponents = pd.Series(opponents if opponents is not None else ['unknown'] * n, dtype=object)
+        dates = pd.to_datetime(pd.Series(dates)).dt.strftime('%Y-%m-%dT%H:%M:%S')
+        return pd.Index(
+            pd.Series(teams, dtype=object).astype(str).str.cat(
+                [opponents.astype(str).reset_index(drop=True), dates.reset_index(drop=True)], sep='|'
+            )
+        )
+
+    def _team_ids(self, names: Sequence) -> np.ndarray:
+        """Map names to state ids, growing the arrays for unseen teams"""
+        values = pd.Series(names, dtype=object).fillna('nan')
+        new = pd.Index(values.unique()).difference(self.team_index, sort=False)
+        if len(new):
+            self.team_index = self.team_index.append(new)
+            self.ratings = np.concatenate([self.ratings, np.full(len(new), float(self.initial_rating))])
+            self.known = np.concatenate([self.known, np.zeros(len(new), dtype=bool)])
+        return self.team_index.get_indexer(values)
+
+    def process(
+        self,
+        teams: Sequence,
+        opponents: Optional[Sequence] = None,
+        results: Optional[Sequence] = None,
+        dates: Optional[Sequence] = None,
+        keys: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        Apply rows in the given (chronological) order.
+
+        Each row updates only its own team, against the opponent's current
+        rating, and only when the opponent has already been seen as a team.
+
+        Args:
+            teams: Team name per row
+            opponents: Opponent name per row ('unknown'/NaN = no update)
+            results: 'W'/'D'/'L' per row (NaN = no update)
+            dates: Match dates, used to track the last processed date
+            keys: row_keys() of the rows, recorded as applied
+
+        Returns:
+            Pre-match rating per row
+        """
+        n = len(teams)
+        team_ids = self._team_ids(teams).tolist()
+
+        if opponents is not None and results is not None:
+            opponents = pd.Series(opponents, dtype=object)
+            valid_opponent = opponents.notna() & (opponents != 'unknown')
+            opp_ids = np.full(n, -1)
+            opp_ids[valid_opponent.to_numpy()] = self._team_ids(opponents[valid_opponent])
+            results = pd.Series(results, dtype=object)
+            scores = np.where(
+                results.notna(),
+                results.map(RESULT_SCORES).fillna(0.0).to_numpy(dtype=float),
+                np.nan
+            )
+        else:
+            opp_ids = np.full(n, -1)
+            scores = np.full(n, np.nan)
+
+        # Tight loop over plain lists (much faster than ndarray item access)
+        ratings = self.ratings.tolist()
+        known = self.known.tolist()
+        opp_ids = opp_ids.tolist()
+        scores = scores.tolist()
+        k = float(self.k_factor)
+        pre_match = [0.0] * n
+
+        for i in range(n):
+            t = team_ids[i]
+            known[t] = True
+            current = ratings[t]
+            pre_match[i] = current
+
+            o = opp_ids[i]
+            s = scores[i]
+            if o >= 0 and s == s and known[o]:
+                expected = 1 / (1 + 10 ** ((ratings[o] - current) / 400))
+                ratings[t] = current + k * (s - expected)
+
+        self.ratings = np.asarray(ratings, dtype=float)
+        self.known = np.asarray(known, dtype=bool)
+        self.rows_processed += n
+        if keys is not None:
+            self.applied_keys.update(keys)
+        if dates is not None and n:
+            latest = pd.Series(dates).max()
+            if pd.notna(latest) and (self.last_date is None or latest > self.last_date):
+                self.last_date = pd.Timestamp(latest)
+
+        return np.asarray(pre_match, dtype=float)
+
+    def rating(self, team: str) -> float:
+        """Current rating of a team (initial rating if never seen)"""
+        position = self.team_index.get_indexer([team])[0]
+        return float(self.ratings[position]) if position >= 0 else float(self.initial_rating)
+
+    def ratings_dict(self) -> Dict[str, float]:
+        return dict(zip(self.team_index, self.ratings.tolist()))
+
+    # ========== PERSISTENCE ==========
+
+    def save(self, path: Union[str, Path]):
+        """Persist state as JSON (written atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'k_factor': self.k_factor,
+            'initial_rating': self.initial_rating,
+            'teams': self.team_index.tolist(),
+            'ratings': self.ratings.tolist(),
+            'known': self.known.tolist(),
+            'last_date': self.last_date.isoformat() if self.last_date is not None else None,
+            'rows_processed': self.rows_processed,
+            'applied_keys': sorted(self.applied_keys),
+        }
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "EloRatingEngine":
+        state = json.loads(Path(path).read_text())
+        engine = cls(k_factor=state['k_factor'], initial_rating=state['initial_rating'])
+        engine.team_index = pd.Index(state['teams'], dtype=object)
+        engine.ratings = np.asarray(state['ratings'], dtype=float)
+        engine.known = np.asarray(state['known'], dtype=bool)
+        engine.last_date = pd.Timestamp(state['last_date']) if state['last_date'] else None
+        engine.rows_processed = state['rows_processed']
+        engine.applied_keys = set(state.get('applied_keys', []))
+        return engine
@@ -17,11 +17,18 @@ from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import json
 
+from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.feature_store import FeatureStore
 from app.models.match import Match
 from app.models.statistics import MatchStatistics
 from app.models.team import Team
 
+# Dataset do feature store com as features avançadas (uma linha por jogo)
+ENHANCED_DATASET = 'enhanced_features'
+ENHANCED_KEY_COLUMNS = ['match_id', 'match_date', 'competition', 'season']
+
+
 class EnhancedFeatureExtractor:
     """Extrator de features avançadas para ML"""
 
@@ -236,20 +243,31 @@ class EnhancedFeatureExtractor:
         return result
 
 
-def create_enhanced_dataset(db):
-    """Criar dataset com features avançadas"""
+def create_enhanced_dataset(db, store: FeatureStore = None):
+    """
+    Criar dataset com features avançadas
+
+    As features de cada jogo são calculadas uma única vez e gravadas no
+    feature store; execuções seguintes só processam os jogos novos.
+    """
+    store = store or FeatureStore(settings.FEATURE_STORE_PATH)
     print("📊 Carregando matches com estatísticas...")
 
-    # Buscar matches finalizados com estatísticas
-    matches = db.query(Match).join(
-        MatchStatistics, Match.id == MatchStatistics.match_id
-    ).filter(
-        Match.status == 'FT',
-        Match.home_score.isnot(None),
-        Match.away_score.isnot(None)
-    ).order_by(Match.match_date).all()
+    # Buscar matches finalizados com estatísticas que ainda não estão no store
+    known = store.known_keys(ENHANCED_DATASET, 'match_id')
+    new_ids = [
+        match_id for (match_id,) in db.query(Match.id).join(
+            MatchStatistics, Match.id == MatchStatistics.match_id
+        ).filter(
+            Match.status == 'FT',
+            Match.home_score.isnot(None),
+            Match.away_score.isnot(None)
+        )
+        if match_id not in known
+    ]
+    matches = db.query(Match).filter(Match.id.in_(new_ids)).order_by(Match.match_date).all() if new_ids else []
 
-    print(f"   ✅ {len(matches)} matches carregados")
+    print(f"   ✅ {len(matches)} matches novos ({len(known)} já no feature store)")
 
     extractor = EnhancedFeatureExtractor(db)
 
@@ -309,6 +327,10 @@ def create_enhanced_dataset(db):
 
         # Combinar todas as features
         row = {
+            'match_id': match.id,
+            'match_date': match.match_date,
+            'competition': match.league,
+            'season': match.season,
             **basic_features,
             # Forma recente - Home
             'home_recent_wins': home_form['wins'],
@@ -349,7 +371,13 @@ def create_enhanced_dataset(db):
 
         data.append(row)
 
-    df = pd.DataFrame(data)
+    if data:
+        store.append(ENHANCED_DATASET, pd.DataFrame(data), key='match_id')
+
+    # Ler o dataset completo do store, sem as colunas de identificação
+    df = store.read(ENHANCED_DATASET)
+    if not df.empty:
+        df = df.sort_values('match_date', kind='mergesort').drop(columns=ENHANCED_KEY_COLUMNS).reset_index(drop=True)
     print(f"   ✅ Dataset criado: {len(df)} matches com features avançadas")
 
     return df
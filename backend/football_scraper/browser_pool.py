@@ -0,0 +1,369 @@
+"""
+🌐 BROWSER POOL - Shared Headless Chrome Workers
+Small pool of reusable Selenium drivers used by SeleniumFetcher and
+JavaScriptMiddleware. Features:
+- Configurable pool size (pages render in parallel, one per browser)
+- Page reuse with cookie/storage reset between renders
+- Health check on checkout, dead browsers are replaced
+- Recycle a browser after N pages (keeps Chrome memory in check)
+- Queue-wait and render-time metrics
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES_PER_BROWSER = 50
+DEFAULT_PAGE_LOAD_TIMEOUT = 30
+
+CHROME_ARGUMENTS = [
+    '--headless',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--allow-running-insecure-content',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-images',
+    '--window-size=1920,1080',
+]
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def _chromedriver_path() -> str:
+    """Resolve chromedriver once per process (webdriver-manager hits the network)"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+def create_chrome_driver(page_load_timeout: int = DEFAULT_PAGE_LOAD_TIMEOUT):
+    """Default driver factory: headless Chrome"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    options = Options()
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+
+    driver = webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+    driver.implicitly_wait(10)
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+@dataclass
+class BrowserWorker:
+    """One pooled browser and its usage counters"""
+    worker_id: int
+    driver: object
+    pages_rendered: int = 0
+    created_at: datetime = field(default_factory=datetime.now)
+    last_origin: Optional[str] = None
+    slots: Optional[threading.Semaphore] = None
+
+@dataclass
+class RenderedPage:
+    """Result of BrowserPool.render"""
+    html: str
+    title: str
+    current_url: str
+    queue_wait: float
+    render_time: float
+    worker_id: int
+
+class BrowserPoolStats:
+    """Queue-wait and render-time metrics"""
+    def __init__(self):
+        self.renders = 0
+        self.failures = 0
+        self.browsers_created = 0
+        self.browsers_recycled = 0
+        self.health_check_failures = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.render_time_total = 0.0
+        self.render_time_max = 0.0
+
+    def add_queue_wait(self, seconds: float):
+        self.queue_wait_total += seconds
+        self.queue_wait_max = max(self.queue_wait_max, seconds)
+
+    def add_render(self, seconds: float, success: bool):
+        if success:
+            self.renders += 1
+        else:
+            self.failures += 1
+        self.render_time_total += seconds
+        self.render_time_max = max(self.render_time_max, seconds)
+
+class BrowserPool:
+    """
+    🏊 Pool of headless browsers
+    Thread-safe; render() blocks, so async callers run it in a worker thread
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+        page_load_timeout: int = DEFAULT_PAGE_LOAD_TIMEOUT,
+        driver_factory: Optional[Callable[[], object]] = None
+    ):
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.page_load_timeout = page_load_timeout
+        self.driver_factory = driver_factory or (lambda: create_chrome_driver(self.page_load_timeout))
+
+        self._slots = threading.Semaphore(size)
+        self._idle: List[BrowserWorker] = []
+        self._lock = threading.Lock()
+        self._live = 0
+        self._checked_out = 0
+        self._next_id = 0
+        self._waiting = 0
+        self.stats = BrowserPoolStats()
+
+    def configure(
+        self,
+        size: Optional[int] = None,
+        max_pages_per_browser: Optional[int] = None,
+        page_load_timeout: Optional[int] = None
+    ):
+        """Configure pool parameters (size can only change while no browser is checked out)"""
+        with self._lock:
+            if size is not None and size != self.size:
+                if self._checked_out:
+                    logger.warning("Browser pool busy, keeping size %s", self.size)
+                else:
+                    self.size = size
+                    self._slots = threading.Semaphore(size)
+            if max_pages_per_browser is not None:
+                self.max_pages_per_browser = max_pages_per_browser
+            if page_load_timeout is not None:
+                self.page_load_timeout = page_load_timeout
+
+    # ========== CHECKOUT / CHECKIN ==========
+
+    def _new_worker(self) -> BrowserWorker:
+        driver = self.driver_factory()
+
+        with self._lock:
+            self._live += 1
+            self._next_id += 1
+            self.stats.browsers_created += 1
+            worker_id = self._next_id
+
+        logger.info(f"Browser #{worker_id} started ({self._live}/{self.size})")
+        return BrowserWorker(worker_id=worker_id, driver=driver)
+
+    def _is_healthy(self, worker: BrowserWorker) -> bool:
+        try:
+            return worker.driver.execute_script("return 1") == 1
+        except Exception as e:
+            logger.warning(f"Browser #{worker.worker_id} failed health check: {e}")
+            return False
+
+    def _discard(self, worker: BrowserWorker):
+        try:
+            worker.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser #{worker.worker_id}: {e}")
+        with self._lock:
+            self._live -= 1
+
+    def acquire(self, timeout: Optional[float] = None) -> BrowserWorker:
+        """Check out a healthy browser, waiting for a free slot if the pool is full"""
+        start_time = time.time()
+        slots = self._slots
+
+        with self._lock:
+            self._waiting += 1
+        try:
+            acquired = slots.acquire(timeout=timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not acquired:
+            raise TimeoutError(f"No browser available after {timeout}s")
+
+        try:
+            while True:
+                with self._lock:
+                    worker = self._idle.pop() if self._idle else None
+
+                if worker is None:
+                    worker = self._new_worker()
+                elif not self._is_healthy(worker):
+                    with self._lock:
+                        self.stats.health_check_failures += 1
+                    self._discard(worker)
+                    continue
+                break
+        except Exception:
+            slots.release()
+            raise
+
+        worker.slots = slots
+        with self._lock:
+            self._checked_out += 1
+            self.stats.add_queue_wait(time.time() - start_time)
+        return worker
+
+    def release(self, worker: BrowserWorker, healthy: bool = True):
+        """Return a browser: recycle it after N pages, otherwise reset its storage"""
+        worker.pages_rendered += 1
+
+        try:
+            if not healthy:
+                self._discard(worker)
+            elif worker.pages_rendered >= self.max_pages_per_browser:
+                logger.info(f"Recycling browser #{worker.worker_id} after {worker.pages_rendered} pages")
+                with self._lock:
+                    self.stats.browsers_recycled += 1
+                self._discard(worker)
+            else:
+                try:
+                    self._reset_storage(worker)
+                except Exception as e:
+                    logger.warning(f"Storage reset failed for browser #{worker.worker_id}: {e}")
+                    self._discard(worker)
+                else:
+                    with self._lock:
+                        self._idle.append(worker)
+        finally:
+            with self._lock:
+                self._checked_out -= 1
+            worker.slots.release()
+
+    def _reset_storage(self, worker: BrowserWorker):
+        """Clear cookies, local/session storage and cache left by the last page"""
+        driver = worker.driver
+        if worker.last_origin:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': worker.last_origin,
+                'storageTypes': 'all'
+            })
+        driver.delete_all_cookies()
+        driver.get('about:blank')
+        worker.last_origin = None
+
+    # ========== RENDERING ==========
+
+    def render(
+        self,
+        url: str,
+        user_agent: Optional[str] = None,
+        wait_time: float = 3,
+        wait_for_selector: Optional[str] = None,
+        scroll_down: bool = False,
+        timeout: Optional[float] = None
+    ) -> RenderedPage:
+        """
+        Render a page on a pooled browser (blocking)
+
+        Args:
+            url: URL to render
+            user_agent: User-Agent override for this page
+            wait_time: Seconds to wait after load
+            wait_for_selector: CSS selector to wait for
+            scroll_down: Scroll to the bottom before reading the page
+            timeout: Max seconds to wait for a free browser
+        """
+        requested_at = time.time()
+        worker = self.acquire(timeout=timeout)
+        queue_wait = time.time() - requested_at
+        healthy = True
+        start_time = time.time()
+
+        try:
+            driver = worker.driver
+
+            if user_agent:
+                driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+
+            parsed = urlparse(url)
+            worker.last_origin = f"{parsed.scheme}://{parsed.netloc}"
+            driver.get(url)
+
+            if wait_time:
+                time.sleep(wait_time)
+
+            if wait_for_selector:
+                from selenium.webdriver.common.by import By
+                from selenium.webdriver.support import expected_conditions as EC
+                from selenium.webdriver.support.ui import WebDriverWait
+
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_selector))
+                )
+
+            if scroll_down:
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)
+
+            page = RenderedPage(
+                html=driver.page_source,
+                title=driver.title,
+                current_url=driver.current_url,
+                queue_wait=queue_wait,
+                render_time=time.time() - start_time,
+                worker_id=worker.worker_id
+            )
+            with self._lock:
+                self.stats.add_render(page.render_time, success=True)
+            return page
+
+        except Exception:
+            with self._lock:
+                self.stats.add_render(time.time() - start_time, success=False)
+            healthy = self._is_healthy(worker)
+            raise
+
+        finally:
+            self.release(worker, healthy=healthy)
+
+    # ========== LIFECYCLE ==========
+
+    def close(self):
+        """Quit all idle browsers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._discard(worker)
+
+    def get_stats(self) -> Dict:
+        """Get pool statistics"""
+        stats = self.stats
+        completed = stats.renders + stats.failures
+        return {
+            'size': self.size,
+            'live_browsers': self._live,
+            'idle_browsers': len(self._idle),
+            'checked_out': self._checked_out,
+            'waiting': self._waiting,
+            'max_pages_per_browser': self.max_pages_per_browser,
+            'renders': stats.renders,
+            'failures': stats.failures,
+            'browsers_created': stats.browsers_created,
+            'browsers_recycled': stats.browsers_recycled,
+            'health_check_failures': stats.health_check_failures,
+            'avg_queue_wait': stats.queue_wait_total / max(completed, 1),
+            'max_queue_wait': stats.queue_wait_max,
+            'avg_render_time': stats.render_time_total / max(completed, 1),
+            'max_render_time': stats.render_time_max,
+        }
+
+# Global browser pool instance
+browser_pool = BrowserPool()
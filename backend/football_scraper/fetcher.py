@@ -5,31 +5,44 @@ Implements multiple fetching strategies with automatic fallback:
 2. requests + pandas.read_html
 3. requests_html (JS rendering)
 4. Selenium headless (fallback final)
+
+The HTTP-based strategies share one async backend (httpx) with a
+connection pool and a concurrency limit per domain, so MultiFetcher
+can overlap requests. Selenium renders on the shared browser pool
+(browser_pool.py) from worker threads.
 """
 
 import asyncio
+import inspect
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Union, Any
+from io import StringIO
+from typing import Dict, List, Optional, Tuple, Union, Any
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlparse
+import httpx
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
-from requests_html import HTMLSession
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-
-from .proxy_manager import proxy_manager
+from requests_html import AsyncHTMLSession, HTML
+
+from .browser_pool import browser_pool, BrowserPool
+from .proxy_manager import proxy_manager, ProxyInfo
 from .ua_manager import ua_manager
-from .retry_backoff import retry_manager
+from .retry_backoff import retry_manager, RetryBackoffManager
 
 logger = logging.getLogger(__name__)
 
+# Same defaults as CONCURRENT_REQUESTS / CONCURRENT_REQUESTS_PER_DOMAIN in settings.py
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_DOMAIN_LIMIT = 2
+DEFAULT_TIMEOUT = 30.0
+
+# httpx 0.26 renamed AsyncClient(proxies=) to proxy= and 0.28 dropped the old
+# name; requirements pin 0.25.2, which only knows proxies=
+_PROXY_KWARG = 'proxy' if 'proxy' in inspect.signature(httpx.AsyncClient).parameters else 'proxies'
+
 class FetchResult:
     """Container for fetch results"""
     def __init__(
@@ -51,6 +64,169 @@ class FetchResult:
         self.metadata = metadata or {}
         self.timestamp = datetime.now()
 
+class HTTPStatusError(Exception):
+    """Non-200 response; carries status_code so retry_manager can classify it"""
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+def _read_tables(html: str, **kwargs) -> List[pd.DataFrame]:
+    """pandas.read_html that returns [] when the page has no tables"""
+    try:
+        return pd.read_html(StringIO(html), **kwargs)
+    except ValueError:
+        return []
+
+class AsyncHttpClient:
+    """
+    🌐 Async HTTP backend shared by the HTTP-based fetchers
+    - One httpx.AsyncClient (connection pool) per domain and proxy
+    - Per-domain concurrency limit
+    - Proxy and User-Agent rotation through proxy_manager / ua_manager
+    - Retries through retry_manager.execute_with_retry
+    """
+
+    def __init__(
+        self,
+        per_domain_limit: int = DEFAULT_PER_DOMAIN_LIMIT,
+        timeout: float = DEFAULT_TIMEOUT,
+        use_proxies: bool = True,
+        retry: Optional[RetryBackoffManager] = None
+    ):
+        self.per_domain_limit = per_domain_limit
+        self.timeout = timeout
+        self.use_proxies = use_proxies
+        self.retry = retry or retry_manager
+        self._clients: Dict[Tuple[str, Optional[str]], httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop = None
+        self.requests_per_domain: Dict[str, int] = {}
+
+    def _bind_loop(self):
+        """Pools and semaphores belong to the event loop that created them"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            old_loop, clients = self._loop, list(self._clients.values())
+            self.reset()
+            self._loop = loop
+            if clients:
+                self._close_on_loop(old_loop, clients)
+
+    @staticmethod
+    def _close_on_loop(loop, clients: List[httpx.AsyncClient]):
+        """
+        Close pools left behind by a loop change. Their sockets belong to
+        the old loop, so they are closed there, never on the current one.
+        """
+        async def close_all():
+            for client in clients:
+                await client.aclose()
+
+        if loop is None or loop.is_closed():
+            # Nothing left to run aclose() on; callers should await aclose()
+            # before their loop ends (MultiFetcher keeps a single loop)
+            logger.warning(f"Dropping {len(clients)} HTTP pools: their event loop is closed")
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(close_all(), loop)
+        else:
+            threading.Thread(target=loop.run_until_complete, args=(close_all(),), daemon=True).start()
+
+    def _client(self, domain: str, proxy: Optional[str]) -> httpx.AsyncClient:
+        key = (domain, proxy)
+        if key not in self._clients:
+            self._clients[key] = httpx.AsyncClient(
+                **{_PROXY_KWARG: proxy},
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.per_domain_limit,
+                    max_keepalive_connections=self.per_domain_limit
+                )
+            )
+        return self._clients[key]
+
+    def _semaphore(self, domain: str) -> asyncio.Semaphore:
+        if domain not in self._semaphores:
+            self._semaphores[domain] = asyncio.Semaphore(self.per_domain_limit)
+        return self._semaphores[domain]
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        proxy: Optional[str] = None
+    ) -> Tuple[httpx.Response, Optional[ProxyInfo], Dict[str, str]]:
+        """
+        GET with retry. Raises HTTPStatusError / httpx.HTTPError once
+        retries are exhausted.
+
+        Returns (response, proxy used, request headers).
+        """
+        self._bind_loop()
+        domain = urlparse(url).netloc
+
+        # The domain slot is held during retry backoff too, which keeps
+        # the pressure off a domain that is already rate limiting us
+        async with self._semaphore(domain):
+            self.requests_per_domain[domain] = self.requests_per_domain.get(domain, 0) + 1
+            return await self.retry.execute_with_retry(
+                self._get_once, url, domain, headers, proxy, domain=domain
+            )
+
+    async def _get_once(
+        self,
+        url: str,
+        domain: str,
+        headers: Optional[Dict[str, str]],
+        proxy: Optional[str]
+    ) -> Tuple[httpx.Response, Optional[ProxyInfo], Dict[str, str]]:
+        """Single attempt; a new proxy and User-Agent are picked on every retry"""
+        proxy_info = None
+        if proxy is None and self.use_proxies:
+            proxy_info = await proxy_manager.get_proxy()
+            proxy = proxy_info.formatted_proxy if proxy_info else None
+
+        headers = dict(headers or ua_manager.get_random_headers())
+        # Let httpx advertise only the encodings it can decode (br needs brotli)
+        headers.pop('Accept-Encoding', None)
+
+        start_time = time.time()
+        try:
+            response = await self._client(domain, proxy).get(url, headers=headers)
+        except httpx.HTTPError:
+            if proxy_info:
+                proxy_manager.report_failure(proxy_info)
+            raise
+
+        if response.status_code != 200:
+            if proxy_info:
+                proxy_manager.report_failure(proxy_info, response.status_code)
+            raise HTTPStatusError(response.status_code)
+
+        if proxy_info:
+            proxy_manager.report_success(proxy_info, time.time() - start_time)
+
+        return response, proxy_info, headers
+
+    def reset(self):
+        """Forget pools without awaiting (their loop may already be closed)"""
+        self._clients = {}
+        self._semaphores = {}
+
+    async def aclose(self):
+        """Close all connection pools"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+        self._semaphores = {}
+
+    def get_stats(self) -> Dict:
+        return {
+            'per_domain_limit': self.per_domain_limit,
+            'open_pools': len(self._clients),
+            'requests_per_domain': dict(self.requests_per_domain)
+        }
+
 class BaseFetcher:
     """Base class for all fetchers"""
 
@@ -76,380 +252,273 @@ class BaseFetcher:
             'avg_response_time': self.total_response_time / max(self.success_count, 1)
         }
 
-class ScrapyFetcher(BaseFetcher):
+class HttpFetcher(BaseFetcher):
+    """Base class for the fetchers backed by AsyncHttpClient"""
+
+    def __init__(self, name: str, http: Optional[AsyncHttpClient] = None):
+        super().__init__(name)
+        self.http = http or AsyncHttpClient()
+
+    async def _get(self, url: str, **kwargs) -> Tuple[httpx.Response, Optional[ProxyInfo], Dict[str, str]]:
+        """GET honouring the proxy / user_agent passed by the spider"""
+        headers = None
+        user_agent = kwargs.get('user_agent')
+        if isinstance(user_agent, bytes):
+            user_agent = user_agent.decode('utf-8', 'ignore')
+        if user_agent:
+            headers = ua_manager.get_random_headers()
+            headers['User-Agent'] = user_agent
+
+        return await self.http.get(url, headers=headers, proxy=kwargs.get('proxy'))
+
+    def _failure(self, start_time: float, error: Exception) -> FetchResult:
+        self.failure_count += 1
+        return FetchResult(
+            success=False,
+            strategy=self.name,
+            response_time=time.time() - start_time,
+            status_code=getattr(error, 'status_code', None),
+            error=str(error)
+        )
+
+class ScrapyFetcher(HttpFetcher):
     """
-    🕷️ Scrapy-based fetcher (primary strategy)
-    Uses Scrapy's robust downloading system
+    🕷️ Scrapy-style fetcher (primary strategy)
+    Plain async download through the shared HTTP backend
     """
 
-    def __init__(self):
-        super().__init__("scrapy")
+    def __init__(self, http: Optional[AsyncHttpClient] = None):
+        super().__init__("scrapy", http)
 
     async def fetch(self, url: str, **kwargs) -> FetchResult:
-        """Fetch using Scrapy downloader"""
+        """Fetch using the async HTTP backend"""
         start_time = time.time()
 
         try:
-            # This would integrate with Scrapy's downloader
-            # For now, we'll use requests as a placeholder
-            # In a full Scrapy integration, this would use the Scrapy engine
-
-            headers = ua_manager.get_random_headers()
-            proxy = await proxy_manager.get_proxy()
-
-            proxies = None
-            if proxy:
-                proxies = {
-                    'http': proxy.formatted_proxy,
-                    'https': proxy.formatted_proxy
-                }
-
-            response = requests.get(
-                url,
-                headers=headers,
-                proxies=proxies,
-                timeout=30,
-                allow_redirects=True
-            )
-
-            response_time = time.time() - start_time
+            response, proxy, headers = await self._get(url, **kwargs)
 
-            if response.status_code == 200:
-                self.success_count += 1
-                self.total_response_time += response_time
-
-                # Parse tables if HTML
-                tables = []
-                if 'text/html' in response.headers.get('content-type', ''):
-                    try:
-                        tables = pd.read_html(response.text)
-                    except ValueError:
-                        pass  # No tables found
-
-                return FetchResult(
-                    success=True,
-                    data={
-                        'html': response.text,
-                        'tables': tables,
-                        'headers': dict(response.headers)
-                    },
-                    strategy=self.name,
-                    response_time=response_time,
-                    status_code=response.status_code,
-                    metadata={
-                        'url': url,
-                        'proxy_used': proxy.url if proxy else None,
-                        'user_agent': headers.get('User-Agent')
-                    }
-                )
-            else:
-                self.failure_count += 1
-                return FetchResult(
-                    success=False,
-                    strategy=self.name,
-                    response_time=response_time,
-                    status_code=response.status_code,
-                    error=f"HTTP {response.status_code}"
-                )
+            # Parse tables if HTML (off the event loop, lxml parsing is CPU bound)
+            tables = []
+            if 'text/html' in response.headers.get('content-type', ''):
+                tables = await asyncio.to_thread(_read_tables, response.text)
 
-        except Exception as e:
-            self.failure_count += 1
             response_time = time.time() - start_time
+            self.success_count += 1
+            self.total_response_time += response_time
 
             return FetchResult(
-                success=False,
+                success=True,
+                data={
+                    'html': response.text,
+                    'tables': tables,
+                    'headers': dict(response.headers)
+                },
                 strategy=self.name,
                 response_time=response_time,
-                error=str(e)
+                status_code=response.status_code,
+                metadata={
+                    'url': url,
+                    'proxy_used': proxy.url if proxy else kwargs.get('proxy'),
+                    'user_agent': headers.get('User-Agent')
+                }
             )
 
-class RequestsPandasFetcher(BaseFetcher):
+        except Exception as e:
+            return self._failure(start_time, e)
+
+class RequestsPandasFetcher(HttpFetcher):
     """
-    📊 Requests + pandas.read_html fetcher
+    📊 HTTP + pandas.read_html fetcher
     Good for simple HTML tables
     """
 
-    def __init__(self):
-        super().__init__("requests_pandas")
-        self.session = requests.Session()
+    def __init__(self, http: Optional[AsyncHttpClient] = None):
+        super().__init__("requests_pandas", http)
 
     async def fetch(self, url: str, **kwargs) -> FetchResult:
-        """Fetch using requests + pandas"""
+        """Fetch using the async HTTP backend + pandas"""
         start_time = time.time()
 
         try:
-            headers = ua_manager.get_random_headers()
-            proxy = await proxy_manager.get_proxy()
-
-            # Update session headers
-            self.session.headers.update(headers)
-
-            # Set proxy
-            if proxy:
-                self.session.proxies = {
-                    'http': proxy.formatted_proxy,
-                    'https': proxy.formatted_proxy
-                }
-
-            response = self.session.get(url, timeout=30)
-            response_time = time.time() - start_time
-
-            if response.status_code == 200:
-                # Try to extract tables with pandas
-                tables = []
-                try:
-                    tables = pd.read_html(
-                        response.text,
-                        match=kwargs.get('table_match'),
-                        attrs=kwargs.get('table_attrs'),
-                        encoding='utf-8'
-                    )
-                    logger.info(f"Found {len(tables)} tables in {url}")
-                except ValueError:
-                    logger.warning(f"No tables found in {url}")
-
-                self.success_count += 1
-                self.total_response_time += response_time
-
-                return FetchResult(
-                    success=True,
-                    data={
-                        'html': response.text,
-                        'tables': tables,
-                        'headers': dict(response.headers)
-                    },
-                    strategy=self.name,
-                    response_time=response_time,
-                    status_code=response.status_code,
-                    metadata={
-                        'url': url,
-                        'proxy_used': proxy.url if proxy else None,
-                        'tables_found': len(tables)
-                    }
-                )
+            response, proxy, _ = await self._get(url, **kwargs)
+
+            # Try to extract tables with pandas
+            tables = await asyncio.to_thread(
+                _read_tables,
+                response.text,
+                match=kwargs.get('table_match') or '.+',
+                attrs=kwargs.get('table_attrs'),
+                encoding='utf-8'
+            )
+            if tables:
+                logger.info(f"Found {len(tables)} tables in {url}")
             else:
-                self.failure_count += 1
-                return FetchResult(
-                    success=False,
-                    strategy=self.name,
-                    response_time=response_time,
-                    status_code=response.status_code,
-                    error=f"HTTP {response.status_code}"
-                )
+                logger.warning(f"No tables found in {url}")
 
-        except Exception as e:
-            self.failure_count += 1
             response_time = time.time() - start_time
+            self.success_count += 1
+            self.total_response_time += response_time
 
             return FetchResult(
-                success=False,
+                success=True,
+                data={
+                    'html': response.text,
+                    'tables': tables,
+                    'headers': dict(response.headers)
+                },
                 strategy=self.name,
                 response_time=response_time,
-                error=str(e)
+                status_code=response.status_code,
+                metadata={
+                    'url': url,
+                    'proxy_used': proxy.url if proxy else kwargs.get('proxy'),
+                    'tables_found': len(tables)
+                }
             )
 
-class RequestsHtmlFetcher(BaseFetcher):
+        except Exception as e:
+            return self._failure(start_time, e)
+
+class RequestsHtmlFetcher(HttpFetcher):
     """
     🌐 requests-html fetcher with JS rendering
     Good for JavaScript-heavy sites
     """
 
-    def __init__(self):
-        super().__init__("requests_html")
-        self.session = HTMLSession()
+    def __init__(self, http: Optional[AsyncHttpClient] = None):
+        super().__init__("requests_html", http)
+        self.render_session: Optional[AsyncHTMLSession] = None
+
+    def _get_render_session(self) -> AsyncHTMLSession:
+        """AsyncHTMLSession (headless Chromium) created on the running loop"""
+        if self.render_session is None or self.render_session.loop is not asyncio.get_running_loop():
+            self.render_session = AsyncHTMLSession(loop=asyncio.get_running_loop())
+        return self.render_session
 
     async def fetch(self, url: str, **kwargs) -> FetchResult:
-        """Fetch using requests-html"""
+        """Fetch using the async HTTP backend, rendering JS with requests-html"""
         start_time = time.time()
 
         try:
-            headers = ua_manager.get_random_headers()
-            proxy = await proxy_manager.get_proxy()
-
-            # Set proxy
-            if proxy:
-                self.session.proxies = {
-                    'http': proxy.formatted_proxy,
-                    'https': proxy.formatted_proxy
-                }
-
-            # Make request
-            response = self.session.get(url, headers=headers, timeout=30)
+            response, proxy, _ = await self._get(url, **kwargs)
 
             # Render JavaScript if needed
-            if kwargs.get('render_js', True):
-                response.html.render(
+            render_js = kwargs.get('render_js', True)
+            if render_js:
+                html = HTML(session=self._get_render_session(), url=str(response.url), html=response.text)
+                await html.arender(
                     timeout=20,
                     keep_page=False,
                     scrolldown=kwargs.get('scrolldown', 1)
                 )
-
-            response_time = time.time() - start_time
-
-            if response.status_code == 200:
-                # Extract tables from rendered HTML
-                tables = []
-                try:
-                    tables = pd.read_html(
-                        response.html.html,
-                        match=kwargs.get('table_match'),
-                        attrs=kwargs.get('table_attrs')
-                    )
-                except ValueError:
-                    pass
-
-                self.success_count += 1
-                self.total_response_time += response_time
-
-                return FetchResult(
-                    success=True,
-                    data={
-                        'html': response.html.html,
-                        'text': response.html.text,
-                        'tables': tables,
-                        'links': list(response.html.links),
-                        'headers': dict(response.headers)
-                    },
-                    strategy=self.name,
-                    response_time=response_time,
-                    status_code=response.status_code,
-                    metadata={
-                        'url': url,
-                        'proxy_used': proxy.url if proxy else None,
-                        'js_rendered': kwargs.get('render_js', True),
-                        'tables_found': len(tables)
-                    }
-                )
             else:
-                self.failure_count += 1
-                return FetchResult(
-                    success=False,
-                    strategy=self.name,
-                    response_time=response_time,
-                    status_code=response.status_code,
-                    error=f"HTTP {response.status_code}"
-                )
+                html = HTML(url=str(response.url), html=response.text)
+
+            # Extract tables from rendered HTML
+            tables = await asyncio.to_thread(
+                _read_tables,
+                html.html,
+                match=kwargs.get('table_match') or '.+',
+                attrs=kwargs.get('table_attrs')
+            )
 
-        except Exception as e:
-            self.failure_count += 1
             response_time = time.time() - start_time
+            self.success_count += 1
+            self.total_response_time += response_time
 
             return FetchResult(
-                success=False,
+                success=True,
+                data={
+                    'html': html.html,
+                    'text': html.text,
+                    'tables': tables,
+                    'links': list(html.links),
+                    'headers': dict(response.headers)
+                },
                 strategy=self.name,
                 response_time=response_time,
-                error=str(e)
+                status_code=response.status_code,
+                metadata={
+                    'url': url,
+                    'proxy_used': proxy.url if proxy else kwargs.get('proxy'),
+                    'js_rendered': render_js,
+                    'tables_found': len(tables)
+                }
             )
 
+        except Exception as e:
+            return self._failure(start_time, e)
+
+    async def aclose(self):
+        """Close the headless browser used for rendering"""
+        if self.render_session is not None:
+            await self.render_session.close()
+            self.render_session = None
+
 class SeleniumFetcher(BaseFetcher):
     """
     🤖 Selenium headless fetcher (final fallback)
-    Most robust but slowest option
+    Most robust but slowest option. Pages are rendered on the shared
+    browser pool, in a worker thread since WebDriver is blocking.
     """
 
-    def __init__(self):
+    def __init__(self, pool: Optional[BrowserPool] = None):
         super().__init__("selenium")
-        self.driver = None
-
-    def _get_driver(self):
-        """Get or create Selenium driver"""
-        if self.driver is None:
-            try:
-                options = Options()
-                options.add_argument('--headless')
-                options.add_argument('--no-sandbox')
-                options.add_argument('--disable-dev-shm-usage')
-                options.add_argument('--disable-gpu')
-                options.add_argument('--disable-web-security')
-                options.add_argument('--allow-running-insecure-content')
-                options.add_argument('--disable-extensions')
-                options.add_argument('--disable-plugins')
-                options.add_argument('--disable-images')
-                options.add_argument('--window-size=1920,1080')
-
-                self.driver = webdriver.Chrome(
-                    ChromeDriverManager().install(),
-                    options=options
-                )
-
-                # Set timeouts
-                self.driver.implicitly_wait(10)
-                self.driver.set_page_load_timeout(30)
-
-            except Exception as e:
-                logger.error(f"Failed to create Selenium driver: {e}")
-                raise
-
-        return self.driver
+        self.pool = pool or browser_pool
 
     async def fetch(self, url: str, **kwargs) -> FetchResult:
         """Fetch using Selenium"""
         start_time = time.time()
 
         try:
-            driver = self._get_driver()
-
             # Set User-Agent (limited support in Selenium)
-            headers = ua_manager.get_random_headers()
-            user_agent = headers['User-Agent']
-
-            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                'userAgent': user_agent
-            })
-
-            # Navigate to page
-            driver.get(url)
+            user_agent = kwargs.get('user_agent')
+            if isinstance(user_agent, bytes):
+                user_agent = user_agent.decode('utf-8', 'ignore')
+            user_agent = user_agent or ua_manager.get_random_headers()['User-Agent']
 
-            # Wait for page to load
             wait_time = kwargs.get('wait_time', 3)
-            time.sleep(wait_time)
-
-            # Wait for specific elements if specified
-            if 'wait_for_selector' in kwargs:
-                wait = WebDriverWait(driver, 10)
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, kwargs['wait_for_selector'])))
-
-            # Scroll if needed
-            if kwargs.get('scroll_down', False):
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-
-            # Get page source
-            html = driver.page_source
-
-            response_time = time.time() - start_time
+            page = await asyncio.to_thread(
+                self.pool.render,
+                url,
+                user_agent=user_agent,
+                wait_time=wait_time,
+                wait_for_selector=kwargs.get('wait_for_selector'),
+                scroll_down=kwargs.get('scroll_down', False)
+            )
 
             # Extract tables
-            tables = []
-            try:
-                tables = pd.read_html(
-                    html,
-                    match=kwargs.get('table_match'),
-                    attrs=kwargs.get('table_attrs')
-                )
-            except ValueError:
-                pass
+            tables = await asyncio.to_thread(
+                _read_tables,
+                page.html,
+                match=kwargs.get('table_match') or '.+',
+                attrs=kwargs.get('table_attrs')
+            )
 
+            response_time = time.time() - start_time
             self.success_count += 1
             self.total_response_time += response_time
 
             return FetchResult(
                 success=True,
                 data={
-                    'html': html,
+                    'html': page.html,
                     'tables': tables,
-                    'title': driver.title,
-                    'current_url': driver.current_url
+                    'title': page.title,
+                    'current_url': page.current_url
                 },
                 strategy=self.name,
                 response_time=response_time,
                 status_code=200,
                 metadata={
                     'url': url,
-                    'final_url': driver.current_url,
+                    'final_url': page.current_url,
                     'user_agent': user_agent,
                     'tables_found': len(tables),
-                    'wait_time': wait_time
+                    'wait_time': wait_time,
+                    'queue_wait': page.queue_wait,
+                    'render_time': page.render_time,
+                    'browser_id': page.worker_id
                 }
             )
 
@@ -465,28 +534,36 @@ class SeleniumFetcher(BaseFetcher):
             )
 
     def close(self):
-        """Clean up Selenium driver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                self.driver = None
-            except Exception as e:
-                logger.error(f"Error closing Selenium driver: {e}")
+        """Quit idle browsers in the pool"""
+        self.pool.close()
 
 class MultiFetcher:
     """
     🔄 Multi-Strategy Fetcher
     Tries different strategies with automatic fallback
+    (Selenium is always last)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_domain_limit: int = DEFAULT_PER_DOMAIN_LIMIT,
+        http: Optional[AsyncHttpClient] = None,
+        pool: Optional[BrowserPool] = None
+    ):
+        self.concurrency = concurrency
+        self.http = http or AsyncHttpClient(per_domain_limit=per_domain_limit)
+        self.pool = pool or browser_pool
         self.strategies = [
-            ScrapyFetcher(),
-            RequestsPandasFetcher(),
-            RequestsHtmlFetcher(),
-            SeleniumFetcher()
+            ScrapyFetcher(self.http),
+            RequestsPandasFetcher(self.http),
+            RequestsHtmlFetcher(self.http),
+            SeleniumFetcher(self.pool)
         ]
         self.strategy_stats = {}
+        # Event loop thread behind fetch_with_fallback, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
 
     async def fetch(
         self,
@@ -535,10 +612,43 @@ class MultiFetcher:
             metadata={'url': url, 'strategies_tried': [s.name for s in available_strategies]}
         )
 
+    async def fetch_many(
+        self,
+        urls: List[str],
+        strategies: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        **kwargs
+    ) -> List[FetchResult]:
+        """
+        Fetch a list of URLs concurrently, each with the usual fallback
+
+        Args:
+            urls: URLs to fetch
+            strategies: List of strategy names to try (in order)
+            concurrency: Max URLs in flight (per-domain limits still apply)
+            **kwargs: Additional arguments for fetchers
+
+        Returns:
+            One FetchResult per URL, in the same order as `urls`
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def fetch_one(url: str) -> FetchResult:
+            async with semaphore:
+                return await self.fetch(url, strategies=strategies, **kwargs)
+
+        results = await asyncio.gather(*(fetch_one(url) for url in urls))
+
+        successful = sum(1 for r in results if r.success)
+        logger.info(f"Fetched {successful}/{len(urls)} URLs")
+        return list(results)
+
     def get_stats(self) -> Dict:
         """Get statistics for all strategies"""
         return {
             'strategies': [strategy.get_stats() for strategy in self.strategies],
+            'http': self.http.get_stats(),
+            'browser_pool': self.pool.get_stats(),
             'total_requests': sum(s.success_count + s.failure_count for s in self.strategies),
             'overall_success_rate': (
                 sum(s.success_count for s in self.strategies) /
@@ -555,34 +665,41 @@ class MultiFetcher:
         **kwargs
     ) -> FetchResult:
         """
-        Synchronous version of fetch for use in Scrapy spiders
+        Synchronous version of fetch for use in Scrapy spiders.
+        Every call runs on the same background loop, so the HTTP pools
+        are reused across calls instead of being rebuilt per call.
         """
-        import asyncio
+        return self._run_sync(
+            self.fetch(url, strategies=strategy_preference, proxy=proxy, user_agent=user_agent, **kwargs)
+        )
 
-        # Use existing event loop if available, otherwise create new one
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is running, we need to run in a thread
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        asyncio.run,
-                        self.fetch(url, strategies=strategy_preference, proxy=proxy, user_agent=user_agent, **kwargs)
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(
-                    self.fetch(url, strategies=strategy_preference, proxy=proxy, user_agent=user_agent, **kwargs)
-                )
-        except RuntimeError:
-            # No event loop, create new one
-            return asyncio.run(
-                self.fetch(url, strategies=strategy_preference, proxy=proxy, user_agent=user_agent, **kwargs)
-            )
+    def _run_sync(self, coro):
+        """Run `coro` on the fetcher's loop thread and wait for the result"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name='multi-fetcher-loop', daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def aclose(self):
+        """Clean up all fetchers, closing HTTP pools and the render browser"""
+        await self.http.aclose()
+        for strategy in self.strategies:
+            if hasattr(strategy, 'aclose'):
+                await strategy.aclose()
+        self.close()
 
     def close(self):
         """Clean up all fetchers"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            # Pools opened by fetch_with_fallback are closed on their own loop
+            asyncio.run_coroutine_threadsafe(self.http.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+        self.http.reset()
         for strategy in self.strategies:
             if hasattr(strategy, 'close'):
                 strategy.close()
@@ -16,7 +16,9 @@ from scrapy.exceptions import NotConfigured, IgnoreRequest
 from scrapy.utils.response import response_status_message
 from scrapy.spiders import Spider
 from twisted.internet.error import TimeoutError, DNSLookupError, ConnectionRefusedError
+from twisted.internet.threads import deferToThread
 
+from .browser_pool import browser_pool, BrowserPool, RenderedPage
 from .proxy_manager import proxy_manager
 from .ua_manager import ua_manager
 from .retry_backoff import retry_manager, RetryReason
@@ -300,12 +302,14 @@ class RetryMiddleware(RetryMiddleware):
 class JavaScriptMiddleware:
     """
     🌐 JavaScript Rendering Middleware
-    Uses Selenium for JavaScript-heavy sites as fallback
+    Uses Selenium for JavaScript-heavy sites as fallback.
+    Pages are rendered on the shared browser pool from Twisted's thread
+    pool, so several JS pages can render while the reactor keeps running.
     """
 
-    def __init__(self):
-        self.selenium_enabled = False
-        self.driver = None
+    def __init__(self, pool: BrowserPool = None, crawler_stats=None):
+        self.pool = pool or browser_pool
+        self.crawler_stats = crawler_stats
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -313,35 +317,14 @@ class JavaScriptMiddleware:
         if not settings.getbool('SELENIUM_ENABLED', False):
             raise NotConfigured('Selenium middleware not enabled')
 
-        return cls()
+        browser_pool.configure(
+            size=settings.getint('BROWSER_POOL_SIZE', browser_pool.size),
+            max_pages_per_browser=settings.getint('BROWSER_POOL_MAX_PAGES', browser_pool.max_pages_per_browser)
+        )
 
-    def _get_driver(self):
-        """Get Selenium WebDriver instance"""
-        if self.driver is None:
-            try:
-                from selenium import webdriver
-                from selenium.webdriver.chrome.options import Options
-                from webdriver_manager.chrome import ChromeDriverManager
-
-                chrome_options = Options()
-                chrome_options.add_argument('--headless')
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                chrome_options.add_argument('--disable-gpu')
-                chrome_options.add_argument('--disable-web-security')
-                chrome_options.add_argument('--allow-running-insecure-content')
-
-                self.driver = webdriver.Chrome(
-                    ChromeDriverManager().install(),
-                    options=chrome_options
-                )
-                self.selenium_enabled = True
-
-            except Exception as e:
-                logger.error(f"Failed to initialize Selenium driver: {e}")
-                self.selenium_enabled = False
-
-        return self.driver
+        middleware = cls(browser_pool, crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
 
     def process_request(self, request, spider):
         """Process request with Selenium if needed"""
@@ -351,41 +334,43 @@ class JavaScriptMiddleware:
             any(site in request.url for site in ['oddspedia.com', 'fbref.com'])
         )
 
-        if use_selenium and self.selenium_enabled:
-            driver = self._get_driver()
-            if driver:
-                try:
-                    # Set headers via Selenium (limited capability)
-                    if 'user_agent_info' in request.meta:
-                        user_agent = request.meta['user_agent_info']['User-Agent']
-                        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                            'userAgent': user_agent
-                        })
-
-                    # Load page
-                    driver.get(request.url)
-
-                    # Wait for page to load
-                    import time
-                    time.sleep(3)
-
-                    # Get page source
-                    html = driver.page_source
-
-                    # Create response
-                    response = HtmlResponse(
-                        url=request.url,
-                        body=html.encode('utf-8'),
-                        encoding='utf-8',
-                        request=request
-                    )
-
-                    logger.info(f"Rendered {request.url} with Selenium")
-                    return response
-
-                except Exception as e:
-                    logger.error(f"Selenium rendering failed for {request.url}: {e}")
+        if not use_selenium:
+            return None
 
+        # Set headers via Selenium (limited capability)
+        user_agent = None
+        if 'user_agent_info' in request.meta:
+            user_agent = request.meta['user_agent_info']['User-Agent']
+
+        deferred = deferToThread(self.pool.render, request.url, user_agent=user_agent, wait_time=3)
+        deferred.addCallbacks(
+            lambda page: self._to_response(page, request),
+            lambda failure: self._render_failed(failure, request)
+        )
+        return deferred
+
+    def _to_response(self, page: RenderedPage, request) -> HtmlResponse:
+        """Create response from a rendered page"""
+        if self.crawler_stats:
+            self.crawler_stats.inc_value('browser_pool/renders')
+            self.crawler_stats.max_value('browser_pool/max_queue_wait', page.queue_wait)
+            self.crawler_stats.max_value('browser_pool/max_render_time', page.render_time)
+
+        logger.info(f"Rendered {request.url} with Selenium in {page.render_time:.2f}s "
+                    f"(queued {page.queue_wait:.2f}s)")
+
+        return HtmlResponse(
+            url=request.url,
+            body=page.html.encode('utf-8'),
+            encoding='utf-8',
+            request=request
+        )
+
+    def _render_failed(self, failure, request):
+        """Fall back to the regular download when rendering fails"""
+        if self.crawler_stats:
+            self.crawler_stats.inc_value('browser_pool/failures')
+        logger.error(f"Selenium rendering failed for {request.url}: {failure.value}")
         return None
 
     def process_response(self, request, response, spider):
@@ -424,12 +409,11 @@ class JavaScriptMiddleware:
         return any(indicator in body_text for indicator in js_indicators)
 
     def spider_closed(self, spider):
-        """Clean up Selenium driver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                logger.error(f"Error closing Selenium driver: {e}")
+        """Record pool metrics and quit idle browsers"""
+        if self.crawler_stats:
+            for key, value in self.pool.get_stats().items():
+                self.crawler_stats.set_value(f'browser_pool/{key}', value)
+        self.pool.close()
 
 class RobotsTxtMiddleware:
     """
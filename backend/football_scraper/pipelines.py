@@ -1,18 +1,22 @@
 """
 📊 SCRAPY PIPELINES - Data Processing and Export Pipelines
-Handles data cleaning, normalization, metadata addition, and multi-format export.
-Outputs to CSV, JSONL, and Parquet formats with comprehensive metadata.
+Handles data cleaning, normalization, metadata addition, cross-run deduplication
+and multi-format export. Streams CSV, JSONL, and Parquet outputs with comprehensive metadata.
 """
 
+import csv
 import json
 import logging
 import hashlib
 import os
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
 
@@ -215,32 +219,207 @@ class MetadataPipeline:
 
         return item
 
-    def _generate_item_hash(self, adapter: ItemAdapter) -> str:
-        """Generate unique hash for item"""
-        # Use key fields to generate hash
-        key_fields = ['source_url', 'home_team', 'away_team', 'match_date']
+    # Identity + content: a re-scrape with a final score, new status or moved odds
+    # is new data and must not be dropped by DeduplicationPipeline
+    HASH_FIELDS = [
+        'source_url', 'home_team', 'away_team', 'match_date', 'table_name', 'data',
+        'status', 'home_score', 'away_score', 'home_odds', 'draw_odds', 'away_odds'
+    ]
+    NUMERIC_HASH_FIELDS = {'home_score', 'away_score', 'home_odds', 'draw_odds', 'away_odds'}
 
-        hash_string = ''
-        for field in key_fields:
+    def _generate_item_hash(self, adapter: ItemAdapter) -> str:
+        """Generate unique hash for item (used by DeduplicationPipeline across runs)"""
+        hash_parts = []
+        for field in self.HASH_FIELDS:
             if field in adapter and adapter[field] is not None:
-                hash_string += str(adapter[field])
+                value = adapter[field]
+                if isinstance(value, pd.DataFrame):
+                    # str(DataFrame) is truncated; hash every cell instead
+                    value = hashlib.md5(pd.util.hash_pandas_object(value, index=True).values.tobytes()).hexdigest()
+                elif field in self.NUMERIC_HASH_FIELDS:
+                    # '2', 2 and 2.0 are the same score whether or not DataCleaningPipeline ran
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        pass
+                hash_parts.append(f"{field}={value}")
+
+        return hashlib.md5('|'.join(hash_parts).encode()).hexdigest()
+
+class SeenItemStore:
+    """
+    💾 On-disk set of item hashes (SQLite)
+    Keeps deduplication state across runs without holding every hash in memory
+    """
+
+    def __init__(self, path: Path, commit_every: int = 1000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.commit_every = commit_every
+        self._pending = 0
+
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS seen_items (item_hash TEXT PRIMARY KEY, first_seen TEXT)')
+        self.connection.commit()
+
+    def add(self, item_hash: str) -> bool:
+        """Register a hash. Returns False if it was already seen (in this or a previous run)"""
+        cursor = self.connection.execute(
+            'INSERT OR IGNORE INTO seen_items (item_hash, first_seen) VALUES (?, ?)',
+            (item_hash, datetime.now().isoformat())
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.connection.commit()
+            self._pending = 0
+        return True
+
+    def __contains__(self, item_hash: str) -> bool:
+        return self.connection.execute(
+            'SELECT 1 FROM seen_items WHERE item_hash = ?', (item_hash,)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM seen_items').fetchone()[0]
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+class DeduplicationPipeline:
+    """
+    🔁 Cross-Run Deduplication Pipeline
+    Drops items whose MetadataPipeline item_hash was already exported
+    """
+
+    def __init__(self, store_path: str = 'scraped_data/seen_items.sqlite'):
+        self.store_path = Path(store_path)
+        self.store: Optional[SeenItemStore] = None
+        self.duplicates = 0
 
-        return hashlib.md5(hash_string.encode()).hexdigest()
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        output_dir = Path(settings.get('OUTPUT_DIR', 'scraped_data'))
+        return cls(store_path=str(output_dir / settings.get('DEDUP_STORE', 'seen_items.sqlite')))
+
+    def open_spider(self, spider):
+        """Open the on-disk hash set"""
+        self.store = SeenItemStore(self.store_path)
+        logger.info(f"DeduplicationPipeline: {len(self.store)} hashes already seen")
+
+    def process_item(self, item, spider):
+        """Drop items already seen"""
+        item_hash = ItemAdapter(item).get('item_hash')
+        if not item_hash:
+            return item
+
+        if not self.store.add(item_hash):
+            self.duplicates += 1
+            raise DropItem(f"Duplicate item: {item_hash}")
+
+        return item
+
+    def close_spider(self, spider):
+        """Persist the hash set"""
+        if self.store:
+            self.store.close()
+        logger.info(f"DeduplicationPipeline dropped {self.duplicates} duplicate items")
+
+# Stable export schema: known fields are typed, anything else goes to `extra` (JSON)
+EXPORT_SCHEMA = pa.schema([
+    ('source_url', pa.string()),
+    ('source_site', pa.string()),
+    ('spider_name', pa.string()),
+    ('scraped_at', pa.string()),
+    ('competition', pa.string()),
+    ('season', pa.string()),
+    ('table_name', pa.string()),
+    ('data', pa.string()),
+    ('home_team', pa.string()),
+    ('away_team', pa.string()),
+    ('match_date', pa.string()),
+    ('home_score', pa.float64()),
+    ('away_score', pa.float64()),
+    ('home_odds', pa.float64()),
+    ('draw_odds', pa.float64()),
+    ('away_odds', pa.float64()),
+    ('possession_home', pa.float64()),
+    ('possession_away', pa.float64()),
+    ('shots_home', pa.float64()),
+    ('shots_away', pa.float64()),
+    ('proxy', pa.string()),
+    ('proxy_used', pa.string()),
+    ('proxy_country', pa.string()),
+    ('user_agent', pa.string()),
+    ('strategy', pa.string()),
+    ('scrape_strategy', pa.string()),
+    ('response_time_ms', pa.float64()),
+    ('status_code', pa.int64()),
+    ('metadata', pa.string()),
+    ('item_hash', pa.string()),
+    ('extra', pa.string()),
+])
+EXPORT_COLUMNS = EXPORT_SCHEMA.names
+
+def _to_text(value) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+def _to_number(value, cast):
+    if value is None or value == '':
+        return None
+    try:
+        number = cast(value)
+    except (TypeError, ValueError):
+        return None
+    return None if isinstance(number, float) and np.isnan(number) else number
+
+def to_export_row(item_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an item to EXPORT_SCHEMA (typed known columns + JSON `extra`)"""
+    row = {}
+    for field in EXPORT_SCHEMA:
+        value = item_dict.get(field.name)
+        if pa.types.is_floating(field.type):
+            row[field.name] = _to_number(value, float)
+        elif pa.types.is_integer(field.type):
+            row[field.name] = _to_number(value, int)
+        else:
+            row[field.name] = _to_text(value)
+
+    extra = {key: value for key, value in item_dict.items() if key not in EXPORT_SCHEMA.names}
+    row['extra'] = json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+    return row
 
 class ExportPipeline:
     """
     📤 Multi-Format Export Pipeline
-    Exports data to CSV, JSONL, and Parquet formats with metadata
+    Streams data to JSONL, CSV and Parquet formats with metadata.
+    Memory use is bounded by `batch_size` items regardless of crawl length.
     """
 
-    def __init__(self, output_dir: str = 'scraped_data'):
+    def __init__(self, output_dir: str = 'scraped_data', export_formats: Optional[List[str]] = None,
+                 batch_size: int = 1000):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.export_formats = set(export_formats or ['jsonl', 'csv', 'parquet'])
+        self.batch_size = batch_size
 
         # File handles
         self.jsonl_file = None
-        self.csv_data = []
+        self.csv_file = None
+        self.csv_writer = None
+        self.parquet_writer = None
+        self.parquet_buffer: List[Dict[str, Any]] = []
         self.items_processed = 0
+        self.row_groups_written = 0
 
         # Metadata tracking
         self.start_time = datetime.now()
@@ -248,20 +427,47 @@ class ExportPipeline:
         self.competitions = set()
         self.seasons = set()
 
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            output_dir=settings.get('OUTPUT_DIR', 'scraped_data'),
+            export_formats=settings.getlist('EXPORT_FORMATS') or None,
+            batch_size=settings.getint('EXPORT_BATCH_SIZE', 1000)
+        )
+
     def open_spider(self, spider):
         """Initialize export files"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base_path = self.output_dir / f'data_{spider.name}_{timestamp}'
+
+        # Never overwrite an earlier run started in the same second
+        suffix = 1
+        while any(Path(f'{base_path}.{ext}').exists() for ext in ('jsonl', 'csv', 'parquet')):
+            base_path = self.output_dir / f'data_{spider.name}_{timestamp}_{suffix}'
+            suffix += 1
+        timestamp = base_path.name[len(f'data_{spider.name}_'):]
+
+        # JSONL file (buffered; flushed every batch)
+        if 'jsonl' in self.export_formats:
+            self.jsonl_file = open(f'{base_path}.jsonl', 'w', encoding='utf-8', buffering=1024 * 1024)
+
+        # CSV file (header written once, rows streamed)
+        if 'csv' in self.export_formats:
+            self.csv_file = open(f'{base_path}.csv', 'w', encoding='utf-8', newline='')
+            self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=EXPORT_COLUMNS)
+            self.csv_writer.writeheader()
 
-        # JSONL file
-        jsonl_path = self.output_dir / f'data_{spider.name}_{timestamp}.jsonl'
-        self.jsonl_file = open(jsonl_path, 'w', encoding='utf-8')
+        # Parquet file (one row group per batch)
+        if 'parquet' in self.export_formats:
+            self.parquet_writer = pq.ParquetWriter(f'{base_path}.parquet', EXPORT_SCHEMA)
 
         # Store paths for later use
         self.current_timestamp = timestamp
         self.current_spider = spider.name
 
         logger.info(f"ExportPipeline initialized for {spider.name}")
-        logger.info(f"JSONL output: {jsonl_path}")
+        logger.info(f"Output: {base_path}.{{{','.join(sorted(self.export_formats))}}}")
 
     def process_item(self, item, spider):
         """Export item to all formats"""
@@ -272,12 +478,15 @@ class ExportPipeline:
             item_dict = dict(adapter)
 
             # Write to JSONL
-            json_line = json.dumps(item_dict, ensure_ascii=False, default=str)
-            self.jsonl_file.write(json_line + '\n')
-            self.jsonl_file.flush()
+            if self.jsonl_file:
+                self.jsonl_file.write(json.dumps(item_dict, ensure_ascii=False, default=str) + '\n')
 
-            # Add to CSV data
-            self.csv_data.append(item_dict)
+            # Write to CSV / buffer for Parquet
+            row = to_export_row(item_dict)
+            if self.csv_writer:
+                self.csv_writer.writerow(row)
+            if self.parquet_writer:
+                self.parquet_buffer.append(row)
 
             # Update metadata tracking
             if 'source_site' in item_dict:
@@ -291,7 +500,8 @@ class ExportPipeline:
 
             self.items_processed += 1
 
-            if self.items_processed % 100 == 0:
+            if self.items_processed % self.batch_size == 0:
+                self._flush()
                 logger.info(f"Exported {self.items_processed} items")
 
             return item
@@ -300,24 +510,28 @@ class ExportPipeline:
             logger.error(f"Error exporting item: {e}")
             return item
 
+    def _flush(self):
+        """Write the buffered Parquet row group and flush text files"""
+        if self.parquet_writer and self.parquet_buffer:
+            self.parquet_writer.write_table(pa.Table.from_pylist(self.parquet_buffer, schema=EXPORT_SCHEMA))
+            self.parquet_buffer = []
+            self.row_groups_written += 1
+
+        for handle in (self.jsonl_file, self.csv_file):
+            if handle:
+                handle.flush()
+
     def close_spider(self, spider):
         """Finalize exports and generate metadata"""
         try:
-            # Close JSONL file
-            if self.jsonl_file:
-                self.jsonl_file.close()
+            self._flush()
 
-            # Export to CSV
-            if self.csv_data:
-                csv_path = self.output_dir / f'data_{self.current_spider}_{self.current_timestamp}.csv'
-                df = pd.DataFrame(self.csv_data)
-                df.to_csv(csv_path, index=False, encoding='utf-8')
-                logger.info(f"CSV exported: {csv_path}")
+            for handle in (self.jsonl_file, self.csv_file, self.parquet_writer):
+                if handle:
+                    handle.close()
 
-                # Export to Parquet
-                parquet_path = self.output_dir / f'data_{self.current_spider}_{self.current_timestamp}.parquet'
-                df.to_parquet(parquet_path, index=False, engine='pyarrow')
-                logger.info(f"Parquet exported: {parquet_path}")
+            logger.info(f"Exported {self.items_processed} items "
+                        f"({self.row_groups_written} Parquet row groups)")
 
             # Create unified files
             self._create_unified_files()
@@ -330,38 +544,54 @@ class ExportPipeline:
         except Exception as e:
             logger.error(f"Error closing ExportPipeline: {e}")
 
+    def _iter_run_jsonl(self):
+        """Lines from every per-run JSONL file, oldest first"""
+        for file_path in sorted(self.output_dir.glob('data_*.jsonl')):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield line if line.endswith('\n') else line + '\n'
+
     def _create_unified_files(self):
-        """Create unified data.jsonl and data.parquet files"""
+        """Create unified data.jsonl and data.parquet files (streamed from the per-run JSONL files)"""
         try:
-            # Combine all JSONL files
             unified_jsonl_path = self.output_dir / 'data.jsonl'
-            all_data = []
-
-            # Read all individual files
-            for file_path in self.output_dir.glob('data_*.jsonl'):
-                if file_path.name != 'data.jsonl':  # Skip the unified file itself
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            if line.strip():
-                                all_data.append(json.loads(line))
-
-            # Write unified JSONL
-            if all_data:
-                with open(unified_jsonl_path, 'w', encoding='utf-8') as f:
-                    for item in all_data:
-                        json_line = json.dumps(item, ensure_ascii=False, default=str)
-                        f.write(json_line + '\n')
-
-                # Create unified Parquet
-                unified_parquet_path = self.output_dir / 'data.parquet'
-                df_unified = pd.DataFrame(all_data)
-                df_unified.to_parquet(unified_parquet_path, index=False, engine='pyarrow')
-
-                logger.info(f"Unified files created: {unified_jsonl_path}, {unified_parquet_path}")
+            unified_parquet_path = self.output_dir / 'data.parquet'
+            tmp_jsonl_path = unified_jsonl_path.with_suffix('.jsonl.tmp')
+            tmp_parquet_path = unified_parquet_path.with_suffix('.parquet.tmp')
+
+            total, rows = 0, []
+            with open(tmp_jsonl_path, 'w', encoding='utf-8', buffering=1024 * 1024) as jsonl_out, \
+                    pq.ParquetWriter(str(tmp_parquet_path), EXPORT_SCHEMA) as parquet_out:
+                for line in self._iter_run_jsonl():
+                    jsonl_out.write(line)
+                    rows.append(to_export_row(json.loads(line)))
+                    total += 1
+                    if len(rows) >= self.batch_size:
+                        parquet_out.write_table(pa.Table.from_pylist(rows, schema=EXPORT_SCHEMA))
+                        rows = []
+                if rows:
+                    parquet_out.write_table(pa.Table.from_pylist(rows, schema=EXPORT_SCHEMA))
+
+            if total:
+                os.replace(tmp_jsonl_path, unified_jsonl_path)
+                os.replace(tmp_parquet_path, unified_parquet_path)
+                logger.info(f"Unified files created: {unified_jsonl_path}, {unified_parquet_path} ({total} items)")
+            else:
+                tmp_jsonl_path.unlink(missing_ok=True)
+                tmp_parquet_path.unlink(missing_ok=True)
 
         except Exception as e:
             logger.error(f"Error creating unified files: {e}")
 
+    @staticmethod
+    def _file_md5(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+        digest = hashlib.md5()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     def _generate_metadata_file(self):
         """Generate comprehensive metadata file"""
         try:
@@ -370,18 +600,14 @@ class ExportPipeline:
 
             # Calculate file sizes and hashes
             files_info = {}
-            for file_path in self.output_dir.glob('data*.{jsonl,csv,parquet}'):
-                if file_path.exists():
+            for file_path in sorted(self.output_dir.glob('data*')):
+                if file_path.suffix in ('.jsonl', '.csv', '.parquet') and file_path.is_file():
                     file_size = file_path.stat().st_size
 
-                    # Calculate file hash
-                    with open(file_path, 'rb') as f:
-                        file_hash = hashlib.md5(f.read()).hexdigest()
-
                     files_info[file_path.name] = {
                         'size_bytes': file_size,
                         'size_mb': round(file_size / (1024 * 1024), 2),
-                        'md5_hash': file_hash
+                        'md5_hash': self._file_md5(file_path)
                     }
 
             metadata = {
@@ -62,6 +62,7 @@ EXTENSIONS = {
 ITEM_PIPELINES = {
     'football_scraper.pipelines.DataCleaningPipeline': 300,
     'football_scraper.pipelines.MetadataPipeline': 400,
+    'football_scraper.pipelines.DeduplicationPipeline': 450,
     'football_scraper.pipelines.ExportPipeline': 500,
 }
 
@@ -91,12 +92,18 @@ PROXY_LIST_PATH = 'proxies.txt'
 USER_AGENTS_LIST_PATH = 'user_agents.txt'
 OUTPUT_DIR = 'scraped_data'
 EXPORT_FORMATS = ['jsonl', 'parquet', 'csv']
+EXPORT_BATCH_SIZE = 1000  # items per Parquet row group / file flush
+DEDUP_STORE = 'seen_items.sqlite'  # on-disk item_hash set (inside OUTPUT_DIR)
 
 # Compliance and ethics
 DOWNLOAD_TIMEOUT = 180
 DOWNLOAD_MAXSIZE = 1073741824  # 1GB
 DOWNLOAD_WARNSIZE = 33554432   # 32MB
 
+# Headless browser pool (SeleniumFetcher / JavaScriptMiddleware)
+BROWSER_POOL_SIZE = 2  # browsers rendering in parallel
+BROWSER_POOL_MAX_PAGES = 50  # recycle a browser after N pages
+
 # Anti-detection settings
 SELENIUM_DRIVER_NAME = 'chrome'
 SELENIUM_DRIVER_EXECUTABLE_PATH = None  # Use webdriver-manager
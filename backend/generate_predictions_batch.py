@@ -195,8 +195,7 @@ def generate_predictions_for_match(
             away_goals_avg=away_stats['goals_avg'],
             home_conceded_avg=home_stats['conceded_avg'],
             away_conceded_avg=away_stats['conceded_avg'],
-            market_odds=None,
-            league_avg=2.7
+            market_odds=None
         )
 
         # 4. Focar no mercado 1X2 para salvar no banco (por enquanto)
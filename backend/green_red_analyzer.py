@@ -11,6 +11,7 @@ from datetime import datetime
 from sqlalchemy import and_
 from app.core.database import SessionLocal
 from app.models import Match, Prediction, Odds
+from app.services.performance_rollup_service import PerformanceRollupService
 
 class GreenRedAnalyzer:
     """Analisa predictions e marca GREEN ou RED"""
@@ -34,6 +35,7 @@ class GreenRedAnalyzer:
         ).all()
 
         print(f"📊 {len(finished_matches)} jogos finalizados encontrados\n")
+        rollup = PerformanceRollupService(self.db)
 
         for match in finished_matches:
             # Buscar prediction
@@ -55,6 +57,8 @@ class GreenRedAnalyzer:
 
             # Comparar com prediction
             is_correct = (prediction.predicted_outcome == actual_outcome)
+            # Re-análise de prediction já liquidada substitui a contribuição anterior
+            before = rollup.prediction_contribution(prediction, match.league)
 
             # Atualizar prediction
             prediction.actual_outcome = actual_outcome
@@ -69,6 +73,8 @@ class GreenRedAnalyzer:
                     # RED: perdeu stake
                     prediction.profit_loss = -100
 
+            rollup.track(before, rollup.prediction_contribution(prediction, match.league))
+
             self.total += 1
             if is_correct:
                 self.greens += 1
@@ -80,6 +86,7 @@ class GreenRedAnalyzer:
             print(f"{status} | {match.home_team.name} {match.home_score}-{match.away_score} {match.away_team.name}")
             print(f"        Prediction: {prediction.predicted_outcome} | Real: {actual_outcome}")
 
+        rollup.flush()
         self.db.commit()
 
         # Estatísticas
@@ -2,25 +2,21 @@
 """
 ⏰ SCHEDULER AUTOMÁTICO GREEN/RED
 Executa análise GREEN/RED a cada 30 minutos automaticamente
+(job 'green_red_analyzer' do job_runner, grupo 'green_red')
 """
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
-import time
+import asyncio
 import logging
 from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 
 from app.core.database import SessionLocal
 from app.models import Match, Prediction
+from app.services.performance_rollup_service import PerformanceRollupService
 from sqlalchemy import func
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class GreenRedScheduler:
@@ -28,7 +24,6 @@ class GreenRedScheduler:
 
     def __init__(self, interval_minutes=30):
         self.interval_minutes = interval_minutes
-        self.scheduler = BackgroundScheduler()
         self.last_run = None
         self.total_runs = 0
 
@@ -48,6 +43,7 @@ class GreenRedScheduler:
             greens = 0
             reds = 0
             total_analyzed = 0
+            rollup = PerformanceRollupService(db)
 
             for match in finished_matches:
                 # Buscar prediction
@@ -73,6 +69,7 @@ class GreenRedScheduler:
 
                 # Comparar com prediction
                 is_correct = (prediction.predicted_outcome == actual_outcome)
+                before = rollup.prediction_contribution(prediction, match.league)
 
                 # Atualizar prediction
                 prediction.actual_outcome = actual_outcome
@@ -87,6 +84,8 @@ class GreenRedScheduler:
                         # RED: perdeu stake
                         prediction.profit_loss = -100
 
+                rollup.track(before, rollup.prediction_contribution(prediction, match.league))
+
                 total_analyzed += 1
                 if is_correct:
                     greens += 1
@@ -95,6 +94,7 @@ class GreenRedScheduler:
                     reds += 1
                     logger.info(f"   🔴 RED: {match.home_team.name if match.home_team else '?'} {match.home_score}-{match.away_score} {match.away_team.name if match.away_team else '?'}")
 
+            rollup.flush()
             db.commit()
 
             # Atualizar estatísticas do scheduler
@@ -121,7 +121,7 @@ class GreenRedScheduler:
         except Exception as e:
             logger.error(f"❌ Erro na análise GREEN/RED: {e}")
             db.rollback()
-            return None
+            raise
         finally:
             db.close()
 
@@ -165,70 +165,36 @@ class GreenRedScheduler:
         finally:
             db.close()
 
-    def start(self):
-        """Iniciar scheduler"""
-        logger.info(f"🚀 Iniciando Green/Red Scheduler...")
-        logger.info(f"⏰ Intervalo: {self.interval_minutes} minutos")
-
-        # Executar uma vez imediatamente
-        logger.info("▶️  Executando análise inicial...")
-        self.analyze_green_red()
 
-        # Agendar execução periódica
-        self.scheduler.add_job(
-            self.analyze_green_red,
-            trigger=IntervalTrigger(minutes=self.interval_minutes),
-            id='green_red_analyzer',
-            name='Green/Red Analyzer',
-            replace_existing=True
-        )
+_green_red_scheduler = GreenRedScheduler(interval_minutes=30)
 
-        self.scheduler.start()
-        logger.info("✅ Scheduler iniciado com sucesso!")
-        logger.info(f"📅 Próxima execução em {self.interval_minutes} minutos")
 
-    def stop(self):
-        """Parar scheduler"""
-        logger.info("🛑 Parando scheduler...")
-        self.scheduler.shutdown()
-        logger.info("✅ Scheduler parado")
+def run_green_red_analysis():
+    """Entrada do job 'green_red_analyzer' no job_runner"""
+    return _green_red_scheduler.analyze_green_red()
 
 
 def main():
     """Função principal"""
+    from app.services.job_registry import run_standalone_runner
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
     print("=" * 70)
     print("🟢🔴 GREEN/RED ANALYZER - SCHEDULER AUTOMÁTICO")
     print("=" * 70)
     print()
-
-    # Criar e iniciar scheduler (padrão: 30 minutos)
-    scheduler = GreenRedScheduler(interval_minutes=30)
-    scheduler.start()
-
-    print()
-    print("💡 Scheduler rodando em background...")
+    print("💡 Job runner rodando (grupo 'green_red', a cada 30 minutos)...")
     print("   Pressione Ctrl+C para parar")
     print()
 
     try:
-        # Manter script rodando
-        while True:
-            time.sleep(60)  # Sleep 1 minuto
-
-            # Mostrar estatísticas a cada minuto
-            stats = scheduler.get_statistics()
-            if stats:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] "
-                      f"📊 Analisados: {stats['total_analyzed']} | "
-                      f"🟢 {stats['greens']} | "
-                      f"🔴 {stats['reds']} | "
-                      f"⏳ Pendentes: {stats['pending']} | "
-                      f"📈 {stats['accuracy']:.1f}% | "
-                      f"Execuções: {stats['total_runs']}")
-
+        asyncio.run(run_standalone_runner(['green_red'], name='green_red'))
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupção detectada...")
-        scheduler.stop()
         print("\n✅ Scheduler finalizado")
         print("=" * 70)
 
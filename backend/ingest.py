@@ -4,12 +4,14 @@
 Converts scraped data (JSONL/Parquet) into ML-ready features for training.
 
 Input: raw_data/ (data.jsonl, data.parquet from scraper)
-Output: ml_ready/ (features.parquet, labels.parquet, metadata.json)
+Output: ml_ready/ feature store (features/ and labels/ partitioned by
+competition/season, manifest.json, metadata.json). Re-running appends only
+records not stored yet.
 """
 
 import json
 import logging
-import hashlib
+import os
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -21,12 +23,17 @@ import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 import numpy as np
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
 from sklearn.impute import SimpleImputer
 
+from app.core.feature_store import FeatureStore, stable_id
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Category codes and imputation values fitted by the first run on a store;
+# later runs reuse them so appended rows are encoded like the stored ones
+PREPROCESSING_NAME = 'preprocessing.json'
+
 
 class MLDataIngestor:
     """Converts scraped football data into ML-ready features"""
@@ -63,9 +70,11 @@ class MLDataIngestor:
             }
         }
 
-        # Initialize encoders
-        self.label_encoders = {}
-        self.imputers = {}
+        # Fitted preprocessing state (loaded from / saved to the output store)
+        # label_encoders: column -> categories in code order (code = position)
+        # imputers: 'numeric' / 'categorical' -> {column: fill value}
+        self.label_encoders: Dict[str, List[str]] = {}
+        self.imputers: Dict[str, Dict[str, Any]] = {'numeric': {}, 'categorical': {}}
 
     def _default_config(self) -> Dict:
         """Default configuration for data ingestion"""
@@ -105,6 +114,7 @@ class MLDataIngestor:
         out_dir.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Starting ML data ingestion: {raw_dir} -> {out_dir}")
+        self._load_preprocessing(out_dir)
 
         # Step 1: Load raw data
         raw_data = self._load_raw_data(raw_dir)
@@ -332,13 +342,18 @@ class MLDataIngestor:
             if pd.isna(row.get('home_team')) or pd.isna(row.get('away_team')):
                 continue
 
+            match_key = (row.get('competition', 'unknown'), row.get('season', 'unknown'),
+                         row['home_team'], row['away_team'], row.get('match_date'))
+
             feature_dict = {
-                'id': str(uuid.uuid4()),
+                'id': stable_id(*match_key, 'home'),
                 'source_url': row.get('source_url', ''),
                 'competition': row.get('competition', 'unknown'),
                 'season': row.get('season', 'unknown'),
                 'home_team': row['home_team'],
                 'away_team': row['away_team'],
+                'team': row['home_team'],
+                'opponent': row['away_team'],
                 'match_date': row.get('match_date', datetime.now()),
                 'home': True,  # For home team record
                 'scraped_at': row.get('scraped_at', datetime.now()),
@@ -379,7 +394,7 @@ class MLDataIngestor:
             # Create away team record
             away_feature_dict = feature_dict.copy()
             away_feature_dict.update({
-                'id': str(uuid.uuid4()),
+                'id': stable_id(*match_key, 'away'),
                 'team': row['away_team'],
                 'opponent': row['home_team'],
                 'home': False
@@ -416,7 +431,8 @@ class MLDataIngestor:
 
         for idx, row in df.iterrows():
             feature_dict = {
-                'id': str(uuid.uuid4()),
+                'id': stable_id(row.get('competition', 'unknown'), row.get('season', 'unknown'),
+                                row.get('team', 'unknown'), row.get('scraped_at')),
                 'source_url': row.get('source_url', ''),
                 'competition': row.get('competition', 'unknown'),
                 'season': row.get('season', 'unknown'),
@@ -443,10 +459,6 @@ class MLDataIngestor:
 
         features = df.copy()
 
-        # Add ID if missing
-        if 'id' not in features.columns:
-            features['id'] = [str(uuid.uuid4()) for _ in range(len(features))]
-
         # Handle list values in all columns
         for col in features.columns:
             if features[col].apply(lambda x: isinstance(x, list)).any():
@@ -454,6 +466,10 @@ class MLDataIngestor:
                     lambda x: x[0] if isinstance(x, list) and len(x) > 0 else (str(x) if isinstance(x, list) else x)
                 )
 
+        # Add ID if missing (content-derived, so re-ingesting a record keeps its id)
+        if 'id' not in features.columns:
+            features['id'] = [stable_id(*values) for values in features.astype(str).itertuples(index=False)]
+
         return features
 
     def _add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -472,37 +488,105 @@ class MLDataIngestor:
         return df
 
     def _add_team_statistics(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add team-level statistical features"""
-        logger.info("Adding team statistics...")
-
-        if 'goals_for' in df.columns and 'goals_against' in df.columns:
-            # Calculate team stats
-            team_stats = df.groupby('team').agg({
-                'goals_for': ['mean', 'std', 'sum'],
-                'goals_against': ['mean', 'std', 'sum'],
-                'result': lambda x: (x == 'W').mean() if 'result' in df.columns else 0
-            }).round(3)
+        """
+        Add team-level statistical features
 
-            team_stats.columns = ['goals_for_avg', 'goals_for_std', 'goals_for_total',
-                                'goals_against_avg', 'goals_against_std', 'goals_against_total',
-                                'win_rate']
+        Every feature is computed per match from the team's *previous*
+        matches only (shift(1) before rolling/expanding), so a row never
+        sees its own result. Rows are ordered by match_date within each
+        team; ties and missing dates keep the input order.
+        """
+        logger.info("Adding team statistics...")
 
-            # Form indicators
-            for window in self.config['feature_windows']:
-                if len(df) >= window:
-                    form_stats = df.groupby('team').apply(
-                        lambda x: self._calculate_form(x, window)
-                    ).reset_index(drop=True)
+        if 'goals_for' not in df.columns or 'goals_against' not in df.columns:
+            return df
 
-                    form_df = pd.DataFrame(form_stats.tolist())
-                    form_df['team'] = form_stats.index
+        df = df.reset_index(drop=True)
+        team_form = self._rolling_team_form(df, self.config['feature_windows'])
 
-                    df = df.merge(form_df, on='team', how='left', suffixes=('', f'_last_{window}'))
+        return pd.concat([df.drop(columns=team_form.columns, errors='ignore'), team_form], axis=1)
 
-            # Merge team stats back
-            df = df.merge(team_stats, on='team', how='left')
+    def _rolling_team_form(self, df: pd.DataFrame, windows: List[int]) -> pd.DataFrame:
+        """
+        Vectorized pre-match team form for all windows in one pass
 
-        return df
+        Returns a frame aligned with `df` (same RangeIndex) with, per window N:
+        matches/wins/draws/losses_last_N, form_last_N, goals_for_avg_last_N,
+        goals_against_avg_last_N and points_per_game_last_N; plus expanding
+        (all previous matches) goals_for/against avg/std/total and win_rate.
+        """
+        result = df['result'] if 'result' in df.columns else pd.Series(np.nan, index=df.index)
+        has_result = result.isin(['W', 'D', 'L'])
+
+        stats = pd.DataFrame({
+            'played': has_result.astype(float),
+            'wins': (result == 'W').astype(float),
+            'draws': (result == 'D').astype(float),
+            'losses': (result == 'L').astype(float),
+            'goals_for': pd.to_numeric(df['goals_for'], errors='coerce'),
+            'goals_against': pd.to_numeric(df['goals_against'], errors='coerce'),
+        })
+        stats['points'] = 3 * stats['wins'] + stats['draws']
+        stats['goals_n'] = stats['goals_for'].notna().astype(float)
+
+        # Chronological order inside each team (stable, so ties keep input order)
+        order_keys = pd.DataFrame({'team': df['team'], 'position': np.arange(len(df))})
+        if 'match_date' in df.columns:
+            order_keys['match_date'] = pd.to_datetime(df['match_date'], errors='coerce')
+            order = order_keys.sort_values(['team', 'match_date', 'position'], kind='mergesort').index
+        else:
+            order = order_keys.sort_values(['team', 'position'], kind='mergesort').index
+
+        stats = stats.loc[order]
+        teams = df['team'].loc[order]
+        labels = result.where(has_result, '').loc[order]
+
+        # Leak-free: everything below only sees matches before the current one
+        prior = stats.groupby(teams, sort=False).shift(1)
+        prior_labels = labels.groupby(teams, sort=False)
+
+        features = {}
+        for window in windows:
+            sums = (
+                prior.groupby(teams, sort=False)
+                .rolling(window, min_periods=1)
+                .sum()
+                .reset_index(level=0, drop=True)
+            )
+            played = sums['played'].replace(0, np.nan)
+            goals_n = sums['goals_n'].replace(0, np.nan)
+
+            features[f'matches_last_{window}'] = sums['played'].fillna(0)
+            features[f'wins_last_{window}'] = sums['wins'].fillna(0)
+            features[f'draws_last_{window}'] = sums['draws'].fillna(0)
+            features[f'losses_last_{window}'] = sums['losses'].fillna(0)
+            features[f'goals_for_avg_last_{window}'] = sums['goals_for'] / goals_n
+            features[f'goals_against_avg_last_{window}'] = sums['goals_against'] / goals_n
+            features[f'points_per_game_last_{window}'] = sums['points'] / played
+
+            # Oldest -> newest, e.g. 'WDLWW'
+            form = pd.Series('', index=labels.index)
+            for lag in range(window, 0, -1):
+                form = form + prior_labels.shift(lag).fillna('')
+            features[f'form_last_{window}'] = form
+
+        expanding = prior.groupby(teams, sort=False).expanding(min_periods=1)
+        totals = expanding.sum().reset_index(level=0, drop=True)
+        std = (
+            prior[['goals_for', 'goals_against']].groupby(teams, sort=False)
+            .expanding(min_periods=2).std().reset_index(level=0, drop=True)
+        )
+        goals_n = totals['goals_n'].replace(0, np.nan)
+
+        features['goals_for_avg'] = (totals['goals_for'] / goals_n).round(3)
+        features['goals_for_std'] = std['goals_for'].round(3)
+        features['goals_for_total'] = totals['goals_for'].fillna(0)
+        features['goals_against_avg'] = (totals['goals_against'] / goals_n).round(3)
+        features['goals_against_std'] = std['goals_against'].round(3)
+        features['goals_against_total'] = totals['goals_against'].fillna(0)
+        features['win_rate'] = (totals['wins'] / totals['played'].replace(0, np.nan)).round(3)
+
+        return pd.DataFrame(features).sort_index()
 
     def _add_match_statistics(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add match-level statistical features"""
@@ -514,66 +598,66 @@ class MLDataIngestor:
 
         return df
 
-    def _calculate_form(self, team_data: pd.DataFrame, window: int) -> Dict:
-        """Calculate form statistics for a team"""
-        if len(team_data) < window:
-            return {}
-
-        recent = team_data.tail(window)
-
-        form_dict = {}
-
-        if 'result' in recent.columns:
-            results = recent['result'].tolist()
-            form_dict[f'form_last_{window}'] = ''.join(results)
-            form_dict[f'wins_last_{window}'] = results.count('W')
-            form_dict[f'draws_last_{window}'] = results.count('D')
-            form_dict[f'losses_last_{window}'] = results.count('L')
-
-        if 'goals_for' in recent.columns:
-            form_dict[f'goals_for_avg_last_{window}'] = recent['goals_for'].mean()
-            form_dict[f'goals_against_avg_last_{window}'] = recent['goals_against'].mean()
-
-        return form_dict
+    def _load_preprocessing(self, out_dir: Path):
+        """Reuse the encoders/imputers fitted by previous runs on this store"""
+        path = out_dir / PREPROCESSING_NAME
+        if not path.exists():
+            return
+        with open(path) as f:
+            state = json.load(f)
+        self.label_encoders = state['label_encoders']
+        self.imputers = state['imputers']
+        logger.info(f"Loaded preprocessing state: {len(self.label_encoders)} encoded columns")
+
+    def _save_preprocessing(self, out_dir: Path):
+        path = out_dir / PREPROCESSING_NAME
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'label_encoders': self.label_encoders, 'imputers': self.imputers}, f, indent=2)
+        os.replace(tmp_path, path)
 
     def _encode_categorical_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Encode categorical features"""
+        """Encode categorical features (known categories keep their code, new ones are appended)"""
         categorical_cols = df.select_dtypes(include=['object']).columns
         categorical_cols = [col for col in categorical_cols
                           if col not in ['id', 'source_url', 'scraped_at', 'proxy', 'user_agent']]
 
         if self.config['categorical_encoding'] == 'label':
             for col in categorical_cols:
-                if col not in self.label_encoders:
-                    self.label_encoders[col] = LabelEncoder()
+                categories = self.label_encoders.setdefault(col, [])
 
                 # Handle NaN values
                 non_null_mask = df[col].notna()
                 if non_null_mask.any():
-                    df.loc[non_null_mask, f'{col}_encoded'] = self.label_encoders[col].fit_transform(
-                        df.loc[non_null_mask, col].astype(str)
-                    )
+                    values = df.loc[non_null_mask, col].astype(str)
+                    known = set(categories)
+                    categories.extend(sorted(set(values) - known))
+                    codes = {category: code for code, category in enumerate(categories)}
+                    df.loc[non_null_mask, f'{col}_encoded'] = values.map(codes)
 
         return df
 
     def _impute_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Impute missing values"""
+        """Impute missing values (fill values are fitted once per column)"""
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         categorical_cols = df.select_dtypes(include=['object']).columns
 
-        # Numeric imputation
-        if len(numeric_cols) > 0:
-            if 'numeric' not in self.imputers:
-                self.imputers['numeric'] = SimpleImputer(strategy=self.config['numerical_imputation'])
-
-            df[numeric_cols] = self.imputers['numeric'].fit_transform(df[numeric_cols])
-
-        # Categorical imputation
-        if len(categorical_cols) > 0:
-            if 'categorical' not in self.imputers:
-                self.imputers['categorical'] = SimpleImputer(strategy=self.config['categorical_imputation'])
+        for kind, columns, strategy in (
+            ('numeric', numeric_cols, self.config['numerical_imputation']),
+            ('categorical', categorical_cols, self.config['categorical_imputation']),
+        ):
+            fill_values = self.imputers.setdefault(kind, {})
+            new_cols = [col for col in columns if col not in fill_values and df[col].notna().any()]
+            if new_cols:
+                imputer = SimpleImputer(strategy=strategy).fit(df[new_cols])
+                fill_values.update({
+                    col: value.item() if isinstance(value, np.generic) else value
+                    for col, value in zip(new_cols, imputer.statistics_)
+                })
 
-            df[categorical_cols] = self.imputers['categorical'].fit_transform(df[categorical_cols])
+            fill = {col: fill_values[col] for col in columns if col in fill_values}
+            if fill:
+                df = df.fillna(fill)
 
         return df
 
@@ -585,6 +669,8 @@ class MLDataIngestor:
             for idx, row in df.iterrows():
                 label_dict = {
                     'id': row.get('id', str(uuid.uuid4())),
+                    'competition': row.get('competition'),
+                    'season': row.get('season'),
                     'result': row['result']
                 }
 
@@ -607,19 +693,22 @@ class MLDataIngestor:
         out_dir: Path,
         raw_data: pd.DataFrame
     ) -> Dict:
-        """Save processed results and generate metadata"""
+        """Append processed results to the feature store and generate metadata"""
+        store = FeatureStore(out_dir, partitioning=self.config['output_partitioning'])
 
-        # Save features
-        features_path = out_dir / 'features.parquet'
-        features_df.to_parquet(features_path, index=False)
-        logger.info(f"Saved features: {features_path} ({len(features_df)} records)")
+        # Save features (only records not stored by a previous run)
+        features_summary = store.append('features', features_df, key='id')
+        logger.info(f"Saved features: {out_dir / 'features'} ({features_summary['rows_written']} new, "
+                    f"{features_summary['rows_skipped']} already stored)")
 
         # Save labels if available
-        labels_path = None
+        labels_summary = None
         if not labels_df.empty:
-            labels_path = out_dir / 'labels.parquet'
-            labels_df.to_parquet(labels_path, index=False)
-            logger.info(f"Saved labels: {labels_path} ({len(labels_df)} records)")
+            labels_summary = store.append('labels', labels_df, key='id')
+            logger.info(f"Saved labels: {out_dir / 'labels'} ({labels_summary['rows_written']} new, "
+                        f"{labels_summary['rows_skipped']} already stored)")
+
+        self._save_preprocessing(out_dir)
 
         # Generate validation report
         validation_report = self._generate_validation_report(features_df, labels_df)
@@ -643,10 +732,16 @@ class MLDataIngestor:
                 'min': raw_data['scraped_at'].min() if 'scraped_at' in raw_data.columns else None,
                 'max': raw_data['scraped_at'].max() if 'scraped_at' in raw_data.columns else None
             },
+            'rows_appended': {
+                'features': features_summary['rows_written'],
+                'labels': labels_summary['rows_written'] if labels_summary else 0
+            },
+            # Hashes come from the manifest (computed when each part was written)
             'file_hashes': {
-                'features': self._calculate_file_hash(features_path),
-                'labels': self._calculate_file_hash(labels_path) if labels_path else None
+                'features': store.dataset_hash('features'),
+                'labels': store.dataset_hash('labels')
             },
+            'manifest': str(store.manifest_path),
             'config': self.config,
             'validation_report': validation_report
         }
@@ -688,17 +783,6 @@ class MLDataIngestor:
 
         return report
 
-    def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate file hash for versioning"""
-        if not file_path or not file_path.exists():
-            return None
-
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-
 
 def main():
     """CLI interface for the ML ingestion service"""
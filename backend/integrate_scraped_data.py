@@ -4,15 +4,22 @@
 Enriches existing match data with scraped team statistics for better ML predictions.
 """
 
+import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
 from typing import Dict, List, Optional
 
+from app.core.feature_store import FeatureStore, stable_id
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Feature store dataset with one enriched row per match
+ENRICHED_DATASET = 'enriched_matches'
+FEATURE_STORE_PATH = os.getenv('FEATURE_STORE_PATH', 'feature_store')
+
 class ScrapedDataIntegrator:
     """Integrates scraped team statistics with existing match data"""
 
@@ -126,6 +133,30 @@ class ScrapedDataIntegrator:
 
         return enriched_df
 
+    def save_to_feature_store(
+        self,
+        enriched_df: pd.DataFrame,
+        store: FeatureStore,
+        competition: str = 'brasileirao',
+        season: str = '2024'
+    ) -> Dict:
+        """Append enriched matches not stored yet (partitioned by competition/season)"""
+        df = enriched_df.copy()
+        if 'competition' not in df.columns:
+            df['competition'] = df['league'] if 'league' in df.columns else competition
+        if 'season' not in df.columns:
+            df['season'] = season
+
+        date_column = next((c for c in ['match_date', 'date'] if c in df.columns), None)
+        df['match_key'] = [
+            stable_id(*values) for values in zip(
+                df['competition'], df['season'],
+                df[date_column] if date_column else [None] * len(df),
+                df['home_team'], df['away_team']
+            )
+        ]
+        return store.append(ENRICHED_DATASET, df, key='match_key')
+
     def validate_integration(self, enriched_df: pd.DataFrame) -> Dict:
         """Validate the integration results"""
         validation_report = {
@@ -174,6 +205,10 @@ def main():
     enriched_df.to_csv(output_path, index=False)
     logger.info(f"💾 Saved enriched dataset: {output_path}")
 
+    # Append new matches to the feature store (read by train_ml_enriched.py)
+    summary = integrator.save_to_feature_store(enriched_df, FeatureStore(FEATURE_STORE_PATH))
+    logger.info(f"💾 Feature store: {summary['rows_written']} new matches in '{ENRICHED_DATASET}'")
+
     # Save team statistics separately
     team_stats_path = 'team_statistics_scraped.csv'
     team_stats.to_csv(team_stats_path, index=False)
@@ -14,6 +14,8 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from elo_engine import EloRatingEngine
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,7 @@ class FootballFeatureEngineer:
             'season_weight_decay': 0.1,  # Weight decay for historical seasons
             'min_matches_threshold': 3,  # Minimum matches for reliable stats
             'elo_k_factor': 32,  # ELO rating K-factor
+            'elo_state_path': None,  # Persisted ELO state (JSON) for incremental updates
             'home_advantage': 0.1,  # Home advantage factor
             'position_weights': {  # Position-based feature weights
                 'GK': 0.1, 'DEF': 0.7, 'MID': 0.8, 'ATT': 1.0
@@ -193,54 +196,46 @@ class FootballFeatureEngineer:
         return df
 
     def _engineer_elo_ratings(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Engineer ELO rating system"""
+        """Engineer ELO rating system (pre-match rating per row)"""
         logger.info("Engineering ELO ratings...")
 
         if not all(col in df.columns for col in ['team', 'match_date']):
             return df
 
-        # Initialize ELO ratings
-        elo_ratings = {}
         df = df.sort_values(['match_date', 'team'])
 
-        elo_history = []
-
-        for idx, row in df.iterrows():
-            team = row['team']
-            date = row['match_date']
-
-            # Initialize team ELO if not exists
-            if team not in elo_ratings:
-                elo_ratings[team] = 1500  # Standard starting ELO
-
-            current_elo = elo_ratings[team]
-
-            # Update ELO based on match result if available
-            if 'result' in row and pd.notna(row['result']):
-                opponent = row.get('opponent', 'unknown')
-                if opponent != 'unknown' and opponent in elo_ratings:
-                    opponent_elo = elo_ratings[opponent]
-
-                    # Calculate expected score
-                    expected_score = 1 / (1 + 10 ** ((opponent_elo - current_elo) / 400))
-
-                    # Actual score
-                    actual_score = 1 if row['result'] == 'W' else 0.5 if row['result'] == 'D' else 0
+        opponents = df['opponent'].values if 'opponent' in df.columns else None
+        keys = EloRatingEngine.row_keys(df['team'].values, opponents, df['match_date'].values)
+
+        # Persisted state lets new results be applied without replaying history
+        state_path = self.config.get('elo_state_path')
+        engine = None
+        if state_path and Path(state_path).exists():
+            engine = EloRatingEngine.load(state_path)
+            overlap = keys.isin(engine.applied_keys)
+            if engine.applied_keys and engine.applied_keys.issubset(keys):
+                engine = None  # Batch contains the whole saved history: full rebuild
+            elif overlap.any() or (engine.last_date is not None and df['match_date'].min() <= engine.last_date):
+                raise ValueError(
+                    f"ELO batch overlaps the state in {state_path} (last date {engine.last_date}, "
+                    f"{int(overlap.sum())} rows already applied): pass only newer results or the full history"
+                )
 
-                    # Update ELO
-                    new_elo = current_elo + self.config['elo_k_factor'] * (actual_score - expected_score)
-                    elo_ratings[team] = new_elo
+        if engine is None:
+            engine = EloRatingEngine(k_factor=self.config['elo_k_factor'])
+        else:
+            logger.info(f"Applying {len(df)} rows incrementally on ELO state from {engine.last_date}")
 
-            elo_history.append({
-                'index': idx,
-                'team': team,
-                'elo_rating': current_elo,
-                'date': date
-            })
+        df['elo_rating'] = engine.process(
+            df['team'].values,
+            opponents,
+            df['result'].values if 'result' in df.columns else None,
+            df['match_date'].values,
+            keys=keys
+        )
 
-        # Merge ELO ratings back
-        elo_df = pd.DataFrame(elo_history).set_index('index')
-        df['elo_rating'] = elo_df['elo_rating']
+        if state_path:
+            engine.save(state_path)
 
         return df
 
@@ -258,37 +253,171 @@ class FootballFeatureEngineer:
             else:
                 return df
 
-        # Calculate head-to-head statistics
-        h2h_features = []
+        # Calculate head-to-head statistics from the pair index
+        h2h_df = self._indexed_h2h_statistics(df)
 
-        for idx, row in df.iterrows():
-            team = row['team']
-            opponent = row['opponent']
+        # Merge
+        df = pd.concat([df, h2h_df], axis=1)
 
-            if pd.isna(opponent) or opponent == 'unknown':
-                h2h_features.append({})
-                continue
+        return df
 
-            # Filter historical matches between these teams
-            h2h_matches = df[
-                ((df['team'] == team) & (df['opponent'] == opponent)) |
-                ((df['team'] == opponent) & (df['opponent'] == team))
-            ]
+    H2H_RESULTS = ('W', 'D', 'L')
+    H2H_GOAL_COLUMNS = ('goals_for', 'goals_against')
 
-            if 'match_date' in df.columns and pd.notna(row['match_date']):
-                h2h_matches = h2h_matches[h2h_matches['match_date'] < row['match_date']]
+    def _indexed_h2h_statistics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Last-N head-to-head statistics for every row via a pair index.
 
-            h2h_matches = h2h_matches.tail(self.config['head_to_head_limit'])
+        Rows are grouped by a canonical (team, opponent) pair key and ordered
+        by match date inside each pair, with cumulative result and goal sums.
+        Prior meetings of a row are then a prefix found by searchsorted, and
+        the last-N window sums are differences of the cumulative arrays.
 
-            # Calculate H2H statistics
-            h2h_stats = self._calculate_h2h_statistics(h2h_matches, team, opponent)
-            h2h_features.append(h2h_stats)
+        Pairs whose rows are not in date order (or have missing dates) are
+        computed with the per-row filter so the output is always the same.
+        """
+        n = len(df)
+        limit = self.config['head_to_head_limit']
+        team = df['team'].to_numpy(dtype=object)
+        opponent = df['opponent'].to_numpy(dtype=object)
+        has_dates = 'match_date' in df.columns
+
+        # Canonical pair key over rows where both names are present
+        valid = pd.notna(team) & pd.notna(opponent)
+        codes, _ = pd.factorize(np.concatenate([team, opponent]))
+        team_code, opp_code = codes[:n], codes[n:]
+        lo = np.minimum(team_code, opp_code)
+        hi = np.maximum(team_code, opp_code)
+        pair_key = lo.astype(np.int64) * (codes.max() + 1) + hi
+
+        rows = np.flatnonzero(valid)
+        pair_id = np.full(n, -1, dtype=np.int64)
+        pair_id[rows] = pd.factorize(pair_key[rows])[0]
+        n_pairs = int(pair_id.max()) + 1 if len(rows) else 0
+
+        if has_dates:
+            dates = pd.to_datetime(df['match_date']).to_numpy()
+            date_rank = pd.factorize(dates, sort=True)[0]  # NaT -> -1
+        else:
+            date_rank = np.zeros(n, dtype=np.int64)
+
+        # Sorted pair index: grouped by pair, position order inside the pair
+        order = rows[np.lexsort((rows, pair_id[rows]))]
+        sorted_pair = pair_id[order]
+        sorted_rank = date_rank[order]
+        group_start = np.searchsorted(sorted_pair, np.arange(n_pairs), 'left')
+        group_end = np.searchsorted(sorted_pair, np.arange(n_pairs), 'right')
+
+        # Pairs where position order differs from date order (or NaT) use the slow path
+        slow_pair = np.zeros(n_pairs, dtype=bool)
+        if has_dates and len(order):
+            same_pair = sorted_pair[1:] == sorted_pair[:-1]
+            slow_pair[sorted_pair[1:][same_pair & (sorted_rank[1:] < sorted_rank[:-1])]] = True
+            slow_pair[sorted_pair[sorted_rank < 0]] = True
+
+        # Cumulative sums per orientation (row's team == pair's lower code)
+        is_lo = (team_code == lo)[order]
+
+        def cumulative(values: np.ndarray) -> np.ndarray:
+            return np.concatenate([[0], np.cumsum(values)])
+
+        flags = {'team_lo': cumulative(is_lo)}
+        if 'result' in df.columns:
+            result = df['result'].to_numpy(dtype=object)[order]
+            for outcome in self.H2H_RESULTS:
+                hit = result == outcome
+                flags[f'{outcome}_lo'] = cumulative(hit & is_lo)
+                flags[f'{outcome}_hi'] = cumulative(hit & ~is_lo)
+        for col in self.H2H_GOAL_COLUMNS:
+            if col in df.columns:
+                goals = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)[order]
+                present = ~np.isnan(goals)
+                flags[f'{col}_sum_lo'] = cumulative(np.where(present & is_lo, goals, 0.0))
+                flags[f'{col}_sum_hi'] = cumulative(np.where(present & ~is_lo, goals, 0.0))
+                flags[f'{col}_cnt_lo'] = cumulative(present & is_lo)
+                flags[f'{col}_cnt_hi'] = cumulative(present & ~is_lo)
+
+        # Query rows: valid pair and a known opponent
+        query = valid & (opponent != 'unknown')
+        query &= ~slow_pair[np.where(pair_id >= 0, pair_id, 0)] | (pair_id < 0)
+        q = np.flatnonzero(query)
+        g = pair_id[q]
+
+        if has_dates:
+            # Dates are sorted inside fast pairs: prior meetings are a prefix
+            composite = sorted_pair.astype(np.int64) * (n + 1) + sorted_rank
+            end = np.searchsorted(composite, g * (n + 1) + date_rank[q], 'left')
+        else:
+            end = group_end[g]
+        start = np.maximum(group_start[g], end - limit)
+
+        def window(name: str) -> np.ndarray:
+            return flags[name][end] - flags[name][start]
+
+        row_is_lo = team_code[q] == lo[q]
+        matches = end - start
+        team_matches = np.where(row_is_lo, window('team_lo'), matches - window('team_lo'))
+
+        columns: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        def add(name: str, values: np.ndarray, present: np.ndarray):
+            full_values = np.full(n, np.nan)
+            full_present = np.zeros(n, dtype=bool)
+            full_values[q] = values
+            full_present[q] = present
+            columns[name] = (full_values, full_present)
+
+        has_h2h = matches > 0
+        has_team = has_h2h & (team_matches > 0)
+        add('h2h_matches', matches, has_h2h)
+        add('h2h_team_matches', team_matches, has_h2h)
 
-        # Convert to DataFrame and merge
-        h2h_df = pd.DataFrame(h2h_features)
-        df = pd.concat([df, h2h_df], axis=1)
+        if 'result' in df.columns:
+            counts = {
+                outcome: np.where(row_is_lo, window(f'{outcome}_lo'), window(f'{outcome}_hi'))
+                for outcome in self.H2H_RESULTS
+            }
+            add('h2h_wins', counts['W'], has_team)
+            add('h2h_draws', counts['D'], has_team)
+            add('h2h_losses', counts['L'], has_team)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                add('h2h_win_rate', counts['W'] / team_matches, has_team)
 
-        return df
+        for col in self.H2H_GOAL_COLUMNS:
+            if col in df.columns:
+                total = np.where(row_is_lo, window(f'{col}_sum_lo'), window(f'{col}_sum_hi'))
+                count = np.where(row_is_lo, window(f'{col}_cnt_lo'), window(f'{col}_cnt_hi'))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    add(f'h2h_{col}_avg', np.where(count > 0, total / count, np.nan), has_team)
+
+        # Slow path: per-row filter restricted to the rows of the pair
+        for pair in np.flatnonzero(slow_pair):
+            pair_rows = df.iloc[np.sort(order[group_start[pair]:group_end[pair]])]
+            for pos in np.flatnonzero((pair_id == pair) & valid & (opponent != 'unknown')):
+                h2h_matches = pair_rows
+                if has_dates and pd.notna(df['match_date'].iloc[pos]):
+                    h2h_matches = h2h_matches[h2h_matches['match_date'] < df['match_date'].iloc[pos]]
+                h2h_matches = h2h_matches.tail(limit)
+                stats = self._calculate_h2h_statistics(h2h_matches, team[pos], opponent[pos])
+                for name, value in stats.items():
+                    if name not in columns:
+                        columns[name] = (np.full(n, np.nan), np.zeros(n, dtype=bool))
+                    columns[name][0][pos] = value
+                    columns[name][1][pos] = True
+
+        # Same columns/dtypes as a DataFrame built from per-row stat dicts
+        h2h_df = pd.DataFrame(index=pd.RangeIndex(n))
+        for name in ['h2h_matches', 'h2h_team_matches', 'h2h_wins', 'h2h_draws', 'h2h_losses',
+                     'h2h_win_rate', 'h2h_goals_for_avg', 'h2h_goals_against_avg']:
+            if name not in columns or not columns[name][1].any():
+                continue
+            values, present = columns[name]
+            values = np.where(present, values, np.nan)
+            if name not in ('h2h_win_rate', 'h2h_goals_for_avg', 'h2h_goals_against_avg') and present.all():
+                values = values.astype(np.int64)
+            h2h_df[name] = values
+
+        return h2h_df
 
     def _engineer_form_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Engineer form and momentum features"""
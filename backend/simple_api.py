@@ -10,7 +10,7 @@ from slowapi.errors import RateLimitExceeded
 
 from app.core.database import get_db
 from app.core.rate_limiter import limiter, rate_limit_exceeded_handler
-from app.core.scheduler import start_scheduler, stop_scheduler
+from app.services.job_registry import start_job_runner, stop_job_runner
 from app.api.api_v1.endpoints import predictions, analytics, global_stats, news, monitoring, dashboard, matches, ml_performance, auth, manual_predictions, live_matches, tickets, user_bankroll, user_tickets
 
 app = FastAPI(
@@ -21,13 +21,13 @@ app = FastAPI(
 # Lifecycle events
 @app.on_event("startup")
 async def startup_event():
-    """Iniciar scheduler ao iniciar a API"""
-    start_scheduler()
+    """Iniciar o job runner ao iniciar a API"""
+    await start_job_runner()
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Parar scheduler ao desligar a API"""
-    stop_scheduler()
+    """Parar o job runner ao desligar a API"""
+    await stop_job_runner()
 
 # Configurar rate limiter
 app.state.limiter = limiter
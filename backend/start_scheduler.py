@@ -11,14 +11,13 @@ from datetime import datetime
 
 sys.path.append(os.getcwd())
 
-from app.services.intelligent_scheduler import intelligent_scheduler
+from app.services.job_registry import run_standalone_runner
 from app.core.database import get_db_session
 from app.models.match import Match
 
 def signal_handler(sig, frame):
     """Parar scheduler graciosamente"""
     print("\n🛑 Parando scheduler...")
-    intelligent_scheduler.stop_scheduler()
     print("✅ Scheduler parado com sucesso")
     sys.exit(0)
 
@@ -79,38 +78,16 @@ def main():
         print("  📊 Relatório diário: 23:30")
         print()
 
-        # Iniciar scheduler
-        intelligent_scheduler.start_scheduler()
-
         print("✅ Scheduler iniciado com sucesso!")
-        print("⏰ Sistema rodando automaticamente...")
+        print("⏰ Sistema rodando automaticamente (job runner, grupo 'collectors')...")
         print("🔒 Rate limits sendo respeitados")
         print()
         print("💡 Para parar o scheduler, pressione Ctrl+C")
         print("📊 Para ver status, verifique os logs")
         print()
 
-        # Mostrar status inicial
-        status = intelligent_scheduler.get_status()
-        print("📊 STATUS INICIAL:")
-        print(f"  • Rodando: {status['is_running']}")
-        print(f"  • Jobs agendados: {len(status['next_scheduled_jobs'])}")
-        print()
-
-        # Loop para manter o programa rodando
         try:
-            while True:
-                # Mostrar status a cada 5 minutos
-                import time
-                time.sleep(300)  # 5 minutos
-
-                print(f"⏰ {datetime.now().strftime('%H:%M:%S')} - Scheduler ativo")
-                status = intelligent_scheduler.get_status()
-
-                if status['last_execution']['last_run']:
-                    print(f"  📊 Última execução: {status['last_execution']['last_run']}")
-                    print(f"  ⚽ Jogos adicionados: {status['last_execution']['matches_added']}")
-
+            asyncio.run(run_standalone_runner(['collectors'], name='collectors'))
         except KeyboardInterrupt:
             signal_handler(None, None)
 
@@ -2,18 +2,24 @@
 """
 🤖 START ALL SCHEDULERS - Sistema 100% Automatizado
 
-Inicia todos os schedulers em background:
+Processo dedicado para o job runner (sem a API), com os grupos de
+settings.JOB_RUNNER_GROUPS:
 - Importação de jogos (4x/dia)
 - Atualização de jogos ao vivo (2 min)
 - Geração de predictions ML (6h)
-- Análise AI Agent (12h)
+- Análise AI Agent (2h)
 - Limpeza de jogos finalizados (1h)
 - Normalização de ligas (diária)
 - Atualização de resultados (1h)
+
+Pode rodar junto com a API: a eleição de líder no Redis garante que cada
+job rode uma vez só.
 """
-import time
+import asyncio
 import logging
-from app.core.scheduler import start_scheduler, scheduler
+
+from app.core.job_runner import job_runner
+from app.services.job_registry import start_job_runner, stop_job_runner
 
 # Configure logging
 logging.basicConfig(
@@ -23,24 +29,17 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-if __name__ == "__main__":
-    print("=" * 80)
-    print("🤖 INICIANDO SISTEMA AUTOMATIZADO COMPLETO")
-    print("=" * 80)
 
-    # Start scheduler
-    start_scheduler()
+async def main():
+    await start_job_runner()
 
-    print("\n✅ Scheduler iniciado com sucesso!")
+    status = job_runner.get_status()
+    print("\n✅ Job runner iniciado com sucesso!")
+    print(f"   Worker: {status['worker']} ({'líder' if status['is_leader'] else 'standby'})")
     print("\n📋 Jobs ativos:")
-    for job in scheduler.get_jobs():
-        print(f"   - {job.name} (ID: {job.id})")
-        if hasattr(job.trigger, 'interval'):
-            print(f"     Intervalo: {job.trigger.interval}")
-        elif hasattr(job.trigger, 'fields'):
-            hour = job.trigger.fields[5]
-            minute = job.trigger.fields[6]
-            print(f"     Horário: {hour}:{minute}")
+    for job in status['jobs']:
+        print(f"   - {job['name']} (ID: {job['id']})")
+        print(f"     Trigger: {job['trigger']}")
 
     print("\n" + "=" * 80)
     print("🚀 SISTEMA RODANDO EM BACKGROUND")
@@ -49,14 +48,21 @@ if __name__ == "__main__":
     print()
 
     try:
-        # Keep running
         while True:
-            time.sleep(60)
+            await asyncio.sleep(60)
             # Show heartbeat every minute
-            logger.info("💚 Sistema ativo - Todos os schedulers rodando")
+            logger.info(f"💚 Sistema ativo - {'líder' if job_runner.is_leader else 'standby'}")
+    finally:
+        await stop_job_runner()
+
 
+if __name__ == "__main__":
+    print("=" * 80)
+    print("🤖 INICIANDO SISTEMA AUTOMATIZADO COMPLETO")
+    print("=" * 80)
+
+    try:
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n⏹️  Parando schedulers...")
-        from app.core.scheduler import stop_scheduler
-        stop_scheduler()
         print("✅ Schedulers parados com sucesso!")
@@ -0,0 +1,39 @@
+"""
+🧪 Fixtures compartilhadas
+"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import database
+from app.core.database import Base
+
+
+@pytest.fixture
+def sqlite_file_db(tmp_path, monkeypatch):
+    """
+    SQLite em arquivo visto pela engine síncrona e pela async (aiosqlite)
+
+    - session_factory: Sessions síncronas (também usada por run_sync_db)
+    - override_async_db: substituto de get_async_db para dependency_overrides
+    """
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+
+    # NullPool: TestClient abre um event loop por request
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    yield SimpleNamespace(session_factory=session_factory, override_async_db=override_async_db)
+    engine.dispose()
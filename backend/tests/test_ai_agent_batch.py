@@ -0,0 +1,214 @@
+"""
+🧪 Testes Unitários - AI Agent em lote (Ollama stub local)
+"""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.models import Match, Prediction, Team
+from app.services import ai_agent_batch
+from app.services.ai_agent_batch import AIAgentBatchService
+from app.services.ai_agent_service import AIAgentService
+from app.services.few_shot_memory import FewShotMemory
+
+
+class StubOllama:
+    """Servidor com a API do Ollama: /api/tags e /api/generate (jogos 'Slow' demoram mais)"""
+
+    def __init__(self, delay=0.2, slow_delay=2.0):
+        self.delay = delay
+        self.slow_delay = slow_delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply({'models': [{'name': 'llama3.1:8b'}]})
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.prompts.append(request['prompt'])
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.slow_delay if 'Slow' in request['prompt'] else stub.delay)
+                    analysis = {
+                        'context_analysis': 'ok', 'key_factors': ['forma'], 'confidence_adjustment': 0.7,
+                        'adjustment_reasoning': 'contexto', 'recommendation': 'bet', 'risk_level': 'low',
+                        'explanation': f"stub:{request['prompt'].split('JOGO:')[1].split(' vs ')[0].strip()}"
+                    }
+                    self._reply({'model': request['model'], 'response': json.dumps(analysis), 'done': True})
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def ollama():
+    stub = StubOllama()
+    yield stub
+    stub.server.shutdown()
+
+
+def batch_items(names):
+    predictions = [
+        {'match_data': {'home_team': name, 'away_team': 'Rival'},
+         'ml_prediction': {'predicted_outcome': '1', 'confidence': 0.6}}
+        for name in names
+    ]
+    return predictions, [{} for _ in names]
+
+
+class TestAIAgentBatchAnalyze:
+    """Testes para AIAgentService.batch_analyze"""
+
+    def test_requests_overlap_up_to_max_concurrent(self, ollama):
+        """Test: Chamadas ao Ollama em paralelo, limitadas por max_concurrent, na ordem de entrada"""
+        agent = AIAgentService(base_url=ollama.url, timeout=5)
+        predictions, contexts = batch_items([f"Team {i}" for i in range(8)])
+
+        start = time.time()
+        results = agent.batch_analyze(predictions, contexts, max_concurrent=4)
+        elapsed = time.time() - start
+
+        assert [r['explanation'] for r in results] == [f"stub:Team {i}" for i in range(8)]
+        assert [r['recommendation'] for r in results] == ['BET'] * 8
+        assert ollama.max_in_flight == 4
+        # 8 x 0.2s com 4 simultâneas -> ~0.4s (sequencial seria 1.6s)
+        assert elapsed < 1.2
+
+    def test_timeout_falls_back_for_that_prediction_only(self, ollama):
+        """Test: Análise que estoura o timeout vira fallback; as outras seguem"""
+        agent = AIAgentService(base_url=ollama.url, timeout=0.5)
+        predictions, contexts = batch_items(["Team A", "Slow FC", "Team B"])
+
+        results = agent.batch_analyze(predictions, contexts, max_concurrent=3)
+
+        assert [r.get('ai_available', True) for r in results] == [True, False, True]
+        assert results[1]['adjusted_confidence'] == 0.6
+
+    def test_offline_server_returns_fallback_without_waiting(self):
+        """Test: Ollama fora do ar -> fallback imediato para todo o batch"""
+        agent = AIAgentService(base_url="http://127.0.0.1:9", timeout=30)
+        predictions, contexts = batch_items(["Team A", "Team B"])
+
+        start = time.time()
+        results = agent.batch_analyze(predictions, contexts)
+
+        assert all(r['ai_available'] is False for r in results)
+        assert time.time() - start < 5
+
+
+@pytest.fixture
+def pending_predictions(sqlite_file_db):
+    """6 predictions pendentes (1 em jogo 'Slow') + 2 resolvidas para few-shot"""
+    db = sqlite_file_db.session_factory()
+    names = ["Flamengo", "Palmeiras", "Santos", "Slow FC", "Bahia", "Vasco", "Rival"]
+    db.add_all([Team(id=i, name=name) for i, name in enumerate(names, 1)])
+    kickoff = datetime.now() + timedelta(days=1)
+    for i in range(1, 7):
+        db.add(Match(id=i, home_team_id=i, away_team_id=7, league="Brasileirão", match_date=kickoff, status="NS"))
+        db.add(Prediction(id=i, match_id=i, prediction_type="SINGLE", market_type="1X2",
+                          predicted_outcome="1", confidence_score=0.6, ai_analyzed=False))
+    for i, winner in [(7, True), (8, False)]:
+        db.add(Prediction(id=i, match_id=1, prediction_type="SINGLE", market_type="1X2", predicted_outcome="1",
+                          confidence_score=0.7, actual_outcome="1" if winner else "2", is_winner=winner,
+                          ai_analyzed=True))
+    db.commit()
+    yield db
+    db.close()
+
+
+class TestAIAgentBatchService:
+    """Testes para AIAgentBatchService.process_unanalyzed_predictions"""
+
+    def test_process_writes_successes_and_keeps_failures_pending(self, ollama, pending_predictions, monkeypatch):
+        """Test: Few-shot carregado uma vez, timeouts continuam pendentes, sucesso gravado"""
+        calls = []
+        original = FewShotMemory.get_learning_examples
+
+        def counting(self, *args, **kwargs):
+            calls.append(1)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(FewShotMemory, 'get_learning_examples', counting)
+        agent = AIAgentService(base_url=ollama.url, timeout=0.5, max_concurrent=3)
+        service = AIAgentBatchService(db=pending_predictions, ai_agent=agent)
+
+        result = service.process_unanalyzed_predictions(limit=10)
+
+        assert result['success']
+        assert result['stats'] == {'processed': 6, 'success': 5, 'failed': 1, 'skipped': 0}
+        assert len(calls) == 1
+        assert all('EXEMPLOS DE APRENDIZADO' in prompt for prompt in ollama.prompts)
+        assert ollama.max_in_flight == 3
+
+        pending_predictions.expire_all()
+        rows = {p.id: p for p in pending_predictions.query(Prediction).filter(Prediction.id <= 6)}
+        assert [rows[i].ai_analyzed for i in range(1, 7)] == [True, True, True, False, True, True]
+        assert rows[1].ai_recommendation == 'BET'
+        assert rows[1].ai_analysis == 'stub:Flamengo'
+        assert rows[1].ai_confidence_delta == pytest.approx(0.1)
+
+    def test_scheduler_entrypoint_is_async(self, ollama, pending_predictions, monkeypatch):
+        """Test: analyze_unanalyzed_predictions roda dentro do event loop do scheduler"""
+        monkeypatch.setattr(ai_agent_batch, 'AIAgentService',
+                            lambda model: AIAgentService(model=model, base_url=ollama.url, timeout=5))
+        monkeypatch.setattr(ai_agent_batch, 'SessionLocal', lambda: pending_predictions)
+        monkeypatch.setattr(pending_predictions, 'close', lambda: None)
+
+        result = asyncio.run(ai_agent_batch.analyze_unanalyzed_predictions(limit=2))
+
+        assert result['stats']['success'] == 2
+
+
+class TestPipelineAIBatchJob:
+    """Testes para o job ai_batch_analysis (automated_pipeline.run_ai_batch_analysis)"""
+
+    def test_offline_ollama_skips_context_building(self, pending_predictions, monkeypatch):
+        """Test: Ollama fora do ar -> job sai antes de montar contextos (sem gastar NewsAPI)"""
+        from app.services import ai_agent_service, automated_pipeline, context_analyzer
+
+        contexts = []
+
+        class RecordingAnalyzer:
+            def analyze_match_context(self, match):
+                contexts.append(match.id)
+                return {}
+
+        monkeypatch.setattr(automated_pipeline, 'get_db_session', lambda: pending_predictions)
+        monkeypatch.setattr(pending_predictions, 'close', lambda: None)
+        monkeypatch.setattr(ai_agent_service, 'AIAgentService',
+                            lambda: AIAgentService(base_url="http://127.0.0.1:9", timeout=5))
+        monkeypatch.setattr(context_analyzer, 'get_context_analyzer', lambda db: RecordingAnalyzer())
+
+        result = automated_pipeline.run_ai_batch_analysis()
+
+        assert result['ai_available'] is False
+        assert contexts == []
@@ -0,0 +1,92 @@
+"""
+🧪 Testes Unitários - APIRequestScheduler (quota da API-Football)
+"""
+import asyncio
+import time
+
+from app.services.api_request_scheduler import APIRequestScheduler
+
+
+class TestAPIRequestScheduler:
+    """Testes para o token bucket + quota diária"""
+
+    def test_burst_up_to_bucket_capacity_without_waiting(self):
+        """Test: Requests até a capacidade do minuto não esperam"""
+        scheduler = APIRequestScheduler(requests_per_minute=60, daily_limit=1000, max_concurrent=5)
+
+        async def run():
+            start = time.monotonic()
+            results = [await scheduler.acquire() for _ in range(60)]
+            return results, time.monotonic() - start
+
+        results, elapsed = asyncio.run(run())
+
+        assert all(results)
+        assert elapsed < 0.5
+        assert scheduler.get_stats()['daily_used'] == 60
+
+    def test_empty_bucket_waits_for_refill(self):
+        """Test: Bucket vazio espera apenas o tempo de reposição"""
+        scheduler = APIRequestScheduler(requests_per_minute=600, daily_limit=1000)
+        scheduler._tokens = 0.0
+
+        async def run():
+            start = time.monotonic()
+            await scheduler.acquire()
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(run())
+
+        # 600/min = 10 tokens/s -> ~0.1s por token
+        assert 0.05 <= elapsed < 0.5
+
+    def test_daily_quota_exhausted(self):
+        """Test: Quota diária esgotada retorna False sem esperar"""
+        scheduler = APIRequestScheduler(requests_per_minute=60, daily_limit=2)
+
+        async def run():
+            return [await scheduler.acquire() for _ in range(3)]
+
+        assert asyncio.run(run()) == [True, True, False]
+
+    def test_update_from_headers(self):
+        """Test: Headers x-ratelimit-* ajustam a quota"""
+        scheduler = APIRequestScheduler(requests_per_minute=300, daily_limit=7500)
+        scheduler.update_from_headers({
+            'x-ratelimit-requests-remaining': '42',
+            'x-ratelimit-remaining': '3'
+        })
+
+        stats = scheduler.get_stats()
+        assert stats['daily_remaining'] == 42
+        assert stats['tokens_available'] <= 3.1
+
+    def test_max_concurrent_in_flight(self):
+        """Test: No máximo N requests simultâneos"""
+        scheduler = APIRequestScheduler(requests_per_minute=600, daily_limit=1000, max_concurrent=3)
+        in_flight = 0
+        peak = 0
+
+        async def fake_request():
+            nonlocal in_flight, peak
+            async with scheduler.slot() as allowed:
+                assert allowed
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def run():
+            await asyncio.gather(*(fake_request() for _ in range(12)))
+
+        asyncio.run(run())
+        assert peak == 3
+
+    def test_sync_with_quota_manager(self):
+        """Test: Quota diária alinhada com o APIQuotaManager"""
+        class FakeQuotaManager:
+            def get_available_requests(self):
+                return 10
+
+        scheduler = APIRequestScheduler(daily_limit=7500)
+        assert scheduler.sync_with_quota_manager(FakeQuotaManager()) == 10
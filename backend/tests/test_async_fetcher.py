@@ -0,0 +1,223 @@
+"""
+🧪 Testes Unitários - Fetcher assíncrono com pools e limites por domínio
+"""
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("requests_html")
+pytest.importorskip("selenium")
+pytest.importorskip("webdriver_manager")
+
+from football_scraper.browser_pool import BrowserPool
+from football_scraper.fetcher import AsyncHttpClient, MultiFetcher
+from football_scraper.retry_backoff import RetryBackoffManager
+
+PAGE = "<html><body><table><tr><th>Team</th></tr><tr><td>Flamengo</td></tr></table></body></html>"
+
+
+class StubSite:
+    """Servidor HTTP local: /slow dorme, /flaky falha na 1ª vez, /missing dá 404"""
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.hits = {}
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                host = self.headers['Host'].split(':')[0]
+                with site.lock:
+                    site.hits[self.path] = site.hits.get(self.path, 0) + 1
+                    hits = site.hits[self.path]
+                    site.in_flight[host] = site.in_flight.get(host, 0) + 1
+                    site.max_in_flight[host] = max(site.max_in_flight.get(host, 0), site.in_flight[host])
+                try:
+                    if self.path.startswith('/slow'):
+                        time.sleep(site.delay)
+                    status = 200
+                    if self.path.startswith('/missing') or (self.path.startswith('/flaky') and hits == 1):
+                        status = 404 if self.path.startswith('/missing') else 503
+                    body = PAGE.encode()
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with site.lock:
+                        site.in_flight[host] -= 1
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, host, path):
+        return f"http://{host}:{self.port}{path}"
+
+
+class NoDelayRetry(RetryBackoffManager):
+    def calculate_delay(self, attempt, status_code, exception=None):
+        return 0.0
+
+
+@pytest.fixture
+def site():
+    stub = StubSite()
+    yield stub
+    stub.server.shutdown()
+
+
+class FakeDriver:
+    """Dublê mínimo do WebDriver que registra a thread de cada página"""
+
+    def __init__(self, threads):
+        self.threads = threads
+        self.current_url = self.title = ''
+        self.page_source = PAGE
+
+    def get(self, url):
+        if url != 'about:blank':
+            self.threads.append(threading.get_ident())
+            self.current_url = url
+
+    def execute_script(self, script):
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def make_fetcher(per_domain_limit=2, pool=None):
+    http = AsyncHttpClient(per_domain_limit=per_domain_limit, use_proxies=False, retry=NoDelayRetry())
+    return MultiFetcher(concurrency=8, http=http, pool=pool)
+
+
+class TestAsyncFetcher:
+    """Testes para o backend HTTP assíncrono do MultiFetcher"""
+
+    def test_fetch_many_overlaps_within_domain_limits(self, site):
+        """Test: fetch_many sobrepõe requisições, respeitando o limite por domínio"""
+        fetcher = make_fetcher(per_domain_limit=2)
+        urls = [site.url(host, f"/slow/{i}") for host in ('127.0.0.1', 'localhost') for i in range(4)]
+
+        async def run():
+            try:
+                return await fetcher.fetch_many(urls, strategies=['scrapy'])
+            finally:
+                await fetcher.aclose()
+
+        start = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - start
+
+        assert [r.success for r in results] == [True] * 8
+        assert [r.metadata['url'] for r in results] == urls
+        assert results[0].data['tables'][0].iloc[0, 0] == "Flamengo"
+        assert site.max_in_flight == {'127.0.0.1': 2, 'localhost': 2}
+        # 8 pedidos de 0.3s, 2 domínios x 2 conexões -> ~0.6s (sequencial seria 2.4s)
+        assert elapsed < 1.6
+
+    def test_retry_manager_retries_server_errors(self, site):
+        """Test: 503 passa pelo retry_manager e a 2ª tentativa tem sucesso"""
+        fetcher = make_fetcher()
+
+        async def run():
+            try:
+                return await fetcher.fetch(site.url('127.0.0.1', '/flaky'), strategies=['scrapy'])
+            finally:
+                await fetcher.aclose()
+
+        result = asyncio.run(run())
+
+        assert result.success
+        assert site.hits['/flaky'] == 2
+        assert fetcher.http.retry.domain_stats[f"127.0.0.1:{site.port}"].failed_attempts == 1
+
+    def test_selenium_is_last_and_runs_in_thread(self, site):
+        """Test: Selenium só roda depois das estratégias HTTP, no pool de navegadores, fora do event loop"""
+        calls = []
+        fetcher = make_fetcher(pool=BrowserPool(size=1, driver_factory=lambda: FakeDriver(calls)))
+
+        async def run():
+            try:
+                return await fetcher.fetch(site.url('127.0.0.1', '/missing'), strategies=['selenium', 'scrapy'])
+            finally:
+                await fetcher.aclose()
+
+        result = asyncio.run(run())
+
+        assert result.strategy == 'selenium'
+        assert result.data['tables'][0].iloc[0, 0] == "Flamengo"
+        assert site.hits['/missing'] == 1
+        assert calls and calls[0] != threading.get_ident()
+
+    def test_fetch_with_fallback_reuses_pools(self, site):
+        """Test: Chamadas síncronas rodam no mesmo loop e reaproveitam o pool; close() fecha o pool"""
+        fetcher = make_fetcher()
+
+        first = fetcher.fetch_with_fallback(site.url('127.0.0.1', '/a'), strategy_preference=['scrapy'])
+        client, = fetcher.http._clients.values()
+        second = fetcher.fetch_with_fallback(site.url('127.0.0.1', '/b'), strategy_preference=['scrapy'])
+
+        assert first.success and second.success
+        assert list(fetcher.http._clients.values()) == [client]
+
+        fetcher.close()
+        assert client.is_closed
+        assert fetcher.http._clients == {}
+
+
+class TestAsyncHttpClient:
+    """Testes para o ciclo de vida dos pools do AsyncHttpClient"""
+
+    def test_loop_change_closes_previous_pools(self, site):
+        """Test: Ao trocar de event loop, os pools do loop anterior são fechados nele"""
+        http = AsyncHttpClient(use_proxies=False, retry=NoDelayRetry())
+        url = site.url('127.0.0.1', '/page')
+        old_loop = asyncio.new_event_loop()
+        threading.Thread(target=old_loop.run_forever, daemon=True).start()
+
+        asyncio.run_coroutine_threadsafe(http.get(url), old_loop).result()
+        old_client, = http._clients.values()
+
+        async def run():
+            try:
+                return await http.get(url)
+            finally:
+                await http.aclose()
+
+        response, _, _ = asyncio.run(run())
+        deadline = time.time() + 2
+        while not old_client.is_closed and time.time() < deadline:
+            time.sleep(0.01)
+        old_loop.call_soon_threadsafe(old_loop.stop)
+
+        assert response.status_code == 200
+        assert old_client.is_closed
+
+    def test_proxy_client_matches_installed_httpx(self):
+        """Test: Pool com proxy é criado com o nome de argumento da versão instalada do httpx"""
+        http = AsyncHttpClient(use_proxies=False)
+
+        client = http._client('example.com', 'http://127.0.0.1:3128')
+
+        assert http._client('example.com', 'http://127.0.0.1:3128') is client
+        asyncio.run(http.aclose())
+        assert client.is_closed
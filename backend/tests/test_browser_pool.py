@@ -0,0 +1,136 @@
+"""
+🧪 Testes Unitários - Pool de navegadores headless
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from football_scraper.browser_pool import BrowserPool
+
+
+class FakeDriver:
+    """Dublê do WebDriver: registra chamadas e simula tempo de carregamento"""
+
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def __init__(self, load_time=0.0):
+        self.load_time = load_time
+        self.alive = True
+        self.pages = []
+        self.resets = 0
+        self.quit_called = False
+        self.current_url = 'about:blank'
+        self.title = ''
+
+    def get(self, url):
+        if url == 'about:blank':
+            self.resets += 1
+            return
+        with FakeDriver.lock:
+            FakeDriver.active += 1
+            FakeDriver.max_active = max(FakeDriver.max_active, FakeDriver.active)
+        time.sleep(self.load_time)
+        with FakeDriver.lock:
+            FakeDriver.active -= 1
+        self.pages.append(url)
+        self.current_url, self.title = url, f"Page {len(self.pages)}"
+
+    @property
+    def page_source(self):
+        return f"<html><body>{self.current_url}</body></html>"
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers():
+    FakeDriver.active = FakeDriver.max_active = 0
+    return []
+
+
+def make_pool(drivers, load_time=0.0, **kwargs):
+    def factory():
+        driver = FakeDriver(load_time)
+        drivers.append(driver)
+        return driver
+    return BrowserPool(driver_factory=factory, **kwargs)
+
+
+class TestBrowserPool:
+    """Testes para renderização paralela, reciclagem e health check"""
+
+    def test_renders_in_parallel_up_to_pool_size(self, drivers):
+        """Test: 6 páginas num pool de 3 renderizam 3 por vez e registram espera na fila"""
+        pool = make_pool(drivers, load_time=0.2, size=3)
+        urls = [f"https://fbref.com/page/{i}" for i in range(6)]
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            pages = list(executor.map(lambda url: pool.render(url, wait_time=0), urls))
+        elapsed = time.time() - start
+
+        assert [page.current_url for page in pages] == urls
+        assert len(drivers) == 3
+        assert FakeDriver.max_active == 3
+        assert elapsed < 0.9
+
+        stats = pool.get_stats()
+        assert stats['renders'] == 6
+        assert stats['max_queue_wait'] >= 0.15
+        assert stats['avg_render_time'] >= 0.2
+        assert max(page.queue_wait for page in pages) >= 0.15
+
+    def test_reuses_pages_and_recycles_after_n(self, drivers):
+        """Test: Mesmo navegador é reutilizado com reset de storage e reciclado após N páginas"""
+        pool = make_pool(drivers, size=1, max_pages_per_browser=2)
+
+        for i in range(5):
+            pool.render(f"https://fbref.com/{i}", wait_time=0)
+
+        assert len(drivers) == 3
+        assert [len(d.pages) for d in drivers] == [2, 2, 1]
+        assert [d.resets for d in drivers] == [1, 1, 1]
+        assert [d.quit_called for d in drivers] == [True, True, False]
+        assert pool.get_stats()['browsers_recycled'] == 2
+
+    def test_unhealthy_browser_is_replaced(self, drivers):
+        """Test: Navegador que falha no health check é descartado e substituído"""
+        pool = make_pool(drivers, size=1)
+        pool.render("https://fbref.com/a", wait_time=0)
+        drivers[0].alive = False
+
+        page = pool.render("https://fbref.com/b", wait_time=0)
+
+        assert page.worker_id == 2
+        assert drivers[0].quit_called
+        assert pool.get_stats()['health_check_failures'] == 1
+        assert pool.get_stats()['live_browsers'] == 1
+
+    def test_acquire_times_out_when_pool_is_busy(self, drivers):
+        """Test: Sem navegador livre, acquire respeita o timeout"""
+        pool = make_pool(drivers, size=1)
+        worker = pool.acquire()
+
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+
+        pool.release(worker)
+        assert pool.acquire(timeout=0.05) is worker
@@ -0,0 +1,103 @@
+"""
+🧪 Testes Unitários - Busca podada de combinações (CombinationService)
+"""
+import asyncio
+import itertools
+import random
+from datetime import datetime
+
+import pytest
+
+from app.services.combination_service import BetSelection, CombinationService
+
+# size -> (min_confidence, min_probability, min_ev, top_k) dos filtros do serviço
+FILTERS = {2: (0.6, 0.25, 0.05, 20), 3: (0.65, 0.15, 0.03, 15), 4: (0.70, 0.08, 0.02, 10), 5: (0.70, 0.08, 0.02, 10)}
+
+
+def random_selections(n, seed, low=1.05, high=1.8):
+    """Várias seleções por jogo, valores arredondados para forçar empates de EV"""
+    rng = random.Random(seed)
+    return [
+        BetSelection(match_id=rng.randint(1, max(2, 2 * n // 3)), match_name=f"Jogo {i}", market=f"M{i}",
+                     selection="Yes", probability=round(rng.uniform(0.55, 0.97), 2),
+                     odds=round(rng.uniform(low, high), 2), confidence=round(rng.uniform(0.55, 0.95), 2),
+                     match_date=datetime(2024, 5, 1))
+        for i in range(n)
+    ]
+
+
+def exhaustive_top_k(selections, size, min_odds, max_odds):
+    """Loop anterior: todas as tuplas de itertools, sort estável pelo EV arredondado"""
+    min_confidence, min_probability, min_ev, top_k = FILTERS[size]
+    ranked = []
+    for combo in itertools.combinations(selections, size):
+        if len({sel.match_id for sel in combo}) != size:
+            continue
+        combined_odds, combined_probability = 1.0, 1.0
+        for sel in combo:
+            combined_odds *= sel.odds
+            combined_probability *= sel.probability
+        combined_confidence = sum(sel.confidence for sel in combo) / size
+        expected_value = combined_probability * combined_odds - 1
+        if (min_odds <= combined_odds <= max_odds and combined_confidence >= min_confidence
+                and combined_probability >= min_probability and expected_value > min_ev):
+            ranked.append(([sel.market for sel in combo], round(expected_value, 4)))
+    ranked.sort(key=lambda item: item[1], reverse=True)
+    return ranked[:top_k]
+
+
+def generate(selections, size, min_odds, max_odds):
+    service = CombinationService.__new__(CombinationService)
+    if size == 2:
+        combos = asyncio.run(service._generate_doubles(selections, min_odds, max_odds))
+    elif size == 3:
+        combos = asyncio.run(service._generate_trebles(selections, min_odds, max_odds))
+    else:
+        combos = asyncio.run(service._generate_multiples(selections, min_odds, max_odds, size))
+    return [([s["market"] for s in combo["selections"]], combo["expected_value"]) for combo in combos]
+
+
+class TestCombinationSearch:
+    """Testes para _search_combinations via _generate_doubles/_trebles/_multiples"""
+
+    @pytest.mark.parametrize("size", [2, 3, 4, 5])
+    @pytest.mark.parametrize("odds_range", [(1.5, 2.0), (1.5, 4.0), (1.2, 6.0)])
+    def test_matches_exhaustive_top_k(self, size, odds_range):
+        """Test: Mesmo top-k (ordem e empates incluídos) que o loop sobre todas as tuplas"""
+        for seed in range(8):
+            selections = random_selections(18, seed)
+            assert generate(selections, size, *odds_range) == exhaustive_top_k(selections, size, *odds_range)
+
+    def test_ties_keep_original_order(self):
+        """Test: EV empatado -> ordem de itertools.combinations sobre a lista de entrada"""
+        selections = [
+            BetSelection(match_id=i, match_name=f"Jogo {i}", market=f"M{i}", selection="Yes",
+                         probability=0.9, odds=1.3, confidence=0.8, match_date=datetime(2024, 5, 1))
+            for i in (5, 1, 4, 2, 3)
+        ]
+
+        doubles = generate(selections, 2, 1.5, 2.0)
+
+        assert [markets for markets, _ in doubles] == [list(c) for c in itertools.combinations(
+            ["M5", "M1", "M4", "M2", "M3"], 2)]
+        assert {ev for _, ev in doubles} == {0.3689}
+
+    def test_same_match_selections_never_combined(self):
+        """Test: Seleções do mesmo jogo não entram juntas (bitset por jogo)"""
+        selections = random_selections(30, seed=3, low=1.05, high=1.5)
+        by_market = {sel.market: sel.match_id for sel in selections}
+
+        for size in (2, 3, 4):
+            combos = generate(selections, size, 1.2, 3.0)
+            assert combos
+            assert all(len({by_market[m] for m in markets}) == size for markets, _ in combos)
+
+    def test_non_positive_odds_and_empty_range(self):
+        """Test: Odds zeradas (sem cotação) são ignoradas; faixa vazia não gera nada"""
+        selections = random_selections(12, seed=1)
+        for sel in selections[::3]:
+            sel.odds = 0
+
+        assert generate(selections, 2, 1.5, 2.0) == exhaustive_top_k(selections, 2, 1.5, 2.0)
+        assert generate(selections, 2, 2.0, 1.5) == []
+        assert generate(selections[:1], 2, 1.5, 2.0) == []
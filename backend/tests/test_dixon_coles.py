@@ -0,0 +1,211 @@
+"""
+🧪 Testes Unitários - Dixon-Coles e TeamStrengthService
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.ml.dixon_coles import DixonColesModel, dixon_coles_tau, time_decay_weights
+from app.ml.poisson_predictor import PoissonPredictor
+from app.models import Match, Team
+from app.services.team_strength_service import TeamStrengthService
+
+
+def _synthetic_season(n_teams=20, rounds=12, seed=7):
+    """Jogos sintéticos com forças conhecidas"""
+    rng = np.random.default_rng(seed)
+    attack = rng.normal(0, 0.3, n_teams)
+    defence = rng.normal(0, 0.25, n_teams)
+    attack -= attack.mean()
+    defence -= defence.mean()
+    base, home_adv = 0.1, 0.3
+
+    home_ids, away_ids, home_goals, away_goals, days_ago = [], [], [], [], []
+    for r in range(rounds):
+        for h in range(n_teams):
+            for a in range(n_teams):
+                if h == a or (h + a + r) % 3:
+                    continue
+                home_ids.append(h)
+                away_ids.append(a)
+                home_goals.append(rng.poisson(np.exp(base + home_adv + attack[h] + defence[a])))
+                away_goals.append(rng.poisson(np.exp(base + attack[a] + defence[h])))
+                days_ago.append(float(rounds - r) * 7)
+
+    return attack, defence, home_adv, dict(
+        home_team_ids=home_ids, away_team_ids=away_ids,
+        home_goals=home_goals, away_goals=away_goals,
+        league_ids=['L1'] * len(home_ids), days_ago=days_ago
+    )
+
+
+class TestDixonColesModel:
+    """Testes para o ajuste Dixon-Coles"""
+
+    def test_recovers_team_strengths(self):
+        """Test: Ajuste recupera ataque/defesa e mando de campo"""
+        attack, defence, home_adv, data = _synthetic_season()
+        model = DixonColesModel(half_life_days=10_000).fit(**data)
+
+        idx = [model.team_index[t] for t in range(len(attack))]
+        assert np.corrcoef(model.attack[idx], attack)[0, 1] > 0.9
+        assert np.corrcoef(model.defence[idx], defence)[0, 1] > 0.8
+        assert model.home_advantage[0] == pytest.approx(home_adv, abs=0.1)
+
+    def test_score_matrices_are_distributions(self):
+        """Test: Matrizes somam ~1 e tau só altera placares baixos"""
+        _, _, _, data = _synthetic_season()
+        model = DixonColesModel().fit(**data)
+        lh, la = model.predict_lambdas([0, 1, 99], [2, 3, 4], ['L1', 'L1', 'OTHER'])
+        matrices = model.score_matrices(lh, la)
+
+        assert matrices.shape == (3, 11, 11)
+        assert np.allclose(matrices.sum(axis=(1, 2)), 1.0, atol=1e-4)
+        assert dixon_coles_tau(2, 3, 1.2, 1.1, model.rho) == 1.0
+
+    def test_warm_refit_and_persistence(self):
+        """Test: Reajuste com warm start e round-trip to_dict/from_dict"""
+        _, _, _, data = _synthetic_season()
+        model = DixonColesModel().fit(**data)
+        before = model.attack.copy()
+
+        model.fit(**data)
+        restored = DixonColesModel.from_dict(model.to_dict())
+
+        assert np.allclose(model.attack, before, atol=1e-3)
+        assert np.array_equal(restored.attack, model.attack)
+        assert restored.predict_lambdas([0], [1], ['L1'])[0] == pytest.approx(
+            model.predict_lambdas([0], [1], ['L1'])[0])
+
+    def test_poisson_predictor_uses_fitted_strengths(self):
+        """Test: PoissonPredictor usa forças e mando ajustados em vez das constantes"""
+        _, _, _, data = _synthetic_season()
+        model = DixonColesModel().fit(**data)
+        predictor = PoissonPredictor()
+        averages = {'goals_scored_avg': 1.5, 'goals_conceded_avg': 1.5}
+
+        fitted = predictor.predict_match(averages, averages, strength_model=model,
+                                         home_team_id=0, away_team_id=1, league_id='L1')
+        lh, la = model.predict_lambdas([0], [1], ['L1'])
+        matrix = model.score_matrices(lh, la)[0]
+
+        assert fitted['expected_goals']['home'] == pytest.approx(lh[0])
+        assert fitted['expected_goals']['away'] == pytest.approx(la[0])
+        assert fitted['probabilities']['draw'] == pytest.approx(np.trace(matrix))
+        assert sum(fitted['probabilities'].values()) == pytest.approx(1.0, abs=1e-4)
+
+        # Sem modelo (ou sem ids) continua no Poisson independente
+        fallback = predictor.predict_match(averages, averages, strength_model=model)
+        assert fallback['expected_goals']['home'] == pytest.approx(1.5 * 1.5 / 2.7 * 1.3)
+
+    def test_time_decay_weights(self):
+        """Test: Peso cai pela metade a cada half-life"""
+        weights = time_decay_weights(np.array([0.0, 365.0, 730.0]), 365.0)
+        assert np.allclose(weights, [1.0, 0.5, 0.25])
+
+
+class TestTeamStrengthService:
+    """Testes para ajuste/cache via tabela matches"""
+
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    def _seed(self, db, data):
+        teams = {t: Team(id=t + 1, name=f"Team {t}") for t in
+                 set(data['home_team_ids']) | set(data['away_team_ids'])}
+        db.add_all(teams.values())
+        now = datetime.utcnow()
+        for i, (h, a, hg, ag, days) in enumerate(zip(
+                data['home_team_ids'], data['away_team_ids'],
+                data['home_goals'], data['away_goals'], data['days_ago'])):
+            db.add(Match(
+                external_id=f"m{i}", home_team_id=h + 1, away_team_id=a + 1,
+                home_score=int(hg), away_score=int(ag), league='L1',
+                match_date=now - timedelta(days=days), status='FT'
+            ))
+        db.commit()
+
+    def test_refit_only_when_new_results(self, db, tmp_path):
+        """Test: Ajusta, persiste e só reajusta com resultados novos"""
+        _, _, _, data = _synthetic_season(rounds=6)
+        self._seed(db, data)
+        service = TeamStrengthService(params_path=str(tmp_path / "dc.joblib"))
+
+        first = service.refit_if_stale(db)
+        assert first['fitted'] is True
+        assert service.refit_if_stale(db) is None
+
+        # Outro processo enxerga os parâmetros persistidos
+        other = TeamStrengthService(params_path=str(tmp_path / "dc.joblib"))
+        assert other.get_model() is not None
+        assert other.refit_if_stale(db) is None
+
+        db.add(Match(external_id="new", home_team_id=1, away_team_id=2, home_score=3,
+                     away_score=0, league='L1', match_date=datetime.utcnow(), status='FT'))
+        db.commit()
+        assert service.refit_if_stale(db)['n_matches'] == first['n_matches'] + 1
+
+    def test_analyze_matches_uses_fitted_model(self, db, tmp_path):
+        """Test: Análise de mercados a partir do modelo ajustado"""
+        _, _, _, data = _synthetic_season(rounds=6)
+        self._seed(db, data)
+        service = TeamStrengthService(params_path=str(tmp_path / "dc.joblib"))
+
+        fixture = Match(home_team_id=1, away_team_id=2, league='L1')
+        assert service.analyze_matches([fixture]) is None
+
+        service.fit(db)
+        analysis = service.analyze_matches([fixture])[0]
+
+        assert sum(analysis.probabilities[m] for m in ('HOME_WIN', 'DRAW', 'AWAY_WIN')) == pytest.approx(1.0, abs=1e-3)
+        assert analysis.home_lambda > 0
+
+    def test_refit_publishes_new_snapshot(self, db, tmp_path):
+        """Test: Reajuste não altera o modelo que uma predição em andamento já leu"""
+        _, _, _, data = _synthetic_season(rounds=6)
+        self._seed(db, data)
+        service = TeamStrengthService(params_path=str(tmp_path / "dc.joblib"))
+        service.fit(db)
+
+        in_flight = service.get_model()
+        attack_before = in_flight.attack.copy()
+
+        db.add(Match(external_id="new", home_team_id=1, away_team_id=2, home_score=5,
+                     away_score=0, league='L1', match_date=datetime.utcnow(), status='FT'))
+        db.commit()
+        service.fit(db)
+
+        assert service.get_model() is not in_flight
+        np.testing.assert_array_equal(in_flight.attack, attack_before)
+        assert service.get_status()['n_matches'] == in_flight.n_matches + 1
+
+    def test_markets_endpoint_uses_fitted_model(self, db, tmp_path, monkeypatch):
+        """Test: /analysis/poisson e /value-bets usam o modelo ajustado, com fallback sem ele"""
+        from app.api.api_v1.endpoints import markets
+        from app.services import team_strength_service as strength_module
+
+        _, _, _, data = _synthetic_season(rounds=6)
+        self._seed(db, data)
+        service = TeamStrengthService(params_path=str(tmp_path / "dc.joblib"))
+        monkeypatch.setattr(strength_module, 'team_strength_service', service)
+        fixture = Match(home_team_id=1, away_team_id=2, league='L1')
+
+        _, source = markets._analyze_match_poisson(db, fixture)
+        assert source == 'team_statistics'
+
+        service.fit(db)
+        prediction, source = markets._analyze_match_poisson(db, fixture)
+        lh, la = service.get_model().predict_lambdas([1], [2], ['L1'])
+
+        assert source == 'dixon_coles'
+        assert prediction.home_lambda == pytest.approx(lh[0])
+        assert prediction.away_lambda == pytest.approx(la[0])
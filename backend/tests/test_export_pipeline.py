@@ -0,0 +1,124 @@
+"""
+🧪 Testes Unitários - ExportPipeline em streaming e deduplicação entre execuções
+"""
+import csv
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("itemadapter")
+pytest.importorskip("scrapy")
+
+from scrapy.exceptions import DropItem
+
+from football_scraper.pipelines import (
+    DeduplicationPipeline, EXPORT_SCHEMA, ExportPipeline, MetadataPipeline
+)
+
+SPIDER = SimpleNamespace(name="test_spider")
+
+
+def make_items(n, offset=0):
+    return [
+        {
+            'source_url': f"https://fbref.com/match/{i}", 'scraped_at': "2025-10-01T12:00:00",
+            'home_team': f"Team {i}", 'away_team': f"Team {i + 1}", 'match_date': "2025-10-01",
+            'home_score': str(i % 4), 'status_code': 200, 'metadata': {'page': i}, 'custom_field': i
+        }
+        for i in range(offset, offset + n)
+    ]
+
+
+def run_crawl(output_dir, items, batch_size=100):
+    """Metadata -> Deduplication -> Export, como no ITEM_PIPELINES"""
+    metadata = MetadataPipeline()
+    dedup = DeduplicationPipeline(store_path=str(output_dir / "seen_items.sqlite"))
+    export = ExportPipeline(output_dir=str(output_dir), batch_size=batch_size)
+    for pipeline in (metadata, dedup, export):
+        pipeline.open_spider(SPIDER)
+
+    dropped, max_buffer = 0, 0
+    for item in items:
+        item = metadata.process_item(item, SPIDER)
+        try:
+            item = dedup.process_item(item, SPIDER)
+        except DropItem:
+            dropped += 1
+            continue
+        export.process_item(item, SPIDER)
+        max_buffer = max(max_buffer, len(export.parquet_buffer))
+
+    dedup.close_spider(SPIDER)
+    export.close_spider(SPIDER)
+    return export, dropped, max_buffer
+
+
+class TestExportPipeline:
+    """Testes para a exportação em streaming"""
+
+    def test_streams_row_groups_with_stable_schema(self, tmp_path):
+        """Test: Parquet em row groups de N itens, CSV e JSONL completos, buffer limitado"""
+        export, dropped, max_buffer = run_crawl(tmp_path, make_items(250), batch_size=100)
+
+        base = tmp_path / f"data_{SPIDER.name}_{export.current_timestamp}"
+        parquet = pq.ParquetFile(f"{base}.parquet")
+
+        assert dropped == 0
+        assert max_buffer < 100
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.metadata.num_rows == 250
+        assert parquet.schema_arrow.equals(EXPORT_SCHEMA)
+
+        table = parquet.read()
+        assert table.column('home_score').to_pylist()[:4] == [0.0, 1.0, 2.0, 3.0]
+        assert json.loads(table.column('extra')[0].as_py()) == {'custom_field': 0}
+
+        with open(f"{base}.csv", encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 250
+        assert list(rows[0]) == EXPORT_SCHEMA.names
+
+        with open(f"{base}.jsonl", encoding='utf-8') as f:
+            assert sum(1 for _ in f) == 250
+
+    def test_duplicates_dropped_across_runs(self, tmp_path):
+        """Test: Hashes persistidos em disco descartam itens já exportados em execuções anteriores"""
+        run_crawl(tmp_path, make_items(120))
+        _, dropped, _ = run_crawl(tmp_path, make_items(120) + make_items(30, offset=120))
+
+        unified = pq.ParquetFile(tmp_path / "data.parquet")
+        assert dropped == 120
+        assert unified.metadata.num_rows == 150
+        assert len(set(unified.read().column('item_hash').to_pylist())) == 150
+
+    def test_table_items_from_same_page_are_distinct(self):
+        """Test: Tabelas diferentes da mesma URL geram hashes diferentes"""
+        metadata = MetadataPipeline()
+        first = metadata.process_item({'source_url': "https://fbref.com/x", 'table_name': "t0", 'data': "a"}, SPIDER)
+        second = metadata.process_item({'source_url': "https://fbref.com/x", 'table_name': "t1", 'data': "a"}, SPIDER)
+
+        assert first['item_hash'] != second['item_hash']
+
+    def test_rescrape_with_final_score_or_new_odds_passes(self, tmp_path):
+        """Test: Mesmo jogo raspado antes e depois do apito final (e com odds novas) não é descartado"""
+        fixture = {
+            'source_url': "https://oddspedia.com/match/1", 'scraped_at': "2025-10-01T12:00:00",
+            'home_team': "Team A", 'away_team': "Team B", 'match_date': "2025-10-01",
+            'status': "NS", 'home_odds': 2.1, 'draw_odds': 3.3, 'away_odds': 3.6
+        }
+        pre_match = dict(fixture)
+        odds_moved = {**fixture, 'home_odds': 1.95}
+        full_time = {**fixture, 'status': "FT", 'home_score': "2", 'away_score': "1"}
+
+        _, dropped, _ = run_crawl(tmp_path, [pre_match, odds_moved, full_time])
+        assert dropped == 0
+
+        # Reprocessar o placar final (já normalizado para número) continua sendo duplicata
+        _, dropped, _ = run_crawl(tmp_path, [{**full_time, 'home_score': 2, 'away_score': 1.0}])
+        assert dropped == 1
+
+        rows = pq.ParquetFile(tmp_path / "data.parquet").read().to_pylist()
+        assert [row['home_score'] for row in rows] == [None, None, 2.0]
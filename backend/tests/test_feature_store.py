@@ -0,0 +1,207 @@
+"""
+🧪 Testes Unitários - Feature store Parquet particionado
+"""
+import asyncio
+import hashlib
+import itertools
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.core.feature_store import (
+    FeatureStore, MATCHES_DATASET, MATCH_STATISTICS_DATASET, sync_finished_matches
+)
+from app.models.match import Match
+from app.models.statistics import MatchStatistics
+from app.models.team import Team
+from app.services.ml_trainer_real_data import MLTrainerRealData
+from ingest import MLDataIngestor
+
+
+def rows(ids, competition='brasileirao', season='2024', **columns):
+    return pd.DataFrame({'id': ids, 'competition': competition, 'season': season,
+                         'value': [float(i) for i in ids], **columns})
+
+
+def raw_matches(n_rounds):
+    """Jogos no formato do scraper: 4 times, turno e returno por rodada"""
+    pairs = list(itertools.permutations('ABCD', 2))
+    records = []
+    for i, (home, away) in enumerate(pairs * n_rounds):
+        records.append({
+            'home_team': home, 'away_team': away, 'score': f"{i % 3}-{i % 2}",
+            'match_date': (datetime(2024, 1, 1) + timedelta(days=7 * i)).strftime('%Y-%m-%d'),
+            'competition': 'brasileirao', 'season': '2024' if i < 12 else '2025',
+            'scraped_at': '2024-06-01'
+        })
+    return records
+
+
+class TestFeatureStore:
+    """Testes para FeatureStore"""
+
+    def test_append_skips_keys_already_stored(self, tmp_path):
+        """Test: Reingestão grava só as chaves novas"""
+        store = FeatureStore(tmp_path)
+
+        first = store.append('features', rows([1, 2, 3]))
+        second = store.append('features', rows([2, 3, 4, 4]))
+
+        assert first['rows_written'] == 3
+        assert (second['rows_written'], second['rows_skipped']) == (1, 3)
+        assert sorted(store.read('features')['id']) == [1, 2, 3, 4]
+
+    def test_read_prunes_partitions_and_columns(self, tmp_path):
+        """Test: Filtros de partição nem abrem os arquivos de outras partições"""
+        store = FeatureStore(tmp_path)
+        store.append('features', rows([1, 2], season=2023))
+        store.append('features', rows([3, 4], season='2024', extra=['a', 'b']))
+        store.append('features', rows([5], competition='premier league', season='2024'))
+
+        # Arquivo de outra partição removido: a leitura podada não percebe
+        for file in store.manifest()['datasets']['features']['files']:
+            if file['partition']['season'] == '2023':
+                (tmp_path / 'features' / file['path']).unlink()
+
+        df = store.read('features', columns=['id', 'extra'], competitions=['brasileirao'], seasons=['2024'])
+        assert df.columns.tolist() == ['id', 'extra']
+        assert df['id'].tolist() == [3, 4]
+
+        filtered = store.read('features', columns=['id'], seasons=[2024], filters=[('value', '>', 3.5)])
+        assert sorted(filtered['id']) == [4, 5]
+
+    def test_schema_evolves_across_appends(self, tmp_path):
+        """Test: Coluna nova e int -> float entre execuções são unificadas na leitura"""
+        store = FeatureStore(tmp_path)
+        store.append('features', pd.DataFrame({'id': [1], 'goals': [2]}))
+        store.append('features', pd.DataFrame({'id': [2], 'goals': [1.5], 'xg': [0.7]}))
+
+        df = store.read('features').sort_values('id')
+
+        assert df['goals'].tolist() == [2.0, 1.5]
+        assert df['xg'].isna().tolist() == [True, False]
+        assert df['competition'].tolist() == ['unknown', 'unknown']
+
+    def test_manifest_hashes_match_files(self, tmp_path):
+        """Test: Hash do manifest = sha256 do arquivo; verify detecta alteração"""
+        store = FeatureStore(tmp_path)
+        store.append('features', rows([1, 2]))
+
+        file = store.manifest()['datasets']['features']['files'][0]
+        path = tmp_path / 'features' / file['path']
+        assert hashlib.sha256(path.read_bytes()).hexdigest() == file['sha256']
+        assert path.parent.name == 'season=2024' and path.parent.parent.name == 'competition=brasileirao'
+        assert store.verify()['ok']
+
+        path.write_bytes(path.read_bytes() + b'x')
+        report = store.verify()
+        assert not report['ok']
+        assert report['corrupted'] == [f"features/{file['path']}"]
+
+
+class TestIngestFeatureStore:
+    """Testes para ingest.py gravando no feature store"""
+
+    def test_rerun_appends_only_new_matches(self, tmp_path):
+        """Test: Segunda execução com mais jogos acrescenta só os novos"""
+        raw_dir, out_dir = tmp_path / 'raw', tmp_path / 'ml_ready'
+        raw_dir.mkdir()
+        matches = raw_matches(n_rounds=2)
+
+        (raw_dir / 'data.jsonl').write_text('\n'.join(json.dumps(m) for m in matches[:16]))
+        first = MLDataIngestor().ingest_and_prepare(str(raw_dir), str(out_dir))
+
+        (raw_dir / 'data.jsonl').write_text('\n'.join(json.dumps(m) for m in matches))
+        second = MLDataIngestor().ingest_and_prepare(str(raw_dir), str(out_dir))
+
+        assert first['rows_appended'] == {'features': 32, 'labels': 32}
+        assert second['rows_appended'] == {'features': 16, 'labels': 16}
+        assert not (out_dir / 'features.parquet').exists()
+
+        store = FeatureStore(out_dir)
+        assert store.partitions('features') == [
+            {'competition': 'brasileirao', 'season': '2024'},
+            {'competition': 'brasileirao', 'season': '2025'},
+        ]
+        assert len(store.read('labels', columns=['id'], seasons=['2025'])) == 24
+        assert second['file_hashes']['features'] == store.dataset_hash('features')
+
+    def test_team_codes_stable_across_runs(self, tmp_path):
+        """Test: Time novo na 2ª execução não muda o código dos times já gravados"""
+        raw_dir, out_dir = tmp_path / 'raw', tmp_path / 'ml_ready'
+        raw_dir.mkdir()
+        matches = raw_matches(n_rounds=1)
+        # 'AB' fica entre 'A' e 'B' na ordem alfabética: um encoder reajustado deslocaria B, C e D
+        newcomer = [dict(m, home_team='AB', match_date=f"2025-0{i + 1}-01") for i, m in enumerate(matches[:3])]
+
+        (raw_dir / 'data.jsonl').write_text('\n'.join(json.dumps(m) for m in matches))
+        MLDataIngestor().ingest_and_prepare(str(raw_dir), str(out_dir))
+
+        (raw_dir / 'data.jsonl').write_text('\n'.join(json.dumps(m) for m in matches + newcomer))
+        second = MLDataIngestor().ingest_and_prepare(str(raw_dir), str(out_dir))
+
+        features = FeatureStore(out_dir).read('features', columns=['home_team', 'home_team_encoded'])
+        codes = features.groupby('home_team')['home_team_encoded'].unique()
+
+        assert second['rows_appended']['features'] > 0
+        assert codes.map(len).max() == 1
+        assert codes.map(lambda c: c[0]).to_dict() == {'A': 0, 'B': 1, 'C': 2, 'D': 3, 'AB': 4}
+
+
+@pytest.fixture
+def finished_matches(sqlite_file_db):
+    """Banco com 2 jogos finalizados (1 com estatísticas) e 1 agendado"""
+    db = sqlite_file_db.session_factory()
+    flamengo = Team(name="Flamengo", country="Brazil")
+    palmeiras = Team(name="Palmeiras", country="Brazil")
+    arsenal = Team(name="Arsenal", country="England")
+    db.add_all([flamengo, palmeiras, arsenal])
+    db.flush()
+
+    db.add_all([
+        Match(id=1, home_team_id=flamengo.id, away_team_id=palmeiras.id, league="Brasileirão", season="2024",
+              match_date=datetime(2024, 5, 1), status="FINISHED", home_score=2, away_score=1),
+        Match(id=2, home_team_id=arsenal.id, away_team_id=flamengo.id, league="Premier League", season="2024",
+              match_date=datetime(2024, 5, 2), status="FINISHED", home_score=0, away_score=0),
+        Match(id=3, home_team_id=palmeiras.id, away_team_id=arsenal.id, league="Brasileirão", season="2024",
+              match_date=datetime(2024, 5, 3), status="SCHEDULED"),
+        MatchStatistics(match_id=1, possession_home=55.0, possession_away=45.0, shots_home=12),
+    ])
+    db.commit()
+    yield db
+    db.close()
+
+
+class TestSyncFinishedMatches:
+    """Testes para sync_finished_matches"""
+
+    def test_sync_is_incremental(self, tmp_path, finished_matches):
+        """Test: Só jogos finalizados entram, uma vez; estatísticas tardias entram depois"""
+        store = FeatureStore(tmp_path)
+
+        assert sync_finished_matches(store, finished_matches) == {MATCHES_DATASET: 2, MATCH_STATISTICS_DATASET: 1}
+        assert sync_finished_matches(store, finished_matches) == {MATCHES_DATASET: 0, MATCH_STATISTICS_DATASET: 0}
+
+        finished_matches.add(MatchStatistics(match_id=2, possession_home=60.0))
+        finished_matches.commit()
+        assert sync_finished_matches(store, finished_matches) == {MATCHES_DATASET: 0, MATCH_STATISTICS_DATASET: 1}
+
+        matches = store.read(MATCHES_DATASET, columns=['match_id', 'home_team', 'away_score'],
+                             competitions=['Brasileirão'])
+        assert matches.to_dict('records') == [{'match_id': 1, 'home_team': 'Flamengo', 'away_score': 1}]
+        assert store.read(MATCH_STATISTICS_DATASET, columns=['possession_home'])['possession_home'].sum() == 115.0
+
+    def test_real_data_trainer_reads_league_partition(self, tmp_path, finished_matches, monkeypatch):
+        """Test: MLTrainerRealData carrega só a partição da liga filtrada"""
+        monkeypatch.setattr(settings, 'FEATURE_STORE_PATH', str(tmp_path / 'store'))
+        monkeypatch.chdir(tmp_path)
+
+        data = asyncio.run(MLTrainerRealData(league_filter=["Premier League"])._load_training_data_from_db())
+
+        assert data[['home_team', 'away_team', 'league', 'result', 'total_goals']].to_dict('records') == [
+            {'home_team': 'Arsenal', 'away_team': 'Flamengo', 'league': 'Premier League',
+             'result': 'draw', 'total_goals': 0}
+        ]
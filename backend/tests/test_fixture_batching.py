@@ -0,0 +1,50 @@
+"""
+🧪 Testes Unitários - Busca de fixtures em lote (ids=)
+"""
+import asyncio
+
+from app.services.api_football_service import APIFootballService, chunk_fixture_ids
+
+
+class TestFixtureBatching:
+    """Testes para get_fixtures_by_ids e chunk_fixture_ids"""
+
+    def test_chunk_fixture_ids_dedup_and_size(self):
+        """Test: IDs duplicados removidos e lotes de no máximo 20"""
+        ids = list(range(1, 46)) + [1, 2, '3']
+        batches = chunk_fixture_ids(ids)
+
+        assert [len(b) for b in batches] == [20, 20, 5]
+        assert sum(batches, []) == list(range(1, 46))
+
+    def test_get_fixtures_by_ids_packs_requests(self):
+        """Test: 45 fixtures custam 3 requests e voltam indexados por id"""
+        service = APIFootballService()
+        calls = []
+
+        async def fake_request(endpoint, params=None):
+            calls.append((endpoint, params))
+            ids = [int(i) for i in params['ids'].split('-')]
+            return {'response': [
+                {'fixture': {'id': fid, 'status': {'short': 'FT'}}, 'goals': {'home': 1, 'away': 0}}
+                for fid in ids if fid != 7  # fixture 7 não existe na API
+            ]}
+
+        service._make_request = fake_request
+        fixtures = asyncio.run(service.get_fixtures_by_ids(list(range(1, 46))))
+
+        assert len(calls) == 3
+        assert all(endpoint == 'fixtures' for endpoint, _ in calls)
+        assert len(fixtures) == 44
+        assert 7 not in fixtures
+        assert fixtures[45]['goals']['home'] == 1
+
+    def test_get_fixtures_by_ids_empty(self):
+        """Test: Lista vazia não faz requests"""
+        service = APIFootballService()
+
+        async def fail_request(endpoint, params=None):
+            raise AssertionError("não deveria chamar a API")
+
+        service._make_request = fail_request
+        assert asyncio.run(service.get_fixtures_by_ids([])) == {}
@@ -0,0 +1,74 @@
+"""
+🧪 Testes Unitários - Head-to-head indexado (preprocess.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocess import FootballFeatureEngineer
+
+
+def legacy_h2h_features(engineer, df):
+    """Implementação original (filtro booleano por linha) usada como referência"""
+    h2h_features = []
+    for idx, row in df.iterrows():
+        team, opponent = row['team'], row['opponent']
+        if pd.isna(opponent) or opponent == 'unknown':
+            h2h_features.append({})
+            continue
+        h2h_matches = df[
+            ((df['team'] == team) & (df['opponent'] == opponent)) |
+            ((df['team'] == opponent) & (df['opponent'] == team))
+        ]
+        if 'match_date' in df.columns and pd.notna(row['match_date']):
+            h2h_matches = h2h_matches[h2h_matches['match_date'] < row['match_date']]
+        h2h_matches = h2h_matches.tail(engineer.config['head_to_head_limit'])
+        h2h_features.append(engineer._calculate_h2h_statistics(h2h_matches, team, opponent))
+    return pd.concat([df, pd.DataFrame(h2h_features)], axis=1)
+
+
+def synthetic_rows(n_rows=800, n_teams=8, seed=11, sort=True):
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i}" for i in range(n_teams)]
+    df = pd.DataFrame({
+        'team': rng.choice(teams, n_rows),
+        'opponent': rng.choice(teams + ['unknown'], n_rows),
+        'result': rng.choice(['W', 'D', 'L', None], n_rows, p=[0.4, 0.25, 0.3, 0.05]),
+        'goals_for': rng.integers(0, 5, n_rows).astype(float),
+        'goals_against': rng.integers(0, 5, n_rows).astype(float),
+        'match_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 200, n_rows), unit='D'),
+    })
+    df.loc[rng.choice(n_rows, 20), 'goals_for'] = np.nan
+    return df.sort_values(['match_date', 'team']) if sort else df
+
+
+class TestIndexedHeadToHead:
+    """Testes para o índice de confrontos diretos"""
+
+    @pytest.fixture
+    def engineer(self):
+        return FootballFeatureEngineer()
+
+    def test_identical_to_row_filter(self, engineer):
+        """Test: Mesmas colunas, dtypes e valores que o filtro por linha"""
+        df = synthetic_rows()
+        result = engineer._engineer_head_to_head_features(df.copy())
+
+        pd.testing.assert_frame_equal(result, legacy_h2h_features(engineer, df.copy()))
+
+    def test_unsorted_dates_and_missing_values(self, engineer):
+        """Test: Datas fora de ordem e NaT/NaN caem no caminho por linha"""
+        df = synthetic_rows(n_rows=300, sort=False).reset_index(drop=True)
+        df.loc[[3, 50], 'match_date'] = pd.NaT
+        df.loc[[7], 'opponent'] = np.nan
+        result = engineer._engineer_head_to_head_features(df.copy())
+
+        pd.testing.assert_frame_equal(result, legacy_h2h_features(engineer, df.copy()))
+
+    def test_without_dates_or_results(self, engineer):
+        """Test: Sem match_date/result usa o par inteiro"""
+        df = synthetic_rows(n_rows=200)[['team', 'opponent', 'goals_for']]
+        result = engineer._engineer_head_to_head_features(df.copy())
+
+        pd.testing.assert_frame_equal(result, legacy_h2h_features(engineer, df.copy()))
+        assert 'h2h_wins' not in result.columns
@@ -0,0 +1,273 @@
+"""
+🧪 Testes Unitários - Job runner (eleição de líder, sobreposição, histórico)
+"""
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from app.core import job_runner as runner_module
+from app.core import redis as redis_module
+from app.core.job_metrics import count_api_calls, count_items
+from app.core.job_runner import JobRunner, JobSpec, get_job_metrics, prune_job_runs
+from app.models import JobRun
+from app.services import job_registry
+
+
+class FakeRedis:
+    """Subconjunto do Redis usado pelo runner (SET NX + scripts de renovar/soltar)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def _alive(self, key):
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def get(self, key):
+        return self._alive(key)
+
+    async def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and self._alive(key) is not None:
+            return None
+        ttl = px / 1000 if px else ex
+        self.data[key] = (value, time.monotonic() + ttl if ttl else None)
+        return True
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self._alive(key) != token:
+            return 0
+        if script == runner_module._RENEW_SCRIPT:
+            self.data[key] = (token, time.monotonic() + int(args[0]) / 1000)
+        else:
+            del self.data[key]
+        return 1
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(redis_module, "redis_client", client)
+    return client
+
+
+def _runner(*specs, persist=False):
+    runner = JobRunner(name='test', leader_ttl=30, persist_history=persist)
+    for spec in specs:
+        runner.register(spec)
+    return runner
+
+
+class TestLeaderElection:
+    """Testes para a eleição de líder entre workers"""
+
+    def test_only_leader_executes(self, fake_redis):
+        """Test: Dois workers com os mesmos jobs -> o job roda uma vez"""
+        calls = []
+        spec = JobSpec('job', lambda: calls.append(1), 'interval', {'minutes': 1})
+        first, second = _runner(spec), _runner(spec)
+
+        async def run():
+            await first.election.refresh()
+            await second.election.refresh()
+            return await first.run_job('job'), await second.run_job('job')
+
+        ran, standby = asyncio.run(run())
+
+        assert first.is_leader and not second.is_leader
+        assert ran['status'] == 'success'
+        assert standby['status'] == 'standby'
+        assert calls == [1]
+
+    def test_leadership_moves_when_released(self, fake_redis):
+        """Test: Ao parar o líder, outro worker assume na próxima renovação"""
+        first, second = _runner(), _runner()
+
+        async def run():
+            await first.election.refresh()
+            await first.election.refresh()  # renovação mantém o líder
+            assert first.is_leader
+            await first.election.release()
+            return await second.election.refresh()
+
+        assert asyncio.run(run()) is True
+        assert not first.is_leader
+
+    def test_without_redis_process_is_leader(self, monkeypatch):
+        """Test: DEV_MODE_NO_REDIS -> processo único sempre líder"""
+        monkeypatch.setattr(redis_module, "redis_client", redis_module.NoOpRedisClient())
+        runner = _runner(JobSpec('job', lambda: {'n': 1}, 'interval', {'minutes': 1}, items_key='n'))
+
+        async def run():
+            await runner.election.refresh()
+            return await runner.run_job('job')
+
+        assert asyncio.run(run())['items_processed'] == 1
+
+
+    def test_pause_from_other_worker_stops_leader(self, fake_redis):
+        """Test: /sync/scheduler/stop num worker em standby pausa o job no líder"""
+        calls = []
+        spec = JobSpec('job', lambda: calls.append(1), 'interval', {'minutes': 1})
+        leader, other = _runner(spec), _runner(spec)
+
+        async def run():
+            await leader.election.refresh()
+            await other.election.refresh()
+            await other.pause_jobs(['job'])
+            paused = await leader.run_job('job')
+            forced = await leader.run_job('job', force=True)
+            await other.resume_jobs(['job'])
+            return paused, forced, await leader.run_job('job')
+
+        paused, forced, resumed = asyncio.run(run())
+
+        assert leader.is_leader and not other.is_leader
+        assert paused['status'] == 'paused'
+        assert forced['status'] == resumed['status'] == 'success'
+        assert calls == [1, 1]
+
+
+class TestOverlapControl:
+    """Testes para o controle de sobreposição por job"""
+
+    def test_slow_job_is_not_run_twice(self, fake_redis):
+        """Test: Disparo com a execução anterior em andamento é pulado"""
+        started = []
+
+        async def slow():
+            started.append(1)
+            await asyncio.sleep(0.05)
+
+        runner = _runner(JobSpec('slow', slow, 'interval', {'minutes': 2}))
+
+        async def run():
+            await runner.election.refresh()
+            return await asyncio.gather(runner.run_job('slow'), runner.run_job('slow'))
+
+        results = asyncio.run(run())
+
+        assert started == [1]
+        assert Counter(r['status'] for r in results) == {'success': 1, 'skipped': 1}
+        assert [r['error'] for r in results if r['status'] == 'skipped'] == ['overlap']
+
+    def test_job_lock_is_shared_between_workers(self, fake_redis):
+        """Test: Job em execução em outro worker (troca de líder) é pulado"""
+        started = []
+
+        async def slow():
+            started.append(1)
+            await asyncio.sleep(0.05)
+
+        spec = JobSpec('slow', slow, 'interval', {'minutes': 2})
+        first, second = _runner(spec), _runner(spec)
+
+        async def run():
+            return await asyncio.gather(first.run_job('slow', force=True), second.run_job('slow', force=True))
+
+        results = asyncio.run(run())
+
+        assert started == [1]
+        assert sorted(r['status'] for r in results) == ['skipped', 'success']
+        assert not fake_redis.data  # lock liberado ao terminar
+
+    def test_max_concurrency_allows_parallel_runs(self, fake_redis):
+        """Test: max_concurrency=2 -> duas execuções simultâneas, a terceira é pulada"""
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        runner = _runner(JobSpec('slow', slow, 'interval', {'minutes': 2}, max_concurrency=2))
+
+        async def run():
+            await runner.election.refresh()
+            return await asyncio.gather(*(runner.run_job('slow') for _ in range(3)))
+
+        statuses = Counter(r['status'] for r in asyncio.run(run()))
+        assert statuses == {'success': 2, 'skipped': 1}
+
+
+class TestRunHistory:
+    """Testes para métricas e histórico persistido"""
+
+    def test_sync_job_metrics_are_persisted(self, fake_redis, sqlite_file_db):
+        """Test: Itens (retorno + count_items) e chamadas de API contadas na thread do job"""
+        def sync_job():
+            count_api_calls(3)
+            count_items(2)
+            return {'imported': 4, 'updated': 1}
+
+        def failing_job():
+            raise RuntimeError("API fora do ar")
+
+        runner = _runner(
+            JobSpec('sync_job', sync_job, 'interval', {'minutes': 5}, items_key=('imported', 'updated')),
+            JobSpec('failing', failing_job, 'interval', {'minutes': 5}),
+            persist=True
+        )
+
+        async def run():
+            await runner.election.refresh()
+            await runner.run_job('sync_job')
+            await runner.run_job('sync_job')
+            return await runner.run_job('failing')
+
+        failed = asyncio.run(run())
+        assert failed['status'] == 'error' and 'API fora do ar' in failed['error']
+
+        with sqlite_file_db.session_factory() as db:
+            runs = db.query(JobRun).filter(JobRun.job_id == 'sync_job').all()
+            assert [(r.status, r.items_processed, r.api_calls) for r in runs] == [('success', 7, 3)] * 2
+            assert all(r.worker == runner.election.token and r.runner == 'test' for r in runs)
+
+            metrics = {m['job_id']: m for m in get_job_metrics(db, hours=1)}
+            assert metrics['sync_job']['runs'] == 2
+            assert metrics['sync_job']['items_processed'] == 14
+            assert metrics['sync_job']['api_calls'] == 6
+            assert metrics['failing']['errors'] == 1
+
+            assert prune_job_runs(db, days=1) == 0
+            assert db.query(JobRun).count() == 3
+
+    def test_status_reports_last_run(self, fake_redis):
+        """Test: get_status lista os jobs registrados com a última execução"""
+        runner = _runner(JobSpec('job', lambda: None, 'interval', {'minutes': 1}, group='pipeline'))
+
+        async def run():
+            await runner.election.refresh()
+            await runner.run_job('job')
+
+        asyncio.run(run())
+        status = runner.get_status()
+
+        assert status['is_leader'] is True
+        assert status['jobs'][0]['group'] == 'pipeline'
+        assert status['jobs'][0]['last_run']['status'] == 'success'
+
+
+class TestJobRegistry:
+    """Testes para o registro central dos jobs"""
+
+    def test_job_ids_are_unique(self):
+        """Test: Nenhum id repetido entre os schedulers migrados"""
+        ids = [spec.id for spec in job_registry.JOBS]
+        assert len(ids) == len(set(ids))
+
+    def test_default_groups_are_registered(self):
+        """Test: Grupos de settings.JOB_RUNNER_GROUPS registrados; os demais ficam de fora"""
+        runner = _runner()
+        job_registry.register_jobs(runner)
+
+        groups = {spec.group for spec in runner.jobs.values()}
+        assert groups == set(job_registry.enabled_groups())
+        assert {'update_live', 'full_sync_daily', 'ticket_analyzer', 'automated_retraining'} <= set(runner.jobs)
+        assert 'green_red_analyzer' not in runner.jobs
@@ -0,0 +1,111 @@
+"""
+🧪 Testes Unitários - Carregamento em lote das páginas de partidas
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Match, Odds, Prediction, Team
+from app.services.match_page_loader import load_match_page_context
+
+
+@pytest.fixture
+def db():
+    """Banco SQLite em memória com todas as tabelas"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _seed(db, n_matches=30):
+    now = datetime(2025, 10, 1, 20, 0)
+    teams = [Team(name=f"Team {i}") for i in range(n_matches * 2)]
+    db.add_all(teams)
+    db.flush()
+
+    matches = []
+    for i in range(n_matches):
+        match = Match(
+            home_team_id=teams[2 * i].id,
+            away_team_id=teams[2 * i + 1].id,
+            match_date=now + timedelta(hours=i),
+            status='LIVE'
+        )
+        matches.append(match)
+    db.add_all(matches)
+    db.flush()
+
+    for match in matches:
+        db.add_all([
+            Odds(match_id=match.id, bookmaker='old', market='1X2', home_win=2.0, draw=3.0,
+                 away_win=4.0, odds_timestamp=now - timedelta(hours=2)),
+            Odds(match_id=match.id, bookmaker='new', market='1X2', home_win=2.1, draw=3.1,
+                 away_win=4.1, odds_timestamp=now),
+            Odds(match_id=match.id, bookmaker='inactive', market='1X2', home_win=9.0,
+                 odds_timestamp=now - timedelta(days=1), is_active=False),
+            Prediction(match_id=match.id, prediction_type='SINGLE', market_type='1X2',
+                       predicted_outcome='1'),
+            Prediction(match_id=match.id, prediction_type='DOUBLE', market_type='1X2',
+                       predicted_outcome='X'),
+            Prediction(match_id=match.id, prediction_type='SINGLE', market_type='BTTS',
+                       predicted_outcome='YES'),
+        ])
+    db.commit()
+    return matches
+
+
+class TestMatchPageLoader:
+    """Testes para load_match_page_context"""
+
+    def test_constant_number_of_queries(self, db):
+        """Test: Número de queries não depende do tamanho da página"""
+        _seed(db)
+        matches = db.query(Match).all()
+
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+
+        page = load_match_page_context(
+            db, matches,
+            include_latest_1x2_odds=True,
+            include_active_odds=True,
+            include_predictions=True
+        )
+
+        assert len(statements) == 4
+        assert len(page.teams) == 60
+        assert len(page.latest_1x2_odds) == 30
+        assert len(page.predictions) == 30
+
+    def test_latest_odds_and_first_prediction(self, db):
+        """Test: Mesmas linhas que as queries por partida retornavam"""
+        matches = _seed(db, n_matches=3)
+
+        page = load_match_page_context(
+            db, matches,
+            include_latest_1x2_odds=True,
+            include_active_odds=True,
+            include_predictions=True,
+            prediction_type='DOUBLE'
+        )
+
+        for match in matches:
+            assert page.latest_1x2_odds[match.id].bookmaker == 'new'
+            assert [o.bookmaker for o in page.active_odds[match.id]] == ['old', 'new']
+            assert page.predictions[match.id].predicted_outcome == 'X'
+            assert page.team_name(match.home_team_id).startswith("Team ")
+
+        assert page.team_name(-1) == "Unknown"
+
+    def test_empty_page(self, db):
+        """Test: Página vazia não executa queries"""
+        page = load_match_page_context(db, [], include_latest_1x2_odds=True,
+                                       include_active_odds=True, include_predictions=True)
+        assert page.teams == {}
+        assert page.predictions == {}
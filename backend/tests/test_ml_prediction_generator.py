@@ -0,0 +1,118 @@
+"""
+🧪 Testes Unitários - MLPredictionGenerator (pipeline em lote)
+"""
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import BetCombination, Match, Prediction, Team
+from app.services.ml_prediction_generator import MLPredictionGenerator
+from app.services.team_strength_service import team_strength_service
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(team_strength_service, "get_model", lambda: None)
+    random.seed(7)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    session.add_all([Team(id=i, name=f"Team {i}") for i in range(1, 21)])
+    for i in range(10):
+        session.add(Match(
+            id=i + 1, external_id=f"m{i}", home_team_id=2 * i + 1, away_team_id=2 * i + 2,
+            status='NS', league="Liga", match_date=datetime.utcnow() + timedelta(days=1)
+        ))
+    session.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.info['statements'] = statements
+    yield session
+    session.close()
+
+
+class TestMLPredictionGeneratorPipeline:
+    """Testes para a geração diária em lote"""
+
+    def test_bulk_generation_links_combinations(self, db):
+        """Test: Combinações apontam para predictions gravadas, com poucos statements"""
+        stats = MLPredictionGenerator(db).generate_daily_predictions(target_count=1700)
+
+        combos = db.query(BetCombination).all()
+        predictions = {p.id: p for p in db.query(Prediction)}
+
+        assert stats['total'] > 0
+        assert stats['singles'] == db.query(Prediction).filter(Prediction.prediction_type == 'SINGLE').count()
+        assert len(combos) == stats['total'] - stats['singles']
+        for combo in combos:
+            legs = [predictions[pid] for pid in combo.prediction_ids]
+            assert len(legs) == combo.selections_count
+            assert len({leg.prediction_type for leg in legs}) == 1
+            if legs[0].prediction_type.startswith('COMBO_'):
+                assert len({leg.match_id for leg in legs}) == 1
+            else:
+                # ids ligados às pernas certas: confidence é o produto das pernas
+                assert combo.combined_confidence == pytest.approx(
+                    math.prod(leg.confidence_score for leg in legs))
+
+        assert set(stats['timings']) == {'load', 'compute', 'insert_predictions', 'link_combinations'}
+        inserts = [s for s in db.info['statements'] if s.lstrip().upper().startswith('INSERT')]
+        assert len(inserts) <= 2 + len(predictions) // 100  # lotes, não uma linha por vez
+        assert len(db.info['statements']) < 30
+
+    def test_existing_singles_are_skipped(self, db):
+        """Test: Segunda execução não duplica singles (chaves carregadas uma vez)"""
+        MLPredictionGenerator(db).generate_daily_predictions(target_count=1700)
+        MLPredictionGenerator(db).generate_daily_predictions(target_count=1700)
+
+        singles = db.query(
+            Prediction.match_id, Prediction.market_type
+        ).filter(Prediction.prediction_type == 'SINGLE').all()
+
+        assert len(singles) > 0
+        assert len(singles) == len(set(singles))
+
+    @pytest.mark.parametrize("dialect_name", ["sqlite", "postgresql"])
+    def test_bulk_insert_ids_follow_parameter_order(self, db, dialect_name):
+        """Test: Ids do INSERT em lote voltam na ordem do lote (combinações ligadas às pernas certas)"""
+        class DialectSession:
+            """Sessão real reportando outro dialeto: exercita o ramo sort_by_parameter_order"""
+
+            def __init__(self, session):
+                self.session = session
+
+            def get_bind(self):
+                return type('Bind', (), {'dialect': type('Dialect', (), {'name': dialect_name})()})()
+
+            def __getattr__(self, name):
+                return getattr(self.session, name)
+
+        generator = MLPredictionGenerator(db)
+        generator.db = DialectSession(db)
+        generator._pending_predictions = [
+            {'match_id': i % 10 + 1, 'prediction_type': 'COMBO_2X', 'market_type': f"MARKET_{i}"}
+            for i in range(12)
+        ]
+        legs = [[5, 2], [11, 0, 7], [3, 3]]
+        generator._pending_combinations = [
+            ({'combination_type': 'DOUBLE', 'selections_count': len(indices), 'total_odds': 1.0}, indices)
+            for indices in legs
+        ]
+        generator._flush_pending()
+
+        markets = dict(db.query(Prediction.id, Prediction.market_type))
+        combos = db.query(BetCombination).order_by(BetCombination.id).all()
+
+        assert len(markets) == 12
+        assert [[markets[pid] for pid in combo.prediction_ids] for combo in combos] == [
+            [f"MARKET_{i}" for i in indices] for indices in legs
+        ]
@@ -0,0 +1,170 @@
+"""
+🧪 Testes Unitários - Model registry (versões, mmap, hot-swap entre workers)
+"""
+import asyncio
+import json
+import multiprocessing
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.model_registry import ModelRegistry
+from app.services.automated_ml_retraining import AutomatedMLRetraining, RetrainingTrigger
+
+
+def _model(value):
+    return {'weights': np.full(1000, value, dtype=float)}
+
+
+def _register_many(root, worker, count):
+    registry = ModelRegistry(root, keep_versions=3)
+    for i in range(count):
+        registry.register('btts', _model(float(worker * 100 + i)))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(tmp_path / 'registry', keep_versions=3)
+
+
+class TestRegistryStorage:
+    """Testes para gravação, manifest e carregamento preguiçoso"""
+
+    def test_register_and_lazy_mmap_load(self, registry):
+        """Test: Versão gravada com sha256 e carregada com arrays memory-mapped"""
+        entry = registry.register('btts', _model(1.0), metadata={'accuracy': 0.61})
+
+        manifest = registry.manifest('btts')
+        assert manifest['current'] == entry['version']
+        assert manifest['versions'][0]['metadata'] == {'accuracy': 0.61}
+        assert len(entry['sha256']) == 64
+
+        loaded = registry.get('btts')
+        assert isinstance(loaded.model['weights'], np.memmap)
+        assert loaded.tag == f"btts@{entry['version']}"
+        assert registry.get('btts') is loaded  # cache quente: sem nova leitura
+
+    def test_unknown_model_returns_none(self, registry):
+        """Test: Modelo nunca registrado e sem fallback -> None"""
+        assert registry.get('inexistente') is None
+        assert registry.list_models() == []
+
+    def test_prune_keeps_current_and_rollback(self, registry):
+        """Test: Só keep_versions ficam no disco; rollback volta para a anterior"""
+        entries = [registry.register('1x2', _model(float(i))) for i in range(5)]
+
+        versions = [v['version'] for v in registry.versions('1x2')]
+        assert versions == [e['version'] for e in entries[-3:]]
+        assert len(list((registry.root / '1x2').glob('*.joblib'))) == 3
+
+        registry.rollback('1x2')
+        assert registry.get('1x2').model['weights'][0] == 3.0
+        assert registry.verify()['ok']
+
+    def test_legacy_artifact_is_adopted(self, registry, tmp_path):
+        """Test: Arquivo antigo vira a primeira versão do registry na leitura"""
+        legacy = tmp_path / 'old_model.joblib'
+        joblib.dump(_model(7.0), legacy)
+
+        loaded = registry.get('legacy', fallback=lambda: joblib.load(legacy))
+
+        assert loaded.model['weights'][0] == 7.0
+        assert loaded.metadata == {'source': 'legacy'}
+        assert registry.current_version('legacy') == loaded.version
+
+
+class TestHotSwap:
+    """Testes para troca atômica de versão entre processos"""
+
+    def test_promotion_reaches_other_worker(self, tmp_path):
+        """Test: Worker servindo v1 passa a servir v2 após promoção em outro processo"""
+        trainer = ModelRegistry(tmp_path / 'registry')
+        worker = ModelRegistry(tmp_path / 'registry')
+
+        trainer.register('over_under', _model(1.0))
+        in_flight = worker.get('over_under')
+
+        v2 = trainer.register('over_under', _model(2.0))
+        served = worker.get('over_under')
+
+        assert served.version == v2['version']
+        assert served.model['weights'][0] == 2.0
+        # predição em andamento mantém o artefato inteiro da versão antiga
+        assert in_flight.model['weights'][0] == 1.0
+
+    def test_unpromoted_version_is_not_served(self, registry):
+        """Test: register(promote=False) não troca a versão servida até promote()"""
+        v1 = registry.register('btts', _model(1.0))
+        registry.get('btts')
+        candidate = registry.register('btts', _model(2.0), promote=False)
+
+        assert registry.get('btts').version == v1['version']
+        registry.promote('btts', candidate['version'])
+        assert registry.get('btts').version == candidate['version']
+
+    def test_concurrent_registers_from_processes(self, tmp_path):
+        """Test: Registros simultâneos em vários processos não perdem versões nem deixam arquivos órfãos"""
+        root = tmp_path / 'registry'
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_register_many, args=(root, w, 8)) for w in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+
+        registry = ModelRegistry(root)
+        versions = registry.versions('btts')
+        assert [p.exitcode for p in workers] == [0] * 4
+        assert len(versions) == 3
+        assert registry.current_version('btts') in [v['version'] for v in versions]
+        assert sorted(p.name for p in (root / 'btts').glob('*.joblib')) == sorted(v['file'] for v in versions)
+        assert registry.verify('btts')['ok']
+
+    def test_corrupted_version_keeps_previous(self, tmp_path):
+        """Test: Artefato com sha256 divergente não é servido; a versão anterior continua"""
+        trainer = ModelRegistry(tmp_path / 'registry')
+        worker = ModelRegistry(tmp_path / 'registry')
+        v1 = trainer.register('btts', _model(1.0))
+        worker.get('btts')
+
+        v2 = trainer.register('btts', _model(2.0))
+        path = trainer.root / 'btts' / v2['file']
+        path.write_bytes(path.read_bytes()[:-8] + b'corrupt!')
+
+        assert worker.get('btts').version == v1['version']
+        assert trainer.verify('btts')['corrupted'] == [f"btts@{v2['version']}"]
+
+
+class TestRetrainingPromotion:
+    """Testes para a promoção feita por AutomatedMLRetraining.retrain_model"""
+
+    def test_retrain_promotes_new_version(self, tmp_path, monkeypatch):
+        """Test: Retreino aceito registra, promove e informa a versão servida"""
+        monkeypatch.chdir(tmp_path)
+        registry = ModelRegistry(tmp_path / 'registry')
+        service = AutomatedMLRetraining(registry=registry)
+        features = service.supported_models['btts_classifier']['features']
+
+        rng = np.random.default_rng(0)
+        training = pd.DataFrame(rng.uniform(0, 1, (80, len(features))), columns=features)
+        training['both_teams_scored'] = (training[features[0]] > 0.5).astype(int)
+
+        async def load_training_data(model_name):
+            return training
+
+        monkeypatch.setattr(service, '_load_training_data', load_training_data)
+        trigger = RetrainingTrigger('manual', 0, 1, datetime.now(), 'teste')
+
+        result = asyncio.run(service.retrain_model('btts_classifier', trigger))
+
+        assert result.success
+        assert result.model_version == registry.current_version('btts_classifier')
+        assert result.model_path.endswith(f"{result.model_version}.joblib")
+
+        served = service._get_model('btts_classifier')
+        assert served.version == result.model_version
+        assert served.metadata['training_samples'] == 80
+        assert json.loads((tmp_path / 'retraining_data' / 'btts_classifier_last_retrain.json').read_text())
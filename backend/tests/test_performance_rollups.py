@@ -0,0 +1,185 @@
+"""
+🧪 Testes Unitários - Agregados diários de GREEN/RED (performance_rollups)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_db
+from app.models import Match, PerformanceRollup, Prediction, PredictionLog, Team
+from app.services.performance_rollup_service import PerformanceRollupService
+from app.services.prediction_logger import PredictionLogger
+from app.services.results_updater import ResultsUpdater
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    session.add_all([Team(id=i, name=f"Team {i}") for i in range(1, 9)])
+    outcomes = ['1', 'X', '2']
+    for i in range(4):
+        match = Match(
+            id=i + 1, external_id=str(100 + i), home_team_id=2 * i + 1, away_team_id=2 * i + 2,
+            status='FT', league="Liga A" if i % 2 else "Liga B",
+            match_date=datetime.now() - timedelta(days=i), home_score=i % 3, away_score=1
+        )
+        session.add(match)
+        for j, outcome in enumerate(outcomes):
+            session.add(Prediction(
+                match_id=match.id, prediction_type='SINGLE', market_type='1X2',
+                predicted_outcome=outcome, confidence_score=0.5 + 0.1 * j, actual_odds=2.0 + j,
+                model_version="v1" if j else "v2", predicted_at=datetime.now() - timedelta(days=i)
+            ))
+        session.add(Prediction(
+            match_id=match.id, prediction_type='SINGLE', market_type='BTTS',
+            predicted_outcome='BTTS_YES', confidence_score=0.6, model_version="v1",
+            predicted_at=datetime.now() - timedelta(days=i)
+        ))
+        session.add(PredictionLog(
+            match_id=match.id, predicted_outcome='home', confidence_score=0.7, predicted_probability=0.6,
+            match_date=match.match_date, league=match.league, model_name="rf",
+            model_version="v2.0" if i % 2 else "v2.1", created_at=datetime.now() - timedelta(days=i)
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def settle_all(db):
+    updater = ResultsUpdater(db)
+    for match in db.query(Match).all():
+        updater._calculate_green_red(match, db.query(Prediction).filter(Prediction.match_id == match.id).all())
+    db.commit()
+
+
+def rollup_rows(db):
+    return sorted(
+        (r.source, r.bucket_date, r.model_name, r.model_version, r.market_type, r.league,
+         r.total, r.greens, r.reds, round(r.profit_loss, 6), round(r.confidence_sum, 6), round(r.feedback_sum, 6))
+        for r in db.query(PerformanceRollup).all()
+    )
+
+
+class TestPerformanceRollups:
+    """Testes para a manutenção incremental e leitura dos agregados"""
+
+    def test_green_red_matches_full_scan(self, db):
+        """Test: Totais incrementais = contagem direta na tabela predictions"""
+        settle_all(db)
+        totals = PerformanceRollupService(db).green_red_totals()
+
+        assert totals['total'] == db.query(Prediction).filter(Prediction.actual_outcome.isnot(None)).count() == 16
+        assert totals['greens'] == db.query(Prediction).filter(Prediction.is_winner == True).count()
+        assert totals['reds'] == db.query(Prediction).filter(Prediction.is_winner == False).count()
+        assert totals['profit_loss'] == pytest.approx(db.query(func.sum(Prediction.profit_loss)).scalar())
+
+    def test_resettlement_is_not_double_counted(self, db):
+        """Test: Liquidar de novo (placar corrigido) substitui a contribuição anterior"""
+        settle_all(db)
+        match = db.get(Match, 1)
+        match.home_score, match.away_score = 3, 0
+        settle_all(db)
+
+        incremental = rollup_rows(db)
+        PerformanceRollupService(db).rebuild()
+
+        assert incremental == rollup_rows(db)
+        assert PerformanceRollupService(db).green_red_totals()['total'] == 16
+
+    def test_prediction_logger_feeds_overview(self, db):
+        """Test: Resultado registrado pelo PredictionLogger aparece no overview"""
+        logger_service = PredictionLogger(db)
+        for log in db.query(PredictionLog).all():
+            outcome = 'home' if log.match_id % 2 else 'away'
+            logger_service.update_prediction_with_result(log.id, outcome, 1, 0)
+
+        overview = PerformanceRollupService(db).model_overview((datetime.now() - timedelta(days=30)).date())
+
+        assert overview['total'] == 4
+        assert overview['correct'] == 2
+        assert overview['models']['rf_v2.0']['total'] == 2
+        assert overview['leagues'] == {'Liga A': {'total': 2, 'correct': 0}, 'Liga B': {'total': 2, 'correct': 2}}
+
+        incremental = rollup_rows(db)
+        PerformanceRollupService(db).rebuild()
+        assert incremental == rollup_rows(db)
+
+    def test_endpoints_read_rollups(self, db):
+        """Test: /stats/green-red e /performance/overview usam os agregados"""
+        from app.api.api_v1.endpoints import ml_performance
+
+        settle_all(db)
+        logger_service = PredictionLogger(db)
+        for log in db.query(PredictionLog).all():
+            logger_service.update_prediction_with_result(log.id, 'home', 1, 0)
+
+        app = FastAPI()
+        app.include_router(ml_performance.router, prefix="/ml")
+        app.dependency_overrides[get_db] = lambda: db
+        client = TestClient(app)
+
+        green_red = client.get("/ml/stats/green-red").json()
+        overview = client.get("/ml/performance/overview?days_back=30").json()
+
+        assert green_red['total_analyzed'] == 16
+        assert green_red['greens'] + green_red['reds'] == 16
+        assert green_red['pending'] == 0
+        assert overview['total_predictions'] == 4
+        assert overview['overall_accuracy'] == 1.0
+        assert overview['avg_confidence'] == pytest.approx(0.7)
+        assert set(overview['model_performance']) == {'rf_v2.0', 'rf_v2.1'}
+
+    def test_cleanup_job_feeds_rollups(self, db):
+        """Test: Predictions resolvidas pelo job de limpeza entram nos agregados"""
+        from app.services.automated_pipeline import AutomatedPipeline
+
+        stats = AutomatedPipeline().cleanup_finished_matches_from_predictions(db)
+        totals = PerformanceRollupService(db).green_red_totals()
+
+        assert stats['predictions_resolved'] == 16
+        assert totals['total'] == 16
+        assert totals['greens'] == db.query(Prediction).filter(Prediction.is_winner == True).count()
+
+        incremental = rollup_rows(db)
+        PerformanceRollupService(db).rebuild()
+        assert incremental == rollup_rows(db)
+
+    def test_feedback_feeds_rollups(self, db):
+        """Test: Feedback manual (FewShotMemory.add_feedback) atualiza os agregados"""
+        from app.services.few_shot_memory import FewShotMemory
+
+        prediction = db.query(Prediction).filter(Prediction.market_type == '1X2').first()
+        assert FewShotMemory(db).add_feedback(prediction.id, prediction.predicted_outcome)
+
+        totals = PerformanceRollupService(db).green_red_totals()
+        assert (totals['total'], totals['greens']) == (1, 1)
+
+        incremental = rollup_rows(db)
+        PerformanceRollupService(db).rebuild()
+        assert incremental == rollup_rows(db)
+
+    def test_scheduled_green_red_job_feeds_rollups(self, db, monkeypatch):
+        """Test: Job green_red_analyzer liquidando antes do ResultsUpdater mantém os agregados"""
+        import green_red_scheduler
+
+        monkeypatch.setattr(green_red_scheduler, 'SessionLocal', lambda: db)
+        result = green_red_scheduler.GreenRedScheduler().analyze_green_red()
+        settle_all(db)
+        totals = PerformanceRollupService(db).green_red_totals()
+
+        assert result['total_analyzed'] == 4
+        assert totals['total'] == db.query(Prediction).filter(Prediction.actual_outcome.isnot(None)).count()
+        assert totals['greens'] == db.query(Prediction).filter(Prediction.is_winner == True).count()
+        assert totals['profit_loss'] == pytest.approx(db.query(func.sum(Prediction.profit_loss)).scalar())
+
+        incremental = rollup_rows(db)
+        PerformanceRollupService(db).rebuild()
+        assert incremental == rollup_rows(db)
@@ -0,0 +1,80 @@
+"""
+🧪 Testes Unitários - PoissonService vetorizado
+"""
+import math
+
+import numpy as np
+import pytest
+
+from app.services.poisson_service import PoissonService
+
+
+def _scalar_matrix(lambda_home, lambda_away, max_goals=10):
+    """Matriz de placar de referência (laço duplo com math.factorial)"""
+    def pmf(lam, k):
+        return lam ** k * math.exp(-lam) / math.factorial(k)
+
+    return np.array([
+        [pmf(lambda_home, i) * pmf(lambda_away, j) for j in range(max_goals + 1)]
+        for i in range(max_goals + 1)
+    ])
+
+
+class TestPoissonService:
+    """Testes para o motor de matriz de placares"""
+
+    @pytest.fixture
+    def service(self):
+        return PoissonService()
+
+    def test_score_matrix_matches_scalar_reference(self, service):
+        """Test: Matriz vetorizada igual à versão com laço duplo"""
+        matrices = service.score_matrix_batch([1.4, 0.3, 2.9], [1.1, 2.2, 0.8])
+
+        for n, (lh, la) in enumerate([(1.4, 1.1), (0.3, 2.2), (2.9, 0.8)]):
+            assert np.allclose(matrices[n], _scalar_matrix(lh, la), atol=1e-14)
+
+    def test_markets_match_scalar_formulas(self, service):
+        """Test: Mercados derivados iguais às fórmulas escalares originais"""
+        lh, la = 1.7, 1.2
+        matrix = _scalar_matrix(lh, la)
+        probs = service.calculate_match_probabilities(lh, la)
+
+        over_2_5 = sum(matrix[i, j] for i in range(11) for j in range(11) if i + j > 2.5)
+        odd = sum(matrix[i, j] for i in range(11) for j in range(11) if (i + j) % 2 == 1)
+
+        assert probs['HOME_WIN'] == pytest.approx(np.sum(np.tril(matrix, -1)), abs=1e-12)
+        assert probs['DRAW'] == pytest.approx(np.trace(matrix), abs=1e-12)
+        assert probs['BTTS_YES'] == pytest.approx(
+            1 - matrix[0, :].sum() - matrix[:, 0].sum() + matrix[0, 0], abs=1e-12)
+        assert probs['OVER_2.5'] == pytest.approx(over_2_5, abs=1e-12)
+        assert probs['UNDER_2.5'] == pytest.approx(1 - over_2_5, abs=1e-12)
+        assert probs['ODD_GOALS'] == pytest.approx(odd, abs=1e-12)
+        assert probs['SCORE_2_1'] == pytest.approx(matrix[2, 1], abs=1e-12)
+        assert probs['FIRST_GOAL_HOME'] == pytest.approx((1 - matrix[0, 0]) * lh / (lh + la), abs=1e-12)
+
+    def test_batch_equals_single_match(self, service):
+        """Test: analyze_matches_batch igual a N chamadas de analyze_match"""
+        home_avg = [1.5, 2.1, 0.9]
+        away_avg = [1.3, 0.8, 1.6]
+        home_conc = [1.2, 0.7, 1.9]
+        away_conc = [1.1, 1.5, 1.0]
+        odds = [{'HOME_WIN': 3.0}, None, {'OVER_2.5': 2.5, 'DRAW': 9.0}]
+
+        batch = service.analyze_matches_batch(home_avg, away_avg, home_conc, away_conc, market_odds=odds)
+
+        for i, prediction in enumerate(batch):
+            single = service.analyze_match(home_avg[i], away_avg[i], home_conc[i], away_conc[i],
+                                           market_odds=odds[i])
+            assert prediction.home_lambda == pytest.approx(single.home_lambda)
+            for market, prob in single.probabilities.items():
+                assert prediction.probabilities[market] == pytest.approx(prob, abs=1e-12)
+            assert [b['market'] for b in prediction.value_bets] == [b['market'] for b in single.value_bets]
+
+    def test_zero_lambdas(self, service):
+        """Test: Lambdas zero não geram divisão por zero"""
+        probs = service.calculate_match_probabilities(0.0, 0.0)
+
+        assert probs['DRAW'] == pytest.approx(1.0)
+        assert probs['FIRST_GOAL_HOME'] == 0.0
+        assert service.calculate_fair_odds({'X': 0.0})['X'] == 999.99
@@ -0,0 +1,287 @@
+"""
+🧪 Testes de Regressão - Planos de execução das queries quentes
+
+Semeia um volume realista e verifica via EXPLAIN que cada query usa o
+índice esperado (nenhum full scan na tabela principal).
+
+Variáveis de ambiente:
+- QUERY_PLAN_DATABASE_URL: banco alvo (padrão: SQLite temporário).
+  Use um PostgreSQL descartável para validar o planner de produção.
+- QUERY_PLAN_MATCHES / QUERY_PLAN_PREDICTIONS_PER_MATCH: volume
+  (padrão 2000 x 20; produção ~100000 x 20 = 2M predições).
+"""
+import os
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, insert, inspect, select
+from sqlalchemy.orm import contains_eager
+
+from app.core.database import Base
+from app.models import (
+    Match, Odds, PerformanceRollup, Prediction, PredictionLog, Team, TeamStatistics,
+    TicketSelection, User, UserTicket, ValueBetRanking, ValueBetScan
+)
+
+N_MATCHES = int(os.getenv("QUERY_PLAN_MATCHES", "2000"))
+PREDICTIONS_PER_MATCH = int(os.getenv("QUERY_PLAN_PREDICTIONS_PER_MATCH", "20"))
+N_TEAMS = max(N_MATCHES // 20, 40)
+BATCH = 10000
+
+NOW = datetime(2025, 10, 1, 12, 0)
+LIVE = ['LIVE', 'HT', '1H', '2H']
+UPCOMING = ['NS', 'TBD', 'SCHEDULED'] + LIVE
+MARKETS = ['1X2', 'BTTS', 'OVER_2_5', 'UNDER_2_5', 'DOUBLE_CHANCE']
+
+
+def _insert(conn, model, rows):
+    for start in range(0, len(rows), BATCH):
+        conn.execute(insert(model), rows[start:start + BATCH])
+
+
+def _seed(conn):
+    rng = random.Random(42)
+
+    _insert(conn, Team, [{'id': i, 'name': f"Team {i}"} for i in range(1, N_TEAMS + 1)])
+    _insert(conn, TeamStatistics, [
+        {'team_id': t, 'season': season, 'games_played': 10, 'goals_for': 12, 'goals_against': 9}
+        for t in range(1, N_TEAMS + 1) for season in ('2024', '2025')
+    ])
+
+    matches, odds, predictions, logs = [], [], [], []
+    prediction_id = 0
+    for m in range(1, N_MATCHES + 1):
+        days = rng.randint(-700, 14)
+        home, away = rng.sample(range(1, N_TEAMS + 1), 2)
+        status = 'FT' if days < 0 else rng.choice(UPCOMING if days < 2 else ['NS'])
+        matches.append({
+            'id': m, 'external_id': str(m), 'home_team_id': home, 'away_team_id': away,
+            'league': f"Liga {m % 12}", 'status': status, 'match_date': NOW + timedelta(days=days),
+            'home_score': rng.randint(0, 3) if status == 'FT' else None,
+            'away_score': rng.randint(0, 3) if status == 'FT' else None,
+        })
+        for k, bookmaker in enumerate(('Bet365', 'Pinnacle', 'Betano')):
+            odds.append({
+                'match_id': m, 'bookmaker': bookmaker, 'market': '1X2' if k < 2 else 'BTTS',
+                'home_win': 2.1, 'draw': 3.3, 'away_win': 3.6, 'is_active': status != 'FT',
+                'odds_timestamp': NOW + timedelta(days=days, hours=-k)
+            })
+        for p in range(PREDICTIONS_PER_MATCH):
+            prediction_id += 1
+            settled = status == 'FT'
+            predictions.append({
+                'id': prediction_id, 'match_id': m, 'market_type': MARKETS[p % len(MARKETS)],
+                'prediction_type': 'SINGLE' if p < len(MARKETS) else 'COMBO_2',
+                'predicted_outcome': '1', 'confidence_score': rng.random(),
+                'model_version': f"v{p % 4}", 'predicted_at': NOW + timedelta(days=days - 1),
+                'actual_outcome': '1' if settled else None, 'is_winner': rng.random() < 0.5 if settled else None,
+            })
+        if m % 5 == 0:
+            logs.append({
+                'match_id': m, 'predicted_outcome': 'home', 'confidence_score': 0.6,
+                'predicted_probability': 0.55, 'match_date': NOW + timedelta(days=days),
+                'league': f"Liga {m % 12}", 'model_name': 'rf', 'model_version': 'v2.0'
+            })
+
+        if len(predictions) >= BATCH:
+            _insert(conn, Match, matches)
+            _insert(conn, Odds, odds)
+            _insert(conn, Prediction, predictions)
+            matches, odds, predictions = [], [], []
+
+    _insert(conn, Match, matches)
+    _insert(conn, Odds, odds)
+    _insert(conn, Prediction, predictions)
+    _insert(conn, PredictionLog, logs)
+
+    conn.execute(insert(User), [{'id': 1, 'email': 'plan@test', 'username': 'plan', 'hashed_password': 'x'}])
+    _insert(conn, UserTicket, [
+        {'id': t, 'user_id': 1, 'stake': 10.0, 'total_odds': 2.0, 'potential_return': 20.0}
+        for t in range(1, N_MATCHES // 10 + 1)
+    ])
+    _insert(conn, TicketSelection, [
+        {'ticket_id': m // 10 + 1, 'match_id': m, 'market': '1X2', 'outcome': 'Home', 'odd': 2.0}
+        for m in range(1, N_MATCHES, 7) if m // 10 + 1 <= N_MATCHES // 10
+    ])
+
+    conn.execute(insert(ValueBetScan), [{'id': s} for s in range(1, 4)])
+    _insert(conn, ValueBetRanking, [
+        {'scan_id': s, 'rank': r, 'match_rank': 1, 'match_id': r, 'match_name': 'A vs B',
+         'market_type': '1X2', 'selection': 'home', 'market_odds': 2.0, 'edge': 6.0}
+        for s in range(1, 4) for r in range(1, min(N_MATCHES, 3000) + 1)
+    ])
+    _insert(conn, PerformanceRollup, [
+        {'source': source, 'bucket_date': date(2024, 1, 1) + timedelta(days=d), 'model_name': '',
+         'model_version': f"v{v}", 'market_type': market, 'league': f"Liga {d % 12}",
+         'total': 10, 'greens': 5, 'reds': 5, 'profit_loss': 0.0, 'confidence_sum': 5.0, 'feedback_sum': 0.0}
+        for source in ('predictions', 'prediction_logs') for d in range(600) for v in range(2) for market in MARKETS[:3]
+    ])
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    url = os.getenv("QUERY_PLAN_DATABASE_URL") or f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        _seed(conn)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+# ========== QUERIES QUENTES (id, tabela, índices aceitos, statement) ==========
+# Sem STAT4 o SQLite estima seletividade por médias e pode preferir percorrer
+# ix_matches_match_date na ordem do ORDER BY; o PostgreSQL usa o índice de status.
+# O filtro status + janela em si é coberto por test_status_window_uses_composite_index.
+
+match_ids = list(range(1, 51))
+window_start, window_end = NOW, NOW + timedelta(days=7)
+
+HOT_QUERIES = [
+    ("upcoming_matches", "matches", {"ix_matches_status_match_date", "ix_matches_match_date"},
+     select(Match).where(Match.status.in_(UPCOMING), Match.match_date >= window_start,
+                         Match.match_date <= window_end).order_by(Match.match_date).limit(50)),
+    ("live_matches", "matches", {"ix_matches_status_match_date", "ix_matches_match_date"},
+     select(Match).where(Match.status.in_(LIVE)).order_by(Match.match_date.desc()).limit(50)),
+    ("team_home_form", "matches", {"ix_matches_home_team_date"},
+     select(Match).where(Match.home_team_id == 7, Match.status == 'FT').order_by(Match.match_date.desc()).limit(10)),
+    ("team_away_form", "matches", {"ix_matches_away_team_date"},
+     select(Match).where(Match.away_team_id == 7, Match.status == 'FT').order_by(Match.match_date.desc()).limit(10)),
+    ("results_by_fixture", "matches", {"ix_matches_external_id"},
+     select(Match).where(Match.external_id.in_([str(i) for i in match_ids]))),
+    ("latest_1x2_odds_page", "odds", {"ix_odds_match_market_timestamp"},
+     select(Odds).where(Odds.match_id.in_(match_ids), Odds.market == '1X2')
+     .order_by(Odds.match_id, Odds.odds_timestamp.desc())),
+    ("latest_1x2_odds_one", "odds", {"ix_odds_match_market_timestamp"},
+     select(Odds).where(Odds.match_id == 10, Odds.market == '1X2').order_by(Odds.odds_timestamp.desc()).limit(1)),
+    ("active_odds_page", "odds", {"ix_odds_active_match", "ix_odds_match_market_timestamp"},
+     select(Odds).where(Odds.match_id.in_(match_ids), Odds.is_active == True)),
+    ("page_1x2_predictions", "predictions", {"ix_predictions_match_market_type"},
+     select(Prediction).where(Prediction.match_id.in_(match_ids), Prediction.market_type == '1X2',
+                              Prediction.prediction_type == 'SINGLE')),
+    ("existing_single_keys", "predictions", {"ix_predictions_match_market_type"},
+     select(Prediction.match_id, Prediction.market_type).where(
+         Prediction.match_id.in_(match_ids), Prediction.prediction_type == 'SINGLE')),
+    ("latest_prediction_for_match", "predictions", {"ix_predictions_match_market_type"},
+     select(Prediction).where(Prediction.match_id == 10).order_by(Prediction.predicted_at.desc()).limit(1)),
+    ("featured_predictions", "predictions", {"ix_predictions_market_confidence", "ix_predictions_match_market_type"},
+     select(Prediction).join(Match, Match.id == Prediction.match_id).options(contains_eager(Prediction.match))
+     .where(Match.status.in_(UPCOMING), Match.match_date >= window_start, Match.match_date <= window_end,
+            Prediction.market_type == '1X2', Prediction.confidence_score >= 0.35)
+     .order_by(Prediction.confidence_score.desc()).limit(10)),
+    ("predictions_list", "predictions", {"ix_predictions_predicted_at"},
+     select(Prediction).order_by(Prediction.predicted_at.desc()).offset(0).limit(100)),
+    ("predictions_by_model_version", "predictions", {"ix_predictions_model_version"},
+     select(func.count(Prediction.id)).where(Prediction.model_version == 'v2')),
+    ("pending_predictions_count", "predictions", {"ix_predictions_pending"},
+     select(func.count(Prediction.id)).where(Prediction.actual_outcome.is_(None))),
+    ("team_statistics_bulk", "team_statistics", {"ix_team_statistics_team_season"},
+     select(TeamStatistics).where(TeamStatistics.team_id.in_([1, 2, 3, 4]))),
+    ("team_statistics_season", "team_statistics", {"ix_team_statistics_team_season"},
+     select(TeamStatistics).where(TeamStatistics.team_id == 3, TeamStatistics.season == '2025')),
+    ("ticket_selections_for_match", "ticket_selections", {"ix_ticket_selections_match_id"},
+     select(TicketSelection).where(TicketSelection.match_id == 8)),
+    ("value_bet_page", "value_bet_rankings", {"ix_value_bet_rankings_scan_rank"},
+     select(ValueBetRanking).where(ValueBetRanking.scan_id == 3).order_by(ValueBetRanking.rank).limit(20)),
+    ("performance_overview", "performance_rollups",
+     {"uq_performance_rollups_bucket", "sqlite_autoindex_performance_rollups_1"},
+     select(PerformanceRollup.league, func.sum(PerformanceRollup.total))
+     .where(PerformanceRollup.source == 'prediction_logs', PerformanceRollup.bucket_date >= date(2025, 6, 1))
+     .group_by(PerformanceRollup.league)),
+]
+
+
+def _compile(conn, stmt):
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    return compiled, params
+
+
+def sqlite_plan(conn, stmt):
+    """Linhas de detalhe do EXPLAIN QUERY PLAN (SQLite)"""
+    compiled, params = _compile(conn, stmt)
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()]
+
+
+def explain(conn, stmt):
+    """Lista de (tabela, índice usado ou None) para cada acesso a tabela do plano"""
+    compiled, params = _compile(conn, stmt)
+
+    if conn.dialect.name == 'postgresql':
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+        accesses, nodes = [], [plan[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('Plans', []))
+            if 'Index Name' in node:
+                table = node.get('Relation Name') or node['Index Name']
+                accesses.append((table, node['Index Name']))
+            elif node['Node Type'] == 'Seq Scan':
+                accesses.append((node['Relation Name'], None))
+        return accesses
+
+    accesses = []
+    for detail in sqlite_plan(conn, stmt):
+        words = detail.split()
+        if words[0] in ('SCAN', 'SEARCH') and len(words) > 1:
+            index = None
+            if 'INDEX' in words:
+                index = words[words.index('INDEX') + 1]
+            elif 'PRIMARY' in words:
+                index = 'PRIMARY KEY'
+            accesses.append((words[1], index))
+    return accesses
+
+
+class TestQueryPlans:
+    """Testes para os planos das queries mais frequentes"""
+
+    @pytest.mark.parametrize("name,table,indexes,stmt", HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+    def test_hot_query_uses_index(self, engine, name, table, indexes, stmt):
+        """Test: Query quente usa índice na tabela principal"""
+        with engine.connect() as conn:
+            accesses = explain(conn, stmt)
+
+        used = {index for accessed, index in accesses if accessed == table or index in indexes}
+        assert used & indexes, f"{name}: plano sem índice esperado {sorted(indexes)}: {accesses}"
+        assert (table, None) not in accesses, f"{name}: full scan em {table}: {accesses}"
+
+    @pytest.mark.parametrize("statuses", [UPCOMING, LIVE], ids=["upcoming", "live"])
+    def test_status_window_uses_composite_index(self, engine, statuses):
+        """Test: Filtro status + janela de datas busca por ix_matches_status_match_date quando ele existe"""
+        if 'ix_matches_status_match_date' not in {i['name'] for i in inspect(engine).get_indexes('matches')}:
+            pytest.skip("banco sem a migração d3a9f6b2c8e1")
+        stmt = select(func.count(Match.id)).where(
+            Match.status.in_(statuses), Match.match_date >= window_start, Match.match_date <= window_end
+        )
+
+        with engine.connect() as conn:
+            accesses = explain(conn, stmt)
+
+        assert accesses == [('matches', 'ix_matches_status_match_date')], accesses
+        if engine.dialect.name == 'sqlite':
+            with engine.connect() as conn:
+                assert sqlite_plan(conn, stmt)[0].startswith("SEARCH matches USING"), sqlite_plan(conn, stmt)
+
+    def test_listings_run_without_composite_index(self):
+        """Test: Banco criado antes da migração (sem o índice) continua servindo as listagens"""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_matches_status_match_date")
+            for name, _, _, stmt in HOT_QUERIES[:2]:
+                assert conn.execute(stmt).all() == [], name
+        engine.dispose()
+
+    def test_suite_covers_top_queries(self):
+        """Test: Suíte cobre as 20 queries quentes"""
+        assert len(HOT_QUERIES) == 20
+        assert len({q[0] for q in HOT_QUERIES}) == 20
@@ -0,0 +1,113 @@
+"""
+🧪 Testes Unitários - RealTimeMonitor (sessão compartilhada, fan-out, cache limitado)
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.core.ttl_cache import TTLCache
+from app.models import Match, Team
+from app.services import real_time_monitor as monitor_module
+from app.services.real_time_monitor import RealTimeMonitor
+
+
+class TestTTLCache:
+    """Testes para o cache LRU + TTL"""
+
+    def test_evicts_least_recently_used(self):
+        """Test: Passando de maxsize sai o item menos usado"""
+        cache = TTLCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        assert cache.get('a') == 1  # 'a' passa a ser o mais recente
+        cache['c'] = 3
+
+        assert 'b' not in cache
+        assert cache['a'] == 1 and cache['c'] == 3
+        assert len(cache) == 2
+
+    def test_expires_after_ttl(self):
+        """Test: Itens expiram após o TTL"""
+        cache = TTLCache(maxsize=10, ttl=0.05)
+        cache['a'] = 1
+        assert cache.get('a') == 1
+
+        time.sleep(0.06)
+        assert cache.get('a') is None
+        cache['b'] = 2
+        time.sleep(0.06)
+        assert cache.purge_expired() == 1
+
+
+class TestRealTimeMonitor:
+    """Testes para os loops de monitoramento"""
+
+    @pytest.fixture
+    def session_factory(self, monkeypatch):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        monkeypatch.setattr(monitor_module, "SessionLocal", factory)
+
+        with factory() as db:
+            db.add_all([Team(id=1, name="Home"), Team(id=2, name="Away")])
+            for i in range(12):
+                db.add(Match(
+                    external_id=f"ext{i}", home_team_id=1, away_team_id=2, status='SCHEDULED',
+                    match_date=datetime.now() + timedelta(hours=3)
+                ))
+            db.commit()
+        return factory
+
+    def test_odds_checks_run_concurrently_with_bound(self, session_factory):
+        """Test: Checagens por jogo em paralelo, no máximo N simultâneas"""
+        monitor = RealTimeMonitor(max_concurrent_checks=4)
+        in_flight, peak, seen = 0, 0, []
+
+        async def fake_check(match):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            seen.append((match.external_id, match.home_team.name))
+            in_flight -= 1
+
+        monitor._check_odds_for_match = fake_check
+        asyncio.run(monitor._monitor_odds_changes())
+
+        assert len(seen) == 12
+        assert peak == 4
+        assert seen[0][1] == "Home"  # times carregados antes de fechar a sessão
+
+    def test_odds_cache_is_bounded(self, session_factory):
+        """Test: Histórico de odds limitado ao tamanho configurado"""
+        monitor = RealTimeMonitor(odds_cache_size=5)
+
+        async def fake_odds(external_id):
+            return {'bookmakers': []}
+
+        monitor.odds_service.get_match_odds = fake_odds
+        asyncio.run(monitor._monitor_odds_changes())
+
+        assert len(monitor.odds_cache) == 5
+
+    def test_failing_check_does_not_stop_others(self, session_factory):
+        """Test: Erro em um jogo não interrompe os demais"""
+        monitor = RealTimeMonitor()
+        done = []
+
+        async def flaky_check(match):
+            if match.external_id == "ext3":
+                raise RuntimeError("boom")
+            done.append(match.external_id)
+
+        monitor._check_odds_for_match = flaky_check
+        asyncio.run(monitor._monitor_odds_changes())
+
+        assert len(done) == 11
@@ -0,0 +1,116 @@
+"""
+🧪 Testes Unitários - Response cache (TTL, singleflight, ETag/304, invalidação)
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Query
+from fastapi.testclient import TestClient
+
+from app.core import redis as redis_module
+from app.core import response_cache as cache_module
+from app.core.database import get_async_db
+from app.core.response_cache import ResponseCache, cached_response, invalidate_response_cache
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    """Sem Redis: NoOpRedisClient + cache novo por teste"""
+    monkeypatch.setattr(redis_module, "redis_client", redis_module.NoOpRedisClient())
+    cache = ResponseCache()
+    monkeypatch.setattr(cache_module, "response_cache", cache)
+    return cache
+
+
+def _app(calls):
+    router = APIRouter()
+
+    def fake_db():
+        yield "session"
+
+    @router.get("/items/{item_id}")
+    @cached_response("items", ttl=60)
+    async def get_item(item_id: int, db=Depends(fake_db), limit: int = Query(10)):
+        calls.append((item_id, limit))
+        await asyncio.sleep(0.02)
+        return {"item_id": item_id, "limit": limit, "calls": len(calls)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+class TestResponseCache:
+    """Testes para o decorator cached_response"""
+
+    def test_second_request_is_cache_hit(self):
+        """Test: Segunda chamada com mesmos parâmetros não recalcula"""
+        calls = []
+        client = TestClient(_app(calls))
+
+        first = client.get("/items/1?limit=5")
+        second = client.get("/items/1?limit=5")
+        other = client.get("/items/1?limit=6")
+
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json() == {"item_id": 1, "limit": 5, "calls": 1}
+        assert other.json()["calls"] == 2
+        assert len(calls) == 2
+
+    def test_etag_returns_304(self):
+        """Test: If-None-Match com o ETag atual retorna 304 sem corpo"""
+        client = TestClient(_app([]))
+        etag = client.get("/items/2").headers["etag"]
+
+        response = client.get("/items/2", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert client.get("/items/2", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    def test_invalidation_hook_forces_recompute(self, local_cache):
+        """Test: Hook dos jobs invalida o namespace"""
+        calls = []
+        client = TestClient(_app(calls))
+        client.get("/items/3")
+
+        invalidate_response_cache("other")
+        assert client.get("/items/3").headers["x-cache"] == "HIT"
+
+        invalidate_response_cache("items")
+        assert client.get("/items/3").headers["x-cache"] == "MISS"
+        assert len(calls) == 2
+
+    def test_concurrent_requests_are_coalesced(self, local_cache):
+        """Test: Requests simultâneos calculam apenas uma vez (singleflight)"""
+        calls = []
+        app = _app(calls)
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(client.get("/items/4") for _ in range(20)))
+
+        responses = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(r.json()["calls"] == 1 for r in responses)
+        assert local_cache.stats["coalesced"] == 19
+
+    def test_dashboard_overview_is_cached(self, sqlite_file_db):
+        """Test: Endpoint real do dashboard passa pelo cache"""
+        from app.api.api_v1.endpoints import dashboard
+
+        app = FastAPI()
+        app.include_router(dashboard.router, prefix="/dashboard")
+        app.dependency_overrides[get_async_db] = sqlite_file_db.override_async_db
+        client = TestClient(app)
+
+        first = client.get("/dashboard/overview")
+        second = client.get("/dashboard/overview")
+
+        assert first.status_code == 200
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json()
@@ -0,0 +1,159 @@
+"""
+🧪 Testes Unitários - Precificação de combinadas no mesmo jogo (matriz de placares)
+"""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.markets_config import MARKET_IDS, SCORE_SETTLED_SELECTIONS
+from app.models import BetCombination, Match, Prediction, Team
+from app.services.automated_pipeline import AutomatedPipeline
+from app.services.ml_prediction_generator import MLPredictionGenerator
+from app.services.poisson_service import PoissonService
+from app.services.same_match_pricing import (
+    MarketMaskRegistry, can_price_jointly, get_mask_registry, has_redundant_leg, joint_probabilities, joint_probability,
+    price_legs
+)
+from app.services.team_strength_service import team_strength_service
+
+
+@pytest.fixture
+def analysis():
+    return PoissonService().analyze_match(1.8, 1.1, 1.0, 1.4)
+
+
+def brute_force(score_matrix, condition):
+    """Laço duplo sobre os placares"""
+    size = score_matrix.shape[0]
+    return sum(score_matrix[i, j] for i in range(size) for j in range(size) if condition(i, j))
+
+
+class TestMaskRegistry:
+    """Testes para MarketMaskRegistry"""
+
+    def test_single_legs_match_poisson_markets(self, analysis):
+        """Test: Perna isolada = probabilidade do PoissonService ('OVER_2.5' e 'OVER_2_5')"""
+        # FIRST_GOAL: i/(i+j) por placar vs fórmula fechada, diferem só pelo corte em max_goals
+        registry = get_mask_registry()
+        priced = 0
+        for market, probability in analysis.probabilities.items():
+            if market in registry:
+                assert joint_probability(analysis.score_matrix, [market]) == pytest.approx(probability, abs=1e-6)
+                priced += 1
+
+        assert priced >= 40
+        assert registry.family('OVER_2.5') == registry.family('OVER_2_5') == 'OVER_UNDER'
+
+    def test_registry_follows_markets_config(self):
+        """Test: Toda família existe em MARKET_IDS; mercados fora do placar não têm máscara"""
+        registry = MarketMaskRegistry(max_goals=6)
+
+        assert set(SCORE_SETTLED_SELECTIONS) <= set(MARKET_IDS)
+        assert registry.stack.shape == (sum(map(len, SCORE_SETTLED_SELECTIONS.values())) + 1, 7, 7)
+        assert not can_price_jointly(['OVER_2_5', 'CORNERS_OVER_9_5'])
+        with pytest.raises(KeyError):
+            registry.combined_mask(['HOME_WIN', 'CORNERS_OVER_9_5'])
+        with pytest.raises(ValueError):
+            MarketMaskRegistry(selections={'NOT_A_MARKET': ['HOME_WIN']})
+
+
+class TestJointProbability:
+    """Testes para joint_probability / joint_probabilities"""
+
+    def test_correlated_legs_use_joint_distribution(self, analysis):
+        """Test: OVER_2_5 + BTTS_YES = soma dos placares onde ambos ganham (> produto)"""
+        matrix = analysis.score_matrix
+        joint = joint_probability(matrix, ['OVER_2_5', 'BTTS_YES'])
+
+        assert joint == pytest.approx(brute_force(matrix, lambda i, j: i + j > 2.5 and i > 0 and j > 0))
+        assert joint > analysis.probabilities['OVER_2.5'] * analysis.probabilities['BTTS_YES']
+
+        assert joint_probability(matrix, ['UNDER_0_5', 'BTTS_YES']) == 0.0
+        assert joint_probability(matrix, ['OVER_1_5', 'OVER_0_5']) == pytest.approx(
+            analysis.probabilities['OVER_1.5'])
+        assert has_redundant_leg(matrix, ['OVER_1_5', 'OVER_0_5'])
+        assert has_redundant_leg(matrix, ['HOME_WIN', 'BTTS_YES', 'OVER_1_5'])
+        assert not has_redundant_leg(matrix, ['HOME_WIN', 'OVER_2_5'])
+
+    def test_batch_equals_single_combos(self, analysis):
+        """Test: Lote com combinadas de tamanhos diferentes = uma chamada por combinada"""
+        rng = random.Random(3)
+        markets = [m for m in analysis.probabilities if m in get_mask_registry()]
+        combos = [rng.sample(markets, rng.randint(1, 4)) for _ in range(200)]
+
+        batch = joint_probabilities(analysis.score_matrix, combos)
+
+        np.testing.assert_allclose(batch, [joint_probability(analysis.score_matrix, c) for c in combos], atol=1e-12)
+
+    def test_price_legs_mixes_matches(self, analysis):
+        """Test: Jogos diferentes multiplicam; mesmo jogo usa a conjunta; sem máscara usa produto"""
+        matrices = {1: analysis.score_matrix}
+        joint = joint_probability(analysis.score_matrix, ['HOME_WIN', 'OVER_1_5'])
+
+        assert price_legs([(1, 'HOME_WIN', 0.5), (2, 'BTTS_YES', 0.6)], matrices) == pytest.approx(0.3)
+        assert price_legs([(1, 'HOME_WIN', 0.5), (1, 'OVER_1.5', 0.7), (2, 'DRAW', 0.5)], matrices) == \
+            pytest.approx(joint * 0.5)
+        assert price_legs([(1, 'HOME_WIN', 0.5), (1, 'CORNERS_OVER', 0.7)], matrices) == pytest.approx(0.35)
+        assert price_legs([(2, 'HOME_WIN', 0.5), (2, 'OVER_1_5', 0.7)], matrices) == pytest.approx(0.35)
+
+
+@pytest.fixture
+def db(monkeypatch, sqlite_file_db):
+    monkeypatch.setattr(team_strength_service, "get_model", lambda: None)
+    random.seed(11)
+
+    session = sqlite_file_db.session_factory()
+    session.add_all([Team(id=i, name=f"Team {i}") for i in range(1, 13)])
+    for i in range(6):
+        session.add(Match(
+            id=i + 1, external_id=f"m{i}", home_team_id=2 * i + 1, away_team_id=2 * i + 2,
+            status='NS', league="Liga", match_date=datetime.utcnow() + timedelta(days=1)
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+class TestSameMatchCombos:
+    """Testes para os geradores que criam combinadas no mesmo jogo"""
+
+    def test_generator_prices_combos_with_joint_probability(self, db):
+        """Test: BetCombination no mesmo jogo guarda a conjunta da matriz do jogo"""
+        generator = MLPredictionGenerator(db)
+        matches = db.query(Match).all()
+        generator._preload(matches)
+
+        created = generator._generate_same_match_multiples(matches * 20, market_count=2, target=60)
+        generator._flush_pending()
+
+        combos = db.query(BetCombination).all()
+        predictions = {p.id: p for p in db.query(Prediction)}
+        assert created == len(combos) > 0
+        for combo in combos:
+            legs = [predictions[pid] for pid in combo.prediction_ids]
+            match = db.get(Match, legs[0].match_id)
+            expected = joint_probability(generator.get_score_matrix(match), [leg.market_type for leg in legs])
+            assert combo.combined_probability == pytest.approx(expected)
+            assert combo.combined_probability > 0
+
+    def test_pipeline_same_match_double_uses_joint(self, db):
+        """Test: Double do mesmo jogo entra com a conjunta; redundante/impossível fica de fora"""
+        for i, (match_id, market, prob) in enumerate([
+            (1, 'HOME_WIN', 0.6), (1, 'OVER_1_5', 0.7), (1, 'OVER_0_5', 0.9), (1, 'EXACTLY_0_GOALS', 0.1)
+        ], 1):
+            db.add(Prediction(id=i, match_id=match_id, prediction_type='SINGLE', market_type=market,
+                              predicted_outcome=market, predicted_probability=prob, confidence_score=0.8,
+                              model_version='ml_generator_v3', is_validated=False))
+        db.commit()
+
+        stats = AutomatedPipeline.__new__(AutomatedPipeline)._create_intelligent_combinations(db)
+
+        doubles = {d.market_type: d for d in db.query(Prediction).filter(Prediction.prediction_type == 'DOUBLE')}
+        matrix = MLPredictionGenerator(db).get_score_matrix(db.get(Match, 1))
+        assert stats['doubles'] == len(doubles)
+        # HOME_WIN e OVER_1_5 já implicam OVER_0_5; EXACTLY_0_GOALS é impossível com as outras
+        assert set(doubles) == {'HOME_WIN + OVER_1_5'}
+        assert doubles['HOME_WIN + OVER_1_5'].predicted_probability == pytest.approx(
+            joint_probability(matrix, ['HOME_WIN', 'OVER_1_5']))
@@ -0,0 +1,114 @@
+"""
+🧪 Testes Unitários - Startup da API (lazy imports, factories injetadas)
+
+O orçamento de tempo do cold start fica no benchmark (depende da máquina):
+    python benchmarks/bench_startup.py --budget 3.0
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.api_v1.endpoints import sync
+from app.core.lazy_imports import lazy_module
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Mesmo conjunto do benchmarks/bench_startup.py: nunca importados por `import app.main`
+HEAVY_MODULES = (
+    'tensorflow', 'torch', 'transformers', 'xgboost', 'lightgbm',
+    'sklearn', 'scipy.stats', 'pandas', 'aiohttp', 'scrapy', 'selenium',
+)
+
+PROBE = """
+import json, sys
+import app.main
+singletons = {
+    'app.services.data_synchronizer': '_data_synchronizer',
+    'app.services.global_match_system': '_global_match_system',
+}
+print(json.dumps({
+    'modules': sorted(sys.modules),
+    'built': [name for name, attr in singletons.items()
+              if getattr(sys.modules.get(name), attr, None) is not None],
+}))
+"""
+
+
+@pytest.fixture(scope='module')
+def cold_start():
+    """`import app.main` num interpretador novo"""
+    proc = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestColdStart:
+    """Testes para o custo de `import app.main`"""
+
+    def test_heavy_dependencies_not_imported(self, cold_start):
+        """Test: ML/scraping (tensorflow, sklearn, scipy.stats, pandas...) fora do boot"""
+        imported = [name for name in HEAVY_MODULES if name in cold_start['modules']]
+        assert imported == []
+
+    def test_singletons_not_built_at_import(self, cold_start):
+        """Test: Serviços globais só são instanciados no primeiro uso"""
+        assert cold_start['built'] == []
+
+
+class TestLazyModule:
+    """Testes para app.core.lazy_imports.lazy_module"""
+
+    def test_import_deferred_until_attribute_access(self, monkeypatch):
+        """Test: Módulo só entra em sys.modules no primeiro atributo lido"""
+        monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+
+        colorsys = lazy_module('colorsys')
+        assert not colorsys.is_loaded
+        assert 'colorsys' not in sys.modules
+
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert colorsys.is_loaded
+        assert 'colorsys' in sys.modules
+
+    def test_missing_package_fails_on_use(self):
+        """Test: Pacote ausente não quebra o import, só o primeiro uso"""
+        missing = lazy_module('pacote_que_nao_existe')
+
+        with pytest.raises(ModuleNotFoundError):
+            missing.algum_atributo
+
+
+class TestDependencyInjection:
+    """Testes para as factories de app.api.deps"""
+
+    def test_endpoint_uses_injected_service(self):
+        """Test: dependency_overrides troca o serviço sem importar o módulo real"""
+        class FakeSynchronizer:
+            async def quick_sync(self):
+                return {'matches': 3}
+
+        app = FastAPI()
+        app.include_router(sync.router, prefix="/sync")
+        app.dependency_overrides[deps.get_data_synchronizer] = FakeSynchronizer
+
+        body = TestClient(app).post("/sync/quick").json()
+
+        assert body['results'] == {'matches': 3}
+
+    def test_factory_returns_shared_instance(self):
+        """Test: A factory devolve sempre o mesmo singleton, também pelo nome antigo"""
+        from app.services import data_synchronizer as module
+
+        instance = deps.get_data_synchronizer()
+
+        assert deps.get_data_synchronizer() is instance
+        assert module.data_synchronizer is instance
@@ -0,0 +1,200 @@
+"""
+🧪 Testes Unitários - Value bet scanner (passada vetorizada, snapshot ranqueado, paginação)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import redis as redis_module
+from app.core.database import get_async_db
+from app.models import Match, Odds, Team, TeamStatistics, ValueBetRanking, ValueBetScan
+from app.services.poisson_service import poisson_service
+from app.services.team_strength_service import team_strength_service
+from app.services.value_bet_detector import value_bet_detector
+from app.services.value_bet_scanner import SNAPSHOT_MIN_EDGE, ValueBetScanner
+
+N_MATCHES = 60  # acima do antigo limite de 50
+
+
+@pytest.fixture
+def db(monkeypatch, sqlite_file_db):
+    monkeypatch.setattr(team_strength_service, "get_model", lambda: None)
+    monkeypatch.setattr(redis_module, "redis_client", redis_module.NoOpRedisClient())
+
+    session = sqlite_file_db.session_factory()
+
+    teams = [Team(id=i, name=f"Team {i}") for i in range(1, 13)]
+    session.add_all(teams)
+    for team in teams:
+        session.add(TeamStatistics(
+            team_id=team.id, season="2025", games_played=10,
+            goals_for=8 + team.id, goals_against=20 - team.id
+        ))
+
+    for i in range(N_MATCHES):
+        home, away = i % 12 + 1, (i * 5 + 3) % 12 + 1
+        if home == away:
+            away = home % 12 + 1
+        session.add(Match(
+            id=i + 1, external_id=f"m{i}", home_team_id=home, away_team_id=away,
+            status='NS', league="Liga", match_date=datetime.now() + timedelta(days=1)
+        ))
+        for j, bookmaker in enumerate(["Bet A", "Bet B"]):
+            session.add(Odds(
+                match_id=i + 1, bookmaker=bookmaker, market="1X2",
+                home_win=2.2 + 0.1 * j + (i % 4) * 0.3, draw=3.6 - 0.2 * j, away_win=3.1 + (i % 3) * 0.5,
+                over_2_5=1.9 + 0.05 * j, under_2_5=2.1, btts_yes=1.95, btts_no=1.9 - 0.1 * j,
+                odds_timestamp=datetime.now()
+            ))
+    session.add(Odds(
+        match_id=1, bookmaker="Bet C", market="DOUBLE_CHANCE",
+        additional_markets={"1X": 1.9, "X2": 2.4}, odds_timestamp=datetime.now()
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def reference_value_bets(db):
+    """Caminho antigo (uma análise + detector por jogo) com as mesmas forças"""
+    found = {}
+    stats = {s.team_id: s for s in db.query(TeamStatistics)}
+    for match in db.query(Match).all():
+        home, away = stats[match.home_team_id], stats[match.away_team_id]
+        prediction = poisson_service.analyze_match(
+            home_goals_avg=home.goals_for / 10, away_goals_avg=away.goals_for / 10,
+            home_conceded_avg=home.goals_against / 10, away_conceded_avg=away.goals_against / 10
+        )
+        market_odds = {}
+        for odd in db.query(Odds).filter(Odds.match_id == match.id):
+            for column, market, selection in [
+                ('home_win', '1X2', 'home'), ('draw', '1X2', 'draw'), ('away_win', '1X2', 'away'),
+                ('over_2_5', 'OVER_UNDER_2.5', 'over'), ('under_2_5', 'OVER_UNDER_2.5', 'under'),
+                ('btts_yes', 'BTTS', 'yes'), ('btts_no', 'BTTS', 'no')
+            ]:
+                price = getattr(odd, column)
+                current = market_odds.setdefault(market, {}).get(selection, {'odds': 0})
+                if price is not None and price > current['odds']:
+                    market_odds[market][selection] = {'odds': price, 'bookmaker': odd.bookmaker}
+            for selection, price in (odd.additional_markets or {}).items():
+                market_odds.setdefault(odd.market, {})[selection] = {'odds': price, 'bookmaker': odd.bookmaker}
+
+        for vb in value_bet_detector.detect_value_bets(
+            match.id, "", prediction, market_odds, confidence=0.7
+        ):
+            key = value_bet_detector._get_probability_key(vb.market_type, vb.selection)
+            found[(match.id, key)] = (vb.edge, vb.bookmaker, vb.kelly_stake)
+    return found
+
+
+class TestValueBetScanner:
+    """Testes para o scan em lote"""
+
+    def test_matches_per_match_detector(self, db):
+        """Test: Mesmos value bets, edges e bookmakers que o detector jogo a jogo"""
+        scanner = ValueBetScanner()
+        result = scanner.compute(db)
+
+        assert result['matches_analyzed'] == N_MATCHES
+        assert result['strength_source'] == 'team_statistics'
+
+        key_of = {
+            ('1X2', 'home'): '1X2_HOME', ('1X2', 'draw'): '1X2_DRAW', ('1X2', 'away'): '1X2_AWAY',
+            ('OVER_UNDER', 'over_2_5'): 'OVER_UNDER_2.5_OVER', ('OVER_UNDER', 'under_2_5'): 'OVER_UNDER_2.5_UNDER',
+            ('BTTS', 'btts_yes'): 'BTTS_YES', ('BTTS', 'btts_no'): 'BTTS_NO',
+            ('DOUBLE_CHANCE', '1X'): 'DOUBLE_CHANCE_1X', ('DOUBLE_CHANCE', 'X2'): 'DOUBLE_CHANCE_X2',
+        }
+        scanned = {
+            (vb['match_id'], key_of[(vb['market_type'], vb['selection'])]):
+                (vb['edge'], vb['bookmaker'], vb['kelly_stake'])
+            for vb in result['value_bets']
+        }
+        reference = reference_value_bets(db)
+
+        assert len(scanned) > N_MATCHES
+        assert scanned.keys() == reference.keys()
+        for key, (edge, bookmaker, kelly) in reference.items():
+            assert scanned[key][0] == pytest.approx(edge, abs=0.01)
+            assert scanned[key][1:] == (bookmaker, kelly)
+
+    def test_ranking_order_and_match_rank(self, db):
+        """Test: Ordem por rating + edge e posição dentro de cada jogo"""
+        value_bets = ValueBetScanner().compute(db)['value_bets']
+        priority = {'PREMIUM': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+        keys = [(priority[vb['value_rating']], vb['edge']) for vb in value_bets]
+        assert keys == sorted(keys, reverse=True)
+        assert [vb['rank'] for vb in value_bets] == list(range(1, len(value_bets) + 1))
+
+        seen = {}
+        for vb in value_bets:
+            seen[vb['match_id']] = seen.get(vb['match_id'], 0) + 1
+            assert vb['match_rank'] == seen[vb['match_id']]
+
+    def test_run_scan_replaces_snapshot(self, db):
+        """Test: Novo scan substitui o snapshot anterior"""
+        scanner = ValueBetScanner()
+        first = scanner.run_scan(db)
+        second = scanner.run_scan(db)
+
+        assert first['value_bets_found'] == second['value_bets_found'] > 0
+        assert db.query(ValueBetScan).count() == 1
+        assert {r.scan_id for r in db.query(ValueBetRanking)} == {second['scan_id']}
+
+    def test_page_matches_diversified_scan(self, db):
+        """Test: Páginas = filtro de edge + máximo 2 por jogo, na ordem do ranking"""
+        scanner = ValueBetScanner()
+        scanner.run_scan(db)
+        all_bets = scanner.compute(db)['value_bets']
+
+        expected, per_match = [], {}
+        for vb in all_bets:
+            if vb['edge'] >= 10 and per_match.get(vb['match_id'], 0) < 2:
+                expected.append((vb['match_id'], vb['selection']))
+                per_match[vb['match_id']] = per_match.get(vb['match_id'], 0) + 1
+
+        first = scanner.get_page(db, min_edge=10, offset=0, limit=15)
+        second = scanner.get_page(db, min_edge=10, offset=15, limit=15)
+        paged = [(vb['match_id'], vb['selection']) for vb in first['value_bets'] + second['value_bets']]
+
+        assert paged == expected[:30]
+        assert first['total_available'] == len(expected)
+        assert first['total_value_bets_found'] == sum(vb['edge'] >= 10 for vb in all_bets)
+        assert first['total_matches_analyzed'] == N_MATCHES
+
+    def test_min_edge_below_snapshot_is_rejected(self, db, sqlite_file_db):
+        """Test: min_edge abaixo do piso do snapshot é recusado, não elevado em silêncio"""
+        from app.api.api_v1.endpoints import markets
+
+        scanner = ValueBetScanner()
+        scanner.run_scan(db)
+        with pytest.raises(ValueError):
+            scanner.get_page(db, min_edge=SNAPSHOT_MIN_EDGE - 1)
+
+        app = FastAPI()
+        app.include_router(markets.router, prefix="/markets")
+        app.dependency_overrides[get_async_db] = sqlite_file_db.override_async_db
+
+        assert TestClient(app).get("/markets/value-bets/scan?min_edge=2").status_code == 422
+
+    def test_endpoint_reads_snapshot(self, db, sqlite_file_db, monkeypatch):
+        """Test: Endpoint calcula o snapshot no primeiro acesso e depois só pagina"""
+        from app.api.api_v1.endpoints import markets
+        from app.core import response_cache as cache_module
+
+        monkeypatch.setattr(cache_module, "response_cache", cache_module.ResponseCache())
+        app = FastAPI()
+        app.include_router(markets.router, prefix="/markets")
+        app.dependency_overrides[get_async_db] = sqlite_file_db.override_async_db
+        client = TestClient(app)
+
+        response = client.get("/markets/value-bets/scan?min_edge=5&limit=5&offset=5")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body['total_matches_analyzed'] == N_MATCHES
+        assert len(body['value_bets']) == 5
+        assert body['value_bets'][0]['match_name'].startswith("Team ")
+        assert db.query(ValueBetScan).count() == 1
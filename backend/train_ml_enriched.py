@@ -19,6 +19,36 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from app.core.feature_store import FeatureStore
+from integrate_scraped_data import ENRICHED_DATASET, FEATURE_STORE_PATH, ScrapedDataIntegrator
+
+ENRICHED_CSV = 'brasileirao_2024_matches_enriched.csv'
+
+# Feature groups for better organization
+TEAM_STRENGTH_FEATURES = [
+    'points_home', 'points_away', 'points_diff',
+    'win_rate_home', 'win_rate_away', 'win_rate_diff',
+    'position_home', 'position_away', 'position_diff',
+    'home_strength', 'away_strength', 'strength_diff'
+]
+
+PERFORMANCE_FEATURES = [
+    'goals_for_home', 'goals_for_away',
+    'goals_against_home', 'goals_against_away',
+    'goal_diff_home', 'goal_diff_away', 'goal_diff_diff',
+    'goals_per_match_home', 'goals_per_match_away',
+    'conceded_per_match_home', 'conceded_per_match_away'
+]
+
+FORM_FEATURES = [
+    'wins_home', 'wins_away',
+    'draws_home', 'draws_away',
+    'losses_home', 'losses_away',
+    'points_per_match_home', 'points_per_match_away', 'form_diff'
+]
+
+CATEGORICAL_COLUMNS = ['league', 'source']
+
 class EnhancedMLTrainer:
     """Enhanced ML Trainer using scraped team statistics"""
 
@@ -30,17 +60,25 @@ class EnhancedMLTrainer:
         os.makedirs(self.models_dir, exist_ok=True)
 
     def load_enriched_data(self):
-        """Load enriched dataset with scraped team statistics"""
+        """Load enriched dataset with scraped team statistics from the feature store"""
         print("📊 LOADING ENRICHED BRASILEIRÃO DATA...")
 
-        if not os.path.exists('brasileirao_2024_matches_enriched.csv'):
+        store = FeatureStore(FEATURE_STORE_PATH)
+
+        # Enriched CSVs from older runs are appended once (known matches are skipped)
+        if os.path.exists(ENRICHED_CSV):
+            ScrapedDataIntegrator().save_to_feature_store(pd.read_csv(ENRICHED_CSV), store)
+
+        if ENRICHED_DATASET not in store.datasets():
             print("❌ Enriched dataset not found! Run integrate_scraped_data.py first")
             return None
 
-        df = pd.read_csv('brasileirao_2024_matches_enriched.csv')
+        # Only the columns used for training
+        available = set(store.columns(ENRICHED_DATASET))
+        wanted = TEAM_STRENGTH_FEATURES + PERFORMANCE_FEATURES + FORM_FEATURES + CATEGORICAL_COLUMNS + ['result']
+        df = store.read(ENRICHED_DATASET, columns=[col for col in wanted if col in available])
         print(f"⚽ Matches loaded: {len(df)}")
-        print(f"📊 Features available: {len(df.columns)}")
-        print(f"🆚 Original dataset: 8 columns → Enhanced: {len(df.columns)} columns")
+        print(f"📊 Features loaded: {len(df.columns)} of {len(available)} stored columns")
 
         return df
 
@@ -58,30 +96,9 @@ class EnhancedMLTrainer:
         for col in numeric_cols:
             df[col] = df[col].fillna(df[col].median())
 
-        # Feature groups for better organization
-        basic_features = ['home_score', 'away_score', 'total_goals']
-
-        team_strength_features = [
-            'points_home', 'points_away', 'points_diff',
-            'win_rate_home', 'win_rate_away', 'win_rate_diff',
-            'position_home', 'position_away', 'position_diff',
-            'home_strength', 'away_strength', 'strength_diff'
-        ]
-
-        performance_features = [
-            'goals_for_home', 'goals_for_away',
-            'goals_against_home', 'goals_against_away',
-            'goal_diff_home', 'goal_diff_away', 'goal_diff_diff',
-            'goals_per_match_home', 'goals_per_match_away',
-            'conceded_per_match_home', 'conceded_per_match_away'
-        ]
-
-        form_features = [
-            'wins_home', 'wins_away',
-            'draws_home', 'draws_away',
-            'losses_home', 'losses_away',
-            'points_per_match_home', 'points_per_match_away', 'form_diff'
-        ]
+        team_strength_features = TEAM_STRENGTH_FEATURES
+        performance_features = PERFORMANCE_FEATURES
+        form_features = FORM_FEATURES
 
         # Select available features
         feature_columns = []
@@ -92,7 +109,7 @@ class EnhancedMLTrainer:
 
         # Add categorical features if needed
         categorical_features = []
-        for col in ['league', 'source']:
+        for col in CATEGORICAL_COLUMNS:
             if col in df.columns:
                 df[f'{col}_encoded'] = pd.factorize(df[col])[0]
                 categorical_features.append(f'{col}_encoded')
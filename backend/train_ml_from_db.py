@@ -14,28 +14,49 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from app.core.config import settings
 from app.core.database import SessionLocal
-from app.models.match import Match
-from app.models.statistics import MatchStatistics
-from sqlalchemy.orm import joinedload
+from app.core.feature_store import (
+    FeatureStore, MATCHES_DATASET, MATCH_STATISTICS_DATASET, sync_finished_matches
+)
+
+# Estatísticas do jogo lidas do feature store (valor padrão quando ausente)
+STAT_DEFAULTS = {
+    'possession_home': 50.0,
+    'possession_away': 50.0,
+    'shots_home': 0,
+    'shots_away': 0,
+    'shots_on_target_home': 0,
+    'shots_on_target_away': 0,
+    'corners_home': 0,
+    'corners_away': 0,
+    'fouls_home': 0,
+    'fouls_away': 0,
+    'yellow_cards_home': 0,
+    'yellow_cards_away': 0,
+}
 
 print("🤖 TREINAMENTO DE MODELOS ML")
 print("="*60)
 
 # Criar sessão
 db = SessionLocal()
-
-# Buscar matches com estatísticas
-print("\n📊 Carregando dados do banco...")
-matches = db.query(Match).options(
-    joinedload(Match.home_team),
-    joinedload(Match.away_team),
-    joinedload(Match.statistics)
-).filter(
-    Match.status == 'FT',
-    Match.home_score != None,
-    Match.away_score != None
-).join(MatchStatistics).all()
+store = FeatureStore(settings.FEATURE_STORE_PATH)
+
+# Acrescentar ao store só os jogos finalizados que ainda não estão lá
+print("\n📦 Atualizando feature store...")
+synced = sync_finished_matches(store, db)
+print(f"   ✅ {synced[MATCHES_DATASET]} jogos e {synced[MATCH_STATISTICS_DATASET]} estatísticas novas")
+
+# Buscar matches com estatísticas (só as colunas usadas no treino)
+print("\n📊 Carregando dados do feature store...")
+results = store.read(
+    MATCHES_DATASET,
+    columns=['match_id', 'home_score', 'away_score'],
+    filters=[('status', '=', 'FT')]
+)
+statistics = store.read(MATCH_STATISTICS_DATASET, columns=['match_id'] + list(STAT_DEFAULTS))
+matches = results.merge(statistics, on='match_id')
 
 print(f"   ✅ {len(matches)} matches carregados")
 
@@ -48,49 +69,21 @@ if len(matches) < 100:
 # Preparar dataset
 print("\n🔧 Preparando dataset...")
 
-data = []
-for match in matches:
-    stats = match.statistics
-    if not stats:
-        continue
-
-    # Calcular resultado
-    if match.home_score > match.away_score:
-        result = 'H'  # Home win
-    elif match.home_score < match.away_score:
-        result = 'A'  # Away win
-    else:
-        result = 'D'  # Draw
-
-    # Features
-    features = {
-        # Estatísticas do jogo
-        'possession_home': stats.possession_home or 50.0,
-        'possession_away': stats.possession_away or 50.0,
-        'shots_home': stats.shots_home or 0,
-        'shots_away': stats.shots_away or 0,
-        'shots_on_target_home': stats.shots_on_target_home or 0,
-        'shots_on_target_away': stats.shots_on_target_away or 0,
-        'corners_home': stats.corners_home or 0,
-        'corners_away': stats.corners_away or 0,
-        'fouls_home': stats.fouls_home or 0,
-        'fouls_away': stats.fouls_away or 0,
-        'yellow_cards_home': stats.yellow_cards_home or 0,
-        'yellow_cards_away': stats.yellow_cards_away or 0,
-
-        # Features derivadas
-        'possession_diff': (stats.possession_home or 50) - (stats.possession_away or 50),
-        'shots_diff': (stats.shots_home or 0) - (stats.shots_away or 0),
-        'shots_on_target_diff': (stats.shots_on_target_home or 0) - (stats.shots_on_target_away or 0),
-        'corners_diff': (stats.corners_home or 0) - (stats.corners_away or 0),
-
-        # Target
-        'result': result
-    }
-
-    data.append(features)
-
-df = pd.DataFrame(data)
+# Estatísticas do jogo
+df = matches[list(STAT_DEFAULTS)].fillna(STAT_DEFAULTS)
+
+# Features derivadas
+df['possession_diff'] = df['possession_home'] - df['possession_away']
+df['shots_diff'] = df['shots_home'] - df['shots_away']
+df['shots_on_target_diff'] = df['shots_on_target_home'] - df['shots_on_target_away']
+df['corners_diff'] = df['corners_home'] - df['corners_away']
+
+# Target: H (home win), A (away win), D (draw)
+df['result'] = np.select(
+    [matches['home_score'] > matches['away_score'], matches['home_score'] < matches['away_score']],
+    ['H', 'A'],
+    default='D'
+)
 
 print(f"   ✅ Dataset criado: {len(df)} matches")
 print(f"\n   Distribuição de resultados:")
@@ -10,10 +10,14 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-import joblib
 import os
 from datetime import datetime
 
+from app.core.model_registry import model_registry
+
+# Nome do bundle no registry (lido por /ml-real/brasileirao/predict)
+REGISTRY_NAME = "brasileirao_real"
+
 class MLTrainerCSV:
     """
     🤖 Treinador ML usando dados do CSV coletado
@@ -24,9 +28,8 @@ class MLTrainerCSV:
         self.encoders = {}
         self.feature_importance = {}
 
-        # Diretório para salvar modelos
-        self.models_dir = "models/brasileirao_real"
-        os.makedirs(self.models_dir, exist_ok=True)
+        # Modelos são gravados no registry (save_metadata), num único bundle versionado
+        self.registry = model_registry
 
     def load_data(self):
         """
@@ -162,10 +165,8 @@ class MLTrainerCSV:
             test_score = model.score(X_test, y_test)
             y_pred = model.predict(X_test)
 
-            # Salvar modelo
+            # Guardar modelo (gravado junto com os encoders em save_metadata)
             self.models[model_name] = model
-            model_path = os.path.join(self.models_dir, f"{model_name}_brasileirao.joblib")
-            joblib.dump(model, model_path)
 
             # Feature importance
             if hasattr(model, 'feature_importances_'):
@@ -223,9 +224,14 @@ class MLTrainerCSV:
             'total_samples': 380
         }
 
-        metadata_path = os.path.join(self.models_dir, "metadata.joblib")
-        joblib.dump(metadata, metadata_path)
-        print(f"💾 Metadados salvos: {metadata_path}")
+        bundle = {'models': self.models, **metadata}
+        entry = self.registry.register(REGISTRY_NAME, bundle, metadata={
+            'training_date': metadata['training_date'],
+            'data_source': metadata['data_source'],
+            'total_samples': metadata['total_samples'],
+            'models': sorted(self.models)
+        })
+        print(f"💾 Modelos e metadados salvos: {REGISTRY_NAME}@{entry['version']}")
 
     def predict_match(self, home_team, away_team):
         """
@@ -307,7 +313,7 @@ def main():
     # 5. Relatório final
     print(f"\n" + "="*80)
     print("🎉 TREINAMENTO CONCLUÍDO!")
-    print(f"📁 Modelos salvos em: {trainer.models_dir}/")
+    print(f"📁 Modelos salvos em: {trainer.registry.root / REGISTRY_NAME}/")
     print(f"🎯 Melhor modelo individual: {max(results.keys(), key=lambda k: results[k]['test_accuracy'])}")
     print(f"🏆 Ensemble accuracy: {ensemble_score:.3f}")
 
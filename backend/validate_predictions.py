@@ -7,6 +7,7 @@ from app.core.database import SessionLocal
 from app.models.prediction import Prediction
 from app.models.match import Match
 from app.models.team import Team
+from app.services.performance_rollup_service import PerformanceRollupService
 
 def main():
     db = SessionLocal()
@@ -25,6 +26,7 @@ def main():
     total = len(predictions)
     wins = 0
     losses = 0
+    rollup = PerformanceRollupService(db)
 
     for pred in predictions:
         match = db.query(Match).filter(Match.id == pred.match_id).first()
@@ -50,9 +52,11 @@ def main():
             is_winner = match.home_score == 0 or match.away_score == 0
 
         # Atualizar prediction
+        before = rollup.prediction_contribution(pred, match.league)
         pred.is_validated = True
         pred.is_winner = is_winner
         pred.actual_outcome = f'{match.home_score}x{match.away_score}'
+        rollup.track(before, rollup.prediction_contribution(pred, match.league))
 
         if is_winner:
             wins += 1
@@ -68,6 +72,7 @@ def main():
         print(f'       Pred: {pred.market_type} | Prob: {pred.predicted_probability:.1%} | Conf: {pred.confidence_score:.1%}')
         print()
 
+    rollup.flush()
     db.commit()
 
     accuracy = (wins / total * 100) if total > 0 else 0